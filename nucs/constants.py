@@ -19,9 +19,23 @@ OPTIM_RESET = "RESET"
 OPTIM_PRUNE = "PRUNE"
 OPTIM_MODES = [OPTIM_RESET, OPTIM_PRUNE]
 
+# Restart policies
+RESTART_NONE = "NONE"
+RESTART_LUBY = "LUBY"
+RESTART_GEOMETRIC = "GEOMETRIC"
+RESTART_POLICIES = [RESTART_NONE, RESTART_LUBY, RESTART_GEOMETRIC]
+
+# Choice point modes
+CHOICE_POINTS_AUTO = "AUTO"
+CHOICE_POINTS_COPY = "COPY"
+CHOICE_POINTS_TRAIL = "TRAIL"
+CHOICE_POINTS_MODES = [CHOICE_POINTS_AUTO, CHOICE_POINTS_COPY, CHOICE_POINTS_TRAIL]
+CP_BRANCH_NB = 3  # the number of levels of the stacks written by a domain heuristic, see value_dom_heuristic
+
 # Bounds
 VARIABLE = 0  # index for a variable
 PARAM = 1  # index for a parameter
+STATE = 2  # index for a state cell
 RANGE_START = 0  # index corresponding to the start of a value range
 RANGE_END = 1  # index corresponding to the end of a value range
 
@@ -54,10 +68,66 @@ PROBLEM_INCONSISTENT = 0  # returned when the filtering of a problem detects an
 PROBLEM_UNBOUND = 1  # returned when the filtering of a problem has been completed, but the problem is not solved
 PROBLEM_BOUND = 2  # returned when a problem is solved
 
+SEARCH_EXHAUSTED = 0  # returned by solve_one when the search space has been exhausted
+SEARCH_SOLUTION = 1  # returned by solve_one when a solution has been found
+SEARCH_LIMIT_REACHED = 2  # returned by solve_one when a limit has been reached, the search can be resumed
+SEARCH_STACKS_FULL = 3  # returned by solve_one when the stacks or the trail are full, the search resumes once grown
+
+LIMITS_MAX = 3
+(
+    LIMIT_IDX_CHOICE_NB,  # the number of choices to stop at
+    LIMIT_IDX_BACKTRACK_NB,  # the number of backtracks to stop at
+    LIMIT_IDX_DEADLINE,  # the monotonic time in ns to stop at
+) = tuple(range(LIMITS_MAX))
+LIMIT_NONE = (1 << 63) - 1  # a limit that is never reached
+LIMIT_DEADLINE_PERIOD = 1 << 10  # the number of choices between two checks of the deadline
+INCUMBENT_POLL_PERIOD = 1 << 10  # the number of choices between two polls of a shared incumbent
+PHASE_NONE = 1 << 62  # the phase of a variable without a hint nor a saved value, which no domain contains
+
+# The propagator weights learned from the failures: a header followed by sections of one cell per propagator
+WEIGHTS_HEADER_NB = 3
+(
+    WEIGHTS_IDX_FAILURE_NB,  # the number of failures
+    WEIGHTS_IDX_ACTIVITY_BUMP,  # the current activity bump, which grows to decay the previous ones
+    WEIGHTS_IDX_CHB_STEP,  # the current CHB step size, in millionths
+) = tuple(range(WEIGHTS_HEADER_NB))
+WEIGHTS_SECTION_NB = 4
+(
+    WEIGHTS_SECTION_FAILURE_NB,  # the number of failures of each propagator
+    WEIGHTS_SECTION_ACTIVITY,  # the activity of each propagator
+    WEIGHTS_SECTION_CHB_SCORE,  # the CHB score of each propagator, in WEIGHTS_CHB_SCALE units
+    WEIGHTS_SECTION_CHB_LAST_FAILURE,  # the failure number of the last failure of each propagator
+) = tuple(range(WEIGHTS_SECTION_NB))
+WEIGHTS_ACTIVITY_BUMP_INIT = 1 << 10
+WEIGHTS_ACTIVITY_BUMP_MAX = 1 << 50  # the activities are rescaled beyond this bump
+WEIGHTS_ACTIVITY_DECAY = 95  # in percents
+WEIGHTS_CHB_SCALE = 1 << 32
+WEIGHTS_CHB_STEP_INIT = 400_000
+WEIGHTS_CHB_STEP_MIN = 60_000
+
+# The header of the state of an incremental propagator, followed by the positions changed since its previous call:
+# the appended positions are only complete for the consistency algorithm call that stamped the delta
+DELTA_HEADER_NB = 4
+(
+    DELTA_IDX_STAMP,  # the low half of the stamp
+    DELTA_IDX_STAMP_HIGH,  # the high half of the stamp
+    DELTA_IDX_WARM,  # 0 when the propagator has to recompute everything
+    DELTA_IDX_NB,  # the number of changed positions, more than the arity when the delta has overflowed
+) = tuple(range(DELTA_HEADER_NB))
+# below this arity, maintaining the delta costs more than rescanning the domains
+DELTA_MIN_ARITY = 16
+# the occurrences of the variables in the incremental propagators
+DELTA_OCCURRENCE_NB = 3
+(
+    DELTA_OCCURRENCE_IDX_STATE,  # the start of the state of the propagator in propagator_states
+    DELTA_OCCURRENCE_IDX_ARITY,  # the arity of the propagator
+    DELTA_OCCURRENCE_IDX_POSITION,  # the position of the variable in the propagator
+) = tuple(range(DELTA_OCCURRENCE_NB))
+
 # The array arguments are typed C-contiguous (::1) rather than any-layout (:) so the hot loops in every
 # propagator and in the consistency algorithm index with a plain offset instead of a stride multiply.
 # All these arrays are contiguous np.empty/np.zeros/np.ones allocations threaded through unchanged.
-SIGN_COMPUTE_DOMAINS = int64(int32[:, ::1], int32[::1])  # domains, parameters
+SIGN_COMPUTE_DOMAINS = int64(int32[:, ::1], int32[::1], int32[::1])  # domains, parameters, state
 TYPE_COMPUTE_DOMAINS = types.FunctionType(SIGN_COMPUTE_DOMAINS)
 TYPE_COMPUTE_DOMAINS_LIST = types.ListType(TYPE_COMPUTE_DOMAINS)
 
@@ -82,6 +152,15 @@ SIGN_CONSISTENCY_ALG = int64(
     int32[::1],  # triggered_propagators
     TYPE_COMPUTE_DOMAINS_LIST,  # compute_domains_fcts
     int32[:, ::1],  # domain_buffer
+    int64[::1],  # propagator_weights
+    int32[::1],  # propagator_states
+    uint8[::1],  # incremental_propagators
+    int32[::1],  # deltas
+    int32[::1],  # deltas_offsets
+    int64[:, ::1],  # propagator_profiles
+    int64[::1],  # nogoods
+    int64[::1],  # reason_levels
+    int64[::1],  # trail
 )
 TYPE_CONSISTENCY_ALG = types.FunctionType(SIGN_CONSISTENCY_ALG)
 
@@ -113,7 +192,7 @@ LOG_LEVEL_ERROR = "ERROR"
 LOG_LEVEL_CRITICAL = "CRITICAL"
 LOG_LEVELS = [LOG_LEVEL_DEBUG, LOG_LEVEL_INFO, LOG_LEVEL_WARNING, LOG_LEVEL_ERROR, LOG_LEVEL_CRITICAL]
 
-STATS_MAX = 10
+STATS_MAX = 11
 (
     STATS_IDX_ALG_BC_NB,
     STATS_IDX_PROPAGATOR_ENTAILMENT_NB,
@@ -125,6 +204,7 @@ STATS_MAX = 10
     STATS_IDX_SOLVER_CHOICE_DEPTH,
     STATS_IDX_SOLVER_CHOICE_NB,
     STATS_IDX_SOLVER_ELAPSED_TIME,
+    STATS_IDX_SOLVER_RESTART_NB,
 ) = tuple(range(STATS_MAX))
 
 STATS_LBL_ALG_BC_NB = "ALG_BC_NB"
@@ -137,3 +217,109 @@ STATS_LBL_SOLVER_BACKTRACK_NB = "SOLVER_BACKTRACK_NB"
 STATS_LBL_SOLVER_CHOICE_DEPTH = "SOLVER_CHOICE_DEPTH"
 STATS_LBL_SOLVER_CHOICE_NB = "SOLVER_CHOICE_NB"
 STATS_LBL_SOLVER_ELAPSED_TIME = "SOLVER_ELAPSED_TIME_MS"
+STATS_LBL_SOLVER_RESTART_NB = "SOLVER_RESTART_NB"
+
+# the counters of the profile of a propagator, see BacktrackSolver.get_propagator_profile
+PROFILE_MAX = 7
+(
+    PROFILE_IDX_CALL_NB,
+    PROFILE_IDX_NO_CHANGE_NB,
+    PROFILE_IDX_INCONSISTENCY_NB,
+    PROFILE_IDX_ENTAILMENT_NB,
+    PROFILE_IDX_REMOVED_VALUE_NB,  # the number of values removed by moving the bounds
+    PROFILE_IDX_TIMED_CALL_NB,
+    PROFILE_IDX_TIMED_CALL_TIME,  # the time in ns spent in the timed calls
+) = tuple(range(PROFILE_MAX))
+PROFILE_TIMING_PERIOD = 1 << 4  # a propagator is timed every PROFILE_TIMING_PERIOD calls
+
+PROFILE_LBL_CALL_NB = "CALL_NB"
+PROFILE_LBL_NO_CHANGE_NB = "NO_CHANGE_NB"
+PROFILE_LBL_INCONSISTENCY_NB = "INCONSISTENCY_NB"
+PROFILE_LBL_ENTAILMENT_NB = "ENTAILMENT_NB"
+PROFILE_LBL_REMOVED_VALUE_NB = "REMOVED_VALUE_NB"
+PROFILE_LBL_TIMED_CALL_NB = "TIMED_CALL_NB"
+PROFILE_LBL_TIMED_CALL_TIME = "TIMED_CALL_TIME_NS"
+
+# the nogood store, see nucs/solvers/nogoods.py
+NOGOOD_HEADER_NB = 12
+(
+    NOGOOD_IDX_NB,  # the number of nogoods, including the deleted ones
+    NOGOOD_IDX_LITERAL_NB,  # the number of literals used by the nogoods
+    NOGOOD_IDX_RUN_START,  # the first nogood recorded since the last restart
+    NOGOOD_IDX_RUN_TOP,  # the last nogood of the current run that is not deleted
+    NOGOOD_IDX_CAPACITY,  # the maximal number of nogoods
+    NOGOOD_IDX_LITERAL_CAPACITY,  # the maximal number of literals
+    NOGOOD_IDX_DOMAIN_NB,  # the number of variables
+    NOGOOD_IDX_STKS_MAX_HEIGHT,  # the maximal height of the choice point stacks
+    NOGOOD_IDX_CHANGE_NB,  # the number of variables changed by the last propagation
+    NOGOOD_IDX_RECORDED_NB,  # the number of recorded nogoods
+    NOGOOD_IDX_PRUNING_NB,  # the number of bounds moved by the nogoods
+    NOGOOD_IDX_FAILURE_NB,  # the number of failures detected by the nogoods
+) = tuple(range(NOGOOD_HEADER_NB))
+NOGOOD_RECORD_NB = 9
+(
+    NOGOOD_RECORD_IDX_START,  # the index of the first literal
+    NOGOOD_RECORD_IDX_SIZE,  # the number of literals, 0 when the nogood is deleted
+    NOGOOD_RECORD_IDX_LEVEL,  # the level of the choice point whose refutation recorded the nogood
+    NOGOOD_RECORD_IDX_LBD,  # the number of decision levels of the literals
+    NOGOOD_RECORD_IDX_WATCH_0,  # the positions of the two watched literals
+    NOGOOD_RECORD_IDX_WATCH_1,
+    NOGOOD_RECORD_IDX_NEXT_0,  # the next nodes of the watch lists of the two watched literals
+    NOGOOD_RECORD_IDX_NEXT_1,
+    NOGOOD_RECORD_IDX_PREVIOUS,  # the previous nogood of the current run that is not deleted
+) = tuple(range(NOGOOD_RECORD_NB))
+NOGOOD_LITERAL_FACTOR = 16  # the number of literals per nogood that can be stored
+NOGOOD_NONE = -1
+NOGOOD_BOUND_NONE = 1 << 62  # a bound that no domain reaches
+
+NOGOOD_LBL_RECORDED_NB = "RECORDED_NB"
+NOGOOD_LBL_PRUNING_NB = "PRUNING_NB"
+NOGOOD_LBL_FAILURE_NB = "FAILURE_NB"
+
+# the reason levels, see nucs/solvers/backjumps.py
+BACKJUMP_HEADER_NB = 5
+(
+    BACKJUMP_IDX_DOMAIN_NB,  # the number of variables
+    BACKJUMP_IDX_CONFLICT_LEVEL,  # the reason levels of the last failure
+    BACKJUMP_IDX_CONFLICT_LOWER_LEVEL,
+    BACKJUMP_IDX_JUMP_NB,  # the number of backtracks that have skipped choice points
+    BACKJUMP_IDX_SKIPPED_NB,  # the number of skipped choice points
+) = tuple(range(BACKJUMP_HEADER_NB))
+BACKJUMP_LEVEL = 0  # the deepest reason level of a variable
+BACKJUMP_LOWER_LEVEL = 1  # a bound on the other reason levels of a variable
+
+BACKJUMP_LBL_JUMP_NB = "JUMP_NB"
+BACKJUMP_LBL_SKIPPED_NB = "SKIPPED_NB"
+
+# the statistics of the large neighbourhood search, see nucs/solvers/lns_solver.py
+LNS_LBL_ITERATION_NB = "ITERATION_NB"
+LNS_LBL_IMPROVEMENT_NB = "IMPROVEMENT_NB"
+LNS_LBL_EXHAUSTED_NB = "EXHAUSTED_NB"  # the number of neighbourhoods completely explored
+
+# the trail, see nucs/solvers/trail.py
+TRAIL_HEADER_NB = 9
+(
+    TRAIL_IDX_DOMAIN_NB,  # the number of variables
+    TRAIL_IDX_LEVEL_CAPACITY,  # the maximal number of choice points
+    TRAIL_IDX_ENTRY_CAPACITY,  # the maximal number of entries
+    TRAIL_IDX_LEVEL_NB,  # the number of pending choice points
+    TRAIL_IDX_ENTRY_NB,  # the number of entries
+    TRAIL_IDX_STAMP,  # the stamp of the current level
+    TRAIL_IDX_OBJECTIVE_VARIABLE,  # the variable being optimized, -1 when there is none
+    TRAIL_IDX_OBJECTIVE_BOUND,  # the bound being optimized
+    TRAIL_IDX_OBJECTIVE_VALUE,  # the value that the bound must improve on
+) = tuple(range(TRAIL_HEADER_NB))
+TRAIL_LEVEL_NB = 7
+(
+    TRAIL_LEVEL_IDX_ENTRY_NB,  # the number of entries when the choice point was made
+    TRAIL_LEVEL_IDX_ENTAILMENT_NB,  # the size of the entailment trail when the choice point was made
+    TRAIL_LEVEL_IDX_UNBOUND_NB,  # the number of unbound variables of the refutation
+    TRAIL_LEVEL_IDX_VARIABLE,  # the variable of the refutation
+    TRAIL_LEVEL_IDX_EVENTS,  # the events of the refutation
+    TRAIL_LEVEL_IDX_DOMAIN,  # the domain of the variable in the refutation, MIN and MAX follow
+) = tuple(range(TRAIL_LEVEL_NB - 1))
+TRAIL_ENTRY_NB = 3
+TRAIL_ENTRY_IDX_VARIABLE = 0  # the variable
+TRAIL_ENTRY_IDX_DOMAIN = 1  # its domain before the change, MIN and MAX follow
+# above this number of cells (domain_nb x expected depth), the automatic mode trails rather than copies the domains
+TRAIL_AUTO_CELL_NB = 1 << 16  # see scripts/benchmark_choice_points.py
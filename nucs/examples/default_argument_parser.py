@@ -16,9 +16,12 @@ from typing import Any
 
 from numpy.typing import NDArray
 
-from nucs.constants import LOG_LEVELS, OPTIM_MODES, OPTIM_RESET
+from nucs.constants import CHOICE_POINTS_MODES, LOG_LEVELS, OPTIM_MODES, OPTIM_RESET, RESTART_POLICIES
 from nucs.heuristics.heuristics import DOM_HEURISTICS, VAR_HEURISTICS
+from nucs.problems.problem import Problem
+from nucs.solvers.backtrack_solver import BacktrackSolver
 from nucs.solvers.consistency_algorithms import CONSISTENCY_ALGS
+from nucs.solvers.multiprocessing_solver import MultiprocessingSolver
 from nucs.solvers.solver import Solver
 
 
@@ -27,11 +30,26 @@ class DefaultArgumentParser(argparse.ArgumentParser):
         super().__init__()
         # the choices below are computed when the parser is built:
         # custom algorithms/heuristics registered beforehand are also selectable from the CLI
+        self.add_argument(
+            "--backjumping",
+            help="jump back, after a failure, over the choice points that do not explain it",
+            action=argparse.BooleanOptionalAction,
+        )
+        self.add_argument(
+            "--choice-points",
+            help="set how the choice points save the domains, AUTO selects COPY or TRAIL from the problem size",
+            choices=CHOICE_POINTS_MODES,
+        )
         self.add_argument(
             "--consistency-algorithm",
             help="set the consistency algorithm",
             choices=sorted(CONSISTENCY_ALGS),
         )
+        self.add_argument(
+            "--cp-initial-height",
+            help="set the initial height of the choice points stack",
+            type=int,
+        )
         self.add_argument(
             "--cp-max-height",
             help="set the maximal height of the choice points stack",
@@ -65,16 +83,31 @@ class DefaultArgumentParser(argparse.ArgumentParser):
             help="set the log level",
             choices=LOG_LEVELS,
         )
+        self.add_argument(
+            "--nogood-capacity",
+            help="set the maximal number of nogoods recorded on backtracks and propagated after restarts",
+            type=int,
+        )
         self.add_argument(
             "--optimization-mode",
             help="set the optimization mode",
             choices=OPTIM_MODES,
         )
+        self.add_argument(
+            "--phase-saving",
+            help="try first the values of the last solution found",
+            action=argparse.BooleanOptionalAction,
+        )
         self.add_argument(
             "--processors",
             help="set the number of processors",
             type=int,
         )
+        self.add_argument(
+            "--restart-policy",
+            help="set the restart policy",
+            choices=RESTART_POLICIES,
+        )
         self.add_argument(
             "--symmetry-breaking",
             help="add symmetry breaking constraints",
@@ -105,13 +138,45 @@ def solver_kwargs_from_args(args: Namespace, **defaults: Any) -> dict[str, Any]:
         if args.consistency_algorithm is None
         else CONSISTENCY_ALGS[args.consistency_algorithm],
         "stks_max_height": args.cp_max_height,
+        "stks_initial_height": args.cp_initial_height,
         "var_heuristic": None if args.var_heuristic is None else VAR_HEURISTICS[args.var_heuristic],
         "dom_heuristic": None if args.dom_heuristic is None else DOM_HEURISTICS[args.dom_heuristic],
         "log_level": args.log_level,
+        "restart_policy": args.restart_policy,
+        "nogood_capacity": args.nogood_capacity,
+        "backjumping": args.backjumping,
+        "choice_points": args.choice_points,
+        "phase_saving": args.phase_saving,
     }
     return {**defaults, **{k: v for k, v in overrides.items() if v is not None}}
 
 
+def solver_from_args(problem: Problem, args: Namespace, split_variable: int = 0, **defaults: Any) -> Solver:
+    """
+    Builds a BacktrackSolver, or a MultiprocessingSolver over the sub-problems obtained by splitting a variable
+    when several processors are requested on the command line.
+
+    :param problem: the problem
+    :type problem: Problem
+    :param args: the CLI arguments
+    :type args: Namespace
+    :param split_variable: the variable whose domain is split between the processors, defaults to 0
+    :type split_variable: int
+    :param defaults: kwargs to be passed to the BacktrackSolver(s), overridden by any non-None CLI value
+    :type defaults: Any
+
+    :return: a solver
+    :rtype: Solver
+    """
+    kwargs = solver_kwargs_from_args(args, **defaults)
+    if args.processors is None or args.processors <= 1:
+        return BacktrackSolver(problem, **kwargs)
+    domain_min, domain_max = problem.domains[split_variable]
+    # a sub-problem per processor, but never more sub-problems than values to split
+    split_nb = min(args.processors, domain_max - domain_min + 1)
+    return MultiprocessingSolver(problem.split(split_nb, split_variable), args.processors, **kwargs)
+
+
 def run_solver(solver: Solver, args: Namespace) -> None:
     """
     Runs the solver according to the CLI arguments.
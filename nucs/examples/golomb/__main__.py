@@ -10,9 +10,8 @@
 #
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
-from nucs.examples.default_argument_parser import DefaultArgumentParser, run_optimizer, solver_kwargs_from_args
+from nucs.examples.default_argument_parser import DefaultArgumentParser, run_optimizer, solver_from_args
 from nucs.examples.golomb.golomb_problem import GolombProblem, golomb_consistency_algorithm
-from nucs.solvers.backtrack_solver import BacktrackSolver
 from nucs.solvers.consistency_algorithms import register_consistency_algorithm
 
 # Run with the following command (the second run is much faster because the code has been compiled):
@@ -24,6 +23,5 @@ if __name__ == "__main__":
     parser.add_argument("-n", type=int, default=10)
     args = parser.parse_args()
     problem = GolombProblem(args.n, args.symmetry_breaking)
-    kwargs = solver_kwargs_from_args(args, consistency_algorithm=golomb_consistency_algorithm)
-    solver = BacktrackSolver(problem, **kwargs)
+    solver = solver_from_args(problem, args, consistency_algorithm=golomb_consistency_algorithm)
     run_optimizer(solver, args, problem.length_idx)
@@ -26,7 +26,9 @@ from nucs.propagators.propagators import (
     ALG_SUM_EQ,
     update_propagators,
 )
+from nucs.solvers.backjumps import set_variable_levels
 from nucs.solvers.bc_algorithm import bc_algorithm
+from nucs.solvers.trail import trail_domain
 
 GOLOMB_LENGTHS = np.array([0, 0, 1, 3, 6, 11, 17, 25, 34, 44, 55, 72, 85, 106, 127])
 
@@ -141,6 +143,15 @@ def golomb_consistency_algorithm(
     triggered_propagators: NDArray,
     compute_domains_fcts: ComputeDomainsFunctions,
     domain_buffer: NDArray,
+    propagator_weights: NDArray,
+    propagator_states: NDArray,
+    incremental_propagators: NDArray,
+    deltas: NDArray,
+    deltas_offsets: NDArray,
+    propagator_profiles: NDArray,
+    nogoods: NDArray,
+    reason_levels: NDArray,
+    trail: NDArray,
 ) -> int:
     """
     Applies a custom consistency algorithm for the Golomb Ruler problem.
@@ -183,12 +194,17 @@ def golomb_consistency_algorithm(
             for j in range(i + 1, mark_nb):
                 var = index(mark_nb, i, j)
                 old_min = domains_stk[top, var, MIN]
+                if len(trail) != 0 and old_min < minimal_sum[j - i]:
+                    trail_domain(trail, domains_stk[top], var)
                 domains_stk[top, var, MIN] = max(old_min, minimal_sum[j - i])  # no offset
                 if domains_stk[top, var, MIN] != old_min:
                     events = EVENT_MASK_MIN
                     if domains_stk[top, var, MIN] == domains_stk[top, var, MAX]:
                         events |= EVENT_MASK_GROUND
                         unbound_variable_nb_stk[top] -= 1
+                    if len(reason_levels) != 0:
+                        # the pruning depends on the marks already placed
+                        set_variable_levels(reason_levels, var, top, top - 1)
                     offset = var * EVENT_MASK_NB + events
                     update_propagators(
                         triggered_propagators,
@@ -215,4 +231,13 @@ def golomb_consistency_algorithm(
         triggered_propagators,
         compute_domains_fcts,
         domain_buffer,
+        propagator_weights,
+        propagator_states,
+        incremental_propagators,
+        deltas,
+        deltas_offsets,
+        propagator_profiles,
+        nogoods,
+        reason_levels,
+        trail,
     )
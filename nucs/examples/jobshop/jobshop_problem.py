@@ -11,6 +11,11 @@
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
 
+from collections.abc import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
 from nucs.heuristics.heuristics import DOM_HEURISTIC_MIN_VALUE, VAR_HEURISTIC_CRITICAL_RESOURCE
 from nucs.problems.problem import Problem
 from nucs.propagators.propagators import ALG_ADD_C_EQ, ALG_DISJUNCTIVE, ALG_LINEAR_LEQ_C, ALG_MAX_EQ
@@ -130,6 +135,45 @@ class JobShopProblem(Problem):
             )
         ]
 
+    def window_neighborhood(
+        self, solution: NDArray, decision_variables: NDArray, relaxation_rate: float, rng: np.random.Generator
+    ) -> NDArray:
+        """
+        Relaxes, on every machine, the operations starting in a random time window that ends with the schedule, so
+        that the makespan can decrease; the window covers about the relaxation rate of the makespan.
+
+        This is a neighbourhood of the large neighbourhood search (see :class:`LnsSolver`).
+
+        :param solution: the solution to relax
+        :type solution: NDArray
+        :param decision_variables: the decision variables
+        :type decision_variables: NDArray
+        :param relaxation_rate: the proportion of the makespan to relax
+        :type relaxation_rate: float
+        :param rng: the random generator
+        :type rng: np.random.Generator
+
+        :return: the start-time variables to relax
+        :rtype: NDArray
+        """
+        makespan = int(solution[self.makespan])
+        window_start = makespan * (1 - relaxation_rate * (1 + rng.random()))
+        starts = decision_variables[decision_variables < self.completion_start]
+        relaxed_starts = starts[solution[starts] >= window_start]
+        # the last operation is always relaxed
+        return relaxed_starts if len(relaxed_starts) > 0 else starts[[np.argmax(solution[starts])]]
+
+    def recommended_neighborhoods(self) -> list[Callable[[NDArray, NDArray, float, np.random.Generator], NDArray]]:
+        """
+        Returns the recommended neighbourhoods for the large neighbourhood search of this problem.
+        Pass them to a solver with ``LnsSolver(problem, neighborhoods=problem.recommended_neighborhoods(),
+        searches=problem.recommended_searches())``.
+
+        :return: the neighbourhoods
+        :rtype: List[Callable[[NDArray, NDArray, float, np.random.Generator], NDArray]]
+        """
+        return [self.window_neighborhood]
+
     def start(self, job: int, operation: int) -> int:
         """
         Returns the variable index of the start time of an operation.
@@ -10,9 +10,8 @@
 #
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
-from nucs.examples.default_argument_parser import DefaultArgumentParser, run_solver, solver_kwargs_from_args
+from nucs.examples.default_argument_parser import DefaultArgumentParser, run_solver, solver_from_args
 from nucs.examples.queens.queens_problem import QueensProblem
-from nucs.solvers.backtrack_solver import BacktrackSolver
 
 # Run with the following command (the second run is much faster because the code has been compiled):
 # NUMBA_CACHE_DIR=.numba/cache python -m nucs.examples.queens -n 10
@@ -21,4 +20,4 @@ if __name__ == "__main__":
     parser.add_argument("-n", type=int, default=10)
     args = parser.parse_args()
     problem = QueensProblem(args.n)
-    run_solver(BacktrackSolver(problem, **solver_kwargs_from_args(args)), args)
+    run_solver(solver_from_args(problem, args), args)
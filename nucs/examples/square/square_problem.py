@@ -16,6 +16,7 @@ from numpy.typing import NDArray
 
 from nucs.heuristics.heuristics import DOM_HEURISTIC_MIN_VALUE, VAR_HEURISTIC_SMALLEST_MINIMAL_VALUE
 from nucs.problems.problem import Problem
+from nucs.propagators.cumulative_propagator import CUMULATIVE_FILTERING_TTEF
 from nucs.propagators.propagators import ALG_CUMULATIVE, ALG_DIFFN
 from nucs.solvers.search import Search
 
@@ -62,9 +63,10 @@ class SquarePlacementProblem(Problem):
         # diffn: the squares (rectangles of size s_i x s_i) do not overlap
         self.add_propagator(ALG_DIFFN, xs + ys, self.sizes + self.sizes)
         # cumulative along x: at every column the heights of the covering squares fit within the height
-        self.add_propagator(ALG_CUMULATIVE, xs, self.sizes + self.sizes + [height])
+        # (timetable edge finding: the energetic reasoning prunes more but costs more than it saves here)
+        self.add_propagator(ALG_CUMULATIVE, xs, self.sizes + self.sizes + [height, CUMULATIVE_FILTERING_TTEF])
         # cumulative along y: at every row the widths of the covering squares fit within the width
-        self.add_propagator(ALG_CUMULATIVE, ys, self.sizes + self.sizes + [width])
+        self.add_propagator(ALG_CUMULATIVE, ys, self.sizes + self.sizes + [width, CUMULATIVE_FILTERING_TTEF])
 
     def recommended_searches(self) -> list[Search]:
         """
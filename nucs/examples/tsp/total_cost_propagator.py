@@ -48,12 +48,14 @@ def get_triggers_total_cost(n: int, parameters: NDArray) -> NDArray:
 
 
 @njit(cache=True)
-def compute_domains_total_cost(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_total_cost(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     :param domains: the domains of the variables
     :type domains: NDArray
     :param parameters: the parameters of the propagator
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
     """
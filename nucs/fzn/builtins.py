@@ -29,6 +29,7 @@ from nucs.propagators.propagators import (
     ALG_ALLDIFFERENT,
     ALG_AND_EQ,
     ALG_BIN_PACKING_LOAD,
+    ALG_CIRCUIT_COST,
     ALG_COUNT_EQ,
     ALG_COUNT_EQ_C,
     ALG_COUNT_GEQ_C,
@@ -73,13 +74,13 @@ from nucs.propagators.propagators import (
     ALG_NO_SUB_CYCLE,
     ALG_NVALUE,
     ALG_REGULAR,
-    ALG_RELATION,
     ALG_STRICTLY_INCREASING,
     ALG_SUBCIRCUIT,
     ALG_SUM_EQ,
     ALG_SUM_EQ_C,
     ALG_SUM_GEQ_C,
     ALG_SUM_LEQ_C,
+    ALG_TABLE,
     ALG_VALUE_PRECEDE,
 )
 
@@ -892,6 +893,19 @@ def _circuit(model: "FznModel", args: list[Term]) -> None:
     model.problem.add_propagator(ALG_NO_SUB_CYCLE, succ, [model.const_of(args[1])])
 
 
+def _circuit_cost(model: "FznModel", args: list[Term]) -> None:
+    """
+    Handles ``nucs_circuit_cost(x, d, c, offset)``: c is the cost of the circuit formed by the successor array x,
+    d being the costs of the arcs row by row. The circuit itself is posted separately by the globals library,
+    so only the cost propagator is added here: the successors come first, then the cost, and the node offset
+    leads the costs in the parameters.
+    """
+    succ = model.var_list_of(args[0])
+    model.problem.add_propagator(
+        ALG_CIRCUIT_COST, succ + [model.var_index_of(args[2])], [model.const_of(args[3]), *model.int_list_of(args[1])]
+    )
+
+
 def _subcircuit(model: "FznModel", args: list[Term]) -> None:
     """
     Handles ``nucs_subcircuit(x, offset)``: the successor array x, whose values are the node labels
@@ -952,10 +966,11 @@ def _if_then_else_var_bool(model: "FznModel", args: list[Term]) -> None:
 def _table_int(model: "FznModel", args: list[Term]) -> None:
     """
     Handles ``table_int(x, t)``: each tuple of x must be a row of the table t (an extensional constraint).
-    The 2D table is flattened row-major in FlatZinc, so it lines up with the RELATION tuple layout.
+    The 2D table is flattened row-major in FlatZinc, so it lines up with the TABLE tuple layout; the compact-table
+    propagator keeps the tuples that are still valid in a bitset, instead of rescanning them as RELATION does.
     """
     variables = model.var_list_of(args[0])
-    model.problem.add_propagator(ALG_RELATION, variables, model.int_list_of(args[1]))
+    model.problem.add_propagator(ALG_TABLE, variables, model.int_list_of(args[1]))
 
 
 def _set_in(model: "FznModel", args: list[Term]) -> None:
@@ -1160,6 +1175,7 @@ BUILTINS: dict[str, Handler] = {
     "fzn_strictly_decreasing_int": _strictly_decreasing,
     "fzn_strictly_increasing_int": _strictly_increasing,
     "nucs_circuit": _circuit,
+    "nucs_circuit_cost": _circuit_cost,
     "nucs_inverse": _inverse,
     "nucs_subcircuit": _subcircuit,
     "fzn_value_precede_chain_int": _value_precede_chain,
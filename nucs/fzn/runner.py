@@ -30,6 +30,7 @@ from nucs.heuristics.heuristics import (
     DOM_HEURISTIC_MIN_VALUE,
     DOM_HEURISTIC_SPLIT_HIGH,
     DOM_HEURISTIC_SPLIT_LOW,
+    VAR_HEURISTIC_DOM_WDEG,
     VAR_HEURISTIC_FIRST_NOT_INSTANTIATED,
     VAR_HEURISTIC_GREATEST_DOMAIN,
     VAR_HEURISTIC_LARGEST_MAXIMAL_VALUE,
@@ -41,12 +42,13 @@ from nucs.solvers.backtrack_solver import BacktrackSolver
 from nucs.solvers.search import Search
 
 # FlatZinc variable-selection annotations mapped to NuCS variable heuristics; unlisted ones
-# (dom_w_deg, occurrence, most_constrained, ...) fall back to the default.
+# (occurrence, most_constrained, ...) fall back to the default.
 _VAR_HEURISTICS = {
     "input_order": VAR_HEURISTIC_FIRST_NOT_INSTANTIATED,
     "first_fail": VAR_HEURISTIC_SMALLEST_DOMAIN,
     "anti_first_fail": VAR_HEURISTIC_GREATEST_DOMAIN,
     "max_regret": VAR_HEURISTIC_MAX_REGRET,
+    "dom_w_deg": VAR_HEURISTIC_DOM_WDEG,
     "smallest": VAR_HEURISTIC_SMALLEST_MINIMAL_VALUE,
     "largest": VAR_HEURISTIC_LARGEST_MAXIMAL_VALUE,
 }
@@ -215,9 +217,10 @@ def run(
         solver = BacktrackSolver(model.problem, log_level="ERROR")
     else:
         solver = BacktrackSolver(model.problem, searches=searches, log_level="ERROR")
-    deadline = None if time_limit_ms is None else time.monotonic() + time_limit_ms / 1000
+    if time_limit_ms is not None:
+        solver.set_limits(deadline=time.monotonic_ns() + time_limit_ms * 1_000_000)
     if model.solve.kind == "satisfy":
-        _run_satisfy(model, solver, out, all_solutions, num_solutions, output_mode, deadline)
+        _run_satisfy(model, solver, out, all_solutions, num_solutions, output_mode)
     else:
         assert objective_var is not None
         _run_optimize(
@@ -227,8 +230,7 @@ def run(
             out,
             output_mode,
             output_objective,
-            all_solutions or intermediate_solutions or deadline is not None,
-            deadline,
+            all_solutions or intermediate_solutions or time_limit_ms is not None,
         )
     if statistics:
         _print_statistics(solver, out)
@@ -242,7 +244,6 @@ def _run_optimize(
     output_mode: str,
     output_objective: bool,
     intermediate_solutions: bool,
-    deadline: float | None,
 ) -> None:
     """
     Prints the optimum of an optimization problem, or the whole sequence of improving solutions.
@@ -252,11 +253,11 @@ def _run_optimize(
     and the last of them is the optimum. The search-complete marker is printed once the optimum has been
     proven, and the unsatisfiable marker when no solution exists at all.
 
-    A time limit also turns streaming on, whatever the flags say. Printing only at the end is safe exactly
-    when the search is allowed to finish; under a deadline it is not, because a descent runs in compiled
-    code that cannot be interrupted, so the deadline is noticed late and an external kill -- which is how
-    MiniZinc enforces its own limit -- would land while the best solution found so far had never been
-    printed. Streaming costs nothing there: MiniZinc keeps the last solution it received.
+    A time limit also turns streaming on, whatever the flags say. The solver stops on the deadline, which it
+    checks inside the search, but only every ``LIMIT_DEADLINE_PERIOD`` choices: a slow propagation can still
+    make it late, and an external kill -- which is how MiniZinc enforces its own limit -- would then land while
+    the best solution found so far had never been printed. Streaming costs nothing there: MiniZinc keeps the
+    last solution it received.
 
     The search runs in ``OPTIM_PRUNE`` mode: the tightened objective bound is applied to the choice points
     and the search resumes where it was, instead of restarting from the initial domains after every
@@ -276,8 +277,6 @@ def _run_optimize(
     :type output_objective: bool
     :param intermediate_solutions: whether to print every improving solution rather than only the optimum
     :type intermediate_solutions: bool
-    :param deadline: the monotonic time to stop at, or None for an unbounded search
-    :type deadline: Optional[float]
     """
     if model.solve.kind == "minimize":
         solutions = solver.minimize_solutions(objective_var, mode=OPTIM_PRUNE)
@@ -285,7 +284,6 @@ def _run_optimize(
         solutions = solver.maximize_solutions(objective_var, mode=OPTIM_PRUNE)
     best = None
     printed = False
-    proven = True
     for solution in solutions:
         if intermediate_solutions:
             _print_optimization_solution(model, solution, objective_var, out, output_mode, output_objective)
@@ -293,9 +291,7 @@ def _run_optimize(
         else:
             # The solver yields a view on its own domain stack, which the next descent overwrites.
             best = solution.copy()
-        if _expired(deadline):
-            proven = False
-            break
+    proven = not solver.limit_reached
     if best is not None:
         _print_optimization_solution(model, best, objective_var, out, output_mode, output_objective)
         printed = True
@@ -309,24 +305,6 @@ def _run_optimize(
     out.flush()
 
 
-def _expired(deadline: float | None) -> bool:
-    """
-    Returns whether the wall-clock budget is spent.
-
-    The check can only run where the search returns to Python -- between two solutions -- because a single
-    descent runs in compiled code that nothing in this process can interrupt. It therefore bounds the time
-    spent *between* solutions, not the time spent inside one descent: MiniZinc's own kill remains the
-    backstop for a search that finds nothing for a long time.
-
-    :param deadline: the monotonic time to stop at, or None for an unbounded search
-    :type deadline: Optional[float]
-
-    :return: True when the deadline has passed
-    :rtype: bool
-    """
-    return deadline is not None and time.monotonic() >= deadline
-
-
 def _print_optimization_solution(
     model: FznModel,
     solution: NDArray,
@@ -363,7 +341,6 @@ def _run_satisfy(
     all_solutions: bool,
     num_solutions: int | None,
     output_mode: str,
-    deadline: float | None,
 ) -> None:
     """
     Iterates satisfy solutions honoring the all/limit flags and prints the appropriate terminators.
@@ -380,23 +357,18 @@ def _run_satisfy(
     :type num_solutions: Optional[int]
     :param output_mode: the solution output format, one of ``item``, ``dzn`` or ``json``
     :type output_mode: str
-    :param deadline: the monotonic time to stop at, or None for an unbounded search
-    :type deadline: Optional[float]
     """
     limit = None if all_solutions else (num_solutions if num_solutions is not None else 1)
     found = False
     exhausted = True
-    expired = False
     for count, solution in enumerate(solver.solve(), start=1):
         print_solution(model, solution, out, output_mode)
         found = True
         if limit is not None and count >= limit:
             exhausted = False
             break
-        if _expired(deadline):
-            exhausted = False
-            expired = True
-            break
+    expired = solver.limit_reached
+    exhausted = exhausted and not expired
     if not found:
         # Nothing found and the space was not exhausted is precisely what the unknown marker reports.
         print_unknown(out) if expired else print_unsatisfiable(out)
@@ -0,0 +1,38 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import WEIGHTS_SECTION_ACTIVITY
+from nucs.heuristics.dom_wdeg_var_heuristic import max_weighted_score_variable
+
+
+@njit(cache=True)
+def activity_var_heuristic(decision_variables: NDArray, domains_stk: NDArray, top: int, params: NDArray) -> int:
+    """
+    Chooses the variable with the largest ratio between the activity of its propagators and the size of its domain,
+    the activity of a propagator counting its failures, the recent ones weighing more.
+
+    :param decision_variables: the decision variables
+    :type decision_variables: NDArray
+    :param domains_stk: the stack of domains
+    :type domains_stk: NDArray
+    :param top: the index of the top of the stacks
+    :type top: int
+    :param params: the parameters of the weighted variable heuristics, built by the solver
+    :type params: NDArray
+
+    :return: the variable
+    :rtype: int
+    """
+    return max_weighted_score_variable(decision_variables, domains_stk, top, params[0], WEIGHTS_SECTION_ACTIVITY, 0)
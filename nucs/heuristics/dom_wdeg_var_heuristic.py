@@ -0,0 +1,80 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import MAX, MIN, WEIGHTS_HEADER_NB, WEIGHTS_SECTION_FAILURE_NB, WEIGHTS_SECTION_NB
+
+
+@njit(cache=True)
+def dom_wdeg_var_heuristic(decision_variables: NDArray, domains_stk: NDArray, top: int, params: NDArray) -> int:
+    """
+    Chooses the variable with the smallest ratio between the size of its domain and its weighted degree,
+    the weight of a propagator being one plus its number of failures.
+
+    :param decision_variables: the decision variables
+    :type decision_variables: NDArray
+    :param domains_stk: the stack of domains
+    :type domains_stk: NDArray
+    :param top: the index of the top of the stacks
+    :type top: int
+    :param params: the parameters of the weighted variable heuristics, built by the solver
+    :type params: NDArray
+
+    :return: the variable
+    :rtype: int
+    """
+    return max_weighted_score_variable(decision_variables, domains_stk, top, params[0], WEIGHTS_SECTION_FAILURE_NB, 1)
+
+
+@njit(cache=True)
+def max_weighted_score_variable(
+    decision_variables: NDArray, domains_stk: NDArray, top: int, params: NDArray, section: int, base: int
+) -> int:
+    """
+    Chooses the not instantiated variable maximizing the ratio between the sum of the weights of its propagators
+    and the size of its domain; ties are broken by the smallest domain.
+
+    :param decision_variables: the decision variables
+    :type decision_variables: NDArray
+    :param domains_stk: the stack of domains
+    :type domains_stk: NDArray
+    :param top: the index of the top of the stacks
+    :type top: int
+    :param params: the number of propagators, the propagator weights and the CSR of the propagators of each variable
+    :type params: NDArray
+    :param section: the section of the propagator weights to sum
+    :type section: int
+    :param base: the amount added to each weight
+    :type base: int
+
+    :return: the variable
+    :rtype: int
+    """
+    propagator_nb = params[0]
+    weights_offset = 1 + WEIGHTS_HEADER_NB + section * propagator_nb
+    offsets_offset = 1 + WEIGHTS_HEADER_NB + WEIGHTS_SECTION_NB * propagator_nb
+    propagators_offset = offsets_offset + domains_stk.shape[1] + 1
+    best_score = 0.0
+    best_variable = -1
+    for variable in decision_variables:
+        domain = domains_stk[top, variable]
+        if domain[MIN] < domain[MAX]:
+            weight = 1
+            for idx in range(params[offsets_offset + variable], params[offsets_offset + variable + 1]):
+                weight += base + params[weights_offset + params[propagators_offset + idx]]
+            score = weight / (domain[MAX] - domain[MIN] + 1)
+            if best_score < score:
+                best_variable = variable
+                best_score = score
+    return best_variable
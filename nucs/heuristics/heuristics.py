@@ -12,7 +12,10 @@
 ###############################################################################
 from collections.abc import Callable
 
+from nucs.heuristics.activity_var_heuristic import activity_var_heuristic
+from nucs.heuristics.chb_var_heuristic import chb_var_heuristic
 from nucs.heuristics.critical_resource_var_heuristic import critical_resource_var_heuristic
+from nucs.heuristics.dom_wdeg_var_heuristic import dom_wdeg_var_heuristic
 from nucs.heuristics.first_not_instantiated_var_heuristic import first_not_instantiated_var_heuristic
 from nucs.heuristics.greatest_domain_var_heuristic import greatest_domain_var_heuristic
 from nucs.heuristics.largest_maximal_value_var_heuristic import largest_maximal_value_var_heuristic
@@ -32,9 +35,11 @@ VAR_HEURISTIC_FCTS: list[Callable] = []
 DOM_HEURISTIC_FCTS: list[Callable] = []
 VAR_HEURISTICS: dict[str, int] = {}  # heuristic name to index, for name-based selection (eg from the CLI)
 DOM_HEURISTICS: dict[str, int] = {}  # heuristic name to index, for name-based selection (eg from the CLI)
+# the variable heuristics whose parameters are built by the solver and hold the propagator weights
+WEIGHTED_VAR_HEURISTICS: set[int] = set()
 
 
-def register_var_heuristic(var_heuristic_fct: Callable, name: str | None = None) -> int:
+def register_var_heuristic(var_heuristic_fct: Callable, name: str | None = None, weighted: bool = False) -> int:
     """
     Registers a variable heuristic by adding it function to the corresponding list of functions.
 
@@ -42,6 +47,9 @@ def register_var_heuristic(var_heuristic_fct: Callable, name: str | None = None)
     :type var_heuristic_fct: Callable
     :param name: the name of the heuristic, defaults to the function name without its _var_heuristic suffix, uppercased
     :type name: Optional[str]
+    :param weighted: whether the heuristic relies on the propagator weights,
+                     its parameters are then built by the solver, defaults to False
+    :type weighted: bool
 
     :return: the index of the variable heuristic
     :rtype: int
@@ -50,6 +58,8 @@ def register_var_heuristic(var_heuristic_fct: Callable, name: str | None = None)
     if name is None:
         name = var_heuristic_fct.__name__.removesuffix("_var_heuristic").upper()
     VAR_HEURISTICS[name] = len(VAR_HEURISTIC_FCTS) - 1
+    if weighted:
+        WEIGHTED_VAR_HEURISTICS.add(len(VAR_HEURISTIC_FCTS) - 1)
     return len(VAR_HEURISTIC_FCTS) - 1
 
 
@@ -80,6 +90,10 @@ VAR_HEURISTIC_MAX_REGRET = register_var_heuristic(max_regret_var_heuristic)
 VAR_HEURISTIC_MIN_EARLIEST_START = register_var_heuristic(min_earliest_start_var_heuristic)
 VAR_HEURISTIC_SMALLEST_DOMAIN = register_var_heuristic(smallest_domain_var_heuristic)
 VAR_HEURISTIC_SMALLEST_MINIMAL_VALUE = register_var_heuristic(smallest_minimal_value_var_heuristic)
+# registered after the original heuristics, so that their indices are unchanged
+VAR_HEURISTIC_ACTIVITY = register_var_heuristic(activity_var_heuristic, weighted=True)
+VAR_HEURISTIC_CHB = register_var_heuristic(chb_var_heuristic, weighted=True)
+VAR_HEURISTIC_DOM_WDEG = register_var_heuristic(dom_wdeg_var_heuristic, weighted=True)
 
 DOM_HEURISTIC_MAX_VALUE = register_dom_heuristic(max_value_dom_heuristic)
 DOM_HEURISTIC_MID_VALUE = register_dom_heuristic(mid_value_dom_heuristic)
@@ -28,3 +28,23 @@ def flatten_arrays(arrays: list[NDArray]) -> tuple[NDArray, NDArray]:
     offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
     np.cumsum([array.size for array in arrays], out=offsets[1:])
     return np.concatenate([array.reshape(-1) for array in arrays]), offsets
+
+
+def unique_rows(array: NDArray) -> tuple[NDArray, NDArray]:
+    """
+    Returns the distinct rows of a 2D integer array, sorted, and the index of the distinct row of each row;
+    like np.unique(array, axis=0, return_inverse=True) but sorting the columns with a lexsort, which is much faster.
+
+    :param array: the (n, m) array
+    :type array: NDArray
+
+    :return: the distinct rows and the indices of the distinct rows
+    :rtype: Tuple[NDArray, NDArray]
+    """
+    order = np.lexsort(array.T[::-1]) if array.shape[1] > 0 else np.arange(len(array))
+    rows = array[order]
+    starts = np.ones(len(rows), dtype=np.bool_)  # whether a sorted row differs from the previous one
+    np.any(rows[1:] != rows[:-1], axis=1, out=starts[1:])
+    indices = np.empty(len(rows), dtype=np.int64)
+    indices[order] = np.cumsum(starts) - 1
+    return rows[starts], indices
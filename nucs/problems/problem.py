@@ -13,26 +13,40 @@
 import copy
 import logging
 from collections.abc import Iterable, Sequence
+from itertools import chain
 from typing import Any, Self
 
 import numpy as np
 from numba import njit  # type: ignore
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike, NDArray
 from rich import print
 
 from nucs.buckets import compute_priority
 from nucs.constants import (
+    DELTA_MIN_ARITY,
+    DELTA_OCCURRENCE_IDX_ARITY,
+    DELTA_OCCURRENCE_IDX_POSITION,
+    DELTA_OCCURRENCE_IDX_STATE,
+    DELTA_OCCURRENCE_NB,
     EVENT_MASK_NB,
     NUMBA_DISABLE_JIT,
     PARAM,
     RANGE_END,
     RANGE_START,
     SIGN_GET_TRIGGERS,
+    STATE,
     TYPE_GET_TRIGGERS,
     VARIABLE,
 )
 from nucs.numba_helper import addresses_from_functions, function_ptr_from_address
-from nucs.propagators.propagators import ALG_DUMMY, GET_COMPLEXITY_FCTS, GET_TRIGGERS_FCTS
+from nucs.numpy_helper import unique_rows
+from nucs.propagators.propagators import (
+    ALG_DUMMY,
+    GET_COMPLEXITY_FCTS,
+    GET_STATE_SIZE_FCTS,
+    GET_TRIGGERS_FCTS,
+    INCREMENTAL_ALGS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +70,8 @@ class Problem:
         self.domains = [(domain, domain) if isinstance(domain, int) else domain for domain in domains]
         self.domain_nb = len(self.domains)
         self.propagators: list[tuple[list[int], int, list[int]]] = []
+        # the batches of propagators: the index of their first propagator, their algorithms, variables and parameters
+        self.propagator_batches: list[tuple[int, NDArray, NDArray, NDArray]] = []
         self.propagator_nb = 0
 
     def split(self, split_nb: int, var: int) -> list[Self]:
@@ -130,6 +146,34 @@ class Problem:
         self.propagators.append((variables, algorithm, parameters))
         self.propagator_nb += 1
 
+    def add_propagators(self, algorithm: int, variables: ArrayLike, parameters: ArrayLike | None = None) -> None:
+        """
+        Adds a batch of propagators sharing an algorithm, an arity and a number of parameters.
+        A batch is stored as arrays and copied as such in the arrays of the problem, which makes it much faster to
+        add many propagators than with add_propagator.
+
+        :param algorithm: the algorithm id
+        :type algorithm: int
+        :param variables: the (propagator_nb, arity) variables, a row per propagator
+        :type variables: ArrayLike
+        :param parameters: the (propagator_nb, parameter_nb) parameters, a row per propagator
+        :type parameters: Optional[ArrayLike]
+        """
+        variables = np.array(variables, dtype=np.uint32)
+        if variables.ndim != 2:
+            raise ValueError("The variables of a batch of propagators must be a 2D array")
+        batch_nb = len(variables)
+        parameters = (
+            np.empty((batch_nb, 0), dtype=np.int32) if parameters is None else np.array(parameters, dtype=np.int32)
+        )
+        if parameters.ndim != 2 or len(parameters) != batch_nb:
+            raise ValueError("The parameters of a batch of propagators must be a 2D array with a row per propagator")
+        if batch_nb == 0:
+            return
+        algorithms = np.full(batch_nb, algorithm, dtype=np.uint8)
+        self.propagator_batches.append((self.propagator_nb, algorithms, variables, parameters))
+        self.propagator_nb += batch_nb
+
     def init(self) -> None:
         """
         Completes the initialization of the problem.
@@ -138,27 +182,16 @@ class Problem:
         for domain_min, domain_max in self.domains:
             if domain_min != domain_max:
                 self.unbound_variable_nb += 1
-        self.algorithms = np.array([propagator[1] for propagator in self.propagators], dtype=np.uint8)
-        # The propagation queue is a bucketed (priority) queue:
-        # Priorities here store the bucket index = floor(log2(complexity)), clamped to [0, NB_BUCKETS-1].
-        # Higher-complexitypropagators land in higher buckets and run after cheaper ones at fixpoint computation.
-        self.priorities = np.array(
-            [
-                compute_priority(GET_COMPLEXITY_FCTS[propagator[1]](len(propagator[0]), propagator[2]))
-                for propagator in self.propagators
-            ],
-            dtype=np.uint32,
-        )
-        # We will store propagator specific data in a global arrays, we need to compute variables and parameter bounds.
+        algorithms, priorities, state_sizes, arities, parameter_nbs, variables, parameters = self._get_columns(0)
+        self.algorithms = algorithms
+        self.priorities = priorities
+        # We will store propagator specific data in a global arrays, we need to compute variables, parameter and
+        # state bounds; the states themselves are allocated by the solvers.
         logger.debug("Initializing bounds")
-        self.bounds = np.zeros((max(1, self.propagator_nb), 2, 2), dtype=np.uint32)  # some redundancy here
-        init_bounds(self.bounds, self.propagators)
-        logger.debug("Initializing props")
-        self.propagator_variables = np.empty(self.bounds[-1, VARIABLE, RANGE_END], dtype=np.uint32)
-        self.propagator_parameters = np.empty(self.bounds[-1, PARAM, RANGE_END], dtype=np.int32)
-        init_propagator_variables_and_parameters(
-            self.propagator_variables, self.propagator_parameters, self.bounds, self.propagators
-        )
+        self.bounds = np.zeros((max(1, self.propagator_nb), 3, 2), dtype=np.uint32)  # some redundancy here
+        init_bounds(self.bounds, arities, parameter_nbs, state_sizes)
+        self.propagator_variables = variables
+        self.propagator_parameters = parameters
         logger.debug("Initializing triggers")
         # The triggers map each (variable, event) pair to the propagators to schedule. A dense
         # (domain_nb, EVENT_MASK_NB, propagator_nb) array would be mostly empty (and huge), so it is stored
@@ -172,6 +205,7 @@ class Problem:
         counts = np.zeros((self.domain_nb, EVENT_MASK_NB), dtype=np.int32)
         count_triggers(
             counts,
+            0,
             self.propagator_nb,
             self.bounds,
             self.propagator_variables,
@@ -186,6 +220,7 @@ class Problem:
         fill_triggers(
             self.triggers,
             cursors,
+            0,
             self.propagator_nb,
             self.bounds,
             self.propagator_variables,
@@ -193,10 +228,137 @@ class Problem:
             self.algorithms,
             get_triggers_addrs,
         )
+        logger.debug("Initializing deltas")
+        # The incremental propagators are given the positions of their variables that changed since their previous
+        # call: deltas lists, for each variable, its occurrences in these propagators, in CSR form, so that a change
+        # is recorded without looking at the other propagators. Below DELTA_MIN_ARITY, a propagator always rescans.
+        self.incremental_propagators = get_incremental_propagators(self.algorithms, arities)
+        self.deltas, self.deltas_offsets = init_deltas(
+            self.domain_nb, self.bounds, self.propagator_variables, self.incremental_propagators
+        )
         logger.debug("Problem initialized")
         logger.info(f"Problem has {self.propagator_nb} propagators")
         logger.info(f"Problem has {self.domain_nb} variables")
 
+    def update(self) -> None:
+        """
+        Completes the initialization of the propagators added since the problem has been initialized: their arrays
+        are appended to the ones of the problem and their triggers are inserted in the CSR triggers, the other
+        propagators being left as they are.
+        """
+        start = len(self.algorithms)
+        if start == self.propagator_nb:
+            return
+        if len(self.triggers_offsets) != self.domain_nb * EVENT_MASK_NB + 1:
+            raise ValueError("The variables added after the initialization of the problem require a new initialization")
+        logger.debug(f"Updating problem with {self.propagator_nb - start} propagators")
+        algorithms, priorities, state_sizes, arities, parameter_nbs, variables, parameters = self._get_columns(start)
+        self.algorithms = np.concatenate((self.algorithms, algorithms))
+        self.priorities = np.concatenate((self.priorities, priorities))
+        bounds = np.zeros((len(algorithms), 3, 2), dtype=np.uint32)
+        init_bounds(bounds, arities, parameter_nbs, state_sizes)
+        if start > 0:
+            # the ranges of the new propagators follow the ones of the previous propagators
+            bounds += self.bounds[start - 1, :, RANGE_END].reshape(3, 1)
+            self.bounds = np.concatenate((self.bounds, bounds))
+        else:
+            self.bounds = bounds
+        self.propagator_variables = np.concatenate((self.propagator_variables, variables))
+        self.propagator_parameters = np.concatenate((self.propagator_parameters, parameters))
+        get_triggers_addrs = addresses_from_functions(
+            GET_TRIGGERS_FCTS, SIGN_GET_TRIGGERS, np.unique(algorithms), ALG_DUMMY
+        )
+        counts = np.zeros((self.domain_nb, EVENT_MASK_NB), dtype=np.int32)
+        count_triggers(
+            counts,
+            start,
+            self.propagator_nb,
+            self.bounds,
+            self.propagator_variables,
+            self.propagator_parameters,
+            self.algorithms,
+            get_triggers_addrs,
+        )
+        self.triggers, self.triggers_offsets, cursors = insert_triggers(self.triggers, self.triggers_offsets, counts)
+        fill_triggers(
+            self.triggers,
+            cursors,
+            start,
+            self.propagator_nb,
+            self.bounds,
+            self.propagator_variables,
+            self.propagator_parameters,
+            self.algorithms,
+            get_triggers_addrs,
+        )
+        self.incremental_propagators = np.concatenate(
+            (self.incremental_propagators, get_incremental_propagators(algorithms, arities))
+        )
+        self.deltas, self.deltas_offsets = init_deltas(
+            self.domain_nb, self.bounds, self.propagator_variables, self.incremental_propagators
+        )
+        logger.info(f"Problem has {self.propagator_nb} propagators")
+
+    def remove_propagator(self, propagator: int) -> None:
+        """
+        Removes a propagator: it becomes a dummy propagator triggered by no event, so that the indices of the other
+        propagators are unchanged.
+
+        :param propagator: the index of the propagator
+        :type propagator: int
+        """
+        single_idx = propagator
+        for batch_start, algorithms, _, _ in self.propagator_batches:
+            if propagator < batch_start:
+                break
+            if propagator < batch_start + len(algorithms):
+                algorithms[propagator - batch_start] = ALG_DUMMY
+                single_idx = -1
+                break
+            single_idx -= len(algorithms)
+        if single_idx >= 0:
+            self.propagators[single_idx] = ([], ALG_DUMMY, [])
+        if not hasattr(self, "algorithms") or propagator >= len(self.algorithms):
+            return  # the propagator has not been initialized yet
+        self.algorithms[propagator] = ALG_DUMMY
+        self.priorities[propagator] = compute_priority(GET_COMPLEXITY_FCTS[ALG_DUMMY](0, []))
+        self.triggers, self.triggers_offsets = remove_triggers(self.triggers, self.triggers_offsets, propagator)
+        if self.incremental_propagators[propagator]:
+            self.incremental_propagators[propagator] = 0
+            self.deltas, self.deltas_offsets = init_deltas(
+                self.domain_nb, self.bounds, self.propagator_variables, self.incremental_propagators
+            )
+
+    def _get_columns(self, start: int) -> tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]:
+        """
+        Returns the columns of the propagators from a given one, in the order in which they have been added
+        (see get_propagator_columns and get_batch_columns).
+
+        :param start: the first propagator
+        :type start: int
+
+        :return: the algorithms, priorities, state sizes, arities, numbers of parameters, variables and parameters
+        :rtype: Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]
+        """
+        segments = []
+        single_idx = 0  # the index in propagators of the first propagator added alone that is not yet in a segment
+        propagator = 0
+        for batch_start, algorithms, variables, parameters in self.propagator_batches:
+            single_nb = batch_start - propagator
+            if batch_start > start:
+                skip = max(0, start - propagator)
+                segments.append(get_propagator_columns(self.propagators[single_idx + skip : single_idx + single_nb]))
+            single_idx += single_nb
+            propagator = batch_start + len(algorithms)
+            if propagator > start:
+                skip = max(0, start - batch_start)
+                segments.append(get_batch_columns(algorithms[skip:], variables[skip:], parameters[skip:]))
+        segments.append(get_propagator_columns(self.propagators[single_idx + max(0, start - propagator) :]))
+        algorithms, priorities, state_sizes, arities, parameter_nbs, variables, parameters = (
+            np.concatenate(column) for column in zip(*segments)
+        )
+        return algorithms, priorities, state_sizes, arities, parameter_nbs, variables, parameters
+
     def solution_as_printable(self, solution: NDArray) -> Any:
         """
         Returns a printable representation of a solution.
@@ -219,52 +381,228 @@ class Problem:
         print("No solution" if solution is None else self.solution_as_printable(solution))
 
 
-def init_bounds(bounds: NDArray, propagators: list[tuple[list[int], int, list[int]]]) -> None:
+def get_propagator_columns(
+    propagators: list[tuple[list[int], int, list[int]]],
+) -> tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]:
     """
-    Initializes the variable and parameter bounds for each propagator.
+    Returns the columns of propagators added one by one.
+
+    The propagation queue is a bucketed (priority) queue: a priority is the bucket index
+    floor(log2(complexity)), clamped to [0, NB_BUCKETS-1], so that the propagators with a higher complexity run
+    after the cheaper ones. The stateful propagators size their states from their parameters.
 
-    :param bounds: the bounds to initialize
-    :type bounds: NDArray
     :param propagators: the propagators
     :type propagators: List[Tuple[List[int], int, List[int]]]
+
+    :return: the algorithms, priorities, state sizes, arities, numbers of parameters, flat variables and flat
+             parameters
+    :rtype: Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]
     """
-    for propagator_idx, propagator in enumerate(propagators):
-        if propagator_idx > 0:
-            bounds[propagator_idx, :, RANGE_START] = bounds[propagator_idx - 1, :, RANGE_END]
-        bounds[propagator_idx, VARIABLE, RANGE_END] = bounds[propagator_idx, VARIABLE, RANGE_START] + len(propagator[0])
-        bounds[propagator_idx, PARAM, RANGE_END] = bounds[propagator_idx, PARAM, RANGE_START] + len(propagator[2])
+    propagator_nb = len(propagators)
+    algorithms = np.fromiter((algorithm for _, algorithm, _ in propagators), dtype=np.uint8, count=propagator_nb)
+    priorities = np.fromiter(
+        (
+            compute_priority(GET_COMPLEXITY_FCTS[algorithm](len(variables), parameters))
+            for variables, algorithm, parameters in propagators
+        ),
+        dtype=np.uint32,
+        count=propagator_nb,
+    )
+    state_sizes = np.fromiter(
+        (get_state_size(algorithm, len(variables), parameters) for variables, algorithm, parameters in propagators),
+        dtype=np.int64,
+        count=propagator_nb,
+    )
+    arities = np.fromiter((len(variables) for variables, _, _ in propagators), dtype=np.int64, count=propagator_nb)
+    parameter_nbs = np.fromiter(
+        (len(parameters) for _, _, parameters in propagators), dtype=np.int64, count=propagator_nb
+    )
+    variables = np.fromiter(
+        chain.from_iterable(variables for variables, _, _ in propagators), dtype=np.uint32, count=int(arities.sum())
+    )
+    parameters = np.fromiter(
+        chain.from_iterable(parameters for _, _, parameters in propagators),
+        dtype=np.int32,
+        count=int(parameter_nbs.sum()),
+    )
+    return algorithms, priorities, state_sizes, arities, parameter_nbs, variables, parameters
+
+
+def get_batch_columns(
+    algorithms: NDArray, variables: NDArray, parameters: NDArray
+) -> tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]:
+    """
+    Returns the columns of a batch of propagators (see get_propagator_columns).
+    The complexity and the state size are computed once per distinct row of algorithm and parameters.
 
+    :param algorithms: the (propagator_nb,) algorithms
+    :type algorithms: NDArray
+    :param variables: the (propagator_nb, arity) variables
+    :type variables: NDArray
+    :param parameters: the (propagator_nb, parameter_nb) parameters
+    :type parameters: NDArray
+
+    :return: the algorithms, priorities, state sizes, arities, numbers of parameters, flat variables and flat
+             parameters
+    :rtype: Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]
+    """
+    arity = variables.shape[1]
+    keys, key_indices = unique_rows(np.column_stack((algorithms.astype(np.int32), parameters)))
+    priorities = np.array(
+        [compute_priority(GET_COMPLEXITY_FCTS[key[0]](arity, key[1:])) for key in keys], dtype=np.uint32
+    )
+    state_sizes = np.array([get_state_size(key[0], arity, key[1:]) for key in keys], dtype=np.int64)
+    # like the propagators added one by one, the removed propagators have neither variables nor parameters
+    kept = algorithms != ALG_DUMMY
+    return (
+        algorithms,
+        priorities[key_indices],
+        state_sizes[key_indices],
+        np.where(kept, arity, 0).astype(np.int64),
+        np.where(kept, parameters.shape[1], 0).astype(np.int64),
+        variables[kept].reshape(-1),
+        parameters[kept].reshape(-1),
+    )
+
+
+def get_state_size(algorithm: int, n: int, parameters: Any) -> int:
+    """
+    Returns the size of the state of a propagator, 0 for a stateless propagator.
 
-def init_propagator_variables_and_parameters(
-    propagator_variables: NDArray,
-    propagator_parameters: NDArray,
-    bounds: NDArray,
-    propagators: list[tuple[list[int], int, list[int]]],
-) -> None:
+    :param algorithm: the algorithm id
+    :type algorithm: int
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters
+    :type parameters: Any
+
+    :return: the size of the state
+    :rtype: int
     """
-    Initializes the propagator variables and parameters arrays.
+    get_state_size_fct = GET_STATE_SIZE_FCTS[algorithm]
+    return 0 if get_state_size_fct is None else get_state_size_fct(n, parameters)
 
-    :param propagator_variables: the propagator variables array to fill
-    :type propagator_variables: NDArray
-    :param propagator_parameters: the propagator parameters array to fill
-    :type propagator_parameters: NDArray
+
+def get_incremental_propagators(algorithms: NDArray, arities: NDArray) -> NDArray:
+    """
+    Returns which propagators are given the positions of their variables that changed since their previous call;
+    below DELTA_MIN_ARITY variables, a propagator always rescans.
+
+    :param algorithms: the algorithms
+    :type algorithms: NDArray
+    :param arities: the numbers of variables of the propagators
+    :type arities: NDArray
+
+    :return: 1 for the incremental propagators, 0 otherwise
+    :rtype: NDArray
+    """
+    return (np.array(INCREMENTAL_ALGS, dtype=np.uint8)[algorithms] & (arities >= DELTA_MIN_ARITY)).astype(np.uint8)
+
+
+def insert_triggers(triggers: NDArray, triggers_offsets: NDArray, counts: NDArray) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    Makes room in the CSR triggers for new entries, appended to the slice of each (variable, event).
+
+    :param triggers: the flat triggers array
+    :type triggers: NDArray
+    :param triggers_offsets: the CSR offsets delimiting each (variable, event) slice of triggers
+    :type triggers_offsets: NDArray
+    :param counts: the (domain_nb, EVENT_MASK_NB) array of the numbers of new entries
+    :type counts: NDArray
+
+    :return: the triggers, whose new entries are left to fill, their offsets and the write cursors of the new
+             entries, indexed variable * EVENT_MASK_NB + event
+    :rtype: Tuple[NDArray, NDArray, NDArray]
+    """
+    lengths = np.diff(triggers_offsets)
+    new_offsets = np.zeros(len(triggers_offsets), dtype=np.int32)
+    np.cumsum(lengths + counts.reshape(-1), out=new_offsets[1:])
+    new_triggers = np.empty(int(new_offsets[-1]), dtype=np.int32)
+    shifts = new_offsets[:-1] - triggers_offsets[:-1]
+    new_triggers[np.arange(len(triggers)) + np.repeat(shifts, lengths)] = triggers
+    return new_triggers, new_offsets, new_offsets[:-1] + lengths
+
+
+def remove_triggers(triggers: NDArray, triggers_offsets: NDArray, propagator: int) -> tuple[NDArray, NDArray]:
+    """
+    Removes a propagator from the CSR triggers.
+
+    :param triggers: the flat triggers array
+    :type triggers: NDArray
+    :param triggers_offsets: the CSR offsets delimiting each (variable, event) slice of triggers
+    :type triggers_offsets: NDArray
+    :param propagator: the propagator
+    :type propagator: int
+
+    :return: the triggers and their offsets
+    :rtype: Tuple[NDArray, NDArray]
+    """
+    kept = triggers != propagator
+    kept_nb = np.zeros(len(triggers) + 1, dtype=np.int32)  # the number of entries kept before each entry
+    np.cumsum(kept, out=kept_nb[1:])
+    return triggers[kept], kept_nb[triggers_offsets]
+
+
+def init_bounds(bounds: NDArray, arities: NDArray, parameter_nbs: NDArray, state_sizes: NDArray) -> None:
+    """
+    Initializes the variable, parameter and state bounds for each propagator: the ranges of a propagator follow
+    the ones of the previous propagator.
+
+    :param bounds: the bounds to initialize
+    :type bounds: NDArray
+    :param arities: the numbers of variables of the propagators
+    :type arities: NDArray
+    :param parameter_nbs: the numbers of parameters of the propagators
+    :type parameter_nbs: NDArray
+    :param state_sizes: the sizes of the states of the propagators
+    :type state_sizes: NDArray
+    """
+    propagator_nb = len(arities)
+    for bound, sizes in ((VARIABLE, arities), (PARAM, parameter_nbs), (STATE, state_sizes)):
+        bounds[:propagator_nb, bound, RANGE_END] = np.cumsum(sizes)
+        bounds[:propagator_nb, bound, RANGE_START] = bounds[:propagator_nb, bound, RANGE_END] - sizes
+
+
+def init_deltas(
+    domain_nb: int, bounds: NDArray, propagator_variables: NDArray, incremental_propagators: NDArray
+) -> tuple[NDArray, NDArray]:
+    """
+    Lists, for each variable, its occurrences in the incremental propagators.
+
+    :param domain_nb: the number of variables
+    :type domain_nb: int
     :param bounds: the bounds
     :type bounds: NDArray
-    :param propagators: the propagators
-    :type propagators: List[Tuple[List[int], int, List[int]]]
+    :param propagator_variables: the propagator variables
+    :type propagator_variables: NDArray
+    :param incremental_propagators: 1 for the incremental propagators, 0 otherwise
+    :type incremental_propagators: NDArray
+
+    :return: the flat occurrences (see DELTA_OCCURRENCE_NB) and the CSR offsets delimiting each variable's occurrences
+    :rtype: Tuple[NDArray, NDArray]
     """
-    for propagator_idx, propagator in enumerate(propagators):
-        var_start = bounds[propagator_idx, VARIABLE, RANGE_START]
-        var_end = bounds[propagator_idx, VARIABLE, RANGE_END]
-        propagator_variables[var_start:var_end] = propagator[0]
-        param_start = bounds[propagator_idx, PARAM, RANGE_START]
-        param_end = bounds[propagator_idx, PARAM, RANGE_END]
-        propagator_parameters[param_start:param_end] = propagator[2]
+    propagator_nb = len(incremental_propagators)
+    var_starts = bounds[:propagator_nb, VARIABLE, RANGE_START].astype(np.int64)
+    arities = bounds[:propagator_nb, VARIABLE, RANGE_END].astype(np.int64) - var_starts
+    occurrence_propagators = np.repeat(np.arange(propagator_nb), arities)
+    mask = incremental_propagators[occurrence_propagators] != 0
+    occurrence_propagators = occurrence_propagators[mask]
+    occurrence_positions = (np.arange(len(propagator_variables)) - np.repeat(var_starts, arities))[mask]
+    variables = propagator_variables[mask]
+    order = np.argsort(variables, kind="stable")
+    deltas = np.empty((len(order), DELTA_OCCURRENCE_NB), dtype=np.int32)
+    deltas[:, DELTA_OCCURRENCE_IDX_STATE] = bounds[occurrence_propagators[order], STATE, RANGE_START]
+    deltas[:, DELTA_OCCURRENCE_IDX_ARITY] = arities[occurrence_propagators[order]]
+    deltas[:, DELTA_OCCURRENCE_IDX_POSITION] = occurrence_positions[order]
+    deltas_offsets = np.zeros(domain_nb + 1, dtype=np.int32)
+    np.cumsum(np.bincount(variables, minlength=domain_nb), out=deltas_offsets[1:])
+    return deltas.reshape(-1), deltas_offsets
 
 
 @njit(cache=True)
 def count_triggers(
     counts: NDArray,
+    propagator_start: int,
     propagator_nb: int,
     bounds: NDArray,
     propagator_variables: NDArray,
@@ -277,6 +615,8 @@ def count_triggers(
 
     :param counts: the (domain_nb, EVENT_MASK_NB) array of counts to fill
     :type counts: NDArray
+    :param propagator_start: the first propagator to consider, the previous ones being ignored
+    :type propagator_start: int
     :param propagator_nb: the number of propagators
     :type propagator_nb: int
     :param bounds: the bounds
@@ -290,7 +630,7 @@ def count_triggers(
     :param get_triggers_addrs: the addresses of the get_triggers functions
     :type get_triggers_addrs: NDArray
     """
-    for propagator in range(propagator_nb):
+    for propagator in range(propagator_start, propagator_nb):
         algorithm = algorithms[propagator]
         if NUMBA_DISABLE_JIT:
             trigger_fct = GET_TRIGGERS_FCTS[algorithm]
@@ -322,6 +662,7 @@ def count_triggers(
 def fill_triggers(
     triggers: NDArray,
     cursors: NDArray,
+    propagator_start: int,
     propagator_nb: int,
     bounds: NDArray,
     propagator_variables: NDArray,
@@ -337,6 +678,8 @@ def fill_triggers(
     :type triggers: NDArray
     :param cursors: the per (variable, event) write cursors, indexed variable * EVENT_MASK_NB + event
     :type cursors: NDArray
+    :param propagator_start: the first propagator to consider, the previous ones being ignored
+    :type propagator_start: int
     :param propagator_nb: the number of propagators
     :type propagator_nb: int
     :param bounds: the bounds
@@ -350,7 +693,7 @@ def fill_triggers(
     :param get_triggers_addrs: the addresses of the get_triggers functions
     :type get_triggers_addrs: NDArray
     """
-    for propagator in range(propagator_nb):
+    for propagator in range(propagator_start, propagator_nb):
         algorithm = algorithms[propagator]
         if NUMBA_DISABLE_JIT:
             trigger_fct = GET_TRIGGERS_FCTS[algorithm]
@@ -56,7 +56,7 @@ def get_triggers_abs_eq(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_abs_eq(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_abs_eq(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`abs(y)=x`.
 
@@ -64,6 +64,8 @@ def compute_domains_abs_eq(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: unused here
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
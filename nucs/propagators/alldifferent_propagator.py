@@ -17,8 +17,7 @@ from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
-
-SORT_MAX_N = 64  # above this arity, np.argsort amortizes its fixed cost and beats the insertion sort
+from nucs.propagators.sorting import sort_permutation
 
 
 def get_complexity_alldifferent(n: int, parameters: NDArray) -> int:
@@ -36,6 +35,22 @@ def get_complexity_alldifferent(n: int, parameters: NDArray) -> int:
     return int(n * math.log(n))
 
 
+def get_state_size_alldifferent(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: a warm flag, the permutations sorting the variables by their bounds at the
+    previous call, then the scratch arrays.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return 1 + 2 * n + 4 * 2 * (n + 1) + 2 * n
+
+
 @njit(cache=True)
 def get_triggers_alldifferent(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -223,13 +238,9 @@ def filter_upper(
 
 
 @njit(cache=True, inline="always")
-def argsort_into(sorted_vars: NDArray, domains: NDArray, bound: int) -> None:
+def argsort_into(sorted_vars: NDArray, domains: NDArray, bound: int, warm: bool) -> None:
     """
-    Sorts the variables by their given bound, writing the permutation into sorted_vars.
-
-    Below SORT_MAX_N, an insertion sort on the preallocated int32 output beats np.argsort, whose fixed cost
-    (allocating an int64 result, copying the strided bound column, then narrowing to int32) dominates at small n.
-    Inlined: as a separately cached function it would add a per-process load cost to every solver run.
+    Sorts the variables by their given bound, writing the permutation into sorted_vars (see sort_permutation).
 
     :param sorted_vars: the array of variables to sort, modified in place
     :type sorted_vars: NDArray
@@ -237,25 +248,15 @@ def argsort_into(sorted_vars: NDArray, domains: NDArray, bound: int) -> None:
     :type domains: NDArray
     :param bound: MIN or MAX, the bound to sort on
     :type bound: int
+    :param warm: whether sorted_vars already holds a permutation of the variables
+    :type warm: bool
     """
-    n = len(sorted_vars)
-    if n > SORT_MAX_N:
-        sorted_vars[:] = np.argsort(domains[:, bound])
-        return
-    for i in range(n):
-        sorted_vars[i] = i
-    for i in range(1, n):
-        var = sorted_vars[i]
-        value = domains[var, bound]
-        j = i - 1
-        while j >= 0 and domains[sorted_vars[j], bound] > value:
-            sorted_vars[j + 1] = sorted_vars[j]
-            j -= 1
-        sorted_vars[j + 1] = var
+    values = domains[:, bound]
+    sort_permutation(sorted_vars, values, values, 0, len(sorted_vars), warm)
 
 
 @njit(cache=True)
-def compute_domains_alldifferent(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_alldifferent(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Enforces that :math:`x_i <> x_j when i<>j`.
 
@@ -264,6 +265,8 @@ def compute_domains_alldifferent(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: either empty or offsets
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_alldifferent
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -274,16 +277,19 @@ def compute_domains_alldifferent(domains: NDArray, parameters: NDArray) -> int:
         offsets = parameters[:, np.newaxis]
         domains += offsets
     bounds_nb = 2 * (n + 1)
-    empty_buffer = np.empty(4 * bounds_nb + 4 * n, dtype=np.int32)  # single allocation for all the scratch arrays
-    bounds = empty_buffer[:bounds_nb]
-    t = empty_buffer[bounds_nb : 2 * bounds_nb]  # critical capacity pointers
-    d = empty_buffer[2 * bounds_nb : 3 * bounds_nb]  # differences between critical capacities
-    h = empty_buffer[3 * bounds_nb : 4 * bounds_nb]  # Hall interval pointers
-    min_sorted_vars = empty_buffer[4 * bounds_nb : 4 * bounds_nb + n]
-    max_sorted_vars = empty_buffer[4 * bounds_nb + n : 4 * bounds_nb + 2 * n]
-    ranks = empty_buffer[4 * bounds_nb + 2 * n :].reshape(n, 2)
-    argsort_into(min_sorted_vars, domains, MIN)
-    argsort_into(max_sorted_vars, domains, MAX)
+    # the state holds the warm flag, the permutations of the previous call, then all the scratch arrays
+    warm = state[0] != 0
+    state[0] = 1
+    min_sorted_vars = state[1 : 1 + n]
+    max_sorted_vars = state[1 + n : 1 + 2 * n]
+    scratch = state[1 + 2 * n :]
+    bounds = scratch[:bounds_nb]
+    t = scratch[bounds_nb : 2 * bounds_nb]  # critical capacity pointers
+    d = scratch[2 * bounds_nb : 3 * bounds_nb]  # differences between critical capacities
+    h = scratch[3 * bounds_nb : 4 * bounds_nb]  # Hall interval pointers
+    ranks = scratch[4 * bounds_nb :].reshape(n, 2)
+    argsort_into(min_sorted_vars, domains, MIN, warm)
+    argsort_into(max_sorted_vars, domains, MAX, warm)
     ground = True
     for i in range(n):
         if domains[i, MIN] != domains[i, MAX]:
@@ -46,7 +46,7 @@ def get_triggers_and_eq(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_and_eq(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_and_eq(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`\\& b_i = b_{n-1}` where for each i, b_i is a boolean variable.
 
@@ -54,6 +54,8 @@ def compute_domains_and_eq(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: unused here
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -18,9 +18,29 @@ from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_
 
 # Budgets bounding the exact subset-sum reasoning so a single call stays cheap on large instances; beyond
 # them the propagator falls back to the (always sound) load bounds and O(1) item rules.
-SUBSET_SUM_CAP = 4096  # maximum total candidate weight for which the reachability array is built
+SUBSET_SUM_CAP = 1 << 18  # maximum total candidate weight for which the reachability bitset is built
 ITEM_SUBSET_CAP = 48  # maximum number of candidates for which per-item no-sum pruning is run
 
+# The state of the propagator is laid out as:
+# - the candidates of the current bin,
+# - the reachability of the candidates but one,
+# - for each bin, the number of its candidates, these candidates and their reachability, as computed by the
+#   last call where they were the candidates of this bin.
+# The reachabilities are bitsets, the sums being packed by 64 in uint64 words, each on two int32 cells.
+
+
+def get_word_nb(parameters: NDArray) -> int:
+    """
+    Returns the number of uint64 words of a reachability bitset.
+
+    :param parameters: the bin offset followed by the item weights
+    :type parameters: NDArray
+
+    :return: the number of words
+    :rtype: int
+    """
+    return (min(int(sum(parameters[1:])), SUBSET_SUM_CAP) >> 6) + 1
+
 
 def get_complexity_bin_packing_load(n: int, parameters: NDArray) -> int:
     """
@@ -39,6 +59,24 @@ def get_complexity_bin_packing_load(n: int, parameters: NDArray) -> int:
     return item_nb * item_nb * bin_nb
 
 
+def get_state_size_bin_packing_load(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state, see the layout above.
+
+    :param n: the number of variables (loads and bins)
+    :type n: int
+    :param parameters: the bin offset followed by the item weights
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    item_nb = len(parameters) - 1
+    bin_nb = n - item_nb
+    word_nb = get_word_nb(parameters)
+    return item_nb + 2 * word_nb + bin_nb * (1 + item_nb + 2 * word_nb)
+
+
 @njit(cache=True)
 def get_triggers_bin_packing_load(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -59,61 +97,101 @@ def get_triggers_bin_packing_load(n: int, variable: int, parameters: NDArray) ->
 
 
 @njit(cache=True)
-def _reach(weights: NDArray, count: int, skip: int, total: int) -> NDArray:
+def _reach(parameters: NDArray, candidates: NDArray, count: int, skip: int, total: int, reach: NDArray) -> None:
     """
-    Builds the subset-sum reachability of ``weights[0:count]`` (optionally skipping index ``skip``).
+    Builds the subset-sum reachability of the weights of ``candidates[0:count]`` (optionally skipping index
+    ``skip``): bit ``s`` of ``reach`` is set iff some subset of the selected weights sums to ``s``.
 
-    ``result[s]`` is 1 iff some subset of the selected weights sums to ``s``.
+    Adding a weight ``w`` shifts the bitset by ``w`` and ors it into itself, 64 sums at a time.
 
-    :param weights: the candidate weights
-    :type weights: NDArray
+    :param parameters: the bin offset then the item weights
+    :type parameters: NDArray
+    :param candidates: the candidate items
+    :type candidates: NDArray
     :param count: the number of candidates to consider
     :type count: int
     :param skip: an index to exclude, or -1 to include them all
     :type skip: int
-    :param total: the sum of the selected weights (the size of the reachability array minus one)
+    :param total: the sum of the selected weights
     :type total: int
-
-    :return: the reachability array of length total + 1
-    :rtype: NDArray
+    :param reach: the bitset, of at least total // 64 + 1 words, modified in place
+    :type reach: NDArray
     """
-    reach = np.zeros(total + 1, dtype=np.uint8)
+    word_nb = (total >> 6) + 1
+    reach[:word_nb] = 0
     reach[0] = 1
     for t in range(count):
         if t == skip:
             continue
-        w = weights[t]
-        for s in range(total, w - 1, -1):
-            if reach[s - w]:
-                reach[s] = 1
-    return reach
+        w = parameters[1 + candidates[t]]
+        word_shift = w >> 6
+        bit_shift = np.uint64(w & 63)
+        # from the last word down, so that each word is shifted from words not yet modified
+        for k in range(word_nb - 1, word_shift - 1, -1):
+            word = reach[k - word_shift] << bit_shift
+            if bit_shift > 0 and k > word_shift:
+                word |= reach[k - word_shift - 1] >> (np.uint64(64) - bit_shift)
+            reach[k] |= word
+
+
+@njit(cache=True)
+def _first_reachable(reach: NDArray, lo: int, hi: int) -> int:
+    """
+    Returns the first reachable value in ``[lo, hi]``.
+
+    :param reach: a reachability bitset, of at least hi // 64 + 1 words
+    :type reach: NDArray
+    :param lo: the lower bound, non-negative
+    :type lo: int
+    :param hi: the upper bound
+    :type hi: int
+
+    :return: the value, -1 when none is reachable
+    :rtype: int
+    """
+    s = lo
+    while s <= hi:
+        word = reach[s >> 6] >> np.uint64(s & 63)
+        if word == 0:
+            s = ((s >> 6) + 1) << 6  # the first sum of the next word
+            continue
+        while word & np.uint64(1) == 0:
+            word >>= np.uint64(1)
+            s += 1
+        return s if s <= hi else -1
+    return -1
 
 
 @njit(cache=True)
-def _any_reachable(reach: NDArray, lo: int, hi: int) -> bool:
+def _last_reachable(reach: NDArray, lo: int, hi: int) -> int:
     """
-    Returns whether any value in ``[lo, hi]`` (clamped to the array) is reachable.
+    Returns the last reachable value in ``[lo, hi]``.
 
-    :param reach: a reachability array
+    :param reach: a reachability bitset, of at least hi // 64 + 1 words
     :type reach: NDArray
-    :param lo: the lower bound
+    :param lo: the lower bound, non-negative
     :type lo: int
     :param hi: the upper bound
     :type hi: int
 
-    :return: whether some value in the range is reachable
-    :rtype: bool
+    :return: the value, -1 when none is reachable
+    :rtype: int
     """
-    lo = max(lo, 0)
-    hi = min(hi, len(reach) - 1)
-    for s in range(lo, hi + 1):
-        if reach[s]:
-            return True
-    return False
+    s = hi
+    while s >= lo:
+        word = reach[s >> 6] << np.uint64(63 - (s & 63))
+        if word == 0:
+            s = ((s >> 6) << 6) - 1  # the last sum of the previous word
+            continue
+        while word >> np.uint64(63) == 0:
+            word <<= np.uint64(1)
+            s -= 1
+        return s if s >= lo else -1
+    return -1
 
 
 @njit(cache=True)
-def compute_domains_bin_packing_load(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_bin_packing_load(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements the bin_packing_load constraint: each item i (with non-negative weight w[i]) is placed in bin
     bin[i], and load[j] equals the sum of the weights of the items placed in bin j.
@@ -127,12 +205,15 @@ def compute_domains_bin_packing_load(domains: NDArray, parameters: NDArray) -> i
     - when the candidate weights are small enough, exact subset-sum reasoning (Shaw's no-sum, but complete)
       tightens load[j] to a value its candidates can actually reach, prunes a candidate from a bin when the
       remaining items cannot complete a valid load, and forces a candidate into a bin when nothing else can;
+      the reachability of the candidates of a bin is a bitset, kept in the state until they change;
     - otherwise the cheap O(1) overflow / forced rules are used.
 
     :param domains: the domains of the loads then the bins
     :type domains: NDArray
     :param parameters: the bin offset then the item weights
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_bin_packing_load
+    :type state: NDArray
 
     :return: the status of the propagation (consistency or inconsistency) as an int
     :rtype: int
@@ -140,8 +221,14 @@ def compute_domains_bin_packing_load(domains: NDArray, parameters: NDArray) -> i
     bin_low = parameters[0]
     item_nb = len(parameters) - 1
     bin_nb = domains.shape[0] - item_nb
-    cand_idx = np.empty(item_nb, dtype=np.int64)
-    cand_w = np.empty(item_nb, dtype=np.int64)
+    weight_sum = 0
+    for i in range(item_nb):
+        weight_sum += parameters[1 + i]
+    word_nb = (min(weight_sum, SUBSET_SUM_CAP) >> 6) + 1
+    candidates = state[:item_nb]
+    others = state[item_nb : item_nb + 2 * word_nb].view(np.uint64)
+    cache_start = item_nb + 2 * word_nb
+    cache_size = 1 + item_nb + 2 * word_nb
     change = True
     while change:
         change = False
@@ -157,8 +244,7 @@ def compute_domains_bin_packing_load(domains: NDArray, parameters: NDArray) -> i
                     if item[MIN] == item[MAX]:
                         required += w
                     else:
-                        cand_idx[nc] = i
-                        cand_w[nc] = w
+                        candidates[nc] = i
                         total += w
                         nc += 1
             load = domains[j]
@@ -174,22 +260,25 @@ def compute_domains_bin_packing_load(domains: NDArray, parameters: NDArray) -> i
             if nc == 0:
                 continue  # the load is fully determined by the fixed items
             if total <= SUBSET_SUM_CAP:
-                reach = _reach(cand_w, nc, -1, total)
+                # the reachability of the candidates is kept as long as they are the candidates of bin j
+                cache = state[cache_start + j * cache_size : cache_start + (j + 1) * cache_size]
+                reach = cache[1 + item_nb :].view(np.uint64)
+                cached = cache[0] == nc
+                t = 0
+                while cached and t < nc:
+                    cached = cache[1 + t] == candidates[t]
+                    t += 1
+                if not cached:
+                    cache[0] = nc
+                    cache[1 : 1 + nc] = candidates[:nc]
+                    _reach(parameters, candidates, nc, -1, total, reach)
                 lo = load[MIN] - required
                 hi = load[MAX] - required
                 # tighten the load to the sub-range its candidates can actually sum to
-                min_c = -1
-                for s in range(lo, hi + 1):
-                    if reach[s]:
-                        min_c = s
-                        break
+                min_c = _first_reachable(reach, lo, hi)
                 if min_c < 0:
                     return PROP_INCONSISTENCY
-                max_c = -1
-                for s in range(hi, lo - 1, -1):
-                    if reach[s]:
-                        max_c = s
-                        break
+                max_c = _last_reachable(reach, lo, hi)
                 if load[MIN] < required + min_c:
                     load[MIN] = required + min_c
                     change = True
@@ -200,34 +289,48 @@ def compute_domains_bin_packing_load(domains: NDArray, parameters: NDArray) -> i
                 hi = load[MAX] - required
                 if nc <= ITEM_SUBSET_CAP:
                     for t in range(nc):
-                        item = domains[bin_nb + cand_idx[t]]
-                        if item[MIN] == item[MAX]:
-                            continue  # already committed by an earlier rule this pass
-                        w = cand_w[t]
-                        others = _reach(cand_w, nc, t, total - w)
-                        # can the item still be in bin j? the others must fill [lo - w, hi - w]
-                        if not _any_reachable(others, lo - w, hi - w):
-                            if item[MIN] == v:
-                                item[MIN] += 1
-                                change = True
-                            elif item[MAX] == v:
-                                item[MAX] -= 1
-                                change = True
-                            if item[MIN] > item[MAX]:
-                                return PROP_INCONSISTENCY
+                        w = parameters[1 + candidates[t]]
+                        # the candidates of equal weights share the reachability of the others
+                        first = True
+                        for u in range(t):
+                            if parameters[1 + candidates[u]] == w:
+                                first = False
+                                break
+                        if not first:
                             continue
+                        _reach(parameters, candidates, nc, t, total - w, others)
+                        # can the item still be in bin j? the others must fill [lo - w, hi - w]
+                        can_be_in = _first_reachable(others, max(lo - w, 0), hi - w) >= 0
                         # can the item still be out of bin j? the others alone must fill [lo, hi]
-                        if not _any_reachable(others, lo, hi):
-                            item[MIN] = v
-                            item[MAX] = v
-                            change = True
+                        can_be_out = _first_reachable(others, lo, min(hi, total - w)) >= 0
+                        if can_be_in and can_be_out:
+                            continue
+                        for u in range(t, nc):
+                            if parameters[1 + candidates[u]] != w:
+                                continue
+                            item = domains[bin_nb + candidates[u]]
+                            if item[MIN] == item[MAX]:
+                                continue  # already committed by an earlier rule this pass
+                            if not can_be_in:
+                                if item[MIN] == v:
+                                    item[MIN] += 1
+                                    change = True
+                                elif item[MAX] == v:
+                                    item[MAX] -= 1
+                                    change = True
+                                if item[MIN] > item[MAX]:
+                                    return PROP_INCONSISTENCY
+                            else:
+                                item[MIN] = v
+                                item[MAX] = v
+                                change = True
             else:
                 # large candidate weight: fall back to the cheap sound rules
                 for t in range(nc):
-                    item = domains[bin_nb + cand_idx[t]]
+                    item = domains[bin_nb + candidates[t]]
                     if item[MIN] == item[MAX]:
                         continue
-                    w = cand_w[t]
+                    w = parameters[1 + candidates[t]]
                     if required + w > load[MAX]:  # the item cannot fit in bin j
                         if item[MIN] == v:
                             item[MIN] += 1
@@ -242,10 +345,8 @@ def compute_domains_bin_packing_load(domains: NDArray, parameters: NDArray) -> i
                         item[MAX] = v
                         change = True
         # total-weight channeling: when every item is placed within range, the loads sum to the total weight
-        weight_sum = 0
         all_in_range = True
         for i in range(item_nb):
-            weight_sum += parameters[1 + i]
             item = domains[bin_nb + i]
             if item[MIN] < bin_low or item[MAX] > bin_low + bin_nb - 1:
                 all_in_range = False
@@ -0,0 +1,239 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+
+INFINITY = 1 << 62
+
+# The state of the propagator holds an optimal assignment of the successors, relaxing the circuit, together with
+# optimal dual potentials; it is laid out as:
+# - the potentials of the nodes as sources (u), of the nodes as targets (v) and the scratch minima of the
+#   Hungarian method, as int64 on two int32 cells each,
+# - the source assigned to each target (p), the target assigned to each source, the scratch predecessors and the
+#   scratch marks of the Hungarian method.
+# Every array is indexed from 1, index 0 standing for the source being assigned. A zero state is the empty
+# assignment with null potentials.
+
+
+def get_complexity_circuit_cost(n: int, parameters: NDArray) -> int:
+    """
+    Returns the time complexity of the propagator as an int.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: an int
+    :rtype: int
+    """
+    return n * n
+
+
+def get_state_size_circuit_cost(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: the potentials and the minima as int64, the two sides of the assignment, the
+    predecessors and the marks.
+
+    :param n: the number of variables (the successors and the cost)
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return 3 * 2 * n + 4 * n
+
+
+@njit(cache=True)
+def get_triggers_circuit_cost(n: int, variable: int, parameters: NDArray) -> int:
+    """
+    This propagator is triggered whenever there is a change in the domain of a variable.
+
+    :param n: the number of variables
+    :type n: int
+    :param variable: the index of the variable
+    :type variable: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: an event mask
+    :rtype: int
+    """
+    return EVENT_MASK_MIN_MAX
+
+
+@njit(cache=True)
+def _is_arc(domains: NDArray, offset: int, n: int, i: int, j: int) -> bool:
+    """
+    Returns whether node j (0-based) can be the successor of node i (0-based), self-loops being excluded but for a
+    single node.
+    """
+    return (i != j or n == 1) and domains[i, MIN] <= offset + j <= domains[i, MAX]
+
+
+@njit(cache=True)
+def _augment(
+    domains: NDArray,
+    costs: NDArray,
+    offset: int,
+    n: int,
+    row: int,
+    u: NDArray,
+    v: NDArray,
+    minv: NDArray,
+    p: NDArray,
+    way: NDArray,
+    used: NDArray,
+) -> bool:
+    """
+    Assigns the source row (1-based) by a shortest augmenting path of the Hungarian method, which keeps the
+    potentials feasible, and returns False when there is no such path, i.e. no complete assignment.
+    """
+    p[0] = row
+    j0 = 0
+    for j in range(n + 1):
+        minv[j] = INFINITY
+        used[j] = 0
+    while True:
+        used[j0] = 1
+        i0 = p[j0]
+        delta = INFINITY
+        j1 = -1
+        for j in range(1, n + 1):
+            if used[j] == 0:
+                if _is_arc(domains, offset, n, i0 - 1, j - 1):
+                    reduced_cost = costs[(i0 - 1) * n + j - 1] - u[i0] - v[j]
+                    if reduced_cost < minv[j]:
+                        minv[j] = reduced_cost
+                        way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+        if j1 < 0:
+            return False
+        for j in range(n + 1):
+            if used[j] != 0:
+                u[p[j]] += delta
+                v[j] -= delta
+            elif minv[j] < INFINITY:
+                minv[j] -= delta
+        j0 = j1
+        if p[j0] == 0:
+            break
+    while j0 != 0:
+        j1 = way[j0]
+        p[j0] = p[j1]
+        j0 = j1
+    return True
+
+
+@njit(cache=True)
+def compute_domains_circuit_cost(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
+    """
+    Bounds the cost of a circuit: the last variable is the sum of the costs of the arcs chosen by the successors,
+    the other variables. This propagator only reasons on the cost and is meant to run alongside a circuit
+    constraint on the same successors.
+
+    The lower bound of the cost is the optimum of the assignment problem, which relaxes the circuit into a
+    permutation without self-loops. The assignment and its dual potentials are kept in the state and repaired by
+    the Hungarian method, so that a call only reassigns the sources whose arc was removed. A successor bound is
+    removed when its reduced cost, added to the optimum, exceeds the upper bound of the cost; the upper bound of
+    the cost is the sum of the most expensive remaining arcs.
+
+    As for the sub-circuit constraint, the successors take node labels, node i being labelled ``offset + i``.
+
+    :param domains: the domains of the variables, the successors then the cost
+    :type domains: NDArray
+    :param parameters: the node label offset followed by the costs of the arcs, row by row
+    :type parameters: NDArray
+    :param state: the assignment and its potentials
+    :type state: NDArray
+
+    :return: the status of the propagation (consistency, inconsistency or entailment) as an int
+    :rtype: int
+    """
+    n = len(domains) - 1
+    offset = int(parameters[0])
+    costs = parameters[1:]
+    size = n + 1
+    u = state[: 2 * size].view(np.int64)
+    v = state[2 * size : 4 * size].view(np.int64)
+    minv = state[4 * size : 6 * size].view(np.int64)
+    p = state[6 * size : 7 * size]
+    assigned = state[7 * size : 8 * size]
+    way = state[8 * size : 9 * size]
+    used = state[9 * size : 10 * size]
+    for i in range(n):
+        domains[i, MIN] = max(domains[i, MIN], offset)
+        domains[i, MAX] = min(domains[i, MAX], offset + n - 1)
+        if domains[i, MIN] > domains[i, MAX]:
+            return PROP_INCONSISTENCY
+    # the potentials of the sources are lowered or raised to the smallest reduced cost of their arcs so that they
+    # stay feasible, and the sources whose arc was removed or is no longer tight are unassigned
+    for i in range(1, n + 1):
+        smallest = INFINITY
+        for j in range(1, n + 1):
+            if _is_arc(domains, offset, n, i - 1, j - 1):
+                smallest = min(smallest, costs[(i - 1) * n + j - 1] - v[j])
+        if smallest == INFINITY:
+            return PROP_INCONSISTENCY
+        u[i] = smallest
+        j = assigned[i]
+        if j != 0 and (not _is_arc(domains, offset, n, i - 1, j - 1) or costs[(i - 1) * n + j - 1] != u[i] + v[j]):
+            p[j] = 0
+            assigned[i] = 0
+    for i in range(1, n + 1):
+        if assigned[i] == 0:
+            if not _augment(domains, costs, offset, n, i, u, v, minv, p, way, used):
+                return PROP_INCONSISTENCY
+            for j in range(1, n + 1):
+                assigned[p[j]] = j
+    optimum = 0
+    for i in range(1, n + 1):
+        optimum += costs[(i - 1) * n + assigned[i] - 1]
+    if optimum > domains[n, MAX]:
+        return PROP_INCONSISTENCY
+    domains[n, MIN] = max(domains[n, MIN], optimum)
+    slack = domains[n, MAX] - optimum
+    ground = True
+    highest_sum = 0
+    for i in range(1, n + 1):
+        row = (i - 1) * n
+        while domains[i - 1, MIN] < domains[i - 1, MAX]:
+            j = domains[i - 1, MIN] - offset + 1
+            if _is_arc(domains, offset, n, i - 1, j - 1) and costs[row + j - 1] - u[i] - v[j] <= slack:
+                break
+            domains[i - 1, MIN] += 1
+        while domains[i - 1, MIN] < domains[i - 1, MAX]:
+            j = domains[i - 1, MAX] - offset + 1
+            if _is_arc(domains, offset, n, i - 1, j - 1) and costs[row + j - 1] - u[i] - v[j] <= slack:
+                break
+            domains[i - 1, MAX] -= 1
+        if domains[i - 1, MIN] < domains[i - 1, MAX]:
+            ground = False
+        highest = costs[row + domains[i - 1, MIN] - offset]
+        for j in range(domains[i - 1, MIN] - offset + 1, domains[i - 1, MAX] - offset + 1):
+            if _is_arc(domains, offset, n, i - 1, j):
+                highest = max(highest, costs[row + j])
+        highest_sum += highest
+    domains[n, MAX] = min(domains[n, MAX], highest_sum)
+    if domains[n, MIN] > domains[n, MAX]:
+        return PROP_INCONSISTENCY
+    if ground:
+        return PROP_ENTAILMENT
+    return PROP_CONSISTENCY
@@ -14,6 +14,12 @@ from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+from nucs.propagators.deltas import get_delta_nb, get_delta_regions, get_state_size_delta, is_warm
+
+# the cache of the count propagators
+COUNT_CACHE_NB = 2
+COUNT_IDX_FIXED_NB = 0  # the number of x_i fixed to a
+COUNT_IDX_OUT_NB = 1  # the number of x_i that cannot be equal to a
 
 
 def get_complexity_count_eq_c(n: int, parameters: NDArray) -> int:
@@ -31,6 +37,79 @@ def get_complexity_count_eq_c(n: int, parameters: NDArray) -> int:
     return n
 
 
+def get_state_size_count_eq_c(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: the delta, then the cache of the counts.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return get_state_size_delta(n, COUNT_CACHE_NB)
+
+
+@njit(cache=True)
+def update_count_cache(domains: NDArray, x_nb: int, a: int, state: NDArray) -> tuple[int, int]:
+    """
+    Brings the cache of a count propagator up to date with the domains, only looking at the changed positions
+    when the state is warm.
+
+    :param domains: the domains of the variables, the counted variables first
+    :type domains: NDArray
+    :param x_nb: the number of counted variables
+    :type x_nb: int
+    :param a: the counted value
+    :type a: int
+    :param state: the state of the propagator
+    :type state: NDArray
+
+    :return: the number of x_i fixed to a and the number of x_i that can be equal to a
+    :rtype: Tuple[int, int]
+    """
+    fixed_nb = out_nb = 0
+    if is_warm(state):
+        positions, snapshot, cache = get_delta_regions(state, len(domains))
+        fixed_nb = cache[COUNT_IDX_FIXED_NB]
+        out_nb = cache[COUNT_IDX_OUT_NB]
+        for delta_idx in range(get_delta_nb(state)):
+            i = positions[delta_idx]
+            if i >= x_nb:
+                continue
+            old_min = snapshot[i, MIN]
+            old_max = snapshot[i, MAX]
+            if old_min == a and old_max == a:
+                fixed_nb -= 1
+            elif old_min > a or old_max < a:
+                out_nb -= 1
+            x_min = domains[i, MIN]
+            x_max = domains[i, MAX]
+            if x_min == a and x_max == a:
+                fixed_nb += 1
+            elif x_min > a or x_max < a:
+                out_nb += 1
+            snapshot[i, MIN] = x_min
+            snapshot[i, MAX] = x_max
+    else:
+        for i in range(x_nb):
+            x_min = domains[i, MIN]
+            x_max = domains[i, MAX]
+            if x_min == a and x_max == a:
+                fixed_nb += 1
+            elif x_min > a or x_max < a:
+                out_nb += 1
+        if len(state) == 0:
+            return fixed_nb, x_nb - out_nb
+        _, snapshot, cache = get_delta_regions(state, len(domains))
+        snapshot[:] = domains
+    cache[COUNT_IDX_FIXED_NB] = fixed_nb
+    cache[COUNT_IDX_OUT_NB] = out_nb
+    return fixed_nb, x_nb - out_nb
+
+
 @njit(cache=True)
 def get_triggers_count_eq_c(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -46,7 +125,7 @@ def get_triggers_count_eq_c(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_count_eq_c(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_count_eq_c(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`\\sum_i (x_i == a) = c`.
 
@@ -54,25 +133,18 @@ def compute_domains_count_eq_c(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: the parameters of the propagator, a is the first parameter, c is the second parameter
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_count_eq_c
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
     """
     a = int(parameters[0])
     c = int(parameters[1])
-    count_max = len(domains)
-    count_min = 0
-    for domain in domains:
-        domain_min = domain[MIN]
-        domain_max = domain[MAX]
-        if domain_min > a or domain_max < a:
-            count_max -= 1
-            if count_max < c:
-                return PROP_INCONSISTENCY
-        elif domain_min == a and domain_max == a:
-            count_min += 1
-            if count_min > c:
-                return PROP_INCONSISTENCY
+    # the counts are obtained from the changed positions only, the domains are only scanned when filtering
+    count_min, count_max = update_count_cache(domains, len(domains), a, state)
+    if count_max < c or count_min > c:
+        return PROP_INCONSISTENCY
     if count_min == c:
         if count_max == c:
             return PROP_ENTAILMENT
@@ -14,6 +14,7 @@ from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+from nucs.propagators.count_eq_c_propagator import get_state_size_count_eq_c, update_count_cache
 
 
 def get_complexity_count_eq(n: int, parameters: NDArray) -> int:
@@ -31,6 +32,21 @@ def get_complexity_count_eq(n: int, parameters: NDArray) -> int:
     return n
 
 
+def get_state_size_count_eq(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: the delta, then the cache of the counts.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return get_state_size_count_eq_c(n, parameters)
+
+
 @njit(cache=True)
 def get_triggers_count_eq(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -46,7 +62,7 @@ def get_triggers_count_eq(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_count_eq(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_count_eq(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`\\sum_i (x_i == a) = x_{n-1}`.
 
@@ -54,6 +70,8 @@ def compute_domains_count_eq(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: the parameters of the propagator, a is the first parameter
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_count_eq
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -62,24 +80,13 @@ def compute_domains_count_eq(domains: NDArray, parameters: NDArray) -> int:
     x = domains[:-1]
     counter = domains[-1]
     # count_min = number of x_i already fixed to a, count_max = number that can still equal a;
-    # the counter must lie in [count_min, count_max]. The counter bounds are read once into locals,
-    # and the loop bails out as soon as count_max drops below them (too few possible) or count_min
-    # rises above them (too many forced), saving the rest of the scan.
+    # the counter must lie in [count_min, count_max]. The counts are obtained from the changed positions only,
+    # the domains are only scanned when filtering.
     counter_min = counter[MIN]
     counter_max = counter[MAX]
-    count_max = len(x)
-    count_min = 0
-    for x_i in x:
-        x_i_min = x_i[MIN]
-        x_i_max = x_i[MAX]
-        if x_i_min > a or x_i_max < a:  # a is not in the domain: this x_i can never equal a
-            count_max -= 1
-            if count_max < counter_min:
-                return PROP_INCONSISTENCY
-        elif x_i_min == a and x_i_max == a:  # x_i is fixed to a
-            count_min += 1
-            if count_min > counter_max:
-                return PROP_INCONSISTENCY
+    count_min, count_max = update_count_cache(domains, len(x), a, state)
+    if count_max < counter_min or count_min > counter_max:
+        return PROP_INCONSISTENCY
     if count_min > counter_min:
         counter[MIN] = count_min
     if count_max < counter_max:
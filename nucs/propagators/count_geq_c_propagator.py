@@ -14,6 +14,7 @@ from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+from nucs.propagators.count_eq_c_propagator import get_state_size_count_eq_c, update_count_cache
 
 
 def get_complexity_count_geq_c(n: int, parameters: NDArray) -> int:
@@ -31,6 +32,21 @@ def get_complexity_count_geq_c(n: int, parameters: NDArray) -> int:
     return n
 
 
+def get_state_size_count_geq_c(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: the delta, then the cache of the counts.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return get_state_size_count_eq_c(n, parameters)
+
+
 @njit(cache=True)
 def get_triggers_count_geq_c(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -46,7 +62,7 @@ def get_triggers_count_geq_c(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_count_geq_c(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_count_geq_c(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`\\sum_i (x_i == a) >= c`.
 
@@ -54,25 +70,20 @@ def compute_domains_count_geq_c(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: the parameters of the propagator, a is the first parameter, c is the second parameter
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_count_geq_c
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
     """
     a = int(parameters[0])
     c = int(parameters[1])
-    count_max = len(domains)
-    count_min = 0
-    for domain in domains:
-        domain_min = domain[MIN]
-        domain_max = domain[MAX]
-        if domain_min > a or domain_max < a:
-            count_max -= 1
-            if count_max < c:
-                return PROP_INCONSISTENCY
-        elif domain_min == a and domain_max == a:
-            count_min += 1
-            if count_min >= c:
-                return PROP_ENTAILMENT
+    # the counts are obtained from the changed positions only, the domains are only scanned when filtering
+    count_min, count_max = update_count_cache(domains, len(domains), a, state)
+    if count_max < c:
+        return PROP_INCONSISTENCY
+    if count_min >= c:
+        return PROP_ENTAILMENT
     if count_max == c:  # we cannot have more domains different from a
         for domain in domains:
             if domain[MIN] <= a <= domain[MAX]:
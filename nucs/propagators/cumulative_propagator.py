@@ -10,11 +10,61 @@
 #
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
-import numpy as np
+import math
+
 from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+from nucs.propagators.deltas import get_int64, set_int64
+from nucs.propagators.scheduling import (
+    ORDER_IDX_ECT,
+    ORDER_IDX_EST,
+    ORDER_IDX_LCT,
+    ORDER_IDX_LST,
+    ORDER_NB,
+    mirror_tasks,
+    sort_orders,
+)
+
+# The filterings, selected by the optional last parameter of the cumulative propagators:
+CUMULATIVE_FILTERING_TIMETABLE = 0  # sweep timetabling, O(n log n)
+CUMULATIVE_FILTERING_TTEF = 1  # sweep timetabling and timetable edge finding, O(n^2)
+CUMULATIVE_FILTERING_ENERGETIC = 2  # sweep timetabling and energetic reasoning, O(n^3), the default
+
+
+def get_filtering(n: int, parameters: NDArray) -> int:
+    """
+    Returns the filtering of a cumulative propagator.
+
+    :param n: the number of the other parameters, the filtering being the next one when present
+    :type n: int
+    :param parameters: the parameters
+    :type parameters: NDArray
+
+    :return: the filtering, CUMULATIVE_FILTERING_ENERGETIC when not given
+    :rtype: int
+    """
+    return int(parameters[n]) if len(parameters) > n else CUMULATIVE_FILTERING_ENERGETIC
+
+
+def get_filtering_complexity(n: int, filtering: int) -> int:
+    """
+    Returns the time complexity of a filtering of a cumulative propagator as an int.
+
+    :param n: the number of tasks
+    :type n: int
+    :param filtering: the filtering
+    :type filtering: int
+
+    :return: an int
+    :rtype: int
+    """
+    if filtering == CUMULATIVE_FILTERING_TIMETABLE:
+        return int(n * math.log(n)) if n > 1 else 1
+    if filtering == CUMULATIVE_FILTERING_TTEF:
+        return n * n
+    return n * n * n
 
 
 def get_complexity_cumulative(n: int, parameters: NDArray) -> int:
@@ -23,13 +73,29 @@ def get_complexity_cumulative(n: int, parameters: NDArray) -> int:
 
     :param n: the number of variables
     :type n: int
-    :param parameters: the parameters, unused here
+    :param parameters: the parameters, the filtering being the last one when present
     :type parameters: NDArray
 
     :return: an int
     :rtype: int
     """
-    return n * n * n
+    return get_filtering_complexity(n, get_filtering(2 * n + 1, parameters))
+
+
+def get_state_size_cumulative(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: a warm flag, the orders of the tasks at the previous call, then the scratch
+    arrays of the filtering.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return 1 + ORDER_NB * n + 21 * n
 
 
 @njit(cache=True)
@@ -51,20 +117,119 @@ def get_triggers_cumulative(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def _filter_est(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int, capacity: int) -> bool:
+def _build_profile(
+    est: NDArray,
+    lct: NDArray,
+    p: NDArray,
+    h: NDArray,
+    n: int,
+    capacity: int,
+    orders: NDArray,
+    seg_start: NDArray,
+    seg_height: NDArray,
+) -> int:
+    """
+    Builds the resource profile, the sum of the compulsory parts, in one sweep over the starts and the ends of the
+    compulsory parts.
+
+    The compulsory part of a task is the interval ``[lst, ect)`` it must occupy whatever its start; over that
+    interval it consumes ``h`` units. The profile is a sequence of segments: segment ``s`` spans
+    ``[seg_start[s], seg_start[s + 1])`` at height ``seg_height[s]``, the height being 0 before the first segment
+    and in the last one. A segment starts at each distinct bound of a compulsory part, so that a segment is either
+    inside or outside the compulsory part of a task.
+
+    :param est: the earliest start times
+    :type est: NDArray
+    :param lct: the latest completion times
+    :type lct: NDArray
+    :param p: the durations
+    :type p: NDArray
+    :param h: the resource demands (heights)
+    :type h: NDArray
+    :param n: the number of tasks
+    :type n: int
+    :param capacity: the resource capacity
+    :type capacity: int
+    :param orders: the (ORDER_NB, n) orders of the tasks
+    :type orders: NDArray
+    :param seg_start: the starts of the segments, of size 2 * n, modified in place
+    :type seg_start: NDArray
+    :param seg_height: the heights of the segments, of size 2 * n, modified in place
+    :type seg_height: NDArray
+
+    :return: the number of segments, -1 when the profile exceeds the capacity
+    :rtype: int
+    """
+    lst_order = orders[ORDER_IDX_LST]
+    ect_order = orders[ORDER_IDX_ECT]
+    start_rank = 0
+    end_rank = 0
+    height = 0
+    seg_nb = 0
+    while True:
+        # the next start and the next end of a compulsory part
+        while start_rank < n:
+            i = lst_order[start_rank]
+            if p[i] > 0 and h[i] > 0 and lct[i] - p[i] < est[i] + p[i]:
+                break
+            start_rank += 1
+        while end_rank < n:
+            i = ect_order[end_rank]
+            if p[i] > 0 and h[i] > 0 and lct[i] - p[i] < est[i] + p[i]:
+                break
+            end_rank += 1
+        if end_rank == n:
+            return seg_nb  # every compulsory part has ended, hence also started
+        i = ect_order[end_rank]
+        time = est[i] + p[i]
+        if start_rank < n:
+            i = lst_order[start_rank]
+            time = min(time, lct[i] - p[i])
+        # all the compulsory parts starting or ending at this time
+        while start_rank < n:
+            i = lst_order[start_rank]
+            if p[i] > 0 and h[i] > 0 and lct[i] - p[i] < est[i] + p[i]:
+                if lct[i] - p[i] != time:
+                    break
+                height += h[i]
+            start_rank += 1
+        while end_rank < n:
+            i = ect_order[end_rank]
+            if p[i] > 0 and h[i] > 0 and lct[i] - p[i] < est[i] + p[i]:
+                if est[i] + p[i] != time:
+                    break
+                height -= h[i]
+            end_rank += 1
+        if height > capacity:
+            return -1  # overload
+        seg_start[seg_nb] = time
+        seg_height[seg_nb] = height
+        seg_nb += 1
+
+
+@njit(cache=True)
+def _filter_timetable(
+    est: NDArray,
+    lct: NDArray,
+    p: NDArray,
+    h: NDArray,
+    n: int,
+    capacity: int,
+    seg_start: NDArray,
+    seg_height: NDArray,
+    seg_nb: int,
+) -> None:
     """
     Raises the earliest start times by timetabling on a cumulative resource.
 
-    The compulsory part of a task is the interval ``[lst, est + p)`` it must occupy whatever its start; over
-    that interval it consumes ``h`` units. The sum of the compulsory parts is the resource profile. If the
-    profile ever exceeds the capacity the resource is overloaded. Otherwise a task may not overlap any instant
-    where the profile of the *other* tasks would leave less than its own height free, so its earliest start is
-    pushed past every such forbidden region.
+    A task may not overlap any segment of the profile where the *other* tasks would leave less than its own height
+    free, so its earliest start is pushed past every such segment. The first segment a task may overlap is found by
+    a binary search, then the segments are swept while they intersect the placement window of the task.
 
     :param est: the earliest start times, raised in place
     :type est: NDArray
-    :param lst: the latest start times
-    :type lst: NDArray
+    :param lct: the latest completion times
+    :type lct: NDArray
     :param p: the durations
     :type p: NDArray
     :param h: the resource demands (heights)
@@ -73,66 +238,155 @@ def _filter_est(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int, capa
     :type n: int
     :param capacity: the resource capacity
     :type capacity: int
-
-    :return: False when the resource is overloaded (inconsistent), True otherwise
-    :rtype: bool
+    :param seg_start: the starts of the segments of the profile
+    :type seg_start: NDArray
+    :param seg_height: the heights of the segments of the profile
+    :type seg_height: NDArray
+    :param seg_nb: the number of segments
+    :type seg_nb: int
     """
-    # collect the boundaries of the non-empty compulsory parts
-    bounds = np.empty(2 * n, dtype=np.int64)
-    bound_nb = 0
-    for i in range(n):
-        ect = est[i] + p[i]
-        if p[i] > 0 and h[i] > 0 and lst[i] < ect:  # task i has a compulsory part [lst, ect)
-            bounds[bound_nb] = lst[i]
-            bounds[bound_nb + 1] = ect
-            bound_nb += 2
-    if bound_nb == 0:
-        return True  # no compulsory part: nothing forces the profile, nothing to filter
-    sorted_bounds = np.sort(bounds[:bound_nb])
-    # the distinct boundaries delimit the profile segments [seg_start, seg_end)
-    seg_start = np.empty(bound_nb, dtype=np.int64)
-    seg_end = np.empty(bound_nb, dtype=np.int64)
-    seg_nb = 0
-    for idx in range(1, bound_nb):
-        if sorted_bounds[idx] != sorted_bounds[idx - 1]:
-            seg_start[seg_nb] = sorted_bounds[idx - 1]
-            seg_end[seg_nb] = sorted_bounds[idx]
-            seg_nb += 1
-    # the profile height of each segment (sum of the demands of the tasks whose compulsory part covers it)
-    seg_height = np.zeros(seg_nb, dtype=np.int64)
-    for s in range(seg_nb):
-        a = seg_start[s]
-        b = seg_end[s]
-        total = 0
-        for j in range(n):
-            if p[j] > 0 and h[j] > 0 and lst[j] <= a and est[j] + p[j] >= b:  # cp of j covers [a, b)
-                total += h[j]
-        if total > capacity:
-            return False  # overload
-        seg_height[s] = total
-    # push each task past the regions where it would not fit alongside the others' profile
+    if seg_nb == 0:
+        return  # no compulsory part: nothing forces the profile, nothing to filter
     for i in range(n):
         if h[i] == 0 or p[i] == 0:
             continue
+        lst = lct[i] - p[i]
         ect = est[i] + p[i]
-        i_has_cp = lst[i] < ect
         tau = est[i]
-        for s in range(seg_nb):
-            if seg_end[s] <= tau:
-                continue
-            if seg_start[s] >= tau + p[i]:  # the segment starts after the placement window, none left
-                break
-            height_without_i = seg_height[s]
-            if i_has_cp and lst[i] <= seg_start[s] and ect >= seg_end[s]:  # this segment includes i itself
-                height_without_i -= h[i]
-            if height_without_i > capacity - h[i]:  # task i cannot overlap this segment
-                tau = seg_end[s]
+        # the last segment starting by tau
+        low = 0
+        high = seg_nb
+        while low < high:
+            middle = (low + high) >> 1
+            if seg_start[middle] <= tau:
+                low = middle + 1
+            else:
+                high = middle
+        s = max(low - 1, 0)
+        # the last segment has a height of 0, so that tau never goes past it
+        while s < seg_nb - 1 and seg_start[s] < tau + p[i]:
+            seg_end = seg_start[s + 1]
+            if seg_end > tau:
+                height_without_i = seg_height[s]
+                if lst <= seg_start[s] and seg_end <= ect:  # this segment includes the compulsory part of i
+                    height_without_i -= h[i]
+                if height_without_i > capacity - h[i]:  # task i cannot overlap this segment
+                    tau = seg_end
+            s += 1
         est[i] = tau
+
+
+@njit(cache=True)
+def _filter_ttef(
+    est: NDArray,
+    lct: NDArray,
+    p: NDArray,
+    h: NDArray,
+    n: int,
+    capacity: int,
+    orders: NDArray,
+    seg_start: NDArray,
+    seg_height: NDArray,
+    seg_nb: int,
+    energies: NDArray,
+    new_est: NDArray,
+) -> bool:
+    """
+    Checks the overload and raises the earliest start times by timetable edge finding on a cumulative resource
+    (Vilím, 2011; Schutt, Feydy and Stuckey, 2013).
+
+    The energy of a task is split into its compulsory part, counted by the profile, and its free part. Over a
+    window ``[begin, end)``, ``begin`` being an earliest start and ``end`` a latest completion time, the tasks
+    inside the window must spend their free energy and the profile its energy: if these exceed
+    ``capacity * (end - begin)`` the resource is overloaded. Otherwise, if a task starting in the window and
+    ending after it would, left-shifted, need more than the energy left, its earliest start is raised so that it
+    only needs the energy left. For a window end, the windows are swept by decreasing begin, the tasks inside and
+    the task with the largest need being maintained incrementally: a call costs O(n^2).
+
+    :param est: the earliest start times, raised in place
+    :type est: NDArray
+    :param lct: the latest completion times
+    :type lct: NDArray
+    :param p: the durations
+    :type p: NDArray
+    :param h: the resource demands (heights)
+    :type h: NDArray
+    :param n: the number of tasks
+    :type n: int
+    :param capacity: the resource capacity
+    :type capacity: int
+    :param orders: the (ORDER_NB, n) orders of the tasks
+    :type orders: NDArray
+    :param seg_start: the starts of the segments of the profile
+    :type seg_start: NDArray
+    :param seg_height: the heights of the segments of the profile
+    :type seg_height: NDArray
+    :param seg_nb: the number of segments
+    :type seg_nb: int
+    :param energies: a scratch array of size 4 * n, receiving the energies of the profile before the earliest
+                     start times and before the latest completion times, as int64 on two cells
+    :type energies: NDArray
+    :param new_est: a scratch array of size n
+    :type new_est: NDArray
+
+    :return: False when the resource is overloaded (inconsistent), True otherwise
+    :rtype: bool
+    """
+    est_order = orders[ORDER_IDX_EST]
+    lct_order = orders[ORDER_IDX_LCT]
+    # the energies of the profile before the earliest start times then before the latest completion times
+    for bound in range(2):
+        order = est_order if bound == 0 else lct_order
+        s = -1  # the last segment starting by the current time
+        energy = 0  # the energy of the profile before the start of segment s
+        for rank in range(n):
+            i = order[rank]
+            time = est[i] if bound == 0 else lct[i]
+            while s + 1 < seg_nb and seg_start[s + 1] <= time:
+                if s >= 0:
+                    energy += seg_height[s] * (seg_start[s + 1] - seg_start[s])
+                s += 1
+            set_int64(energies, 2 * (bound * n + i), energy + (seg_height[s] * (time - seg_start[s]) if s >= 0 else 0))
+    for i in range(n):
+        new_est[i] = est[i]
+    for end_rank in range(n - 1, -1, -1):
+        b = lct_order[end_rank]
+        end = lct[b]
+        if end_rank > 0 and lct[lct_order[end_rank - 1]] == end:
+            continue  # the window ends are distinct, the window is processed with the first task ending there
+        free_energy = 0  # the free energy of the tasks inside the window
+        u = -1  # the task starting in the window and ending after it with the largest need of free energy
+        u_energy = 0
+        for begin_rank in range(n - 1, -1, -1):
+            a = est_order[begin_rank]
+            begin = est[a]
+            if begin >= end:
+                continue
+            free_p = p[a] - max(0, est[a] + 2 * p[a] - lct[a])  # the duration of the task out of its compulsory part
+            if lct[a] <= end:
+                free_energy += h[a] * free_p
+            elif h[a] * min(end - begin, free_p) > u_energy:
+                u = a
+                u_energy = h[a] * min(end - begin, free_p)
+            if begin_rank > 0 and est[est_order[begin_rank - 1]] == begin:
+                continue  # the other tasks starting at begin are in the window too
+            profile_energy = get_int64(energies, 2 * (n + b)) - get_int64(energies, 2 * a)
+            available = capacity * (end - begin) - free_energy - profile_energy
+            if available < 0:
+                return False  # overload
+            if available < u_energy:
+                # the energy left for u, whose compulsory part in the window is counted by the profile
+                compulsory_energy = h[u] * max(0, min(end, est[u] + p[u]) - max(begin, lct[u] - p[u]))
+                new_est[u] = max(new_est[u], end - (available + compulsory_energy) // h[u])
+    for i in range(n):
+        est[i] = new_est[i]
     return True
 
 
 @njit(cache=True)
-def _filter_energetic(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int, capacity: int) -> bool:
+def _filter_energetic(
+    est: NDArray, lct: NDArray, p: NDArray, h: NDArray, n: int, capacity: int, scratch: NDArray
+) -> bool:
     """
     Filters both start bounds by energetic reasoning on a cumulative resource.
 
@@ -150,8 +404,8 @@ def _filter_energetic(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int
 
     :param est: the earliest start times, raised in place
     :type est: NDArray
-    :param lst: the latest start times, lowered in place
-    :type lst: NDArray
+    :param lct: the latest completion times, lowered in place
+    :type lct: NDArray
     :param p: the durations
     :type p: NDArray
     :param h: the resource demands (heights)
@@ -160,23 +414,28 @@ def _filter_energetic(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int
     :type n: int
     :param capacity: the resource capacity
     :type capacity: int
+    :param scratch: a scratch array of size 8 * n
+    :type scratch: NDArray
 
     :return: False when an interval is overloaded (inconsistent), True otherwise
     :rtype: bool
     """
-    lefts = np.empty(3 * n, dtype=np.int64)
-    rights = np.empty(3 * n, dtype=np.int64)
+    lefts = scratch[: 3 * n]
+    rights = scratch[3 * n : 6 * n]
+    new_est = scratch[6 * n : 7 * n]
+    new_lst = scratch[7 * n : 8 * n]
     for i in range(n):
+        lst = lct[i] - p[i]
         lefts[3 * i] = est[i]
-        lefts[3 * i + 1] = lst[i]
+        lefts[3 * i + 1] = lst
         lefts[3 * i + 2] = est[i] + p[i]
         rights[3 * i] = est[i] + p[i]
-        rights[3 * i + 1] = lst[i] + p[i]
-        rights[3 * i + 2] = lst[i]
-    lefts = np.sort(lefts)
-    rights = np.sort(rights)
-    new_est = est.copy()
-    new_lst = lst.copy()
+        rights[3 * i + 1] = lct[i]
+        rights[3 * i + 2] = lst
+        new_est[i] = est[i]
+        new_lst[i] = lst
+    lefts.sort()
+    rights.sort()
     for li in range(3 * n):
         if li > 0 and lefts[li] == lefts[li - 1]:
             continue
@@ -197,7 +456,7 @@ def _filter_energetic(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int
                     work = min(work, p[j])
                     left = est[j] + p[j] - t1
                     work = min(work, left)
-                    right = t2 - lst[j]
+                    right = t2 - (lct[j] - p[j])
                     work = min(work, right)
                     if work > 0:
                         energy += h[j] * work
@@ -206,11 +465,12 @@ def _filter_energetic(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int
             for i in range(n):
                 if h[i] == 0 or p[i] == 0:
                     continue
+                lst = lct[i] - p[i]
                 work_i = length
                 work_i = min(work_i, p[i])
                 left = est[i] + p[i] - t1
                 work_i = min(work_i, left)
-                right = t2 - lst[i]
+                right = t2 - lst
                 work_i = min(work_i, right)
                 work_i = max(work_i, 0)
                 avail = cap_energy - (energy - h[i] * work_i)  # energy this interval leaves for task i
@@ -223,31 +483,36 @@ def _filter_energetic(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int
                     raised = t2 - slack
                     new_est[i] = max(new_est[i], raised)
                 # lower the latest start if task i, right-shifted, would not fit
-                right_intersection = min(lst[i] + p[i], t2) - max(lst[i], t1)
+                right_intersection = min(lct[i], t2) - max(lst, t1)
                 if right_intersection > 0 and h[i] * right_intersection > avail:
                     lowered = t1 + slack - p[i]
                     new_lst[i] = min(new_lst[i], lowered)
     for i in range(n):
         est[i] = new_est[i]
-        lst[i] = new_lst[i]
+        lct[i] = new_lst[i] + p[i]
     return True
 
 
 @njit(cache=True)
-def _filter_starts(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int, capacity: int) -> bool:
+def _filter_starts(
+    est: NDArray, lct: NDArray, p: NDArray, h: NDArray, n: int, capacity: int, filtering: int, state: NDArray
+) -> bool:
     """
-    Runs timetabling and energetic reasoning on the start bounds until a full sweep changes nothing.
+    Runs timetabling, then timetable edge finding or energetic reasoning, on the start bounds until a full sweep
+    changes nothing.
 
     Timetabling raises starts so that no task overlaps an instant already saturated by the other tasks'
-    compulsory parts (and lowers latest starts by mirroring time); energetic reasoning then, over a quadratic
-    set of intervals, compares each task's minimum mandatory energy against the capacity. Neither rule is
-    idempotent, so the block is iterated to its own fixpoint; each changing sweep tightens at least one bound by
-    >= 1 so it terminates in at most the total initial domain width.
+    compulsory parts (and lowers latest starts by mirroring time); timetable edge finding then compares the free
+    energy of the tasks inside a window, plus the energy of the profile, against the capacity, or energetic
+    reasoning, over a quadratic set of intervals, compares each task's minimum mandatory energy against the
+    capacity. The rules share the orders of the tasks, kept sorted from a rule to the next and from a call to the
+    next. Neither rule is idempotent, so the block is iterated to its own fixpoint; each changing sweep tightens
+    at least one bound by >= 1 so it terminates in at most the total initial domain width.
 
     :param est: the earliest start times, raised in place
     :type est: NDArray
-    :param lst: the latest start times, lowered in place
-    :type lst: NDArray
+    :param lct: the latest completion times, lowered in place
+    :type lct: NDArray
     :param p: the durations (for a variable-duration task, its minimum, which is sound for the compulsory part)
     :type p: NDArray
     :param h: the resource demands (heights)
@@ -256,59 +521,103 @@ def _filter_starts(est: NDArray, lst: NDArray, p: NDArray, h: NDArray, n: int, c
     :type n: int
     :param capacity: the resource capacity
     :type capacity: int
+    :param filtering: the filtering, see CUMULATIVE_FILTERING_TIMETABLE
+    :type filtering: int
+    :param state: the state of the propagator, see get_state_size_cumulative; its first 4 * n cells after the
+                  orders hold est, lct, p and h
+    :type state: NDArray
 
     :return: False when the resource is overloaded (inconsistent), True otherwise
     :rtype: bool
     """
-    mest = np.empty(n, dtype=np.int64)
-    mlst = np.empty(n, dtype=np.int64)
-    prev_est = np.empty(n, dtype=np.int64)
-    prev_lst = np.empty(n, dtype=np.int64)
+    # the state holds the warm flag, the orders of the previous call, then all the scratch arrays
+    warm = state[0] != 0
+    state[0] = 1
+    orders = state[1 : 1 + ORDER_NB * n].reshape(ORDER_NB, n)
+    scratch = state[1 + ORDER_NB * n + 4 * n :]
+    mest = scratch[:n]
+    mlct = scratch[n : 2 * n]
+    prev_est = scratch[2 * n : 3 * n]
+    prev_lct = scratch[3 * n : 4 * n]
+    morders = scratch[4 * n : (4 + ORDER_NB) * n].reshape(ORDER_NB, n)
+    # the rules run one after the other, they share the rest of the scratch
+    work = scratch[(4 + ORDER_NB) * n :]
+    seg_start = work[: 2 * n]
+    seg_height = work[2 * n : 4 * n]
+    energies = work[4 * n : 8 * n]
+    new_est = work[8 * n : 9 * n]
+    sort_orders(est, lct, p, n, orders, warm)
     has_changed = True
     while has_changed:
         for i in range(n):
             prev_est[i] = est[i]
-            prev_lst[i] = lst[i]
+            prev_lct[i] = lct[i]
         # raise earliest start times
-        if not _filter_est(est, lst, p, h, n, capacity):
+        seg_nb = _build_profile(est, lct, p, h, n, capacity, orders, seg_start, seg_height)
+        if seg_nb < 0:
             return False
-        # lower latest start times by mirroring time (a start s maps to -(s + p)) and reusing the filter
-        for i in range(n):
-            mest[i] = -(lst[i] + p[i])
-            mlst[i] = -(est[i] + p[i])
-        if not _filter_est(mest, mlst, p, h, n, capacity):
+        _filter_timetable(est, lct, p, h, n, capacity, seg_start, seg_height, seg_nb)
+        sort_orders(est, lct, p, n, orders, True)
+        # lower latest completion times by mirroring time (est' = -lct, lct' = -est) and reusing the filter
+        mirror_tasks(est, lct, orders, mest, mlct, morders, n)
+        seg_nb = _build_profile(mest, mlct, p, h, n, capacity, morders, seg_start, seg_height)
+        if seg_nb < 0:
             return False
+        _filter_timetable(mest, mlct, p, h, n, capacity, seg_start, seg_height, seg_nb)
         for i in range(n):
-            lst[i] = -mest[i] - p[i]
-        # energetic reasoning: stronger interval-based filtering of both bounds
-        if not _filter_energetic(est, lst, p, h, n, capacity):
-            return False
+            lct[i] = -mest[i]
+        sort_orders(est, lct, p, n, orders, True)
+        if filtering == CUMULATIVE_FILTERING_TTEF:
+            seg_nb = _build_profile(est, lct, p, h, n, capacity, orders, seg_start, seg_height)
+            if seg_nb < 0 or not _filter_ttef(
+                est, lct, p, h, n, capacity, orders, seg_start, seg_height, seg_nb, energies, new_est
+            ):
+                return False
+            sort_orders(est, lct, p, n, orders, True)
+            mirror_tasks(est, lct, orders, mest, mlct, morders, n)
+            seg_nb = _build_profile(mest, mlct, p, h, n, capacity, morders, seg_start, seg_height)
+            if seg_nb < 0 or not _filter_ttef(
+                mest, mlct, p, h, n, capacity, morders, seg_start, seg_height, seg_nb, energies, new_est
+            ):
+                return False
+            for i in range(n):
+                lct[i] = -mest[i]
+            sort_orders(est, lct, p, n, orders, True)
+        elif filtering == CUMULATIVE_FILTERING_ENERGETIC:
+            # energetic reasoning: stronger interval-based filtering of both bounds
+            if not _filter_energetic(est, lct, p, h, n, capacity, work):
+                return False
+            sort_orders(est, lct, p, n, orders, True)
         has_changed = False
         for i in range(n):
-            if est[i] > lst[i]:  # the start window has emptied
+            if est[i] + p[i] > lct[i]:  # the start window has emptied
                 return False
-            if est[i] != prev_est[i] or lst[i] != prev_lst[i]:
+            if est[i] != prev_est[i] or lct[i] != prev_lct[i]:
                 has_changed = True
     return True
 
 
 @njit(cache=True)
-def compute_domains_cumulative(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_cumulative(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements the cumulative constraint: tasks with start times ``domains`` run for constant durations and
     consume constant amounts of a resource of fixed capacity; at no instant may the total consumption of the
     tasks in progress exceed the capacity.
 
-    Filtering combines timetabling and energetic reasoning (see :func:`_filter_starts`). Both rules are
-    incomplete, so the propagator may stay consistent on an infeasible instance -- that is sound.
+    Filtering combines sweep timetabling and, depending on the filtering, timetable edge finding or energetic
+    reasoning (see :func:`_filter_starts`). These rules are incomplete, so the propagator may stay consistent on
+    an infeasible instance -- that is sound.
 
-    The parameters pack, in order, the ``n`` durations, then the ``n`` demands (heights), then the capacity:
-    ``parameters = [p_0, ..., p_{n-1}, h_0, ..., h_{n-1}, capacity]``.
+    The parameters pack, in order, the ``n`` durations, then the ``n`` demands (heights), then the capacity, then
+    optionally the filtering (CUMULATIVE_FILTERING_TIMETABLE, CUMULATIVE_FILTERING_TTEF or, by default,
+    CUMULATIVE_FILTERING_ENERGETIC): ``parameters = [p_0, ..., p_{n-1}, h_0, ..., h_{n-1}, capacity, filtering]``.
 
     :param domains: the domains of the start-time variables, one per task
     :type domains: NDArray
-    :param parameters: the durations, the demands and the capacity, as described above
+    :param parameters: the durations, the demands, the capacity and the filtering, as described above
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_cumulative
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -317,23 +626,25 @@ def compute_domains_cumulative(domains: NDArray, parameters: NDArray) -> int:
     if n == 0:
         return PROP_ENTAILMENT
     capacity = parameters[2 * n]
-    est = np.empty(n, dtype=np.int64)
-    lst = np.empty(n, dtype=np.int64)
-    p = np.empty(n, dtype=np.int64)
-    h = np.empty(n, dtype=np.int64)
+    filtering = parameters[2 * n + 1] if len(parameters) > 2 * n + 1 else CUMULATIVE_FILTERING_ENERGETIC
+    tasks = state[1 + ORDER_NB * n : 1 + (ORDER_NB + 4) * n]
+    est = tasks[:n]
+    lct = tasks[n : 2 * n]
+    p = tasks[2 * n : 3 * n]
+    h = tasks[3 * n : 4 * n]
     for i in range(n):
         est[i] = domains[i, MIN]
-        lst[i] = domains[i, MAX]
         p[i] = parameters[i]
+        lct[i] = domains[i, MAX] + p[i]
         h[i] = parameters[n + i]
         if h[i] > capacity and p[i] > 0:
             return PROP_INCONSISTENCY  # a single task already exceeds the capacity
-    if not _filter_starts(est, lst, p, h, n, capacity):
+    if not _filter_starts(est, lct, p, h, n, capacity, filtering, state):
         return PROP_INCONSISTENCY
     ground_nb = 0
     for i in range(n):
         domains[i, MIN] = max(domains[i, MIN], est[i])
-        domains[i, MAX] = min(domains[i, MAX], lst[i])
+        domains[i, MAX] = min(domains[i, MAX], lct[i] - p[i])
         if domains[i, MIN] > domains[i, MAX]:
             return PROP_INCONSISTENCY
         if domains[i, MIN] == domains[i, MAX]:
@@ -350,14 +661,29 @@ def get_complexity_cumulative_var(n: int, parameters: NDArray) -> int:
 
     :param n: the number of variables (starts and durations)
     :type n: int
-    :param parameters: the parameters, unused here
+    :param parameters: the parameters, the filtering being the last one when present
     :type parameters: NDArray
 
     :return: an int
     :rtype: int
     """
     tasks = n // 2
-    return tasks * tasks * tasks
+    return get_filtering_complexity(tasks, get_filtering(tasks + 1, parameters))
+
+
+def get_state_size_cumulative_var(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state, which holds the scratch arrays of the filtering.
+
+    :param n: the number of variables (starts and durations)
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return get_state_size_cumulative(n // 2, parameters)
 
 
 @njit(cache=True)
@@ -380,20 +706,23 @@ def get_triggers_cumulative_var(n: int, variable: int, parameters: NDArray) -> i
 
 
 @njit(cache=True)
-def compute_domains_cumulative_var(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_cumulative_var(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements the cumulative constraint with variable durations and constant demands and capacity.
 
     The first ``n`` domains are the start-time variables and the next ``n`` are the duration variables;
-    ``parameters = [h_0, ..., h_{n-1}, capacity]``. The compulsory-part and energetic reasoning use each task's
-    minimum duration, which is sound (a task is guaranteed to run at least that long), and only the start bounds
-    are filtered. When every start and every duration is fixed the minimum duration equals the real one, so a
-    ground assignment is checked exactly.
+    ``parameters = [h_0, ..., h_{n-1}, capacity, filtering]``, the filtering being optional as for the cumulative
+    propagator. The compulsory-part, edge-finding and energetic reasoning use each task's minimum duration, which
+    is sound (a task is guaranteed to run at least that long), and only the start bounds are filtered. When every
+    start and every duration is fixed the minimum duration equals the real one, so a ground assignment is checked
+    exactly.
 
     :param domains: the domains of the start variables then the duration variables
     :type domains: NDArray
-    :param parameters: the demands then the capacity
+    :param parameters: the demands, the capacity and the filtering
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_cumulative_var
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -402,22 +731,24 @@ def compute_domains_cumulative_var(domains: NDArray, parameters: NDArray) -> int
     if n == 0:
         return PROP_ENTAILMENT
     capacity = parameters[n]
-    est = np.empty(n, dtype=np.int64)
-    lst = np.empty(n, dtype=np.int64)
-    p = np.empty(n, dtype=np.int64)
-    h = np.empty(n, dtype=np.int64)
+    filtering = parameters[n + 1] if len(parameters) > n + 1 else CUMULATIVE_FILTERING_ENERGETIC
+    tasks = state[1 + ORDER_NB * n : 1 + (ORDER_NB + 4) * n]
+    est = tasks[:n]
+    lct = tasks[n : 2 * n]
+    p = tasks[2 * n : 3 * n]
+    h = tasks[3 * n : 4 * n]
     for i in range(n):
         est[i] = domains[i, MIN]
-        lst[i] = domains[i, MAX]
         p[i] = domains[n + i, MIN]  # the minimum duration: a sound lower bound on the compulsory part
+        lct[i] = domains[i, MAX] + p[i]
         h[i] = parameters[i]
         if h[i] > capacity and p[i] > 0:
             return PROP_INCONSISTENCY  # a single task already exceeds the capacity
-    if not _filter_starts(est, lst, p, h, n, capacity):
+    if not _filter_starts(est, lct, p, h, n, capacity, filtering, state):
         return PROP_INCONSISTENCY
     for i in range(n):
         domains[i, MIN] = max(domains[i, MIN], est[i])
-        domains[i, MAX] = min(domains[i, MAX], lst[i])
+        domains[i, MAX] = min(domains[i, MAX], lct[i] - p[i])
         if domains[i, MIN] > domains[i, MAX]:
             return PROP_INCONSISTENCY
     ground_nb = 0
@@ -0,0 +1,167 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import DELTA_HEADER_NB, DELTA_IDX_NB, DELTA_IDX_WARM, DELTA_MIN_ARITY, MAX, MIN
+
+# An incremental propagator is given, in its state, the positions of its variables whose domains changed since its
+# previous call. Its state is laid out as:
+# - the delta header (see DELTA_HEADER_NB), maintained by the consistency algorithm,
+# - the changed positions, at most n,
+# - a snapshot of the n domains as they were at the previous call,
+# - the cache of the propagator, the aggregates it derives from the snapshot.
+# During a call of the consistency algorithm, the changes are appended to the delta as they are made. The domains
+# also change between two calls (decisions, backtracks, restarts): the delta is then rebuilt by comparing the domains
+# with the snapshot, so that the cache, which only depends on the snapshot, is sound from any node. Since a domain can
+# grow back, the cache must handle changes in both directions.
+# Below DELTA_MIN_ARITY, the state is empty and the propagator rescans its domains at each call.
+
+
+def get_state_size_delta(n: int, cache_size: int) -> int:
+    """
+    Returns the size of the state of an incremental propagator, 0 below DELTA_MIN_ARITY.
+
+    :param n: the number of variables
+    :type n: int
+    :param cache_size: the size of the cache of the propagator
+    :type cache_size: int
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return 0 if n < DELTA_MIN_ARITY else DELTA_HEADER_NB + 3 * n + cache_size
+
+
+@njit(cache=True, inline="always")
+def get_delta_regions(state: NDArray, n: int) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    Returns the changed positions, the snapshot and the cache of the state of an incremental propagator.
+
+    :param state: the state of the propagator
+    :type state: NDArray
+    :param n: the number of variables
+    :type n: int
+
+    :return: the positions, the (n, 2) snapshot and the cache
+    :rtype: Tuple[NDArray, NDArray, NDArray]
+    """
+    positions = state[DELTA_HEADER_NB : DELTA_HEADER_NB + n]
+    snapshot = state[DELTA_HEADER_NB + n : DELTA_HEADER_NB + 3 * n].reshape(n, 2)
+    cache = state[DELTA_HEADER_NB + 3 * n :]
+    return positions, snapshot, cache
+
+
+@njit(cache=True, inline="always")
+def is_warm(state: NDArray) -> bool:
+    """
+    Returns whether the snapshot and the cache are valid, the delta then holding the changed positions.
+
+    :param state: the state of the propagator
+    :type state: NDArray
+
+    :return: true iff only the positions of the delta need to be processed
+    :rtype: bool
+    """
+    return len(state) != 0 and state[DELTA_IDX_WARM] != 0
+
+
+@njit(cache=True, inline="always")
+def get_delta_nb(state: NDArray) -> int:
+    """
+    Returns the number of changed positions.
+
+    :param state: the state of the propagator
+    :type state: NDArray
+
+    :return: the number of changed positions
+    :rtype: int
+    """
+    return state[DELTA_IDX_NB]
+
+
+@njit(cache=True, inline="always")
+def append_delta(states: NDArray, state_start: int, n: int, position: int) -> None:
+    """
+    Records that the domain at a position has changed; when there are more than n changes (a position can be
+    recorded several times), the delta is marked as overflowed and will be rebuilt from the snapshot.
+
+    :param states: the states of the propagators, or the state of the propagator
+    :type states: NDArray
+    :param state_start: the start of the state of the propagator in states
+    :type state_start: int
+    :param n: the number of variables
+    :type n: int
+    :param position: the position of the variable in the propagator
+    :type position: int
+    """
+    if states[state_start + DELTA_IDX_WARM] != 0:
+        delta_nb = states[state_start + DELTA_IDX_NB]
+        if delta_nb < n:
+            states[state_start + DELTA_HEADER_NB + delta_nb] = position
+            states[state_start + DELTA_IDX_NB] = delta_nb + 1
+        else:
+            states[state_start + DELTA_IDX_NB] = n + 1
+
+
+@njit(cache=True)
+def rebuild_delta(state: NDArray, domains: NDArray) -> None:
+    """
+    Rebuilds the delta by comparing the domains with the snapshot.
+
+    :param state: the state of the propagator
+    :type state: NDArray
+    :param domains: the domains of the variables of the propagator
+    :type domains: NDArray
+    """
+    positions, snapshot, _ = get_delta_regions(state, len(domains))
+    delta_nb = 0
+    for i in range(len(domains)):
+        if domains[i, MIN] != snapshot[i, MIN] or domains[i, MAX] != snapshot[i, MAX]:
+            positions[delta_nb] = i
+            delta_nb += 1
+    state[DELTA_IDX_NB] = delta_nb
+
+
+@njit(cache=True, inline="always")
+def get_int64(array: NDArray, idx: int) -> int:
+    """
+    Reads an int64 stored in two consecutive int32 cells.
+
+    :param array: an int32 array
+    :type array: NDArray
+    :param idx: the index of the low half
+    :type idx: int
+
+    :return: the value
+    :rtype: int
+    """
+    return (int(array[idx + 1]) << 32) + int(array[idx])
+
+
+@njit(cache=True, inline="always")
+def set_int64(array: NDArray, idx: int, value: int) -> None:
+    """
+    Writes an int64 into two consecutive int32 cells.
+
+    :param array: an int32 array
+    :type array: NDArray
+    :param idx: the index of the low half
+    :type idx: int
+    :param value: the value
+    :type value: int
+    """
+    value = int(value)
+    low = ((value + (1 << 31)) & 0xFFFFFFFF) - (1 << 31)  # the low 32 bits as a signed int
+    array[idx] = low
+    array[idx + 1] = (value - low) >> 32
@@ -15,6 +15,9 @@ from numpy.typing import NDArray
 
 from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
 
+# below this number of rectangles, the pairwise filtering is cheaper than the sweep
+DIFFN_SWEEP_MIN_N = 80
+
 
 def get_complexity_diffn(n: int, parameters: NDArray) -> int:
     """
@@ -31,6 +34,21 @@ def get_complexity_diffn(n: int, parameters: NDArray) -> int:
     return n * n
 
 
+def get_state_size_diffn(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state, which holds the forbidden regions of the sweep.
+
+    :param n: the number of variables (twice the number of rectangles)
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return 4 * (n // 2)
+
+
 @njit(cache=True)
 def get_triggers_diffn(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -50,26 +68,22 @@ def get_triggers_diffn(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_diffn(domains: NDArray, parameters: NDArray) -> int:
+def _filter_pairwise(domains: NDArray, parameters: NDArray, n: int) -> bool:
     """
-    Implements the 2D diffn (non-overlapping rectangles) constraint. Rectangle i has its bottom-left corner
-    at ``(x_i, y_i)`` and constant size ``(dx_i, dy_i)``; no two rectangles overlap, i.e. for all i != j at
-    least one of ``x_i + dx_i <= x_j``, ``x_j + dx_j <= x_i``, ``y_i + dy_i <= y_j``, ``y_j + dy_j <= y_i``
-    holds.
-
-    The first n variables are the x coordinates, the next n are the y coordinates. Filtering is pairwise: a
-    pair that can no longer be separated along x (resp. y) must be separated along y (resp. x); when only one
-    separation direction remains feasible it is enforced by tightening the coordinate bounds.
+    Filters the coordinates pairwise: a pair that can no longer be separated along x (resp. y) must be separated
+    along y (resp. x); when only one separation direction remains feasible it is enforced by tightening the
+    coordinate bounds.
 
     :param domains: the domains of the variables, the n x coordinates then the n y coordinates
     :type domains: NDArray
     :param parameters: the n widths (dx) then the n heights (dy)
     :type parameters: NDArray
+    :param n: the number of rectangles
+    :type n: int
 
-    :return: the status of the propagation (consistency, inconsistency or entailment) as an int
-    :rtype: int
+    :return: False when two rectangles overlap (inconsistent), True otherwise
+    :rtype: bool
     """
-    n = len(domains) // 2
     # The pairwise pass is NOT idempotent: separating pair (i, j) can tighten a coordinate that re-opens a
     # forced separation for an earlier pair (k, j) already visited this pass. The engine's self-skip
     # (a propagator does not reschedule itself) then leaves diffn short of its fixpoint, which at a leaf
@@ -99,7 +113,7 @@ def compute_domains_diffn(domains: NDArray, parameters: NDArray) -> int:
                 x_sep = a or b
                 y_sep = c or d
                 if not x_sep and not y_sep:
-                    return PROP_INCONSISTENCY
+                    return False
                 if not x_sep:
                     # the rectangles overlap along x, so they must be separated along y
                     if not c:  # only D remains: enforce y_j + dy_j <= y_i
@@ -110,7 +124,7 @@ def compute_domains_diffn(domains: NDArray, parameters: NDArray) -> int:
                             domains[n + j, MAX] = yi_max - dyj
                             changed = True
                         if domains[n + i, MIN] > domains[n + i, MAX] or domains[n + j, MIN] > domains[n + j, MAX]:
-                            return PROP_INCONSISTENCY
+                            return False
                     elif not d:  # only C remains: enforce y_i + dy_i <= y_j
                         if yi_min + dyi > domains[n + j, MIN]:
                             domains[n + j, MIN] = yi_min + dyi
@@ -119,7 +133,7 @@ def compute_domains_diffn(domains: NDArray, parameters: NDArray) -> int:
                             domains[n + i, MAX] = yj_max - dyi
                             changed = True
                         if domains[n + i, MIN] > domains[n + i, MAX] or domains[n + j, MIN] > domains[n + j, MAX]:
-                            return PROP_INCONSISTENCY
+                            return False
                 elif not y_sep:
                     # the rectangles overlap along y, so they must be separated along x
                     if not a:  # only B remains: enforce x_j + dx_j <= x_i
@@ -130,7 +144,7 @@ def compute_domains_diffn(domains: NDArray, parameters: NDArray) -> int:
                             domains[j, MAX] = xi_max - dxj
                             changed = True
                         if domains[i, MIN] > domains[i, MAX] or domains[j, MIN] > domains[j, MAX]:
-                            return PROP_INCONSISTENCY
+                            return False
                     elif not b:  # only A remains: enforce x_i + dx_i <= x_j
                         if xi_min + dxi > domains[j, MIN]:
                             domains[j, MIN] = xi_min + dxi
@@ -139,7 +153,179 @@ def compute_domains_diffn(domains: NDArray, parameters: NDArray) -> int:
                             domains[i, MAX] = xj_max - dxi
                             changed = True
                         if domains[i, MIN] > domains[i, MAX] or domains[j, MIN] > domains[j, MAX]:
-                            return PROP_INCONSISTENCY
+                            return False
+    return True
+
+
+@njit(cache=True)
+def _sweep(
+    d_lo: NDArray,
+    d_hi: NDArray,
+    o_lo: NDArray,
+    o_hi: NDArray,
+    k: int,
+    start: int,
+    end: int,
+    o_min: int,
+    o_max: int,
+    sign: int,
+) -> int:
+    """
+    Sweeps a dimension, from start towards end, for the first position of the origin of a rectangle that is
+    outside the forbidden regions for some position along the other dimension (Beldiceanu and Carlsson, 2001).
+
+    The sweep point moves along the other dimension, jumping past each forbidden region containing it. When it
+    has jumped past o_max, every position along the other dimension is forbidden at this position, and at the
+    next ones up to the first end of the regions it has jumped past, so that the sweep resumes from there.
+
+    :param d_lo: the starts of the forbidden regions along the swept dimension
+    :type d_lo: NDArray
+    :param d_hi: the ends (included) of the forbidden regions along the swept dimension
+    :type d_hi: NDArray
+    :param o_lo: the starts of the forbidden regions along the other dimension
+    :type o_lo: NDArray
+    :param o_hi: the ends (included) of the forbidden regions along the other dimension
+    :type o_hi: NDArray
+    :param k: the number of forbidden regions
+    :type k: int
+    :param start: the bound of the domain the sweep starts from
+    :type start: int
+    :param end: the other bound of the domain
+    :type end: int
+    :param o_min: the minimum of the domain along the other dimension
+    :type o_min: int
+    :param o_max: the maximum of the domain along the other dimension
+    :type o_max: int
+    :param sign: 1 to sweep upwards, -1 to sweep downwards
+    :type sign: int
+
+    :return: the first feasible position, a position past end when there is none
+    :rtype: int
+    """
+    position = start
+    other = o_min
+    jump = end + sign
+    while True:
+        # the forbidden region containing the sweep point that extends the furthest along the other dimension
+        r = -1
+        for q in range(k):
+            if d_lo[q] <= position <= d_hi[q] and o_lo[q] <= other <= o_hi[q] and (r < 0 or o_hi[q] > o_hi[r]):
+                r = q
+        if r < 0:
+            return position
+        other = o_hi[r] + 1
+        jump = min(jump, d_hi[r] + 1) if sign > 0 else max(jump, d_lo[r] - 1)
+        if other > o_max:
+            position = jump
+            if (position - end) * sign > 0:
+                return position
+            other = o_min
+            jump = end + sign
+
+
+@njit(cache=True)
+def _filter_sweep(domains: NDArray, parameters: NDArray, n: int, regions: NDArray) -> bool:
+    """
+    Filters the coordinates by sweeping the forbidden regions of each rectangle.
+
+    The forbidden region of rectangle j for the origin of rectangle i is the set of the positions of i that
+    overlap j whatever the position of j: ``[x_j max - dx_i + 1, x_j min + dx_j - 1]`` times
+    ``[y_j max - dy_i + 1, y_j min + dy_j - 1]``. Each bound of i is moved to the first position, along its
+    dimension, outside the union of these regions for some position along the other dimension. This subsumes
+    the pairwise filtering, a single region covering the domain of i along the other dimension.
+
+    :param domains: the domains of the variables, the n x coordinates then the n y coordinates
+    :type domains: NDArray
+    :param parameters: the n widths (dx) then the n heights (dy)
+    :type parameters: NDArray
+    :param n: the number of rectangles
+    :type n: int
+    :param regions: the scratch of the forbidden regions, of size 4 * n
+    :type regions: NDArray
+
+    :return: False when a rectangle has no position left (inconsistent), True otherwise
+    :rtype: bool
+    """
+    # the sweep of a rectangle depends on the others: they are swept in turn until n in a row are left unchanged
+    i = 0
+    unchanged_nb = 0
+    while unchanged_nb < n:
+        unchanged_nb += 1
+        # the forbidden regions meeting the domain of i: [x_lo, x_hi] x [y_lo, y_hi]
+        k = 0
+        for j in range(n):
+            if j == i:
+                continue
+            x_lo = domains[j, MAX] - parameters[i] + 1
+            x_hi = domains[j, MIN] + parameters[j] - 1
+            y_lo = domains[n + j, MAX] - parameters[n + i] + 1
+            y_hi = domains[n + j, MIN] + parameters[n + j] - 1
+            if max(x_lo, domains[i, MIN]) <= min(x_hi, domains[i, MAX]) and max(y_lo, domains[n + i, MIN]) <= min(
+                y_hi, domains[n + i, MAX]
+            ):
+                regions[k] = x_lo
+                regions[n + k] = x_hi
+                regions[2 * n + k] = y_lo
+                regions[3 * n + k] = y_hi
+                k += 1
+        # the regions do not depend on i, so its dimensions are swept in turn until both are left unchanged
+        dim = 0
+        stable_dim_nb = 0 if k > 0 else 2
+        while stable_dim_nb < 2:
+            d_var = i + dim * n
+            o_var = i + (1 - dim) * n
+            d_regions = regions[2 * dim * n : 2 * (dim + 1) * n]
+            o_regions = regions[2 * (1 - dim) * n : 2 * (2 - dim) * n]
+            d_lo = d_regions[:n]
+            d_hi = d_regions[n:]
+            o_lo = o_regions[:n]
+            o_hi = o_regions[n:]
+            o_min = domains[o_var, MIN]
+            o_max = domains[o_var, MAX]
+            d_min = _sweep(d_lo, d_hi, o_lo, o_hi, k, domains[d_var, MIN], domains[d_var, MAX], o_min, o_max, 1)
+            if d_min > domains[d_var, MAX]:
+                return False
+            d_max = _sweep(d_lo, d_hi, o_lo, o_hi, k, domains[d_var, MAX], d_min, o_min, o_max, -1)
+            if d_min != domains[d_var, MIN] or d_max != domains[d_var, MAX]:
+                domains[d_var, MIN] = d_min
+                domains[d_var, MAX] = d_max
+                stable_dim_nb = 1
+                unchanged_nb = 1
+            else:
+                stable_dim_nb += 1
+            dim = 1 - dim
+        i = i + 1 if i < n - 1 else 0
+    return True
+
+
+@njit(cache=True)
+def compute_domains_diffn(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
+    """
+    Implements the 2D diffn (non-overlapping rectangles) constraint. Rectangle i has its bottom-left corner
+    at ``(x_i, y_i)`` and constant size ``(dx_i, dy_i)``; no two rectangles overlap, i.e. for all i != j at
+    least one of ``x_i + dx_i <= x_j``, ``x_j + dx_j <= x_i``, ``y_i + dy_i <= y_j``, ``y_j + dy_j <= y_i``
+    holds.
+
+    The first n variables are the x coordinates, the next n are the y coordinates. From DIFFN_SWEEP_MIN_N
+    rectangles on, filtering sweeps the forbidden regions of each rectangle (see :func:`_filter_sweep`); below,
+    it is pairwise (see :func:`_filter_pairwise`).
+
+    :param domains: the domains of the variables, the n x coordinates then the n y coordinates
+    :type domains: NDArray
+    :param parameters: the n widths (dx) then the n heights (dy)
+    :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_diffn
+    :type state: NDArray
+
+    :return: the status of the propagation (consistency, inconsistency or entailment) as an int
+    :rtype: int
+    """
+    n = len(domains) // 2
+    if n >= DIFFN_SWEEP_MIN_N:
+        if not _filter_sweep(domains, parameters, n, state):
+            return PROP_INCONSISTENCY
+    elif not _filter_pairwise(domains, parameters, n):
+        return PROP_INCONSISTENCY
     # when every coordinate is fixed and no overlap was detected, the constraint can no longer be violated
     bound_nb = 0
     for v in range(2 * n):
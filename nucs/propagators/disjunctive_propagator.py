@@ -10,14 +10,34 @@
 #
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
-import numpy as np
+import math
+
 from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+from nucs.propagators.scheduling import (
+    ORDER_IDX_ECT,
+    ORDER_IDX_EST,
+    ORDER_IDX_LCT,
+    ORDER_IDX_LST,
+    ORDER_NB,
+    mirror_tasks,
+    sort_orders,
+)
+
+# The earliest completion time of an empty set of tasks, the smallest value of the int32 state.
+MINUS_INF = -(1 << 31)
 
-# A sentinel smaller than any earliest start time, used to seed earliest-completion-time accumulations.
-MINUS_INF = -(1 << 62)
+# The Θ-Λ-tree is stored in the state as TREE_ARRAY_NB arrays of 2 * leaf_nb nodes, the root being node 1 and the
+# children of node k being nodes 2k and 2k + 1:
+TREE_IDX_SUM_P = 0  # the sum of the durations of the tasks of Θ
+TREE_IDX_ECT = 1  # the earliest completion time of the tasks of Θ
+TREE_IDX_GRAY_SUM_P = 2  # the largest sum of the durations of Θ and of at most one task of Λ
+TREE_IDX_GRAY_ECT = 3  # the largest earliest completion time of Θ and of at most one task of Λ
+TREE_IDX_GRAY_SUM_P_TASK = 4  # the task of Λ responsible for the gray sum of the durations, -1 if none
+TREE_IDX_GRAY_ECT_TASK = 5  # the task of Λ responsible for the gray earliest completion time, -1 if none
+TREE_ARRAY_NB = 6
 
 
 def get_complexity_disjunctive(n: int, parameters: NDArray) -> int:
@@ -32,7 +52,41 @@ def get_complexity_disjunctive(n: int, parameters: NDArray) -> int:
     :return: an int
     :rtype: int
     """
-    return n * n * n
+    return int(n * math.log(n)) if n > 1 else 1
+
+
+@njit(cache=True)
+def get_leaf_nb(n: int) -> int:
+    """
+    Returns the number of leaves of the Θ-Λ-tree, the smallest power of 2 not below the number of tasks.
+
+    :param n: the number of tasks
+    :type n: int
+
+    :return: the number of leaves
+    :rtype: int
+    """
+    leaf_nb = 1
+    while leaf_nb < n:
+        leaf_nb *= 2
+    return leaf_nb
+
+
+def get_state_size_disjunctive(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: a warm flag, the orders of the tasks at the previous call, then the scratch
+    arrays of the filtering: the bounds of the tasks and of their mirrors, the orders of the mirrors, the leaves
+    of the tasks, the new bounds and the Θ-Λ-tree.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return 1 + (7 + 2 * ORDER_NB + 2) * n + TREE_ARRAY_NB * 2 * get_leaf_nb(n)
 
 
 @njit(cache=True)
@@ -54,17 +108,120 @@ def get_triggers_disjunctive(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def _filter_est(est: NDArray, lct: NDArray, p: NDArray, n: int) -> bool:
+def _tree_clear(tree: NDArray, n: int, est_order: NDArray, leaves: NDArray) -> None:
     """
-    Raises the earliest start times by overload checking and edge finding on a unary resource.
+    Empties the Θ-Λ-tree and gives the tasks their leaves, in earliest start time order.
 
-    For every window upper bound ``L`` (each task's latest completion time) let ``Theta`` be the tasks that
-    must complete by ``L`` (``lct_i <= L``). If their earliest completion time ``ECT(Theta)`` exceeds ``L``
-    the resource is overloaded. Otherwise, for any task ``t`` that may finish after ``L``, if ``Theta`` plus
-    ``t`` cannot all complete by ``L`` then ``t`` must run after every task of ``Theta``, so its earliest
-    start is raised to ``ECT(Theta)``.
+    :param tree: the (TREE_ARRAY_NB, 2 * leaf_nb) Θ-Λ-tree
+    :type tree: NDArray
+    :param n: the number of tasks
+    :type n: int
+    :param est_order: the tasks by earliest start time
+    :type est_order: NDArray
+    :param leaves: the leaves of the tasks, modified in place
+    :type leaves: NDArray
+    """
+    tree[TREE_IDX_SUM_P, :] = 0
+    tree[TREE_IDX_ECT, :] = MINUS_INF
+    tree[TREE_IDX_GRAY_SUM_P, :] = 0
+    tree[TREE_IDX_GRAY_ECT, :] = MINUS_INF
+    tree[TREE_IDX_GRAY_SUM_P_TASK, :] = -1
+    tree[TREE_IDX_GRAY_ECT_TASK, :] = -1
+    leaf_nb = tree.shape[1] // 2
+    for rank in range(n):
+        leaves[est_order[rank]] = leaf_nb + rank
+
+
+@njit(cache=True)
+def _tree_set(tree: NDArray, leaf: int, task: int, ect: int, p: int, color: int) -> None:
+    """
+    Sets a leaf of the Θ-Λ-tree and updates its ancestors.
+
+    :param tree: the (TREE_ARRAY_NB, 2 * leaf_nb) Θ-Λ-tree
+    :type tree: NDArray
+    :param leaf: the leaf of the task
+    :type leaf: int
+    :param task: the task
+    :type task: int
+    :param ect: the earliest completion time of the task
+    :type ect: int
+    :param p: the duration of the task
+    :type p: int
+    :param color: 1 to put the task in Θ, 0 to put it in Λ, -1 to remove it
+    :type color: int
+    """
+    if color == 1:
+        tree[TREE_IDX_SUM_P, leaf] = p
+        tree[TREE_IDX_ECT, leaf] = ect
+        tree[TREE_IDX_GRAY_SUM_P, leaf] = p
+        tree[TREE_IDX_GRAY_ECT, leaf] = ect
+        tree[TREE_IDX_GRAY_SUM_P_TASK, leaf] = -1
+        tree[TREE_IDX_GRAY_ECT_TASK, leaf] = -1
+    elif color == 0:
+        tree[TREE_IDX_SUM_P, leaf] = 0
+        tree[TREE_IDX_ECT, leaf] = MINUS_INF
+        tree[TREE_IDX_GRAY_SUM_P, leaf] = p
+        tree[TREE_IDX_GRAY_ECT, leaf] = ect
+        tree[TREE_IDX_GRAY_SUM_P_TASK, leaf] = task
+        tree[TREE_IDX_GRAY_ECT_TASK, leaf] = task
+    else:
+        tree[TREE_IDX_SUM_P, leaf] = 0
+        tree[TREE_IDX_ECT, leaf] = MINUS_INF
+        tree[TREE_IDX_GRAY_SUM_P, leaf] = 0
+        tree[TREE_IDX_GRAY_ECT, leaf] = MINUS_INF
+        tree[TREE_IDX_GRAY_SUM_P_TASK, leaf] = -1
+        tree[TREE_IDX_GRAY_ECT_TASK, leaf] = -1
+    node = leaf >> 1
+    while node > 0:
+        left = 2 * node
+        right = left + 1
+        sum_p_right = tree[TREE_IDX_SUM_P, right]
+        gray_sum_p_right = tree[TREE_IDX_GRAY_SUM_P, right]
+        tree[TREE_IDX_SUM_P, node] = tree[TREE_IDX_SUM_P, left] + sum_p_right
+        ect_left = tree[TREE_IDX_ECT, left]
+        ect_node = tree[TREE_IDX_ECT, right]
+        if ect_left != MINUS_INF:
+            ect_node = max(ect_node, ect_left + sum_p_right)
+        tree[TREE_IDX_ECT, node] = ect_node
+        # the gray values: the task of Λ is either in the left or in the right subtree, the ties favoring Λ
+        gray_sum_p = tree[TREE_IDX_GRAY_SUM_P, left] + sum_p_right
+        gray_sum_p_task = tree[TREE_IDX_GRAY_SUM_P_TASK, left]
+        value = tree[TREE_IDX_SUM_P, left] + gray_sum_p_right
+        if value > gray_sum_p or (value == gray_sum_p and gray_sum_p_task < 0):
+            gray_sum_p = value
+            gray_sum_p_task = tree[TREE_IDX_GRAY_SUM_P_TASK, right]
+        tree[TREE_IDX_GRAY_SUM_P, node] = gray_sum_p
+        tree[TREE_IDX_GRAY_SUM_P_TASK, node] = gray_sum_p_task
+        gray_ect = tree[TREE_IDX_GRAY_ECT, right]
+        gray_ect_task = tree[TREE_IDX_GRAY_ECT_TASK, right]
+        if ect_left != MINUS_INF:
+            value = ect_left + gray_sum_p_right
+            if value > gray_ect or (value == gray_ect and gray_ect_task < 0):
+                gray_ect = value
+                gray_ect_task = tree[TREE_IDX_GRAY_SUM_P_TASK, right]
+        gray_ect_left = tree[TREE_IDX_GRAY_ECT, left]
+        if gray_ect_left != MINUS_INF:
+            value = gray_ect_left + sum_p_right
+            if value > gray_ect or (value == gray_ect and gray_ect_task < 0):
+                gray_ect = value
+                gray_ect_task = tree[TREE_IDX_GRAY_ECT_TASK, left]
+        tree[TREE_IDX_GRAY_ECT, node] = gray_ect
+        tree[TREE_IDX_GRAY_ECT_TASK, node] = gray_ect_task
+        node >>= 1
+
+
+@njit(cache=True)
+def _filter_edge_finding(
+    est: NDArray, lct: NDArray, p: NDArray, n: int, orders: NDArray, leaves: NDArray, new_est: NDArray, tree: NDArray
+) -> bool:
+    """
+    Checks the overload of a unary resource and raises the earliest start times by edge finding, with a Θ-Λ-tree
+    (Vilím, 2008).
 
-    ``ECT`` of a set is the greedy earliest-start-ordered chain, which is exact for a unary resource.
+    Θ is the set of the tasks ending by a bound, the tasks being removed from Θ by decreasing latest completion
+    time: if the earliest completion time ECT(Θ) exceeds the bound, the resource is overloaded. The removed
+    tasks are put in Λ: if ECT(Θ ∪ {t}) exceeds the bound for a task t of Λ, t must run after every task of Θ,
+    and its earliest start time is raised to ECT(Θ).
 
     :param est: the earliest start times, raised in place
     :type est: NDArray
@@ -74,49 +231,52 @@ def _filter_est(est: NDArray, lct: NDArray, p: NDArray, n: int) -> bool:
     :type p: NDArray
     :param n: the number of tasks
     :type n: int
+    :param orders: the (ORDER_NB, n) orders of the tasks
+    :type orders: NDArray
+    :param leaves: the leaves of the tasks
+    :type leaves: NDArray
+    :param new_est: a scratch array of size n
+    :type new_est: NDArray
+    :param tree: the (TREE_ARRAY_NB, 2 * leaf_nb) Θ-Λ-tree
+    :type tree: NDArray
 
     :return: False when the resource is overloaded (inconsistent), True otherwise
     :rtype: bool
     """
-    est_order = np.argsort(est)
-    new_est = est.copy()
-    for c in range(n):
-        bound = lct[c]
-        # ECT(Theta) with Theta = {i : lct[i] <= bound}, tasks visited in earliest-start order.
-        ect = MINUS_INF
-        for idx in range(n):
-            i = est_order[idx]
-            if lct[i] <= bound:
-                ect = (max(ect, est[i])) + p[i]
-        if ect > bound:
-            return False  # overload: Theta cannot complete by bound
-        for t in range(n):
-            if lct[t] > bound:
-                # ECT(Theta ∪ {t}); t is inserted at its earliest-start position.
-                ect_t = MINUS_INF
-                for idx in range(n):
-                    i = est_order[idx]
-                    if lct[i] <= bound or i == t:
-                        ect_t = (max(ect_t, est[i])) + p[i]
-                if ect_t > bound and ect > new_est[t]:
-                    new_est[t] = ect
+    _tree_clear(tree, n, orders[ORDER_IDX_EST], leaves)
+    for i in range(n):
+        new_est[i] = est[i]
+        _tree_set(tree, leaves[i], i, est[i] + p[i], p[i], 1)
+    lct_order = orders[ORDER_IDX_LCT]
+    for rank in range(n - 1, 0, -1):
+        j = lct_order[rank]
+        if tree[TREE_IDX_ECT, 1] > lct[j]:
+            return False  # overload: Θ cannot complete by lct[j]
+        _tree_set(tree, leaves[j], j, est[j] + p[j], p[j], 0)
+        bound = lct[lct_order[rank - 1]]
+        while tree[TREE_IDX_GRAY_ECT, 1] > bound:
+            i = tree[TREE_IDX_GRAY_ECT_TASK, 1]
+            if i < 0:
+                return False  # overload: Θ cannot complete by bound
+            new_est[i] = max(new_est[i], tree[TREE_IDX_ECT, 1])
+            _tree_set(tree, leaves[i], i, 0, 0, -1)
+    if tree[TREE_IDX_ECT, 1] > lct[lct_order[0]]:
+        return False
     for i in range(n):
         est[i] = new_est[i]
     return True
 
 
 @njit(cache=True)
-def _filter_not_last(est: NDArray, lct: NDArray, p: NDArray, n: int) -> None:
+def _filter_not_last(
+    est: NDArray, lct: NDArray, p: NDArray, n: int, orders: NDArray, leaves: NDArray, new_lct: NDArray, tree: NDArray
+) -> None:
     """
-    Lowers the latest completion times by the not-last rule on a unary resource.
+    Lowers the latest completion times by the not-last rule on a unary resource, with a Θ-tree (Vilím, 2004).
 
-    Task ``t`` is "not last" among ``Theta ∪ {t}`` -- where ``Theta = {i != t : lct_i <= lct_t}`` -- when the
-    earliest completion time ``ECT(Theta)`` exceeds ``t``'s latest start ``lct_t - p_t``: ``Theta`` cannot all
-    finish before ``t`` would start, so at least one task of ``Theta`` runs after ``t``. Then ``t`` must
-    complete before that task starts, hence by the largest latest start of ``Theta``, lowering ``lct_t``.
-
-    Not-first is obtained by mirroring time and calling this routine again (as edge finding does), so a single
-    routine covers both rules. Filtering is complementary to edge finding (neither subsumes the other).
+    For a task t, let Θ be the other tasks whose latest start time is below the latest completion time of t. When
+    ECT(Θ) exceeds the latest start time of t, Θ cannot all complete before t starts: t is not last, it must
+    complete before the largest latest start time of Θ.
 
     :param est: the earliest start times
     :type est: NDArray
@@ -126,37 +286,52 @@ def _filter_not_last(est: NDArray, lct: NDArray, p: NDArray, n: int) -> None:
     :type p: NDArray
     :param n: the number of tasks
     :type n: int
+    :param orders: the (ORDER_NB, n) orders of the tasks
+    :type orders: NDArray
+    :param leaves: the leaves of the tasks
+    :type leaves: NDArray
+    :param new_lct: a scratch array of size n
+    :type new_lct: NDArray
+    :param tree: the (TREE_ARRAY_NB, 2 * leaf_nb) Θ-Λ-tree
+    :type tree: NDArray
     """
-    est_order = np.argsort(est)
-    new_lct = lct.copy()
-    for t in range(n):
-        # ECT(Theta) (greedy earliest-start chain) and the largest latest start over Theta.
-        ect = MINUS_INF
-        max_lst = MINUS_INF
-        for idx in range(n):
-            i = est_order[idx]
-            if i != t and lct[i] <= lct[t]:
-                ect = (max(ect, est[i])) + p[i]
-                lst_i = lct[i] - p[i]
-                max_lst = max(max_lst, lst_i)
-        if ect > lct[t] - p[t] and max_lst < new_lct[t]:  # t cannot be last: it must finish by max_lst
-            new_lct[t] = max_lst
-    for t in range(n):
-        lct[t] = new_lct[t]
+    _tree_clear(tree, n, orders[ORDER_IDX_EST], leaves)
+    lst_order = orders[ORDER_IDX_LST]
+    lct_order = orders[ORDER_IDX_LCT]
+    lst_rank = 0
+    last = -1  # the task of Θ with the largest latest start time
+    previous = -1  # the task of Θ with the second largest latest start time
+    for rank in range(n):
+        t = lct_order[rank]
+        new_lct[t] = lct[t]
+        while lst_rank < n and lct[t] > lct[lst_order[lst_rank]] - p[lst_order[lst_rank]]:
+            j = lst_order[lst_rank]
+            _tree_set(tree, leaves[j], j, est[j] + p[j], p[j], 1)
+            previous = last
+            last = j
+            lst_rank += 1
+        in_theta = p[t] > 0  # the latest start time of t is below its latest completion time
+        if in_theta:
+            _tree_set(tree, leaves[t], t, 0, 0, -1)
+        if tree[TREE_IDX_ECT, 1] > lct[t] - p[t]:
+            j = previous if last == t else last
+            new_lct[t] = min(new_lct[t], lct[j] - p[j])
+        if in_theta:
+            _tree_set(tree, leaves[t], t, est[t] + p[t], p[t], 1)
+    for i in range(n):
+        lct[i] = new_lct[i]
 
 
 @njit(cache=True)
-def _filter_detectable_precedences(est: NDArray, lct: NDArray, p: NDArray, n: int) -> None:
+def _filter_detectable_precedences(
+    est: NDArray, lct: NDArray, p: NDArray, n: int, orders: NDArray, leaves: NDArray, new_est: NDArray, tree: NDArray
+) -> None:
     """
-    Raises the earliest start times by detectable precedences on a unary resource.
-
-    A precedence ``i ≪ j`` (``i`` before ``j``) is *detectable* when ``j`` cannot run before ``i``, i.e. when
-    ``i``'s latest start ``lct_i - p_i`` is below ``j``'s earliest completion ``est_j + p_j``. Task ``j`` then
-    runs after all such predecessors, so its earliest start is raised to ``ECT(Pred(j))``.
+    Raises the earliest start times by detectable precedences on a unary resource, with a Θ-tree (Vilím, 2004).
 
-    Detectable successors (lowering latest completion times) are obtained by mirroring time and calling this
-    routine again, as edge finding does. Filtering is complementary to edge finding and not-first/not-last
-    (none subsumes another).
+    A precedence i ≪ j is detectable when the latest start time of i is below the earliest completion time of j:
+    j cannot run before i. The tasks being visited by increasing earliest completion time, Θ is the set of their
+    detectable predecessors, and the earliest start time of a task is raised to ECT(Θ) without the task itself.
 
     :param est: the earliest start times, raised in place
     :type est: NDArray
@@ -166,39 +341,55 @@ def _filter_detectable_precedences(est: NDArray, lct: NDArray, p: NDArray, n: in
     :type p: NDArray
     :param n: the number of tasks
     :type n: int
+    :param orders: the (ORDER_NB, n) orders of the tasks
+    :type orders: NDArray
+    :param leaves: the leaves of the tasks
+    :type leaves: NDArray
+    :param new_est: a scratch array of size n
+    :type new_est: NDArray
+    :param tree: the (TREE_ARRAY_NB, 2 * leaf_nb) Θ-Λ-tree
+    :type tree: NDArray
     """
-    est_order = np.argsort(est)
-    new_est = est.copy()
-    for j in range(n):
-        ect_j = est[j] + p[j]
-        # ECT(Pred(j)) with Pred(j) = {i != j : lct_i - p_i < ect_j}, tasks visited in earliest-start order.
-        ect = MINUS_INF
-        for idx in range(n):
-            i = est_order[idx]
-            if i != j and lct[i] - p[i] < ect_j:
-                ect = (max(ect, est[i])) + p[i]
-        # j must start after all its detectable predecessors complete
-        new_est[j] = max(new_est[j], ect)
-    for j in range(n):
-        est[j] = new_est[j]
+    _tree_clear(tree, n, orders[ORDER_IDX_EST], leaves)
+    lst_order = orders[ORDER_IDX_LST]
+    ect_order = orders[ORDER_IDX_ECT]
+    lst_rank = 0
+    for rank in range(n):
+        t = ect_order[rank]
+        ect_t = est[t] + p[t]
+        while lst_rank < n and ect_t > lct[lst_order[lst_rank]] - p[lst_order[lst_rank]]:
+            j = lst_order[lst_rank]
+            _tree_set(tree, leaves[j], j, est[j] + p[j], p[j], 1)
+            lst_rank += 1
+        in_theta = lct[t] - p[t] < ect_t
+        if in_theta:
+            _tree_set(tree, leaves[t], t, 0, 0, -1)
+        new_est[t] = max(est[t], tree[TREE_IDX_ECT, 1])
+        if in_theta:
+            _tree_set(tree, leaves[t], t, ect_t, p[t], 1)
+    for i in range(n):
+        est[i] = new_est[i]
 
 
 @njit(cache=True)
-def compute_domains_disjunctive(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_disjunctive(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements the disjunctive (unary resource) constraint: tasks with start times ``domains`` and constant
     durations ``parameters`` must not overlap in time, i.e. for all i != j either ``s_i + p_i <= s_j`` or
     ``s_j + p_j <= s_i``.
 
-    Filtering combines overload checking, edge finding, not-first/not-last and detectable precedences: each
-    rule raises earliest start times, and lowers latest start times by running the same reasoning on the
-    time-reversed problem. The rules are not individually idempotent, so the whole block is iterated until a
-    full sweep changes no bound, leaving the propagator at its own fixpoint.
+    Filtering combines overload checking, edge finding, not-first/not-last and detectable precedences, each in
+    O(n log n) with a Θ-Λ-tree: each rule raises earliest start times, and lowers latest start times by running the
+    same reasoning on the time-reversed problem. The rules share the orders of the tasks, kept sorted from a rule
+    to the next and from a call to the next. The rules are not individually idempotent, so the whole block is
+    iterated until a full sweep changes no bound, leaving the propagator at its own fixpoint.
 
     :param domains: the domains of the start-time variables, one per task
     :type domains: NDArray
     :param parameters: the durations, one constant per task in the same order as the variables
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_disjunctive
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -206,9 +397,14 @@ def compute_domains_disjunctive(domains: NDArray, parameters: NDArray) -> int:
     n = len(domains)
     if n <= 1:
         return PROP_ENTAILMENT
-    est = np.empty(n, dtype=np.int64)
-    lct = np.empty(n, dtype=np.int64)
-    p = np.empty(n, dtype=np.int64)
+    # the state holds the warm flag, the orders of the previous call, then all the scratch arrays
+    warm = state[0] != 0
+    state[0] = 1
+    orders = state[1 : 1 + ORDER_NB * n].reshape(ORDER_NB, n)
+    scratch = state[1 + ORDER_NB * n :]
+    est = scratch[:n]
+    lct = scratch[n : 2 * n]
+    p = scratch[2 * n : 3 * n]
     bound_nb = 0
     for i in range(n):
         est[i] = domains[i, MIN]
@@ -216,10 +412,15 @@ def compute_domains_disjunctive(domains: NDArray, parameters: NDArray) -> int:
         lct[i] = domains[i, MAX] + p[i]
         if domains[i, MIN] == domains[i, MAX]:
             bound_nb += 1
-    mest = np.empty(n, dtype=np.int64)
-    mlct = np.empty(n, dtype=np.int64)
-    prev_est = np.empty(n, dtype=np.int64)
-    prev_lct = np.empty(n, dtype=np.int64)
+    mest = scratch[3 * n : 4 * n]
+    mlct = scratch[4 * n : 5 * n]
+    prev_est = scratch[5 * n : 6 * n]
+    prev_lct = scratch[6 * n : 7 * n]
+    morders = scratch[7 * n : (7 + ORDER_NB) * n].reshape(ORDER_NB, n)
+    leaves = scratch[(7 + ORDER_NB) * n : (8 + ORDER_NB) * n]
+    new_bounds = scratch[(8 + ORDER_NB) * n : (9 + ORDER_NB) * n]
+    tree = scratch[(9 + ORDER_NB) * n :].reshape(TREE_ARRAY_NB, -1)
+    sort_orders(est, lct, p, n, orders, warm)
     # The individual rules are not idempotent (a batch pass leaves cascaded pruning on the table), so we
     # iterate the whole filtering block until a full sweep changes no bound: the propagator then returns at
     # its own fixpoint rather than relying on the solver to re-trigger it. Each changing sweep tightens at
@@ -229,34 +430,34 @@ def compute_domains_disjunctive(domains: NDArray, parameters: NDArray) -> int:
         for i in range(n):
             prev_est[i] = est[i]
             prev_lct[i] = lct[i]
-        # Edge finding: raise earliest start times.
-        if not _filter_est(est, lct, p, n):
+        # Overload checking and edge finding: raise earliest start times.
+        if not _filter_edge_finding(est, lct, p, n, orders, leaves, new_bounds, tree):
             return PROP_INCONSISTENCY
+        sort_orders(est, lct, p, n, orders, True)
         # Lower latest completion times by mirroring time (est' = -lct, lct' = -est) and reusing the filter.
-        for i in range(n):
-            mest[i] = -lct[i]
-            mlct[i] = -est[i]
-        if not _filter_est(mest, mlct, p, n):
+        mirror_tasks(est, lct, orders, mest, mlct, morders, n)
+        if not _filter_edge_finding(mest, mlct, p, n, morders, leaves, new_bounds, tree):
             return PROP_INCONSISTENCY
         for i in range(n):
             lct[i] = -mest[i]
+        sort_orders(est, lct, p, n, orders, True)
         # Not-last: lower latest completion times (complementary to edge finding).
-        _filter_not_last(est, lct, p, n)
+        _filter_not_last(est, lct, p, n, orders, leaves, new_bounds, tree)
+        sort_orders(est, lct, p, n, orders, True)
         # Not-first: raise earliest start times by mirroring time and reusing the not-last filter.
-        for i in range(n):
-            mest[i] = -lct[i]
-            mlct[i] = -est[i]
-        _filter_not_last(mest, mlct, p, n)
+        mirror_tasks(est, lct, orders, mest, mlct, morders, n)
+        _filter_not_last(mest, mlct, p, n, morders, leaves, new_bounds, tree)
         for i in range(n):
             est[i] = -mlct[i]
+        sort_orders(est, lct, p, n, orders, True)
         # Detectable precedences: raise earliest start times, then lower latest completion times by mirroring.
-        _filter_detectable_precedences(est, lct, p, n)
-        for i in range(n):
-            mest[i] = -lct[i]
-            mlct[i] = -est[i]
-        _filter_detectable_precedences(mest, mlct, p, n)
+        _filter_detectable_precedences(est, lct, p, n, orders, leaves, new_bounds, tree)
+        sort_orders(est, lct, p, n, orders, True)
+        mirror_tasks(est, lct, orders, mest, mlct, morders, n)
+        _filter_detectable_precedences(mest, mlct, p, n, morders, leaves, new_bounds, tree)
         for i in range(n):
             lct[i] = -mest[i]
+        sort_orders(est, lct, p, n, orders, True)
         # A task whose earliest start has crossed its latest start cannot be scheduled: inconsistency. This
         # also caps the loop when the rules diverge (e.g. mutually detectable precedences push est upward).
         has_changed = False
@@ -46,7 +46,7 @@ def get_triggers_dummy(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_dummy(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_dummy(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     A propagator that does nothing.
 
@@ -48,7 +48,7 @@ def get_triggers_element_eq(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_element_eq(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_element_eq(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Enforces :math:`l_i = v`.
 
@@ -58,6 +58,8 @@ def compute_domains_element_eq(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: the parameters of the propagator, l is an alias for parameters
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
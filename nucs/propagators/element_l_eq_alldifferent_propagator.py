@@ -48,7 +48,7 @@ def get_triggers_element_l_eq_alldifferent(n: int, variable: int, parameters: ND
 
 
 @njit(cache=True)
-def compute_domains_element_l_eq_alldifferent(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_element_l_eq_alldifferent(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Enforces :math:`l_i = v` when alldifferent(l).
 
@@ -59,6 +59,8 @@ def compute_domains_element_l_eq_alldifferent(domains: NDArray, parameters: NDAr
     :type domains: NDArray
     :param parameters: the parameters of the propagator, it is unused
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
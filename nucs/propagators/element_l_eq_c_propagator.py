@@ -47,7 +47,7 @@ def get_triggers_element_l_eq_c(n: int, variable: int, parameters: NDArray) -> i
 
 
 @njit(cache=True)
-def compute_domains_element_l_eq_c(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_element_l_eq_c(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Enforces :math:`l_i = c`.
 
@@ -55,6 +55,8 @@ def compute_domains_element_l_eq_c(domains: NDArray, parameters: NDArray) -> int
     :type domains: NDArray
     :param parameters: the parameters of the propagator, c is the first parameter
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -60,7 +60,7 @@ def get_triggers_eq_imp(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_eq_imp(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_eq_imp(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements the half-reified (implied) constraint :math:`b \\rightarrow x = y`.
 
@@ -72,6 +72,8 @@ def compute_domains_eq_imp(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: unused
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
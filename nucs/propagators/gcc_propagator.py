@@ -12,7 +12,6 @@
 ###############################################################################
 import math
 
-import numpy as np
 from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
@@ -34,6 +33,23 @@ def get_complexity_gcc(n: int, parameters: NDArray) -> int:
     return int(n * math.log(n))
 
 
+def get_state_size_gcc(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: a warm flag, the permutations sorting the variables by their bounds at the
+    previous call, the scratch arrays, then the partial sums of the lower bounds and of the capacities.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    m = (len(parameters) - 1) >> 1
+    return 1 + 2 * n + 6 * 2 * (n + 1) + 3 * n + 4 * (m + 6)
+
+
 @njit(cache=True)
 def get_triggers_gcc(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -52,16 +68,15 @@ def get_triggers_gcc(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def init_partial_sum(first_value: int, m: int, values: NDArray) -> NDArray:
+def init_partial_sum(partial_sum: NDArray, first_value: int, m: int, values: NDArray) -> None:
     """
-    Inits the partial_sum data structure:
+    Inits the partial_sum data structure, a (2, m + 6) array:
     ---------------------
     | sm | first_value |
     ---------------------
     | ds  | last_value  |
     ---------------------
     """
-    partial_sum = np.zeros((2, m + 6), dtype=np.int32)
     partial_sum[0, -1] = first_value - 3
     partial_sum[1, -1] = first_value + m + 1
     sm = partial_sum[0, :-1]
@@ -83,7 +98,6 @@ def init_partial_sum(first_value: int, m: int, values: NDArray) -> NDArray:
         j = i
         i -= 1
     ds[j] = 0
-    return partial_sum
 
 
 @njit(cache=True)
@@ -404,7 +418,7 @@ def filter_upper_min(
 
 
 @njit(cache=True)
-def compute_domains_gcc(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_gcc(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     r"""
     This propagator (Global Cardinality Constraint) enforces that
     :math:`l_j \le |\{ i : x_i = v_j \}| \le c_j` for all j.
@@ -415,28 +429,39 @@ def compute_domains_gcc(domains: NDArray, parameters: NDArray) -> int:
     :param parameters: there are 1 + 2 * m parameters:
                        the first domain value (v_0), then the m lower bounds, then the m upper bounds (capacities)
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_gcc
+    :type state: NDArray
     :return: a propagation status (PROP_INCONSISTENCY or PROP_CONSISTENCY)
     :rtype: int
     """
     n = len(domains)
     m = (len(parameters) - 1) >> 1  # number of values
     bounds_nb = 2 * (n + 1)
-    empty_buffer = np.empty(4 * bounds_nb + 4 * n, dtype=np.int32)  # single allocation for all the scratch arrays
-    bounds = empty_buffer[:bounds_nb]
-    t = empty_buffer[bounds_nb : 2 * bounds_nb]  # critical capacity pointers
-    d = empty_buffer[2 * bounds_nb : 3 * bounds_nb]  # differences between critical capacities
-    h = empty_buffer[3 * bounds_nb : 4 * bounds_nb]  # Hall interval pointers
-    min_sorted_vars = empty_buffer[4 * bounds_nb : 4 * bounds_nb + n]
-    max_sorted_vars = empty_buffer[4 * bounds_nb + n : 4 * bounds_nb + 2 * n]
-    ranks = empty_buffer[4 * bounds_nb + 2 * n :].reshape(n, 2)
-    zero_buffer = np.zeros(2 * bounds_nb + n, dtype=np.int32)  # to reduce the number of allocations
+    # the state holds the warm flag, the permutations of the previous call, the scratch arrays and the partial sums
+    warm = state[0] != 0
+    min_sorted_vars = state[1 : 1 + n]
+    max_sorted_vars = state[1 + n : 1 + 2 * n]
+    scratch = state[1 + 2 * n : 1 + 2 * n + 6 * bounds_nb + 3 * n]
+    bounds = scratch[:bounds_nb]
+    t = scratch[bounds_nb : 2 * bounds_nb]  # critical capacity pointers
+    d = scratch[2 * bounds_nb : 3 * bounds_nb]  # differences between critical capacities
+    h = scratch[3 * bounds_nb : 4 * bounds_nb]  # Hall interval pointers
+    ranks = scratch[4 * bounds_nb : 4 * bounds_nb + 2 * n].reshape(n, 2)
+    zero_buffer = scratch[4 * bounds_nb + 2 * n :]
+    zero_buffer[:] = 0
     stable_intervals = zero_buffer[:bounds_nb]
     stable_sets = zero_buffer[bounds_nb : 2 * bounds_nb]
     new_mins = zero_buffer[2 * bounds_nb :]
-    l = init_partial_sum(parameters[0], m, parameters[1 : 1 + m])
-    u = init_partial_sum(parameters[0], m, parameters[1 + m :])
-    argsort_into(min_sorted_vars, domains, MIN)
-    argsort_into(max_sorted_vars, domains, MAX)
+    partial_sums = state[1 + 2 * n + 6 * bounds_nb + 3 * n :].reshape(2, 2, m + 6)
+    l = partial_sums[0]
+    u = partial_sums[1]
+    if not warm:
+        # the partial sums only depend on the parameters
+        init_partial_sum(l, parameters[0], m, parameters[1 : 1 + m])
+        init_partial_sum(u, parameters[0], m, parameters[1 + m :])
+        state[0] = 1
+    argsort_into(min_sorted_vars, domains, MIN, warm)
+    argsort_into(max_sorted_vars, domains, MAX, warm)
     nb = update_bounds(bounds, n, domains, ranks, min_sorted_vars, max_sorted_vars, l, u)
     # assert get_min_value(l) == get_min_value(u)
     # assert get_max_value(l) == get_max_value(u)
@@ -22,6 +22,21 @@ from nucs.constants import (
     PROP_ENTAILMENT,
     PROP_INCONSISTENCY,
 )
+from nucs.propagators.deltas import (
+    get_delta_nb,
+    get_delta_regions,
+    get_int64,
+    get_state_size_delta,
+    is_warm,
+    set_int64,
+)
+
+# the cache of the linear propagators
+LINEAR_CACHE_NB = 7
+LINEAR_IDX_SUM_MIN = 0  # the largest value of sum a_i * x_i - c, on two cells
+LINEAR_IDX_SUM_MAX = 2  # the smallest value of sum a_i * x_i - c, on two cells
+LINEAR_IDX_WIDTH_MAX = 4  # an upper bound of the largest |a_i| * (max(x_i) - min(x_i)), on two cells
+LINEAR_IDX_UNBOUND_NB = 6  # the number of unbound variables with a non-zero factor
 
 
 def get_complexity_linear_eq_c(n: int, parameters: NDArray) -> int:
@@ -39,6 +54,121 @@ def get_complexity_linear_eq_c(n: int, parameters: NDArray) -> int:
     return n
 
 
+def get_state_size_linear_eq_c(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: the delta, then the cache of the sums.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return get_state_size_delta(n, LINEAR_CACHE_NB)
+
+
+@njit(cache=True)
+def init_linear_cache(domains: NDArray, factors: NDArray, c: int, state: NDArray) -> tuple[int, int, int, int]:
+    """
+    Computes the cache of a linear propagator from all the domains, which become the snapshot.
+
+    :param domains: the domains of the variables
+    :type domains: NDArray
+    :param factors: the factors of the variables
+    :type factors: NDArray
+    :param c: the constant
+    :type c: int
+    :param state: the state of the propagator
+    :type state: NDArray
+
+    :return: the largest and the smallest values of sum a_i * x_i - c, the largest width and the unbound count
+    :rtype: Tuple[int, int, int, int]
+    """
+    n = len(factors)
+    domain_sum_min = domain_sum_max = -c
+    width_max = 0
+    unbound_count = 0
+    for i in range(n):
+        factor = factors[i]
+        x_min = domains[i, MIN]
+        x_max = domains[i, MAX]
+        if factor > 0:
+            domain_sum_min += factor * x_max
+            domain_sum_max += factor * x_min
+            width_max = max(width_max, factor * (x_max - x_min))
+        else:
+            domain_sum_min += factor * x_min
+            domain_sum_max += factor * x_max
+            width_max = max(width_max, -factor * (x_max - x_min))
+        if factor != 0 and x_min < x_max:
+            unbound_count += 1
+    _, snapshot, cache = get_delta_regions(state, n)
+    snapshot[:] = domains
+    set_int64(cache, LINEAR_IDX_SUM_MIN, domain_sum_min)
+    set_int64(cache, LINEAR_IDX_SUM_MAX, domain_sum_max)
+    set_int64(cache, LINEAR_IDX_WIDTH_MAX, width_max)
+    cache[LINEAR_IDX_UNBOUND_NB] = unbound_count
+    return domain_sum_min, domain_sum_max, width_max, unbound_count
+
+
+@njit(cache=True)
+def update_linear_cache(domains: NDArray, factors: NDArray, c: int, state: NDArray) -> tuple[int, int, int, int]:
+    """
+    Brings the cache of a linear propagator up to date with the domains, only looking at the changed positions
+    when the state is warm.
+
+    The cached largest width is an upper bound for the snapshot: it grows with the widths of the changed positions,
+    and it only decreases when the whole cache is recomputed.
+
+    :param domains: the domains of the variables
+    :type domains: NDArray
+    :param factors: the factors of the variables
+    :type factors: NDArray
+    :param c: the constant
+    :type c: int
+    :param state: the state of the propagator
+    :type state: NDArray
+
+    :return: the largest and the smallest values of sum a_i * x_i - c, the largest width and the unbound count
+    :rtype: Tuple[int, int, int, int]
+    """
+    if not is_warm(state):
+        return init_linear_cache(domains, factors, c, state)
+    positions, snapshot, cache = get_delta_regions(state, len(factors))
+    domain_sum_min = get_int64(cache, LINEAR_IDX_SUM_MIN)
+    domain_sum_max = get_int64(cache, LINEAR_IDX_SUM_MAX)
+    width_max = get_int64(cache, LINEAR_IDX_WIDTH_MAX)
+    unbound_count = cache[LINEAR_IDX_UNBOUND_NB]
+    for delta_idx in range(get_delta_nb(state)):
+        i = positions[delta_idx]
+        factor = factors[i]
+        old_min = snapshot[i, MIN]
+        old_max = snapshot[i, MAX]
+        x_min = domains[i, MIN]
+        x_max = domains[i, MAX]
+        if factor > 0:
+            domain_sum_min += factor * (x_max - old_max)
+            domain_sum_max += factor * (x_min - old_min)
+        else:
+            domain_sum_min += factor * (x_min - old_min)
+            domain_sum_max += factor * (x_max - old_max)
+        if factor != 0:
+            if old_min < old_max:
+                unbound_count -= 1
+            if x_min < x_max:
+                unbound_count += 1
+                width_max = max(width_max, abs(factor) * (x_max - x_min))
+        snapshot[i, MIN] = x_min
+        snapshot[i, MAX] = x_max
+    set_int64(cache, LINEAR_IDX_SUM_MIN, domain_sum_min)
+    set_int64(cache, LINEAR_IDX_SUM_MAX, domain_sum_max)
+    set_int64(cache, LINEAR_IDX_WIDTH_MAX, width_max)
+    cache[LINEAR_IDX_UNBOUND_NB] = unbound_count
+    return domain_sum_min, domain_sum_max, width_max, unbound_count
+
+
 @njit(cache=True)
 def get_triggers_linear_eq_c(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -54,9 +184,9 @@ def get_triggers_linear_eq_c(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_linear_eq_c(domains: NDArray, parameters: NDArray) -> int:
+def filter_linear_eq_c(domains: NDArray, parameters: NDArray) -> int:
     """
-    Implements :math:`\\sum_i a_i * x_i = a_{n}`.
+    Implements :math:`\\sum_i a_i * x_i = a_{n}` by rescanning all the domains.
 
     :param domains: the domains of the variables, x is an alias for domains
     :type domains: NDArray
@@ -116,3 +246,85 @@ def compute_domains_linear_eq_c(domains: NDArray, parameters: NDArray) -> int:
                 domains[i, MAX] = new_max
                 has_changed = True
     return PROP_CONSISTENCY
+
+
+@njit(cache=True)
+def compute_domains_linear_eq_c(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
+    """
+    Implements :math:`\\sum_i a_i * x_i = a_{n}`.
+
+    :param domains: the domains of the variables, x is an alias for domains
+    :type domains: NDArray
+    :param parameters: the parameters of the propagator, a is an alias for parameters
+    :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_linear_eq_c
+    :type state: NDArray
+
+    :return: the status of the propagation (consistency, inconsistency or entailment) as an int
+    :rtype: int
+    """
+    if len(state) == 0:
+        return filter_linear_eq_c(domains, parameters)
+    factors = parameters[:-1]
+    n = len(factors)
+    # domain_sum_min / domain_sum_max bracket the value of (sum a_i * x_i - a_n): domain_sum_min is
+    # its largest possible value, domain_sum_max its smallest (the swapped naming is shared with the
+    # geq/leq propagators). They are first obtained from the changed positions only: a bound can only be
+    # filtered when a weighted width exceeds domain_sum_min or -domain_sum_max, otherwise the domains are left as is.
+    domain_sum_min, domain_sum_max, width_max, unbound_count = update_linear_cache(
+        domains, factors, parameters[-1], state
+    )
+    if domain_sum_max > 0 or domain_sum_min < 0:
+        return PROP_INCONSISTENCY
+    if unbound_count == 0:
+        return PROP_ENTAILMENT
+    if width_max <= domain_sum_min and width_max <= -domain_sum_max:
+        return PROP_CONSISTENCY
+    # The bounds are recomputed and re-filtered until a fixpoint is reached.
+    has_changed = True
+    while has_changed:
+        has_changed = False
+        domain_sum_min = domain_sum_max = -parameters[-1]
+        unbound_count = 0
+        for i in range(n):
+            factor = factors[i]
+            x_min = domains[i, MIN]
+            x_max = domains[i, MAX]
+            if factor > 0:
+                domain_sum_min += factor * x_max
+                domain_sum_max += factor * x_min
+            else:
+                domain_sum_min += factor * x_min
+                domain_sum_max += factor * x_max
+            if factor != 0 and x_min < x_max:
+                unbound_count += 1
+        # If the sum is forced strictly above or below a_n the equality is unsatisfiable. This single
+        # global test catches every inconsistency, so the per-variable x[MIN] > x[MAX] check that used
+        # to sit inside the filtering loop below is redundant and was dropped.
+        if domain_sum_max > 0 or domain_sum_min < 0:
+            return PROP_INCONSISTENCY
+        if unbound_count == 0:
+            return PROP_ENTAILMENT
+        for i in range(n):
+            factor = factors[i]
+            if factor == 0:
+                continue
+            x_min = domains[i, MIN]
+            x_max = domains[i, MAX]
+            if x_min == x_max:
+                continue
+            if factor > 0:
+                new_min = x_max - (domain_sum_min // factor)
+                new_max = x_min + (-domain_sum_max // factor)
+            else:
+                new_min = x_max - (domain_sum_max // factor)
+                new_max = x_min + (-domain_sum_min // factor)
+            if new_min > x_min:
+                domains[i, MIN] = new_min
+                has_changed = True
+            if new_max < x_max:
+                domains[i, MAX] = new_max
+                has_changed = True
+    # the filtered domains become the snapshot, so that the cached largest width decreases
+    init_linear_cache(domains, factors, parameters[-1], state)
+    return PROP_CONSISTENCY
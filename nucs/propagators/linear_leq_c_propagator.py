@@ -23,6 +23,11 @@ from nucs.constants import (
     PROP_ENTAILMENT,
     PROP_INCONSISTENCY,
 )
+from nucs.propagators.linear_eq_c_propagator import (
+    get_state_size_linear_eq_c,
+    init_linear_cache,
+    update_linear_cache,
+)
 
 
 def get_complexity_linear_leq_c(n: int, parameters: NDArray) -> int:
@@ -40,6 +45,21 @@ def get_complexity_linear_leq_c(n: int, parameters: NDArray) -> int:
     return n
 
 
+def get_state_size_linear_leq_c(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: the delta, then the cache of the sums.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return get_state_size_linear_eq_c(n, parameters)
+
+
 @njit(cache=True)
 def get_triggers_linear_leq_c(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -57,9 +77,9 @@ def get_triggers_linear_leq_c(n: int, variable: int, parameters: NDArray) -> int
 
 
 @njit(cache=True)
-def compute_domains_linear_leq_c(domains: NDArray, parameters: NDArray) -> int:
+def filter_linear_leq_c(domains: NDArray, parameters: NDArray) -> int:
     """
-    Implements :math:`\\sum_i a_i * x_i <= a_{n}`.
+    Implements :math:`\\sum_i a_i * x_i <= a_{n}` by rescanning all the domains.
 
     :param domains: the domains of the variables, x is an alias for domains
     :type domains: NDArray
@@ -113,3 +133,61 @@ def compute_domains_linear_leq_c(domains: NDArray, parameters: NDArray) -> int:
     if domain_sum_min <= 0:
         return PROP_ENTAILMENT
     return PROP_CONSISTENCY
+
+
+@njit(cache=True)
+def compute_domains_linear_leq_c(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
+    """
+    Implements :math:`\\sum_i a_i * x_i <= a_{n}`.
+
+    :param domains: the domains of the variables, x is an alias for domains
+    :type domains: NDArray
+    :param parameters: the parameters of the propagator, a is an alias for parameters
+    :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_linear_leq_c
+    :type state: NDArray
+
+    :return: the status of the propagation (consistency, inconsistency or entailment) as an int
+    :rtype: int
+    """
+    if len(state) == 0:
+        return filter_linear_leq_c(domains, parameters)
+    factors = parameters[:-1]
+    n = len(factors)
+    # domain_sum_min / domain_sum_max bracket the value of (sum a_i * x_i - a_n): domain_sum_min is
+    # its largest possible value, domain_sum_max its smallest. The constraint holds when this value
+    # can be <= 0, i.e. domain_sum_max <= 0; it is entailed once domain_sum_min <= 0.
+    # They are obtained from the changed positions only.
+    domain_sum_min, domain_sum_max, width_max, _ = update_linear_cache(domains, factors, parameters[-1], state)
+    if domain_sum_min <= 0:
+        return PROP_ENTAILMENT
+    if domain_sum_max > 0:
+        return PROP_INCONSISTENCY
+    if width_max <= -domain_sum_max:  # no weighted width exceeds the slack: no bound can be filtered
+        return PROP_CONSISTENCY
+    # A single pass reaches the fixpoint: the bounds are derived from domain_sum_max, and
+    # tightening x_max (factor > 0) or x_min (factor < 0) never changes domain_sum_max, so a
+    # second pass would compute the same bounds. domain_sum_min is updated to detect entailment.
+    for i in range(n):
+        factor = factors[i]
+        if factor == 0:
+            continue
+        x_min = domains[i, MIN]
+        x_max = domains[i, MAX]
+        if x_min == x_max:
+            continue
+        if factor > 0:
+            new_max = x_min + (-domain_sum_max // factor)
+            if new_max < x_max:
+                domains[i, MAX] = new_max
+                domain_sum_min += factor * (new_max - x_max)
+        else:
+            new_min = x_max - (domain_sum_max // factor)
+            if new_min > x_min:
+                domains[i, MIN] = new_min
+                domain_sum_min += factor * (new_min - x_min)
+    # the filtered domains become the snapshot, so that the cached largest width decreases
+    init_linear_cache(domains, factors, parameters[-1], state)
+    if domain_sum_min <= 0:
+        return PROP_ENTAILMENT
+    return PROP_CONSISTENCY
@@ -46,7 +46,7 @@ def get_triggers_max_eq(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_max_eq(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_max_eq(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`\\max_i x_i = x_{n-1}`.
 
@@ -54,6 +54,8 @@ def compute_domains_max_eq(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: unused here
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
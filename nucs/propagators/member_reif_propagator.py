@@ -50,7 +50,7 @@ def get_triggers_member_reif(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_member_reif(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_member_reif(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`b <=> x \\in \\{a_0, ..., a_{n-1}\\}`.
 
@@ -63,6 +63,8 @@ def compute_domains_member_reif(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: the allowed values, in strictly ascending order
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -117,7 +117,7 @@ def _last_le(end: int, rl: int, ru: int, m: int) -> int:
 
 
 @njit(cache=True)
-def compute_domains_mod_c_eq(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_mod_c_eq(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`x \\bmod m = z` for a constant modulus m, with truncated division (the remainder takes
     the sign of the dividend x), i.e. the FlatZinc/MiniZinc ``int_mod`` semantics with a fixed divisor.
@@ -129,6 +129,8 @@ def compute_domains_mod_c_eq(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: the parameters, m is parameters[0]
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -50,7 +50,7 @@ def get_triggers_mod_eq(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_mod_eq(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_mod_eq(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`x \\bmod y = z` with truncated division (the remainder takes the sign of the
     dividend x), i.e. the FlatZinc/MiniZinc ``int_mod`` semantics.
@@ -59,6 +59,8 @@ def compute_domains_mod_eq(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: unused here
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -50,7 +50,7 @@ def get_triggers_mul_c_eq(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_mul_c_eq(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_mul_c_eq(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`x * c = y`.
 
@@ -58,6 +58,8 @@ def compute_domains_mul_c_eq(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: the constant c, parameters[0]
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency or inconsistency) as an int
     :rtype: int
@@ -50,7 +50,7 @@ def get_triggers_neq_reif(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_neq_reif(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_neq_reif(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements :math:`b <=> x \\neq y`.
 
@@ -58,6 +58,8 @@ def compute_domains_neq_reif(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: unused
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
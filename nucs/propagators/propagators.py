@@ -25,32 +25,44 @@ from nucs.propagators.add_c_eq_propagator import (
 from nucs.propagators.alldifferent_propagator import (
     compute_domains_alldifferent,
     get_complexity_alldifferent,
+    get_state_size_alldifferent,
     get_triggers_alldifferent,
 )
 from nucs.propagators.and_eq_propagator import compute_domains_and_eq, get_complexity_and_eq, get_triggers_and_eq
 from nucs.propagators.bin_packing_load_propagator import (
     compute_domains_bin_packing_load,
     get_complexity_bin_packing_load,
+    get_state_size_bin_packing_load,
     get_triggers_bin_packing_load,
 )
+from nucs.propagators.circuit_cost_propagator import (
+    compute_domains_circuit_cost,
+    get_complexity_circuit_cost,
+    get_state_size_circuit_cost,
+    get_triggers_circuit_cost,
+)
 from nucs.propagators.count_eq_c_propagator import (
     compute_domains_count_eq_c,
     get_complexity_count_eq_c,
+    get_state_size_count_eq_c,
     get_triggers_count_eq_c,
 )
 from nucs.propagators.count_eq_propagator import (
     compute_domains_count_eq,
     get_complexity_count_eq,
+    get_state_size_count_eq,
     get_triggers_count_eq,
 )
 from nucs.propagators.count_geq_c_propagator import (
     compute_domains_count_geq_c,
     get_complexity_count_geq_c,
+    get_state_size_count_geq_c,
     get_triggers_count_geq_c,
 )
 from nucs.propagators.count_leq_c_propagator import (
     compute_domains_count_leq_c,
     get_complexity_count_leq_c,
+    get_state_size_count_leq_c,
     get_triggers_count_leq_c,
 )
 from nucs.propagators.cumulative_propagator import (
@@ -58,17 +70,21 @@ from nucs.propagators.cumulative_propagator import (
     compute_domains_cumulative_var,
     get_complexity_cumulative,
     get_complexity_cumulative_var,
+    get_state_size_cumulative,
+    get_state_size_cumulative_var,
     get_triggers_cumulative,
     get_triggers_cumulative_var,
 )
 from nucs.propagators.diffn_propagator import (
     compute_domains_diffn,
     get_complexity_diffn,
+    get_state_size_diffn,
     get_triggers_diffn,
 )
 from nucs.propagators.disjunctive_propagator import (
     compute_domains_disjunctive,
     get_complexity_disjunctive,
+    get_state_size_disjunctive,
     get_triggers_disjunctive,
 )
 from nucs.propagators.div_c_eq_propagator import (
@@ -123,7 +139,12 @@ from nucs.propagators.eq_reif_propagator import (
     get_complexity_eq_reif,
     get_triggers_eq_reif,
 )
-from nucs.propagators.gcc_propagator import compute_domains_gcc, get_complexity_gcc, get_triggers_gcc
+from nucs.propagators.gcc_propagator import (
+    compute_domains_gcc,
+    get_complexity_gcc,
+    get_state_size_gcc,
+    get_triggers_gcc,
+)
 from nucs.propagators.if_then_else_propagator import (
     compute_domains_if_then_else,
     get_complexity_if_then_else,
@@ -158,16 +179,19 @@ from nucs.propagators.lexleq_propagator import (
 from nucs.propagators.linear_eq_c_propagator import (
     compute_domains_linear_eq_c,
     get_complexity_linear_eq_c,
+    get_state_size_linear_eq_c,
     get_triggers_linear_eq_c,
 )
 from nucs.propagators.linear_geq_c_propagator import (
     compute_domains_linear_geq_c,
     get_complexity_linear_geq_c,
+    get_state_size_linear_geq_c,
     get_triggers_linear_geq_c,
 )
 from nucs.propagators.linear_leq_c_propagator import (
     compute_domains_linear_leq_c,
     get_complexity_linear_leq_c,
+    get_state_size_linear_leq_c,
     get_triggers_linear_leq_c,
 )
 from nucs.propagators.linear_neq_c_propagator import (
@@ -224,11 +248,13 @@ from nucs.propagators.nvalue_propagator import (
 from nucs.propagators.regular_propagator import (
     compute_domains_regular,
     get_complexity_regular,
+    get_state_size_regular,
     get_triggers_regular,
 )
 from nucs.propagators.relation_propagator import (
     compute_domains_relation,
     get_complexity_relation,
+    get_state_size_relation,
     get_triggers_relation,
 )
 from nucs.propagators.scc_propagator import compute_domains_scc, get_complexity_scc, get_triggers_scc
@@ -247,7 +273,12 @@ from nucs.propagators.sum_eq_c_propagator import (
     get_complexity_sum_eq_c,
     get_triggers_sum_eq_c,
 )
-from nucs.propagators.sum_eq_propagator import compute_domains_sum_eq, get_complexity_sum_eq, get_triggers_sum_eq
+from nucs.propagators.sum_eq_propagator import (
+    compute_domains_sum_eq,
+    get_complexity_sum_eq,
+    get_state_size_sum_eq,
+    get_triggers_sum_eq,
+)
 from nucs.propagators.sum_geq_c_propagator import (
     compute_domains_sum_geq_c,
     get_complexity_sum_geq_c,
@@ -258,6 +289,12 @@ from nucs.propagators.sum_leq_c_propagator import (
     get_complexity_sum_leq_c,
     get_triggers_sum_leq_c,
 )
+from nucs.propagators.table_propagator import (
+    compute_domains_table,
+    get_complexity_table,
+    get_state_size_table,
+    get_triggers_table,
+)
 from nucs.propagators.value_precede_propagator import (
     compute_domains_value_precede,
     get_complexity_value_precede,
@@ -267,6 +304,10 @@ from nucs.propagators.value_precede_propagator import (
 GET_TRIGGERS_FCTS: list[Callable] = []
 GET_COMPLEXITY_FCTS: list[Callable] = []
 COMPUTE_DOMAINS_FCTS: list[Callable] = []
+# the functions sizing the state of the stateful propagators, None for a stateless propagator
+GET_STATE_SIZE_FCTS: list[Callable | None] = []
+# whether the propagators are given the positions of their variables that changed since their previous call
+INCREMENTAL_ALGS: list[bool] = []
 
 
 def get_algorithm_nb() -> int:
@@ -277,6 +318,8 @@ def register_propagator(
     get_triggers_fct: Callable,
     get_complexity_fct: Callable,
     compute_domains_fct: Callable,
+    get_state_size_fct: Callable | None = None,
+    incremental: bool = False,
 ) -> int:
     """
     Registers a propagator by adding its functions to the corresponding lists of functions.
@@ -287,6 +330,12 @@ def register_propagator(
     :type get_complexity_fct: Callable
     :param compute_domains_fct: a function that computes the domains
     :type compute_domains_fct: Callable
+    :param get_state_size_fct: a function that computes the size of the state, the solver allocating and passing
+                               it to compute_domains_fct, defaults to None for a stateless propagator
+    :type get_state_size_fct: Optional[Callable]
+    :param incremental: whether the state starts with the delta of the changed positions (see nucs.propagators.deltas),
+                        defaults to False
+    :type incremental: bool
 
     :return: the index of the propagator
     :rtype: int
@@ -294,6 +343,8 @@ def register_propagator(
     GET_TRIGGERS_FCTS.append(get_triggers_fct)
     GET_COMPLEXITY_FCTS.append(get_complexity_fct)
     COMPUTE_DOMAINS_FCTS.append(compute_domains_fct)
+    GET_STATE_SIZE_FCTS.append(get_state_size_fct)
+    INCREMENTAL_ALGS.append(incremental)
     return get_algorithm_nb() - 1
 
 
@@ -301,31 +352,82 @@ ALG_ABS_EQ = register_propagator(get_triggers_abs_eq, get_complexity_abs_eq, com
 ALG_ADD_C_EQ = register_propagator(get_triggers_add_c_eq, get_complexity_add_c_eq, compute_domains_add_c_eq)
 ALG_AND_EQ = register_propagator(get_triggers_and_eq, get_complexity_and_eq, compute_domains_and_eq)
 ALG_BIN_PACKING_LOAD = register_propagator(
-    get_triggers_bin_packing_load, get_complexity_bin_packing_load, compute_domains_bin_packing_load
+    get_triggers_bin_packing_load,
+    get_complexity_bin_packing_load,
+    compute_domains_bin_packing_load,
+    get_state_size_bin_packing_load,
+)
+ALG_LINEAR_EQ_C = register_propagator(
+    get_triggers_linear_eq_c,
+    get_complexity_linear_eq_c,
+    compute_domains_linear_eq_c,
+    get_state_size_linear_eq_c,
+    incremental=True,
 )
-ALG_LINEAR_EQ_C = register_propagator(get_triggers_linear_eq_c, get_complexity_linear_eq_c, compute_domains_linear_eq_c)
 ALG_LINEAR_GEQ_C = register_propagator(
-    get_triggers_linear_geq_c, get_complexity_linear_geq_c, compute_domains_linear_geq_c
+    get_triggers_linear_geq_c,
+    get_complexity_linear_geq_c,
+    compute_domains_linear_geq_c,
+    get_state_size_linear_geq_c,
+    incremental=True,
 )
 ALG_LINEAR_LEQ_C = register_propagator(
-    get_triggers_linear_leq_c, get_complexity_linear_leq_c, compute_domains_linear_leq_c
+    get_triggers_linear_leq_c,
+    get_complexity_linear_leq_c,
+    compute_domains_linear_leq_c,
+    get_state_size_linear_leq_c,
+    incremental=True,
 )
 ALG_LINEAR_NEQ_C = register_propagator(
     get_triggers_linear_neq_c, get_complexity_linear_neq_c, compute_domains_linear_neq_c
 )
 ALG_ALLDIFFERENT = register_propagator(
-    get_triggers_alldifferent, get_complexity_alldifferent, compute_domains_alldifferent
+    get_triggers_alldifferent, get_complexity_alldifferent, compute_domains_alldifferent, get_state_size_alldifferent
+)
+ALG_CIRCUIT_COST = register_propagator(
+    get_triggers_circuit_cost, get_complexity_circuit_cost, compute_domains_circuit_cost, get_state_size_circuit_cost
+)
+ALG_COUNT_EQ = register_propagator(
+    get_triggers_count_eq,
+    get_complexity_count_eq,
+    compute_domains_count_eq,
+    get_state_size_count_eq,
+    incremental=True,
+)
+ALG_COUNT_EQ_C = register_propagator(
+    get_triggers_count_eq_c,
+    get_complexity_count_eq_c,
+    compute_domains_count_eq_c,
+    get_state_size_count_eq_c,
+    incremental=True,
+)
+ALG_COUNT_GEQ_C = register_propagator(
+    get_triggers_count_geq_c,
+    get_complexity_count_geq_c,
+    compute_domains_count_geq_c,
+    get_state_size_count_geq_c,
+    incremental=True,
+)
+ALG_COUNT_LEQ_C = register_propagator(
+    get_triggers_count_leq_c,
+    get_complexity_count_leq_c,
+    compute_domains_count_leq_c,
+    get_state_size_count_leq_c,
+    incremental=True,
+)
+ALG_CUMULATIVE = register_propagator(
+    get_triggers_cumulative, get_complexity_cumulative, compute_domains_cumulative, get_state_size_cumulative
 )
-ALG_COUNT_EQ = register_propagator(get_triggers_count_eq, get_complexity_count_eq, compute_domains_count_eq)
-ALG_COUNT_EQ_C = register_propagator(get_triggers_count_eq_c, get_complexity_count_eq_c, compute_domains_count_eq_c)
-ALG_COUNT_GEQ_C = register_propagator(get_triggers_count_geq_c, get_complexity_count_geq_c, compute_domains_count_geq_c)
-ALG_COUNT_LEQ_C = register_propagator(get_triggers_count_leq_c, get_complexity_count_leq_c, compute_domains_count_leq_c)
-ALG_CUMULATIVE = register_propagator(get_triggers_cumulative, get_complexity_cumulative, compute_domains_cumulative)
 ALG_CUMULATIVE_VAR = register_propagator(
-    get_triggers_cumulative_var, get_complexity_cumulative_var, compute_domains_cumulative_var
+    get_triggers_cumulative_var,
+    get_complexity_cumulative_var,
+    compute_domains_cumulative_var,
+    get_state_size_cumulative_var,
+)
+ALG_DIFFN = register_propagator(get_triggers_diffn, get_complexity_diffn, compute_domains_diffn, get_state_size_diffn)
+ALG_DISJUNCTIVE = register_propagator(
+    get_triggers_disjunctive, get_complexity_disjunctive, compute_domains_disjunctive, get_state_size_disjunctive
 )
-ALG_DIFFN = register_propagator(get_triggers_diffn, get_complexity_diffn, compute_domains_diffn)
-ALG_DISJUNCTIVE = register_propagator(get_triggers_disjunctive, get_complexity_disjunctive, compute_domains_disjunctive)
 ALG_DIV_C_EQ = register_propagator(get_triggers_div_c_eq, get_complexity_div_c_eq, compute_domains_div_c_eq)
 ALG_DUMMY = register_propagator(get_triggers_dummy, get_complexity_dummy, compute_domains_dummy)
 ALG_ELEMENT_EQ = register_propagator(get_triggers_element_eq, get_complexity_element_eq, compute_domains_element_eq)
@@ -350,7 +452,7 @@ ALG_EQ_C_IMP = register_propagator(get_triggers_eq_c_imp, get_complexity_eq_c_im
 ALG_EQ_C_REIF = register_propagator(get_triggers_eq_c_reif, get_complexity_eq_c_reif, compute_domains_eq_c_reif)
 ALG_EQ_IMP = register_propagator(get_triggers_eq_imp, get_complexity_eq_imp, compute_domains_eq_imp)
 ALG_EQ_REIF = register_propagator(get_triggers_eq_reif, get_complexity_eq_reif, compute_domains_eq_reif)
-ALG_GCC = register_propagator(get_triggers_gcc, get_complexity_gcc, compute_domains_gcc)
+ALG_GCC = register_propagator(get_triggers_gcc, get_complexity_gcc, compute_domains_gcc, get_state_size_gcc)
 ALG_IF_THEN_ELSE = register_propagator(
     get_triggers_if_then_else, get_complexity_if_then_else, compute_domains_if_then_else
 )
@@ -376,17 +478,28 @@ ALG_NO_SUB_CYCLE = register_propagator(
     get_triggers_no_sub_cycle, get_complexity_no_sub_cycle, compute_domains_no_sub_cycle
 )
 ALG_NVALUE = register_propagator(get_triggers_nvalue, get_complexity_nvalue, compute_domains_nvalue)
-ALG_REGULAR = register_propagator(get_triggers_regular, get_complexity_regular, compute_domains_regular)
-ALG_RELATION = register_propagator(get_triggers_relation, get_complexity_relation, compute_domains_relation)
+ALG_REGULAR = register_propagator(
+    get_triggers_regular, get_complexity_regular, compute_domains_regular, get_state_size_regular
+)
+ALG_RELATION = register_propagator(
+    get_triggers_relation, get_complexity_relation, compute_domains_relation, get_state_size_relation
+)
 ALG_SCC = register_propagator(get_triggers_scc, get_complexity_scc, compute_domains_scc)
 ALG_STRICTLY_INCREASING = register_propagator(
     get_triggers_strictly_increasing, get_complexity_strictly_increasing, compute_domains_strictly_increasing
 )
 ALG_SUBCIRCUIT = register_propagator(get_triggers_subcircuit, get_complexity_subcircuit, compute_domains_subcircuit)
-ALG_SUM_EQ = register_propagator(get_triggers_sum_eq, get_complexity_sum_eq, compute_domains_sum_eq)
+ALG_SUM_EQ = register_propagator(
+    get_triggers_sum_eq,
+    get_complexity_sum_eq,
+    compute_domains_sum_eq,
+    get_state_size_sum_eq,
+    incremental=True,
+)
 ALG_SUM_EQ_C = register_propagator(get_triggers_sum_eq_c, get_complexity_sum_eq_c, compute_domains_sum_eq_c)
 ALG_SUM_GEQ_C = register_propagator(get_triggers_sum_geq_c, get_complexity_sum_geq_c, compute_domains_sum_geq_c)
 ALG_SUM_LEQ_C = register_propagator(get_triggers_sum_leq_c, get_complexity_sum_leq_c, compute_domains_sum_leq_c)
+ALG_TABLE = register_propagator(get_triggers_table, get_complexity_table, compute_domains_table, get_state_size_table)
 ALG_VALUE_PRECEDE = register_propagator(
     get_triggers_value_precede, get_complexity_value_precede, compute_domains_value_precede
 )
@@ -16,6 +16,21 @@ from numpy.typing import NDArray
 
 from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
 
+# The state of the propagator is laid out as:
+# - a warm flag, the number of states and the initial state of the minimized automaton,
+# - the domains the layered graph was computed from,
+# - the minimized automaton: its transitions (-1 meaning no transition) and its accepting flags,
+# - its edges by symbol (CSR: the offsets then the source states),
+# - its edges by target state (CSR: the offsets, then the source states and the symbols),
+# - the layered graph: whether each state of each layer is alive (reachable from the initial state and reaching an
+#   accepting state), its out and in degrees, and for each position and symbol the number of alive edges,
+# - a stack of the states to remove.
+# The states of the minimized automaton are numbered from 0.
+REGULAR_IDX_WARM = 0
+REGULAR_IDX_STATE_NB = 1
+REGULAR_IDX_INITIAL_STATE = 2
+REGULAR_HEADER_NB = 3
+
 
 def get_complexity_regular(n: int, parameters: NDArray) -> int:
     """
@@ -34,6 +49,23 @@ def get_complexity_regular(n: int, parameters: NDArray) -> int:
     return n * q * s
 
 
+def get_state_size_regular(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state, see the layout above; the minimized automaton has at most Q states.
+
+    :param n: the number of variables (the sequence length)
+    :type n: int
+    :param parameters: the DFA description, starting with the state count and the symbol count
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    q = int(parameters[0])
+    s = int(parameters[1])
+    return REGULAR_HEADER_NB + 2 * n + 4 * q * s + 2 * q + s + 2 + 5 * (n + 1) * q + n * (s + 1)
+
+
 @njit(cache=True)
 def get_triggers_regular(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -53,25 +85,159 @@ def get_triggers_regular(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def _supported(
-    domains: NDArray, parameters: NDArray, fwd: NDArray, bwd: NDArray, i: int, v: int, q_nb: int, s_nb: int
-) -> bool:
+def minimize_dfa(parameters: NDArray, transitions: NDArray, accepting: NDArray) -> tuple[int, int]:
+    """
+    Minimizes the automaton: the states that are not reachable from the initial state, or that cannot reach an
+    accepting state, are removed, and the equivalent states are merged (Moore's partition refinement).
+
+    :param parameters: the DFA description
+    :type parameters: NDArray
+    :param transitions: the (Q, S) transitions of the minimized automaton, -1 meaning no transition
+    :type transitions: NDArray
+    :param accepting: the accepting flags of the minimized automaton
+    :type accepting: NDArray
+
+    :return: the number of states and the initial state of the minimized automaton, (0, -1) when it is empty
+    :rtype: Tuple[int, int]
+    """
+    q_nb = parameters[0]
+    s_nb = parameters[1]
+    q0 = parameters[2] - 1
+    acc_off = 3 + q_nb * s_nb
+    reachable = np.zeros(q_nb, dtype=np.bool_)
+    reachable[q0] = True
+    change = True
+    while change:
+        change = False
+        for q in range(q_nb):
+            if reachable[q]:
+                for v in range(s_nb):
+                    nq = parameters[3 + q * s_nb + v] - 1
+                    if nq >= 0 and not reachable[nq]:
+                        reachable[nq] = True
+                        change = True
+    useful = np.zeros(q_nb, dtype=np.bool_)
+    for q in range(q_nb):
+        useful[q] = parameters[acc_off + q] != 0
+    change = True
+    while change:
+        change = False
+        for q in range(q_nb):
+            if not useful[q]:
+                for v in range(s_nb):
+                    nq = parameters[3 + q * s_nb + v] - 1
+                    if nq >= 0 and useful[nq]:
+                        useful[q] = True
+                        change = True
+                        break
+    for q in range(q_nb):
+        useful[q] = useful[q] and reachable[q]
+    if not useful[q0]:
+        return 0, -1
+    # the classes of the useful states, refined until they are stable
+    classes = np.full(q_nb, -1, dtype=np.int32)
+    for q in range(q_nb):
+        if useful[q]:
+            classes[q] = 1 if parameters[acc_off + q] != 0 else 0
+    new_classes = np.full(q_nb, -1, dtype=np.int32)
+    representatives = np.empty(q_nb, dtype=np.int32)
+    class_nb = 0
+    while True:
+        new_class_nb = 0
+        for q in range(q_nb):
+            if not useful[q]:
+                continue
+            new_classes[q] = -1
+            for c in range(new_class_nb):
+                r = representatives[c]
+                if classes[r] != classes[q]:
+                    continue
+                same = True
+                for v in range(s_nb):
+                    nq = parameters[3 + q * s_nb + v] - 1
+                    nr = parameters[3 + r * s_nb + v] - 1
+                    cq = classes[nq] if nq >= 0 else -1
+                    cr = classes[nr] if nr >= 0 else -1
+                    if cq != cr:
+                        same = False
+                        break
+                if same:
+                    new_classes[q] = c
+                    break
+            if new_classes[q] == -1:
+                representatives[new_class_nb] = q
+                new_classes[q] = new_class_nb
+                new_class_nb += 1
+        classes[:] = new_classes
+        if new_class_nb == class_nb:
+            break
+        class_nb = new_class_nb
+    for c in range(class_nb):
+        r = representatives[c]
+        accepting[c] = parameters[acc_off + r]
+        for v in range(s_nb):
+            nr = parameters[3 + r * s_nb + v] - 1
+            transitions[c, v] = classes[nr] if nr >= 0 else -1
+    return class_nb, classes[q0]
+
+
+@njit(cache=True)
+def kill_states(
+    stack: NDArray,
+    stack_size: int,
+    snapshot: NDArray,
+    transitions: NDArray,
+    pred_offsets: NDArray,
+    pred_states: NDArray,
+    pred_symbols: NDArray,
+    alive: NDArray,
+    out_degrees: NDArray,
+    in_degrees: NDArray,
+    counts: NDArray,
+) -> None:
     """
-    Returns whether symbol ``v`` at position ``i`` lies on a valid path (a forward-reachable state reads it into
-    a state that can still reach acceptance).
+    Removes the states of the stack from the layered graph, with their alive edges, and then the states left
+    without an outgoing or an incoming edge.
+
+    :param stack: the stack of the (layer, state) to remove, as layer * Q + state
+    :type stack: NDArray
+    :param stack_size: the size of the stack
+    :type stack_size: int
+    :param snapshot: the domains of the layered graph
+    :type snapshot: NDArray
     """
-    if v < 1 or v > s_nb:
-        return False
-    for q in range(1, q_nb + 1):
-        if fwd[i, q]:
-            nq = parameters[3 + (q - 1) * s_nb + (v - 1)]
-            if nq != 0 and bwd[i + 1, nq]:
-                return True
-    return False
+    length = len(snapshot)
+    q_nb = alive.shape[1]
+    s_nb = transitions.shape[1]
+    while stack_size > 0:
+        stack_size -= 1
+        i, q = divmod(stack[stack_size], q_nb)
+        if not alive[i, q]:
+            continue
+        alive[i, q] = 0
+        if i < length:
+            for v in range(max(1, snapshot[i, MIN]), min(s_nb, snapshot[i, MAX]) + 1):
+                nq = transitions[q, v - 1]
+                if nq >= 0 and alive[i + 1, nq]:
+                    counts[i, v] -= 1
+                    in_degrees[i + 1, nq] -= 1
+                    if in_degrees[i + 1, nq] == 0:
+                        stack[stack_size] = (i + 1) * q_nb + nq
+                        stack_size += 1
+        if i > 0:
+            for e in range(pred_offsets[q], pred_offsets[q + 1]):
+                p = pred_states[e]
+                v = pred_symbols[e]
+                if alive[i - 1, p] and snapshot[i - 1, MIN] <= v <= snapshot[i - 1, MAX]:
+                    counts[i - 1, v] -= 1
+                    out_degrees[i - 1, p] -= 1
+                    if out_degrees[i - 1, p] == 0:
+                        stack[stack_size] = (i - 1) * q_nb + p
+                        stack_size += 1
 
 
 @njit(cache=True)
-def compute_domains_regular(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_regular(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements the regular constraint: the sequence of variables must be accepted by a deterministic finite
     automaton.
@@ -81,77 +247,181 @@ def compute_domains_regular(domains: NDArray, parameters: NDArray) -> int:
     the state reached from state q on symbol v (0 meaning no transition), and ``a[q-1]`` whether state q is
     accepting.
 
-    Filtering follows Pesant's layered graph: a forward pass computes the states reachable at each position and
-    a backward pass the states from which acceptance is still reachable; a symbol is kept only when some
-    forward-reachable state reads it into a state that can still accept. On the interval domains only a bound
-    can be pruned, which is exact for a binary alphabet (no interior value to remove). The passes are iterated
-    to a fixpoint so a single call is idempotent.
+    Filtering follows Pesant's layered graph: the states of each layer that are reachable from the initial state and
+    reach an accepting state are alive, and a symbol is kept only when it labels an edge between alive states. On the
+    interval domains only a bound can be pruned, which is exact for a binary alphabet (no interior value to remove).
+
+    The automaton is minimized on the first call, and the layered graph is kept in the state (see
+    get_state_size_regular), together with the domains it was computed from. When the domains have been narrowed
+    since, only the edges of the removed symbols are removed, the states left without an outgoing or an incoming edge
+    being removed in turn, so that the cost follows the number of removed edges; the number of alive edges of each
+    symbol at each position then gives the new bounds. When a domain has been widened, as after a backtrack, the
+    graph is rebuilt. Since the state tells which domains it is valid for, it can be reused from any node of the
+    search tree, without being trailed.
 
     :param domains: the domains of the sequence variables
     :type domains: NDArray
     :param parameters: the DFA description, as above
     :type parameters: NDArray
+    :param state: the state of the propagator
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
     """
     length = len(domains)
-    q_nb = parameters[0]
+    q_max = parameters[0]
     s_nb = parameters[1]
-    q0 = parameters[2]
-    acc_off = 3 + q_nb * s_nb
     if length == 0:
-        return PROP_ENTAILMENT if parameters[acc_off + (q0 - 1)] else PROP_INCONSISTENCY
-    fwd = np.zeros((length + 1, q_nb + 1), dtype=np.uint8)
-    bwd = np.zeros((length + 1, q_nb + 1), dtype=np.uint8)
-    change = True
-    while change:
-        change = False
+        return PROP_ENTAILMENT if parameters[3 + q_max * s_nb + (parameters[2] - 1)] else PROP_INCONSISTENCY
+    start = REGULAR_HEADER_NB
+    snapshot = state[start : start + 2 * length].reshape(length, 2)
+    start += 2 * length
+    transitions = state[start : start + q_max * s_nb].reshape(q_max, s_nb)
+    start += q_max * s_nb
+    accepting = state[start : start + q_max]
+    start += q_max
+    symbol_offsets = state[start : start + s_nb + 1]
+    start += s_nb + 1
+    symbol_states = state[start : start + q_max * s_nb]
+    start += q_max * s_nb
+    pred_offsets = state[start : start + q_max + 1]
+    start += q_max + 1
+    pred_states = state[start : start + q_max * s_nb]
+    start += q_max * s_nb
+    pred_symbols = state[start : start + q_max * s_nb]
+    start += q_max * s_nb
+    layer_size = (length + 1) * q_max
+    alive = state[start : start + layer_size].reshape(length + 1, q_max)
+    start += layer_size
+    out_degrees = state[start : start + layer_size].reshape(length + 1, q_max)
+    start += layer_size
+    in_degrees = state[start : start + layer_size].reshape(length + 1, q_max)
+    start += layer_size
+    counts = state[start : start + length * (s_nb + 1)].reshape(length, s_nb + 1)
+    start += length * (s_nb + 1)
+    stack = state[start : start + 2 * layer_size]
+    rebuild = state[REGULAR_IDX_WARM] == 0
+    if rebuild:
+        # cold state: the automaton is minimized and its edges are indexed
+        q_nb, q0 = minimize_dfa(parameters, transitions, accepting)
+        state[REGULAR_IDX_STATE_NB] = q_nb
+        state[REGULAR_IDX_INITIAL_STATE] = q0
+        edge_nb = 0
+        for v in range(s_nb):
+            symbol_offsets[v] = edge_nb
+            for q in range(q_nb):
+                if transitions[q, v] >= 0:
+                    symbol_states[edge_nb] = q
+                    edge_nb += 1
+        symbol_offsets[s_nb] = edge_nb
+        edge_nb = 0
+        for nq in range(q_nb):
+            pred_offsets[nq] = edge_nb
+            for q in range(q_nb):
+                for v in range(s_nb):
+                    if transitions[q, v] == nq:
+                        pred_states[edge_nb] = q
+                        pred_symbols[edge_nb] = v + 1
+                        edge_nb += 1
+        pred_offsets[q_nb] = edge_nb
+        state[REGULAR_IDX_WARM] = 1
+    else:
+        q_nb = state[REGULAR_IDX_STATE_NB]
+        q0 = state[REGULAR_IDX_INITIAL_STATE]
+        for i in range(length):
+            if domains[i, MIN] < snapshot[i, MIN] or domains[i, MAX] > snapshot[i, MAX]:
+                # a domain has been widened: the removed edges cannot be restored one by one
+                rebuild = True
+                break
+    if q_nb == 0:
+        return PROP_INCONSISTENCY  # the automaton accepts no word
+    if rebuild:
+        snapshot[:] = domains
+        alive[:] = 0
+        out_degrees[:] = 0
+        in_degrees[:] = 0
+        counts[:] = 0
         # forward reachability
-        fwd[:] = 0
-        fwd[0, q0] = 1
+        alive[0, q0] = 1
         for i in range(length):
-            var = domains[i]
-            for q in range(1, q_nb + 1):
-                if fwd[i, q]:
-                    for v in range(max(1, var[MIN]), min(s_nb, var[MAX]) + 1):
-                        nq = parameters[3 + (q - 1) * s_nb + (v - 1)]
-                        if nq != 0:
-                            fwd[i + 1, nq] = 1
-        # backward reachability
-        bwd[:] = 0
-        for q in range(1, q_nb + 1):
-            if parameters[acc_off + (q - 1)]:
-                bwd[length, q] = 1
+            for q in range(q_nb):
+                if alive[i, q]:
+                    for v in range(max(1, domains[i, MIN]), min(s_nb, domains[i, MAX]) + 1):
+                        nq = transitions[q, v - 1]
+                        if nq >= 0:
+                            alive[i + 1, nq] = 1
+        # backward reachability, among the forward-reachable states
+        for q in range(q_nb):
+            if not accepting[q]:
+                alive[length, q] = 0
         for i in range(length - 1, -1, -1):
-            var = domains[i]
-            for q in range(1, q_nb + 1):
-                for v in range(max(1, var[MIN]), min(s_nb, var[MAX]) + 1):
-                    nq = parameters[3 + (q - 1) * s_nb + (v - 1)]
-                    if nq != 0 and bwd[i + 1, nq]:
-                        bwd[i, q] = 1
-                        break
-        if not bwd[0, q0]:
-            return PROP_INCONSISTENCY  # the initial state cannot reach acceptance
-        # prune each variable's bounds to the supported symbols
+            for q in range(q_nb):
+                if alive[i, q]:
+                    for v in range(max(1, domains[i, MIN]), min(s_nb, domains[i, MAX]) + 1):
+                        nq = transitions[q, v - 1]
+                        if nq >= 0 and alive[i + 1, nq]:
+                            out_degrees[i, q] += 1
+                            in_degrees[i + 1, nq] += 1
+                            counts[i, v] += 1
+                    if out_degrees[i, q] == 0:
+                        alive[i, q] = 0
+        # the states that remain are reachable from the initial state, the graph is consistent
+        stack_size = 0
+    else:
+        # the edges of the removed symbols are removed
+        stack_size = 0
         for i in range(length):
-            var = domains[i]
-            new_min = var[MIN]
-            while new_min <= var[MAX] and not _supported(domains, parameters, fwd, bwd, i, new_min, q_nb, s_nb):
-                new_min += 1
-            new_max = var[MAX]
-            while new_max >= new_min and not _supported(domains, parameters, fwd, bwd, i, new_max, q_nb, s_nb):
-                new_max -= 1
-            if new_min > new_max:
-                return PROP_INCONSISTENCY
-            if new_min != var[MIN] or new_max != var[MAX]:
-                var[MIN] = new_min
-                var[MAX] = new_max
-                change = True
+            old_min = snapshot[i, MIN]
+            old_max = snapshot[i, MAX]
+            if domains[i, MIN] == old_min and domains[i, MAX] == old_max:
+                continue
+            for v in range(max(1, old_min), min(s_nb, old_max) + 1):
+                if domains[i, MIN] <= v <= domains[i, MAX]:
+                    continue
+                for e in range(symbol_offsets[v - 1], symbol_offsets[v]):
+                    q = symbol_states[e]
+                    nq = transitions[q, v - 1]
+                    if alive[i, q] and alive[i + 1, nq]:
+                        counts[i, v] -= 1
+                        out_degrees[i, q] -= 1
+                        if out_degrees[i, q] == 0:
+                            stack[stack_size] = i * q_max + q
+                            stack_size += 1
+                        in_degrees[i + 1, nq] -= 1
+                        if in_degrees[i + 1, nq] == 0:
+                            stack[stack_size] = (i + 1) * q_max + nq
+                            stack_size += 1
+            snapshot[i] = domains[i]
+    kill_states(
+        stack,
+        stack_size,
+        snapshot,
+        transitions,
+        pred_offsets,
+        pred_states,
+        pred_symbols,
+        alive,
+        out_degrees,
+        in_degrees,
+        counts,
+    )
+    if not alive[0, q0]:
+        return PROP_INCONSISTENCY  # the initial state cannot reach acceptance
+    # the bounds are moved to the symbols labelling an alive edge, the graph is left unchanged
     ground_nb = 0
     for i in range(length):
-        if domains[i, MIN] == domains[i, MAX]:
+        new_min = max(1, domains[i, MIN])
+        while counts[i, new_min] == 0:
+            new_min += 1
+        new_max = min(s_nb, domains[i, MAX])
+        while counts[i, new_max] == 0:
+            new_max -= 1
+        domains[i, MIN] = new_min
+        domains[i, MAX] = new_max
+        if new_min == new_max:
             ground_nb += 1
+    snapshot[:] = domains
     if ground_nb == length:
         return PROP_ENTAILMENT  # a single accepted word remains
     return PROP_CONSISTENCY
@@ -10,7 +10,6 @@
 #
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
-import numpy as np
 from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
@@ -32,6 +31,21 @@ def get_complexity_relation(n: int, parameters: NDArray) -> int:
     return len(parameters)
 
 
+def get_state_size_relation(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: the scratch array of the bounds of the valid tuples.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return 2 * n
+
+
 @njit(cache=True)
 def get_triggers_relation(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -49,7 +63,7 @@ def get_triggers_relation(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_relation(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_relation(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements a relation over n variables defined by its allowed tuples.
 
@@ -59,6 +73,8 @@ def compute_domains_relation(domains: NDArray, parameters: NDArray) -> int:
            the allowed tuples correspond to:
            (parameters_0, ..., parameters_n-1), (parameters_n, ..., parameters_2n-1), ...
     :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_relation
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -67,9 +83,10 @@ def compute_domains_relation(domains: NDArray, parameters: NDArray) -> int:
     tuple_nb = len(parameters) // n
     # Single allocation-free pass over the tuples: a tuple is valid when every value lies within the current
     # domain bounds. We accumulate, per column, the min and max over the valid tuples in a small scratch array
-    # (we cannot write the result into domains yet, since the bounds are still needed to test validity). This
-    # avoids copying the whole tuple table -- and allocating a fresh array per filtered column -- on every call.
-    bounds = np.empty((n, 2), dtype=domains.dtype)
+    # kept in the state (we cannot write the result into domains yet, since the bounds are still needed to test
+    # validity). This avoids copying the whole tuple table -- and allocating a fresh array per filtered column --
+    # on every call.
+    bounds = state.reshape(n, 2)
     valid_nb = 0
     offset = 0
     for _ in range(tuple_nb):
@@ -0,0 +1,83 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.propagators.sorting import sort_permutation
+
+# the orders of the tasks kept by the states of the scheduling propagators
+ORDER_IDX_EST = 0  # by earliest start time
+ORDER_IDX_LCT = 1  # by latest completion time
+ORDER_IDX_LST = 2  # by latest start time
+ORDER_IDX_ECT = 3  # by earliest completion time
+ORDER_NB = 4
+
+
+@njit(cache=True)
+def sort_orders(est: NDArray, lct: NDArray, p: NDArray, n: int, orders: NDArray, warm: bool) -> None:
+    """
+    Sorts the tasks by earliest start, latest completion, latest start and earliest completion times.
+
+    When warm, the insertion sorts start from the orders of the previous sort: the bounds move little from a rule
+    to the next and from a call to the next (see sort_permutation).
+
+    :param est: the earliest start times
+    :type est: NDArray
+    :param lct: the latest completion times
+    :type lct: NDArray
+    :param p: the durations
+    :type p: NDArray
+    :param n: the number of tasks
+    :type n: int
+    :param orders: the (ORDER_NB, n) orders, sorted in place
+    :type orders: NDArray
+    :param warm: whether the orders already hold permutations of the tasks
+    :type warm: bool
+    """
+    sort_permutation(orders[ORDER_IDX_EST], est, p, 0, n, warm)
+    sort_permutation(orders[ORDER_IDX_LCT], lct, p, 0, n, warm)
+    sort_permutation(orders[ORDER_IDX_LST], lct, p, -1, n, warm)
+    sort_permutation(orders[ORDER_IDX_ECT], est, p, 1, n, warm)
+
+
+@njit(cache=True)
+def mirror_tasks(
+    est: NDArray, lct: NDArray, orders: NDArray, mest: NDArray, mlct: NDArray, morders: NDArray, n: int
+) -> None:
+    """
+    Mirrors time: the earliest start times of the mirrored tasks are the opposites of the latest completion
+    times, and the other way round. The orders of the mirrored tasks are the reversed orders of the tasks, the
+    latest start times being the opposites of the earliest completion times.
+
+    :param est: the earliest start times
+    :type est: NDArray
+    :param lct: the latest completion times
+    :type lct: NDArray
+    :param orders: the (ORDER_NB, n) orders of the tasks
+    :type orders: NDArray
+    :param mest: the earliest start times of the mirrored tasks, modified in place
+    :type mest: NDArray
+    :param mlct: the latest completion times of the mirrored tasks, modified in place
+    :type mlct: NDArray
+    :param morders: the (ORDER_NB, n) orders of the mirrored tasks, modified in place
+    :type morders: NDArray
+    :param n: the number of tasks
+    :type n: int
+    """
+    for i in range(n):
+        mest[i] = -lct[i]
+        mlct[i] = -est[i]
+        morders[ORDER_IDX_EST, i] = orders[ORDER_IDX_LCT, n - 1 - i]
+        morders[ORDER_IDX_LCT, i] = orders[ORDER_IDX_EST, n - 1 - i]
+        morders[ORDER_IDX_LST, i] = orders[ORDER_IDX_ECT, n - 1 - i]
+        morders[ORDER_IDX_ECT, i] = orders[ORDER_IDX_LST, n - 1 - i]
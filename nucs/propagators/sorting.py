@@ -0,0 +1,66 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+SORT_MAX_N = 64  # above this size, np.argsort amortizes its fixed cost and beats a cold insertion sort
+SORT_MAX_SHIFT_NB = 8  # above SORT_MAX_N, the shifts per element beyond which a warm insertion sort uses np.argsort
+
+
+@njit(cache=True, inline="always")
+def sort_permutation(order: NDArray, values: NDArray, offsets: NDArray, sign: int, n: int, warm: bool) -> None:
+    """
+    Sorts a permutation of the n first elements by their values plus sign times their offsets.
+
+    Below SORT_MAX_N, an insertion sort on the preallocated int32 permutation beats np.argsort, whose fixed cost
+    (allocating an int64 result, copying the keys, then narrowing to int32) dominates at small n.
+    When warm, the insertion sort starts from the permutation already in order: the propagators keep their
+    permutations in their states and the values move little between two calls, so it costs O(n + inversions).
+    Above SORT_MAX_N, a warm permutation far from sorted (e.g. after a backtrack to a distant node) would make the
+    insertion sort quadratic: once it has shifted more than SORT_MAX_SHIFT_NB * n elements, np.argsort takes over.
+    Inlined: as a separately cached function it would add a per-process load cost to every solver run.
+
+    :param order: the permutation, sorted in place
+    :type order: NDArray
+    :param values: the values of the elements
+    :type values: NDArray
+    :param offsets: the offsets of the elements, ignored when sign is 0
+    :type offsets: NDArray
+    :param sign: -1, 0 or 1
+    :type sign: int
+    :param n: the number of elements
+    :type n: int
+    :param warm: whether order already holds a permutation of the elements
+    :type warm: bool
+    """
+    if not warm:
+        if n > SORT_MAX_N:
+            order[:n] = np.argsort(values[:n] + sign * offsets[:n])
+            return
+        for i in range(n):
+            order[i] = i
+    shift_nb = SORT_MAX_SHIFT_NB * n if n > SORT_MAX_N else -1
+    for i in range(1, n):
+        element = order[i]
+        value = values[element] + sign * offsets[element]
+        j = i - 1
+        while j >= 0 and values[order[j]] + sign * offsets[order[j]] > value:
+            order[j + 1] = order[j]
+            j -= 1
+        order[j + 1] = element
+        if shift_nb >= 0:
+            shift_nb -= i - 1 - j
+            if shift_nb < 0:
+                order[:n] = np.argsort(values[:n] + sign * offsets[:n])
+                return
@@ -14,6 +14,21 @@ from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+from nucs.propagators.deltas import (
+    get_delta_nb,
+    get_delta_regions,
+    get_int64,
+    get_state_size_delta,
+    is_warm,
+    set_int64,
+)
+
+# the cache of the propagator
+SUM_EQ_CACHE_NB = 7
+SUM_EQ_IDX_X_MAX_SUM = 0  # the sum of the maxima of the x_i, on two cells
+SUM_EQ_IDX_X_MIN_SUM = 2  # the sum of the minima of the x_i, on two cells
+SUM_EQ_IDX_WIDTH_MAX = 4  # an upper bound of the largest max(x_i) - min(x_i), on two cells
+SUM_EQ_IDX_UNBOUND_NB = 6  # the number of unbound x_i
 
 
 def get_complexity_sum_eq(n: int, parameters: NDArray) -> int:
@@ -31,6 +46,97 @@ def get_complexity_sum_eq(n: int, parameters: NDArray) -> int:
     return n
 
 
+def get_state_size_sum_eq(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state: the delta, then the cache of the sums.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    return get_state_size_delta(n, SUM_EQ_CACHE_NB)
+
+
+@njit(cache=True)
+def init_sum_eq_cache(domains: NDArray, state: NDArray) -> tuple[int, int, int, int]:
+    """
+    Computes the cache from all the domains, which become the snapshot.
+
+    :param domains: the domains of the variables
+    :type domains: NDArray
+    :param state: the state of the propagator
+    :type state: NDArray
+
+    :return: the sums of the maximums and of the minimums of the x_i, the largest width and the unbound count
+    :rtype: Tuple[int, int, int, int]
+    """
+    n = len(domains) - 1
+    x_max_sum = x_min_sum = width_max = 0
+    x_unbound_count = 0
+    for i in range(n):
+        x_min = domains[i, MIN]
+        x_max = domains[i, MAX]
+        x_max_sum += x_max
+        x_min_sum += x_min
+        if x_min < x_max:
+            x_unbound_count += 1
+            width_max = max(width_max, x_max - x_min)
+    _, snapshot, cache = get_delta_regions(state, n + 1)
+    snapshot[:] = domains
+    set_int64(cache, SUM_EQ_IDX_X_MAX_SUM, x_max_sum)
+    set_int64(cache, SUM_EQ_IDX_X_MIN_SUM, x_min_sum)
+    set_int64(cache, SUM_EQ_IDX_WIDTH_MAX, width_max)
+    cache[SUM_EQ_IDX_UNBOUND_NB] = x_unbound_count
+    return x_max_sum, x_min_sum, width_max, x_unbound_count
+
+
+@njit(cache=True)
+def update_sum_eq_cache(domains: NDArray, state: NDArray) -> tuple[int, int, int, int]:
+    """
+    Brings the cache up to date with the domains, only looking at the changed positions when the state is warm.
+
+    :param domains: the domains of the variables
+    :type domains: NDArray
+    :param state: the state of the propagator
+    :type state: NDArray
+
+    :return: the sums of the maximums and of the minimums of the x_i, the largest width and the unbound count
+    :rtype: Tuple[int, int, int, int]
+    """
+    if not is_warm(state):
+        return init_sum_eq_cache(domains, state)
+    n = len(domains) - 1
+    positions, snapshot, cache = get_delta_regions(state, n + 1)
+    x_max_sum = get_int64(cache, SUM_EQ_IDX_X_MAX_SUM)
+    x_min_sum = get_int64(cache, SUM_EQ_IDX_X_MIN_SUM)
+    width_max = get_int64(cache, SUM_EQ_IDX_WIDTH_MAX)
+    x_unbound_count = cache[SUM_EQ_IDX_UNBOUND_NB]
+    for delta_idx in range(get_delta_nb(state)):
+        i = positions[delta_idx]
+        if i == n:
+            continue
+        x_min = domains[i, MIN]
+        x_max = domains[i, MAX]
+        x_max_sum += x_max - snapshot[i, MAX]
+        x_min_sum += x_min - snapshot[i, MIN]
+        if snapshot[i, MIN] < snapshot[i, MAX]:
+            x_unbound_count -= 1
+        if x_min < x_max:
+            x_unbound_count += 1
+            width_max = max(width_max, x_max - x_min)
+        snapshot[i, MIN] = x_min
+        snapshot[i, MAX] = x_max
+    set_int64(cache, SUM_EQ_IDX_X_MAX_SUM, x_max_sum)
+    set_int64(cache, SUM_EQ_IDX_X_MIN_SUM, x_min_sum)
+    set_int64(cache, SUM_EQ_IDX_WIDTH_MAX, width_max)
+    cache[SUM_EQ_IDX_UNBOUND_NB] = x_unbound_count
+    return x_max_sum, x_min_sum, width_max, x_unbound_count
+
+
 @njit(cache=True)
 def get_triggers_sum_eq(n: int, variable: int, parameters: NDArray) -> int:
     """
@@ -46,14 +152,12 @@ def get_triggers_sum_eq(n: int, variable: int, parameters: NDArray) -> int:
 
 
 @njit(cache=True)
-def compute_domains_sum_eq(domains: NDArray, parameters: NDArray) -> int:
+def filter_sum_eq(domains: NDArray) -> int:
     """
-    Implements :math:`\\sum_i x_i = x_{n-1}`.
+    Implements :math:`\\sum_i x_i = x_{n-1}` by rescanning all the domains.
 
     :param domains: the domains of the variables, x is an alias for domains
     :type domains: NDArray
-    :param parameters: the parameters of the propagator, unused here
-    :type parameters: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -96,3 +200,59 @@ def compute_domains_sum_eq(domains: NDArray, parameters: NDArray) -> int:
         if domains[-1, MIN] > domains[-1, MAX]:
             return PROP_INCONSISTENCY
     return PROP_ENTAILMENT if unbound_count == 1 else PROP_CONSISTENCY
+
+
+@njit(cache=True)
+def compute_domains_sum_eq(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
+    """
+    Implements :math:`\\sum_i x_i = x_{n-1}`.
+
+    :param domains: the domains of the variables, x is an alias for domains
+    :type domains: NDArray
+    :param parameters: the parameters of the propagator, unused here
+    :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_sum_eq
+    :type state: NDArray
+
+    :return: the status of the propagation (consistency, inconsistency or entailment) as an int
+    :rtype: int
+    """
+    if len(state) == 0:
+        return filter_sum_eq(domains)
+    n = len(domains) - 1
+    # the sums are obtained from the changed positions only
+    x_max_sum, x_min_sum, width_max, x_unbound_count = update_sum_eq_cache(domains, state)
+    y_min = domains[-1, MIN]
+    y_max = domains[-1, MAX]
+    domain_sum_min = x_max_sum - y_min
+    domain_sum_max = x_min_sum - y_max
+    unbound_count = x_unbound_count if y_min == y_max else x_unbound_count + 1
+    if unbound_count == 0:
+        return PROP_ENTAILMENT if domain_sum_min == 0 else PROP_INCONSISTENCY
+    # a bound of an x_i can only be filtered when its width exceeds domain_sum_min or -domain_sum_max
+    if width_max > domain_sum_min or width_max > -domain_sum_max:
+        for i in range(n):
+            x_min = domains[i, MIN]
+            x_max = domains[i, MAX]
+            if x_min == x_max:
+                continue
+            new_min = x_max - domain_sum_min
+            new_max = x_min - domain_sum_max
+            if new_min > x_min:
+                domains[i, MIN] = new_min
+            if new_max < x_max:
+                domains[i, MAX] = new_max
+            if domains[i, MIN] > domains[i, MAX]:
+                return PROP_INCONSISTENCY
+        # the filtered domains become the snapshot, so that the cached largest width decreases
+        init_sum_eq_cache(domains, state)
+    if y_min < y_max:
+        new_min = y_max + domain_sum_max
+        new_max = y_min + domain_sum_min
+        if new_min > y_min:
+            domains[-1, MIN] = new_min
+        if new_max < y_max:
+            domains[-1, MAX] = new_max
+        if domains[-1, MIN] > domains[-1, MAX]:
+            return PROP_INCONSISTENCY
+    return PROP_ENTAILMENT if unbound_count == 1 else PROP_CONSISTENCY
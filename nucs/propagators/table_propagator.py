@@ -0,0 +1,374 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import EVENT_MASK_MIN_MAX, MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+
+# The state of the propagator is laid out as:
+# - a warm flag and the number of non-zero words of the current table,
+# - the domains the current table was computed from,
+# - for each column, the offset of its sorted distinct values, then these values,
+# - for each value, the residue: the last word where a support was found,
+# - the indices of the words of the current table, the non-zero ones first,
+# - the current table: a bitset of the tuples that are valid for the domains,
+# - a scratch mask,
+# - for each value, its supports: a bitset of the tuples where it occurs.
+# The tuples are packed by 32 in int32 words.
+TABLE_IDX_WARM = 0
+TABLE_IDX_LIMIT = 1
+TABLE_HEADER_NB = 2
+
+
+def get_complexity_table(n: int, parameters: NDArray) -> int:
+    """
+    Returns the time complexity of the propagator as an int.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the parameters
+    :type parameters: NDArray
+
+    :return: an int
+    :rtype: int
+    """
+    return n * (len(parameters) // max(n, 1) // 32 + 1)
+
+
+def get_state_size_table(n: int, parameters: NDArray) -> int:
+    """
+    Returns the size of the state, see the layout above.
+
+    :param n: the number of variables
+    :type n: int
+    :param parameters: the allowed tuples
+    :type parameters: NDArray
+
+    :return: the size of the state
+    :rtype: int
+    """
+    if n == 0:
+        return TABLE_HEADER_NB
+    tuples = np.asarray(parameters, dtype=np.int32).reshape(-1, n)
+    word_nb = (len(tuples) + 31) >> 5
+    value_nb = sum(len(np.unique(tuples[:, col])) for col in range(n))
+    return TABLE_HEADER_NB + 2 * n + n + 1 + 2 * value_nb + 3 * word_nb + value_nb * word_nb
+
+
+@njit(cache=True)
+def get_triggers_table(n: int, variable: int, parameters: NDArray) -> int:
+    """
+    This propagator is triggered whenever there is a change in the domain of a variable.
+
+    :param n: the number of variables
+    :type n: int
+    :param variable: the variable index, unused here
+    :type variable: int
+    :param parameters: the parameters, unused here
+    :type parameters: NDArray
+
+    :return: an event mask
+    :rtype: int
+    """
+    return EVENT_MASK_MIN_MAX
+
+
+@njit(cache=True, inline="always")
+def get_bit(bit: int) -> int:
+    """
+    Returns the int32 word where only a bit is set.
+
+    :param bit: the bit, between 0 and 31
+    :type bit: int
+
+    :return: the word
+    :rtype: int
+    """
+    return (1 << bit) if bit < 31 else -(1 << 31)
+
+
+@njit(cache=True)
+def get_value_idx(values: NDArray, start: int, end: int, value: int, strict: bool) -> int:
+    """
+    Returns the index of the first value of a sorted slice greater than (or equal to, when not strict) a value.
+
+    :param values: the values
+    :type values: NDArray
+    :param start: the start of the slice
+    :type start: int
+    :param end: the end of the slice
+    :type end: int
+    :param value: the value
+    :type value: int
+    :param strict: whether the values equal to value are skipped
+    :type strict: bool
+
+    :return: an index between start and end
+    :rtype: int
+    """
+    while start < end:
+        middle = (start + end) >> 1
+        if values[middle] < value or (strict and values[middle] == value):
+            start = middle + 1
+        else:
+            end = middle
+    return start
+
+
+@njit(cache=True)
+def init_supports(
+    parameters: NDArray, n: int, tuple_nb: int, offsets: NDArray, values: NDArray, supports: NDArray
+) -> None:
+    """
+    Computes the sorted distinct values of the columns and their supports.
+
+    :param parameters: the allowed tuples
+    :type parameters: NDArray
+    :param n: the number of variables
+    :type n: int
+    :param tuple_nb: the number of tuples
+    :type tuple_nb: int
+    :param offsets: the offsets of the values of the columns
+    :type offsets: NDArray
+    :param values: the values of the columns
+    :type values: NDArray
+    :param supports: the supports of the values
+    :type supports: NDArray
+    """
+    tuples = parameters.reshape(tuple_nb, n)
+    value_nb = 0
+    for col in range(n):
+        column_values = np.unique(tuples[:, col])
+        offsets[col] = value_nb
+        values[value_nb : value_nb + len(column_values)] = column_values
+        value_nb += len(column_values)
+    offsets[n] = value_nb
+    supports[:] = 0
+    for tuple_idx in range(tuple_nb):
+        for col in range(n):
+            value_idx = get_value_idx(values, offsets[col], offsets[col + 1], tuples[tuple_idx, col], False)
+            supports[value_idx, tuple_idx >> 5] |= get_bit(tuple_idx & 31)
+
+
+@njit(cache=True)
+def restrict_table(
+    table: NDArray,
+    words: NDArray,
+    limit: int,
+    mask: NDArray,
+    supports: NDArray,
+    old_start: int,
+    old_end: int,
+    start: int,
+    end: int,
+) -> int:
+    """
+    Removes from the current table the tuples whose value for a column is no longer in the range of its values,
+    from the supports of the removed values or of the kept ones, whichever are fewer.
+
+    :param table: the current table
+    :type table: NDArray
+    :param words: the indices of the words of the current table, the non-zero ones first
+    :type words: NDArray
+    :param limit: the number of non-zero words
+    :type limit: int
+    :param mask: a scratch mask
+    :type mask: NDArray
+    :param supports: the supports of the values
+    :type supports: NDArray
+    :param old_start: the start of the previous range of the values of the column
+    :type old_start: int
+    :param old_end: the end of the previous range of the values of the column
+    :type old_end: int
+    :param start: the start of the range of the values of the column
+    :type start: int
+    :param end: the end of the range of the values of the column
+    :type end: int
+
+    :return: the number of non-zero words
+    :rtype: int
+    """
+    if start >= end:
+        return 0
+    removed_nb = (start - old_start) + (old_end - end)
+    if removed_nb == 0:
+        return limit
+    for i in range(limit):
+        mask[words[i]] = 0
+    if removed_nb < end - start:
+        for value_idx in range(old_start, start):
+            for i in range(limit):
+                mask[words[i]] |= supports[value_idx, words[i]]
+        for value_idx in range(end, old_end):
+            for i in range(limit):
+                mask[words[i]] |= supports[value_idx, words[i]]
+        for i in range(limit):
+            table[words[i]] &= ~mask[words[i]]
+    else:
+        for value_idx in range(start, end):
+            for i in range(limit):
+                mask[words[i]] |= supports[value_idx, words[i]]
+        for i in range(limit):
+            table[words[i]] &= mask[words[i]]
+    for i in range(limit - 1, -1, -1):
+        if table[words[i]] == 0:
+            limit -= 1
+            words[i], words[limit] = words[limit], words[i]
+    return limit
+
+
+@njit(cache=True)
+def is_supported(
+    table: NDArray, words: NDArray, limit: int, supports: NDArray, residues: NDArray, value_idx: int
+) -> bool:
+    """
+    Returns whether a value occurs in a tuple of the current table, checking its residue first.
+
+    :param table: the current table
+    :type table: NDArray
+    :param words: the indices of the words of the current table, the non-zero ones first
+    :type words: NDArray
+    :param limit: the number of non-zero words
+    :type limit: int
+    :param supports: the supports of the values
+    :type supports: NDArray
+    :param residues: the residues of the values
+    :type residues: NDArray
+    :param value_idx: the index of the value
+    :type value_idx: int
+
+    :return: true iff the value is supported
+    :rtype: bool
+    """
+    residue = residues[value_idx]
+    if table[residue] & supports[value_idx, residue] != 0:
+        return True
+    for i in range(limit):
+        word = words[i]
+        if table[word] & supports[value_idx, word] != 0:
+            residues[value_idx] = word
+            return True
+    return False
+
+
+@njit(cache=True)
+def compute_domains_table(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
+    """
+    Implements a relation over n variables defined by its allowed tuples, as compact-table does.
+
+    The supports of the values, bitsets of the tuples where they occur, are computed on the first call and kept in
+    the state (see get_state_size_table), together with the current table, the bitset of the tuples that are valid
+    for the domains it was computed from. When the domains have been narrowed since, the current table is
+    restricted with the supports of the removed values (or of the kept ones); when a domain has been widened, as
+    after a backtrack, it is recomputed from the supports. Only the non-zero words of the current table are visited.
+
+    :param domains: the domains of the variables
+    :type domains: NDArray
+    :param parameters: the parameters of the propagator,
+           the allowed tuples correspond to:
+           (parameters_0, ..., parameters_n-1), (parameters_n, ..., parameters_2n-1), ...
+    :type parameters: NDArray
+    :param state: the state of the propagator, see get_state_size_table
+    :type state: NDArray
+
+    :return: the status of the propagation (consistency, inconsistency or entailment) as an int
+    :rtype: int
+    """
+    n = len(domains)
+    if n == 0:
+        return PROP_ENTAILMENT
+    tuple_nb = len(parameters) // n
+    if tuple_nb == 0:
+        return PROP_INCONSISTENCY
+    word_nb = (tuple_nb + 31) >> 5
+    snapshot = state[TABLE_HEADER_NB : TABLE_HEADER_NB + 2 * n].reshape(n, 2)
+    offsets = state[TABLE_HEADER_NB + 2 * n : TABLE_HEADER_NB + 3 * n + 1]
+    start = TABLE_HEADER_NB + 3 * n + 1
+    value_nb = (len(state) - start - 3 * word_nb) // (word_nb + 2)
+    values = state[start : start + value_nb]
+    residues = state[start + value_nb : start + 2 * value_nb]
+    start += 2 * value_nb
+    words = state[start : start + word_nb]
+    table = state[start + word_nb : start + 2 * word_nb]
+    mask = state[start + 2 * word_nb : start + 3 * word_nb]
+    supports = state[start + 3 * word_nb :].reshape(value_nb, word_nb)
+    warm = state[TABLE_IDX_WARM] != 0
+    if not warm:
+        init_supports(parameters, n, tuple_nb, offsets, values, supports)
+        residues[:] = 0
+        state[TABLE_IDX_WARM] = 1
+    else:
+        for col in range(n):
+            if domains[col, MIN] < snapshot[col, MIN] or domains[col, MAX] > snapshot[col, MAX]:
+                # a domain has been widened: the removed tuples cannot be told apart, the table is recomputed
+                warm = False
+                break
+    if warm:
+        limit = state[TABLE_IDX_LIMIT]
+        for col in range(n):
+            if limit == 0:
+                break
+            if domains[col, MIN] != snapshot[col, MIN] or domains[col, MAX] != snapshot[col, MAX]:
+                limit = restrict_table(
+                    table,
+                    words,
+                    limit,
+                    mask,
+                    supports,
+                    get_value_idx(values, offsets[col], offsets[col + 1], snapshot[col, MIN], False),
+                    get_value_idx(values, offsets[col], offsets[col + 1], snapshot[col, MAX], True),
+                    get_value_idx(values, offsets[col], offsets[col + 1], domains[col, MIN], False),
+                    get_value_idx(values, offsets[col], offsets[col + 1], domains[col, MAX], True),
+                )
+    else:
+        table[:] = -1
+        if tuple_nb & 31 != 0:
+            table[word_nb - 1] = (1 << (tuple_nb & 31)) - 1
+        for i in range(word_nb):
+            words[i] = i
+        limit = word_nb
+        for col in range(n):
+            if limit == 0:
+                break
+            limit = restrict_table(
+                table,
+                words,
+                limit,
+                mask,
+                supports,
+                offsets[col],
+                offsets[col + 1],
+                get_value_idx(values, offsets[col], offsets[col + 1], domains[col, MIN], False),
+                get_value_idx(values, offsets[col], offsets[col + 1], domains[col, MAX], True),
+            )
+    state[TABLE_IDX_LIMIT] = limit
+    snapshot[:] = domains
+    if limit == 0:
+        return PROP_INCONSISTENCY
+    # a tuple of the current table is valid, so every column has a supported value within its bounds
+    ground_nb = 0
+    for col in range(n):
+        value_start = get_value_idx(values, offsets[col], offsets[col + 1], domains[col, MIN], False)
+        while not is_supported(table, words, limit, supports, residues, value_start):
+            value_start += 1
+        value_end = get_value_idx(values, offsets[col], offsets[col + 1], domains[col, MAX], True) - 1
+        while not is_supported(table, words, limit, supports, residues, value_end):
+            value_end -= 1
+        domains[col, MIN] = values[value_start]
+        domains[col, MAX] = values[value_end]
+        if value_start == value_end:
+            ground_nb += 1
+    # the values that are no longer in the domains have no support in the current table, which stays valid
+    snapshot[:] = domains
+    return PROP_ENTAILMENT if ground_nb == n else PROP_CONSISTENCY
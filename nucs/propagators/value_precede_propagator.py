@@ -48,7 +48,7 @@ def get_triggers_value_precede(n: int, variable: int, parameters: NDArray) -> in
 
 
 @njit(cache=True)
-def compute_domains_value_precede(domains: NDArray, parameters: NDArray) -> int:
+def compute_domains_value_precede(domains: NDArray, parameters: NDArray, state: NDArray) -> int:
     """
     Implements value precedence: whenever some x_i equals t, an earlier x_j equals s. Equivalently, the
     first occurrence of s comes before the first occurrence of t (or t does not occur).
@@ -61,6 +61,8 @@ def compute_domains_value_precede(domains: NDArray, parameters: NDArray) -> int:
     :type domains: NDArray
     :param parameters: the parameters, s is the first parameter, t is the second parameter
     :type parameters: NDArray
+    :param state: the state of the propagator, unused here
+    :type state: NDArray
 
     :return: the status of the propagation (consistency, inconsistency or entailment) as an int
     :rtype: int
@@ -0,0 +1,316 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import (
+    BACKJUMP_HEADER_NB,
+    BACKJUMP_IDX_CONFLICT_LEVEL,
+    BACKJUMP_IDX_CONFLICT_LOWER_LEVEL,
+    BACKJUMP_IDX_DOMAIN_NB,
+    BACKJUMP_IDX_JUMP_NB,
+    BACKJUMP_IDX_SKIPPED_NB,
+    BACKJUMP_LEVEL,
+    BACKJUMP_LOWER_LEVEL,
+    DOM_UPDATE_VARIABLE,
+)
+
+# The level L > 0 stands for the decision that has made the domains of the level L of the current branch, the level 0
+# for the root domains. The reason levels of a variable are a pair (level, lower level) such that its domain is
+# implied by the constraints and by the levels in {level} U [0, lower level]. Such pairs are closed under union:
+# the two largest levels of a union are among the two largest levels of its parts.
+# - a decision adds its level to the reason levels of its variable,
+# - a propagator sets the reason levels of the variables it changes to the union of the reason levels of its
+#   variables, a failure of a propagator has the same reason levels,
+# - the nogoods and the consistency algorithms that do not maintain the reason levels depend on all the levels.
+# When a failure has the reason levels (L, M), the pending refutations of the levels L.. of the stacks, which keep
+# the domains of the levels 0..L, fail as well and are skipped: the search jumps back to the level L - 1 whose
+# refutation depends on the levels 0..M (conflict-directed backjumping). The refutation levels of the choice points
+# accumulate the lower levels of the failures of their subtrees; a subtree with a solution makes its refutation
+# depend on all the levels. On a backtrack to the level k, the reason levels are restricted to the levels 0..k,
+# which is sound because the reason levels only grow along a branch, and the refutation levels of the level k are
+# added to those of the variable of its refutation.
+#
+# The reason levels are stored in a single int64 array, laid out as:
+# - the header (see BACKJUMP_HEADER_NB),
+# - the reason levels of the variables,
+# - the refutation levels of the choice points.
+
+
+def get_reason_levels(domain_nb: int, stks_max_height: int, backjumping: bool) -> NDArray:
+    """
+    Allocates the reason levels, empty when there is no backjumping.
+
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+    :param stks_max_height: the maximal height of the choice point stacks
+    :type stks_max_height: int
+    :param backjumping: whether the search backjumps
+    :type backjumping: bool
+
+    :return: the reason levels
+    :rtype: NDArray
+    """
+    if not backjumping:
+        return np.zeros(0, dtype=np.int64)
+    reason_levels = np.zeros(BACKJUMP_HEADER_NB + 2 * domain_nb + stks_max_height, dtype=np.int64)
+    reason_levels[BACKJUMP_IDX_DOMAIN_NB] = domain_nb
+    clear_reason_levels(reason_levels)
+    return reason_levels
+
+
+def grow_reason_levels(reason_levels: NDArray, stks_max_height: int) -> NDArray:
+    """
+    Returns a copy of the reason levels holding the refutation levels of more choice points.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+    :param stks_max_height: the new maximal height of the choice point stacks
+    :type stks_max_height: int
+
+    :return: the new reason levels
+    :rtype: NDArray
+    """
+    if len(reason_levels) == 0:
+        return reason_levels
+    height = len(reason_levels) - BACKJUMP_HEADER_NB - 2 * int(reason_levels[BACKJUMP_IDX_DOMAIN_NB])
+    return np.concatenate((reason_levels, np.full(stks_max_height - height, -1, dtype=np.int64)))
+
+
+@njit(cache=True, inline="always")
+def get_reason_level_sections(reason_levels: NDArray) -> tuple[NDArray, NDArray]:
+    """
+    Returns the sections of the reason levels.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+
+    :return: the (domain_nb, 2) reason levels of the variables and the refutation levels of the choice points
+    :rtype: Tuple[NDArray, NDArray]
+    """
+    start = BACKJUMP_HEADER_NB + 2 * reason_levels[BACKJUMP_IDX_DOMAIN_NB]
+    return reason_levels[BACKJUMP_HEADER_NB:start].reshape(-1, 2), reason_levels[start:]
+
+
+@njit(cache=True, inline="always")
+def union_levels(level: int, lower_level: int, other_level: int, other_lower_level: int) -> tuple[int, int]:
+    """
+    Returns the union of two pairs of reason levels.
+
+    :param level: the level of the first pair
+    :type level: int
+    :param lower_level: the lower level of the first pair
+    :type lower_level: int
+    :param other_level: the level of the second pair
+    :type other_level: int
+    :param other_lower_level: the lower level of the second pair
+    :type other_lower_level: int
+
+    :return: the level and the lower level of the union
+    :rtype: Tuple[int, int]
+    """
+    union_lower_level = max(lower_level, other_lower_level)
+    if level != other_level:
+        union_lower_level = max(union_lower_level, min(level, other_level))
+    union_level = max(level, other_level)
+    return union_level, min(union_lower_level, union_level - 1)
+
+
+@njit(cache=True)
+def clear_reason_levels(reason_levels: NDArray) -> None:
+    """
+    Makes all the domains depend on the root domains only, the statistics are kept.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+    """
+    if len(reason_levels) == 0:
+        return
+    levels, refutation_levels = get_reason_level_sections(reason_levels)
+    levels[:, BACKJUMP_LEVEL] = 0
+    levels[:, BACKJUMP_LOWER_LEVEL] = -1
+    refutation_levels[:] = -1
+
+
+@njit(cache=True, inline="always")
+def set_conflict_levels(reason_levels: NDArray, level: int, lower_level: int) -> None:
+    """
+    Sets the reason levels of a failure.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+    :param level: the level
+    :type level: int
+    :param lower_level: the lower level
+    :type lower_level: int
+    """
+    reason_levels[BACKJUMP_IDX_CONFLICT_LEVEL] = level
+    reason_levels[BACKJUMP_IDX_CONFLICT_LOWER_LEVEL] = lower_level
+
+
+@njit(cache=True, inline="always")
+def set_variable_levels(reason_levels: NDArray, variable: int, level: int, lower_level: int) -> None:
+    """
+    Sets the reason levels of a variable.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+    :param variable: the variable
+    :type variable: int
+    :param level: the level
+    :type level: int
+    :param lower_level: the lower level
+    :type lower_level: int
+    """
+    reason_levels[BACKJUMP_HEADER_NB + 2 * variable + BACKJUMP_LEVEL] = level
+    reason_levels[BACKJUMP_HEADER_NB + 2 * variable + BACKJUMP_LOWER_LEVEL] = lower_level
+
+
+@njit(cache=True, inline="always")
+def get_propagator_levels(
+    reason_levels: NDArray, propagator_variables: NDArray, prop_var_start: int, prop_var_end: int
+) -> tuple[int, int]:
+    """
+    Returns the union of the reason levels of the variables of a propagator.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+    :param propagator_variables: the variables by propagators
+    :type propagator_variables: NDArray
+    :param prop_var_start: the index of the first variable of the propagator
+    :type prop_var_start: int
+    :param prop_var_end: the index following the last variable of the propagator
+    :type prop_var_end: int
+
+    :return: the level and the lower level
+    :rtype: Tuple[int, int]
+    """
+    level = 0
+    lower_level = -1
+    for var_idx in range(prop_var_start, prop_var_end):
+        start = BACKJUMP_HEADER_NB + 2 * propagator_variables[var_idx]
+        level, lower_level = union_levels(
+            level,
+            lower_level,
+            reason_levels[start + BACKJUMP_LEVEL],
+            reason_levels[start + BACKJUMP_LOWER_LEVEL],
+        )
+    return level, lower_level
+
+
+@njit(cache=True)
+def record_decision_levels(reason_levels: NDArray, variable: int, start_level: int, end_level: int) -> None:
+    """
+    Records the decisions on a variable that have made the domains of the levels start_level + 1..end_level.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+    :param variable: the variable
+    :type variable: int
+    :param start_level: the level of the first new choice point
+    :type start_level: int
+    :param end_level: the level following the last new choice point
+    :type end_level: int
+    """
+    levels, refutation_levels = get_reason_level_sections(reason_levels)
+    refutation_levels[start_level:end_level] = -1
+    levels[variable, BACKJUMP_LEVEL], levels[variable, BACKJUMP_LOWER_LEVEL] = union_levels(
+        levels[variable, BACKJUMP_LEVEL],
+        levels[variable, BACKJUMP_LOWER_LEVEL],
+        end_level,
+        end_level - 1 if end_level > start_level + 1 else -1,
+    )
+
+
+@njit(cache=True)
+def backjump_level(reason_levels: NDArray, top: int) -> int:
+    """
+    Returns the level the search jumps back to after a failure at the top of the stacks, whose refutation levels
+    are updated.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+    :param top: the index of the top of the stacks
+    :type top: int
+
+    :return: the level, -1 when the failure is implied by the root domains
+    :rtype: int
+    """
+    refutation_levels = get_reason_level_sections(reason_levels)[1]
+    # the choice points stolen from the bottom of the stacks may leave reason levels above the top
+    level = min(reason_levels[BACKJUMP_IDX_CONFLICT_LEVEL], top) - 1
+    if level >= 0:
+        refutation_levels[level] = max(
+            refutation_levels[level], min(reason_levels[BACKJUMP_IDX_CONFLICT_LOWER_LEVEL], level)
+        )
+    if level < top - 1:
+        reason_levels[BACKJUMP_IDX_JUMP_NB] += 1
+        reason_levels[BACKJUMP_IDX_SKIPPED_NB] += top - 1 - level
+    return level
+
+
+@njit(cache=True)
+def refute_reason_levels(reason_levels: NDArray, domain_update_stk: NDArray, top: int, solution: bool) -> None:
+    """
+    Updates the reason levels after a backtrack to the top of the stacks, whose refutation is pending.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+    :param domain_update_stk: the stack of domain updates
+    :type domain_update_stk: NDArray
+    :param top: the index of the top of the stacks
+    :type top: int
+    :param solution: whether a solution has just been found, in the subtrees of all the pending decisions
+    :type solution: bool
+    """
+    if len(reason_levels) == 0:
+        return
+    levels, refutation_levels = get_reason_level_sections(reason_levels)
+    if solution:
+        for level in range(top + 1):
+            refutation_levels[level] = level
+    for variable in range(len(levels)):
+        if levels[variable, BACKJUMP_LEVEL] > top:
+            level = max(min(levels[variable, BACKJUMP_LOWER_LEVEL], top), 0)
+            levels[variable, BACKJUMP_LEVEL] = level
+            levels[variable, BACKJUMP_LOWER_LEVEL] = level - 1
+    variable = domain_update_stk[top, DOM_UPDATE_VARIABLE]
+    levels[variable, BACKJUMP_LEVEL], levels[variable, BACKJUMP_LOWER_LEVEL] = union_levels(
+        levels[variable, BACKJUMP_LEVEL],
+        levels[variable, BACKJUMP_LOWER_LEVEL],
+        max(refutation_levels[top], 0),
+        refutation_levels[top] - 1,
+    )
+
+
+@njit(cache=True)
+def steal_reason_levels(reason_levels: NDArray, top: int) -> None:
+    """
+    Shifts the reason levels when the choice point of the level 0 has been stolen (see cp_steal): its decision
+    becomes part of the root domains, and the refutations depend on all the levels.
+
+    :param reason_levels: the reason levels
+    :type reason_levels: NDArray
+    :param top: the index of the top of the stacks after the choice point was stolen
+    :type top: int
+    """
+    if len(reason_levels) == 0:
+        return
+    levels, refutation_levels = get_reason_level_sections(reason_levels)
+    for variable in range(len(levels)):
+        level = max(levels[variable, BACKJUMP_LEVEL] - 1, 0)
+        levels[variable, BACKJUMP_LEVEL] = level
+        levels[variable, BACKJUMP_LOWER_LEVEL] = min(max(levels[variable, BACKJUMP_LOWER_LEVEL] - 1, -1), level - 1)
+    for level in range(top):
+        refutation_levels[level] = level
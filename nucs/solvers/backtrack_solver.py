@@ -12,49 +12,66 @@
 ###############################################################################
 import logging
 import time
-from collections.abc import Iterable, Iterator
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from functools import partial
 
 import numpy as np
-from numba import njit  # type: ignore
+from numba import njit, objmode, types  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.buckets import buckets_create, buckets_empty, buckets_init
 from nucs.constants import (
+    BACKJUMP_IDX_JUMP_NB,
+    BACKJUMP_IDX_SKIPPED_NB,
+    BACKJUMP_LBL_JUMP_NB,
+    BACKJUMP_LBL_SKIPPED_NB,
+    CHOICE_POINTS_AUTO,
+    CHOICE_POINTS_TRAIL,
+    CP_BRANCH_NB,
+    DOM_UPDATE_EVENTS,
+    DOM_UPDATE_VARIABLE,
     EVENT_MASK_NB,
+    INCUMBENT_POLL_PERIOD,
+    LIMIT_DEADLINE_PERIOD,
+    LIMIT_IDX_BACKTRACK_NB,
+    LIMIT_IDX_CHOICE_NB,
+    LIMIT_IDX_DEADLINE,
+    LIMIT_NONE,
+    LIMITS_MAX,
     LOG_LEVEL_INFO,
     MAX,
     MIN,
+    NOGOOD_IDX_FAILURE_NB,
+    NOGOOD_IDX_PRUNING_NB,
+    NOGOOD_IDX_RECORDED_NB,
+    NOGOOD_LBL_FAILURE_NB,
+    NOGOOD_LBL_PRUNING_NB,
+    NOGOOD_LBL_RECORDED_NB,
     NUMBA_DISABLE_JIT,
     OPTIM_RESET,
     PROBLEM_BOUND,
     PROBLEM_UNBOUND,
+    PROFILE_MAX,
     RANGE_END,
     RANGE_START,
+    RESTART_NONE,
+    SEARCH_EXHAUSTED,
+    SEARCH_LIMIT_REACHED,
+    SEARCH_SOLUTION,
+    SEARCH_STACKS_FULL,
     SIGN_COMPUTE_DOMAINS,
     SIGN_CONSISTENCY_ALG,
     SIGN_DOM_HEURISTIC,
     SIGN_VAR_HEURISTIC,
-    STATS_IDX_ALG_BC_NB,
-    STATS_IDX_PROPAGATOR_ENTAILMENT_NB,
-    STATS_IDX_PROPAGATOR_FILTER_NB,
-    STATS_IDX_PROPAGATOR_FILTER_NO_CHANGE_NB,
-    STATS_IDX_PROPAGATOR_INCONSISTENCY_NB,
+    STATE,
     STATS_IDX_SOLUTION_NB,
     STATS_IDX_SOLVER_BACKTRACK_NB,
     STATS_IDX_SOLVER_CHOICE_DEPTH,
     STATS_IDX_SOLVER_CHOICE_NB,
     STATS_IDX_SOLVER_ELAPSED_TIME,
-    STATS_LBL_ALG_BC_NB,
-    STATS_LBL_PROPAGATOR_ENTAILMENT_NB,
-    STATS_LBL_PROPAGATOR_FILTER_NB,
-    STATS_LBL_PROPAGATOR_FILTER_NO_CHANGE_NB,
-    STATS_LBL_PROPAGATOR_INCONSISTENCY_NB,
-    STATS_LBL_SOLUTION_NB,
-    STATS_LBL_SOLVER_BACKTRACK_NB,
-    STATS_LBL_SOLVER_CHOICE_DEPTH,
-    STATS_LBL_SOLVER_CHOICE_NB,
-    STATS_LBL_SOLVER_ELAPSED_TIME,
+    STATS_IDX_SOLVER_RESTART_NB,
     STATS_MAX,
+    TRAIL_IDX_LEVEL_NB,
     VARIABLE,
 )
 from nucs.heuristics.heuristics import (
@@ -62,25 +79,78 @@ from nucs.heuristics.heuristics import (
     DOM_HEURISTIC_MIN_VALUE,
     VAR_HEURISTIC_FCTS,
     VAR_HEURISTIC_FIRST_NOT_INSTANTIATED,
+    WEIGHTED_VAR_HEURISTICS,
 )
+from nucs.heuristics.value_dom_heuristic import value_dom_heuristic
 from nucs.numba_helper import (
     ComputeDomainsFunctions,
     ConsistencyAlgorithmFunctions,
     DomainHeuristicFunctions,
     VariableHeuristicFunctions,
+    addresses_from_functions,
     build_function_ptrs,
+    build_function_ptrs_from_addresses,
 )
 from nucs.numpy_helper import flatten_arrays
 from nucs.problems.problem import Problem
 from nucs.propagators.propagators import (
     ALG_DUMMY,
     COMPUTE_DOMAINS_FCTS,
+    get_algorithm_nb,
     update_propagators,
 )
-from nucs.solvers.choice_points import backtrack, cp_init, fix_choice_point, fix_choice_points
+from nucs.solvers.backjumps import (
+    backjump_level,
+    clear_reason_levels,
+    get_reason_levels,
+    grow_reason_levels,
+    record_decision_levels,
+    refute_reason_levels,
+    set_conflict_levels,
+    steal_reason_levels,
+)
+from nucs.solvers.choice_points import (
+    backtrack,
+    cp_full,
+    cp_grow,
+    cp_init,
+    cp_steal,
+    fix_choice_point,
+    fix_choice_points,
+)
 from nucs.solvers.consistency_algorithms import CONSISTENCY_ALG_BC, CONSISTENCY_ALG_FCTS
+from nucs.solvers.nogoods import (
+    clear_nogoods,
+    get_nogoods,
+    grow_nogoods,
+    record_decisions,
+    record_nogood,
+    restart_nogoods,
+    steal_nogood_decision,
+)
+from nucs.solvers.phases import get_hint, get_hint_domains, get_phases, has_phase
+from nucs.solvers.propagator_weights import (
+    get_propagator_weights_size,
+    get_weighted_var_heuristic_params,
+    init_propagator_weights,
+)
+from nucs.solvers.restarts import restart_backtrack_nb
 from nucs.solvers.search import Search
-from nucs.solvers.solver import Solver, get_solution
+from nucs.solvers.solver import Solver, get_solution, statistics_as_dictionary
+from nucs.solvers.trail import (
+    clear_trail,
+    get_branch_domains,
+    get_trail,
+    grow_trail,
+    is_trailing,
+    set_trail_objective,
+    trail_backtrack,
+    trail_branch,
+    trail_fix_objective,
+    trail_full,
+    trail_pop,
+    trail_steal,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -91,11 +161,13 @@ class BacktrackSolver(Solver):
     """
 
     # the per-search ragged collections threaded into solve_one, stored CSR-style: a flat concatenation
-    # plus the offsets delimiting each search's slice (and, for the 2d parameter arrays, their shapes)
+    # plus the offsets delimiting each search's slice (and, for the 2d parameter arrays, their shapes);
+    # the variable heuristic parameters are delimited by ranges instead, since the searches using a weighted
+    # variable heuristic share the same slice
     decision_variables: NDArray
     decision_variables_offsets: NDArray
     var_heuristic_params: NDArray
-    var_heuristic_params_offsets: NDArray
+    var_heuristic_params_ranges: NDArray
     var_heuristic_params_shapes: NDArray
     dom_heuristic_params: NDArray
     dom_heuristic_params_offsets: NDArray
@@ -105,6 +177,8 @@ class BacktrackSolver(Solver):
     var_heuristic_fcts: VariableHeuristicFunctions
     dom_heuristic_fcts: DomainHeuristicFunctions
     compute_domains_fcts: ComputeDomainsFunctions
+    # the addresses of the compute_domains functions, unresolved ones sharing the address of the dummy propagator
+    compute_domains_addrs: NDArray
 
     def __init__(
         self,
@@ -116,8 +190,18 @@ class BacktrackSolver(Solver):
         dom_heuristic: int = DOM_HEURISTIC_MIN_VALUE,
         dom_heuristic_params: list[list[int]] | None = None,
         searches: list[Search] | None = None,
-        stks_max_height: int = 8192,
+        stks_max_height: int | None = None,
+        stks_initial_height: int = 64,
         log_level: str = LOG_LEVEL_INFO,
+        restart_policy: str = RESTART_NONE,
+        restart_scale: int = 100,
+        restart_factor: float = 1.5,
+        profile_propagators: bool = False,
+        nogood_capacity: int = 0,
+        backjumping: bool = False,
+        choice_points: str = CHOICE_POINTS_AUTO,
+        solution_hint: Sequence[int | None] | NDArray | None = None,
+        phase_saving: bool = False,
     ):
         """
         Initializes the solver.
@@ -144,12 +228,42 @@ class BacktrackSolver(Solver):
                          is built from the decision_variables / var_heuristic / dom_heuristic arguments above.
                          The union of the searches' decision variables should cover every branchable variable.
         :type searches: Optional[List[Search]]
-        :param stks_max_height: the maximal height of the choice point stacks,
-                                defaults to 512
-        :type stks_max_height: int
+        :param stks_max_height: the maximal height of the choice point stacks or None for no maximal height,
+                                defaults to None
+        :type stks_max_height: Optional[int]
+        :param stks_initial_height: the initial height of the choice point stacks, which double (up to their maximal
+                                    height) whenever a domain heuristic may not have room for its choice points,
+                                    defaults to 64
+        :type stks_initial_height: int
         :param log_level: the log level,
                           defaults to INFO
         :type log_level: str
+        :param restart_policy: the policy bounding the number of backtracks before the search restarts,
+                               defaults to no restart
+        :type restart_policy: str
+        :param restart_scale: the number of backtracks of the first run, defaults to 100
+        :type restart_scale: int
+        :param restart_factor: the growth factor of the geometric restart policy, defaults to 1.5
+        :type restart_factor: float
+        :param profile_propagators: whether the consistency algorithm maintains the counters returned by
+                                    get_propagator_profile, defaults to False
+        :type profile_propagators: bool
+        :param nogood_capacity: the maximal number of nogoods recorded from the failures of the search and
+                                propagated by the consistency algorithm, defaults to 0 (no nogood)
+        :type nogood_capacity: int
+        :param backjumping: whether the search jumps back, after a failure, over the choice points that do not
+                            take part in it, defaults to False
+        :type backjumping: bool
+        :param choice_points: whether the domains of the choice points are copied or trailed, defaults to AUTO which
+                              trails them when the problem is large (see CHOICE_POINTS_MODES)
+        :type choice_points: str
+        :param solution_hint: a value or None per variable, tried first by the search before the domain heuristics,
+                              and checked before optimizing so that a hint that is a solution bounds the objective,
+                              defaults to None
+        :type solution_hint: Optional[Union[Sequence[Optional[int]], NDArray]]
+        :param phase_saving: whether the values of the last solution found are tried first by the search,
+                             defaults to False
+        :type phase_saving: bool
         """
         super().__init__(problem, log_level)
         if var_heuristic_params is None:
@@ -178,26 +292,51 @@ class BacktrackSolver(Solver):
         logger.info(f"BacktrackSolver uses decision domains {[dv.tolist() for dv in decision_variables_per_search]}")
         self.decision_variables, self.decision_variables_offsets = flatten_arrays(decision_variables_per_search)
         logger.info(f"BacktrackSolver uses variable heuristics {var_heuristics}")
-        self.var_heuristic_params, self.var_heuristic_params_offsets = flatten_arrays(var_params)
-        self.var_heuristic_params_shapes = np.array([params.shape for params in var_params], dtype=np.int64)
+        # kept so that the weighted variable heuristics can be sized again for new propagators
+        self.var_heuristics = var_heuristics
+        self.var_params = var_params
+        self._init_var_heuristic_params(var_heuristics, var_params)
         logger.info(f"BacktrackSolver uses domain heuristics {dom_heuristics}")
         self.dom_heuristic_params, self.dom_heuristic_params_offsets = flatten_arrays(dom_params)
         self.dom_heuristic_params_shapes = np.array([params.shape for params in dom_params], dtype=np.int64)
         logger.info(f"BacktrackSolver uses consistency algorithm {consistency_algorithm}")
         self.triggered_propagators = buckets_create(problem.propagator_nb)
+        buckets_empty(self.triggered_propagators, problem.priorities)
+        buckets_init(self.triggered_propagators, problem.priorities)
         self.domain_buffer = get_domain_buffer(problem.bounds)
+        self.propagator_states = get_propagator_states(problem.bounds)
+        self.hint = get_hint(problem.domain_nb, solution_hint)
+        self.phase_saving = phase_saving
+        self.phases = get_phases(problem.domain_nb, self.hint, phase_saving)
         logger.debug("Initializing choice points")
-        self.domains_stk = np.empty((stks_max_height, self.problem.domain_nb, 2), dtype=np.int32)
-        self.domain_update_stk = np.empty((stks_max_height, 2), dtype=np.uint32)
-        self.unbound_variable_nb_stk = np.empty(stks_max_height, dtype=np.uint32)
+        trailing = is_trailing(choice_points, problem.domain_nb, len(self.decision_variables))
+        if trailing and (nogood_capacity > 0 or backjumping):
+            if choice_points == CHOICE_POINTS_TRAIL:
+                logger.warning(
+                    "The domains of the choice points are copied since the nogoods and backjumping need them"
+                )
+            trailing = False
+        logger.info(f"BacktrackSolver {'trails' if trailing else 'copies'} the domains of the choice points")
+        # with the trail, the stacks only hold the current domains and the choices of a domain heuristic
+        self.stks_max_height = stks_max_height
+        if stks_max_height is not None:
+            stks_initial_height = min(stks_initial_height, stks_max_height)
+        stks_height = CP_BRANCH_NB if trailing else stks_initial_height
+        self.domains_stk = np.empty((1 if trailing else stks_initial_height, self.problem.domain_nb, 2), dtype=np.int32)
+        self.domain_update_stk = np.empty((stks_height, 2), dtype=np.uint32)
+        self.unbound_variable_nb_stk = np.empty(stks_height, dtype=np.uint32)
         self.stks_top = np.ones((1,), dtype=np.uint32)
         # entailment is tracked by a trail rather than a per-level array: entailed_propagator_depths[p]
         # holds the depth at which propagator p was entailed (-1 when active), entailment_trail records the
         # entailed propagators in order (its first cell is the trail size) so backtracking can reactivate them
         self.entailed_propagator_depths = np.empty(self.problem.propagator_nb, dtype=np.int32)
         self.entailment_trail = np.empty(self.problem.propagator_nb + 1, dtype=np.int32)
-        logger.info(f"The stacks of the choice points have a maximal height of {stks_max_height}")
+        logger.info(
+            f"The stacks of the choice points have an initial height of {stks_initial_height}"
+            f" and a maximal height of {stks_max_height}"
+        )
         self.initial_domains = np.array(problem.domains)
+        self.initial_unbound_variable_nb = problem.unbound_variable_nb
         cp_init(
             self.domains_stk,
             self.entailed_propagator_depths,
@@ -206,12 +345,30 @@ class BacktrackSolver(Solver):
             self.unbound_variable_nb_stk,
             self.stks_top,
             self.initial_domains,
-            problem.unbound_variable_nb,
+            self.initial_unbound_variable_nb,
         )
         logger.debug("Choice points initialized")
         logger.debug("Initializing statistics")
         self.statistics = np.zeros(STATS_MAX, dtype=np.int64)
         logger.debug("Statistics initialized")
+        self.propagator_profiles = np.zeros(
+            (problem.propagator_nb if profile_propagators else 0, PROFILE_MAX), dtype=np.int64
+        )
+        self.nogoods = get_nogoods(nogood_capacity, problem.domain_nb, stks_initial_height)
+        self.reason_levels = get_reason_levels(problem.domain_nb, stks_initial_height, backjumping)
+        self.trail = get_trail(problem.domain_nb, stks_initial_height, trailing)
+        self.limits = np.full(LIMITS_MAX, LIMIT_NONE, dtype=np.int64)
+        # the limits of the current run: the backtrack limit is also bounded by the next restart
+        self.run_limits = np.full(LIMITS_MAX, LIMIT_NONE, dtype=np.int64)
+        logger.info(f"BacktrackSolver uses restart policy {restart_policy}")
+        self.restart_policy = restart_policy
+        self.restart_scale = restart_scale
+        self.restart_factor = restart_factor
+        self.restart_idx = 0
+        self.restart_backtrack_nb = LIMIT_NONE
+        self._schedule_restart()
+        # whether the last search stopped on a limit rather than on the exhaustion of the search space
+        self.limit_reached = False
         if NUMBA_DISABLE_JIT:
             self.compute_domains_fcts = COMPUTE_DOMAINS_FCTS
             self.consistency_alg_fcts = [CONSISTENCY_ALG_FCTS[consistency_algorithm]]
@@ -220,9 +377,12 @@ class BacktrackSolver(Solver):
         else:
             # resolving only the algorithms used by the problem keeps the init cost proportional
             # to the problem instead of the whole propagator library
-            self.compute_domains_fcts = build_function_ptrs(
+            self.compute_domains_addrs = addresses_from_functions(
                 COMPUTE_DOMAINS_FCTS, SIGN_COMPUTE_DOMAINS, np.unique(self.problem.algorithms), ALG_DUMMY
             )
+            self.compute_domains_fcts = build_function_ptrs_from_addresses(
+                self.compute_domains_addrs, types.FunctionType(SIGN_COMPUTE_DOMAINS)
+            )
             self.consistency_alg_fcts = build_function_ptrs(
                 [CONSISTENCY_ALG_FCTS[consistency_algorithm]], SIGN_CONSISTENCY_ALG
             )
@@ -234,6 +394,90 @@ class BacktrackSolver(Solver):
             )
         logger.debug("BacktrackSolver initialized")
 
+    def update(self) -> None:
+        """
+        Takes into account the propagators added to or removed from the problem since the solver has been created,
+        then resets the search (see :meth:`reset`). The problem is updated rather than initialized again (see
+        Problem.update), the states of the previous propagators are kept and only the algorithms new to the solver
+        are resolved; the weights learned by the weighted variable heuristics are reset.
+        """
+        problem = self.problem
+        problem.update()
+        logger.debug("Updating BacktrackSolver")
+        self.triggered_propagators = buckets_create(problem.propagator_nb)
+        arities = problem.bounds[:, VARIABLE, RANGE_END] - problem.bounds[:, VARIABLE, RANGE_START]
+        if int(arities.max()) > len(self.domain_buffer):
+            self.domain_buffer = get_domain_buffer(problem.bounds)
+        propagator_states = get_propagator_states(problem.bounds)
+        propagator_states[: len(self.propagator_states)] = self.propagator_states
+        self.propagator_states = propagator_states
+        self.entailed_propagator_depths = np.empty(problem.propagator_nb, dtype=np.int32)
+        self.entailment_trail = np.empty(problem.propagator_nb + 1, dtype=np.int32)
+        self._init_var_heuristic_params(self.var_heuristics, self.var_params)
+        if len(self.propagator_profiles) != 0:
+            propagator_profiles = np.zeros((problem.propagator_nb, PROFILE_MAX), dtype=np.int64)
+            propagator_profiles[: len(self.propagator_profiles)] = self.propagator_profiles
+            self.propagator_profiles = propagator_profiles
+        if not NUMBA_DISABLE_JIT:
+            filler_nb = len(COMPUTE_DOMAINS_FCTS) - len(self.compute_domains_addrs)  # the algorithms registered since
+            self.compute_domains_addrs = np.concatenate(
+                (self.compute_domains_addrs, np.full(filler_nb, self.compute_domains_addrs[ALG_DUMMY]))
+            )
+            algorithms = np.unique(problem.algorithms)
+            # an unresolved algorithm shares the address of the filler
+            new_algorithms = algorithms[
+                (self.compute_domains_addrs[algorithms] == self.compute_domains_addrs[ALG_DUMMY])
+                & (algorithms != ALG_DUMMY)
+            ]
+            if len(new_algorithms) != 0:
+                logger.info(f"BacktrackSolver resolves algorithms {new_algorithms.tolist()}")
+                self.compute_domains_addrs[new_algorithms] = addresses_from_functions(
+                    COMPUTE_DOMAINS_FCTS, SIGN_COMPUTE_DOMAINS, new_algorithms, ALG_DUMMY
+                )[new_algorithms]
+                self.compute_domains_fcts = build_function_ptrs_from_addresses(
+                    self.compute_domains_addrs, types.FunctionType(SIGN_COMPUTE_DOMAINS)
+                )
+        self.reset()
+
+    def _init_var_heuristic_params(self, var_heuristics: list[int], var_params: list[NDArray]) -> None:
+        """
+        Flattens the parameters of the variable heuristics and allocates the propagator weights.
+
+        The searches using a weighted variable heuristic share a single parameter block, built from the problem,
+        which embeds the propagator weights updated by the consistency algorithm.
+
+        :param var_heuristics: the variable heuristics, one per search
+        :type var_heuristics: List[int]
+        :param var_params: the parameters of the variable heuristics, one per search
+        :type var_params: List[NDArray]
+        """
+        weighted = [var_heuristic in WEIGHTED_VAR_HEURISTICS for var_heuristic in var_heuristics]
+        weights_size = get_propagator_weights_size(self.problem.propagator_nb)
+        if not any(weighted):
+            self.var_heuristic_params, offsets = flatten_arrays(var_params)
+            self.var_heuristic_params_ranges = np.stack((offsets[:-1], offsets[1:]), axis=1)
+            self.var_heuristic_params_shapes = np.array([params.shape for params in var_params], dtype=np.int64)
+            self.propagator_weights = np.empty(weights_size, dtype=np.int64)
+        else:
+            # the weighted block is appended once, after the parameters of the other searches
+            weighted_params = get_weighted_var_heuristic_params(
+                self.problem.propagator_nb,
+                self.problem.domain_nb,
+                self.problem.bounds,
+                self.problem.propagator_variables,
+            )
+            var_params = [
+                np.empty((1, 0), dtype=np.int64) if is_weighted else params
+                for is_weighted, params in zip(weighted, var_params)
+            ]
+            self.var_heuristic_params, offsets = flatten_arrays(var_params + [weighted_params])
+            self.var_heuristic_params_ranges = np.stack((offsets[:-2], offsets[1:-1]), axis=1)
+            self.var_heuristic_params_ranges[weighted] = offsets[-2:]
+            self.var_heuristic_params_shapes = np.array([params.shape for params in var_params], dtype=np.int64)
+            self.var_heuristic_params_shapes[weighted] = weighted_params.shape
+            self.propagator_weights = self.var_heuristic_params[offsets[-2] + 1 : offsets[-2] + 1 + weights_size]
+        init_propagator_weights(self.propagator_weights)
+
     def get_statistics_as_array(self) -> NDArray:
         """
         Returns the statistics as a Numpy array.
@@ -250,18 +494,50 @@ class BacktrackSolver(Solver):
         :return: a dictionary mapping statistic labels to values
         :rtype: Dict[str, int]
         """
+        return statistics_as_dictionary(self.statistics)
+
+    def get_propagator_profile(self) -> tuple[NDArray, NDArray]:
+        """
+        Returns the profile of the propagators, which is only maintained when the solver has been created with
+        profile_propagators=True; every propagator call is counted but only one in PROFILE_TIMING_PERIOD is timed.
+
+        :return: the counters (see PROFILE_MAX) indexed by propagators and indexed by algorithms
+        :rtype: Tuple[NDArray, NDArray]
+        """
+        algorithm_profiles = np.zeros((get_algorithm_nb(), PROFILE_MAX), dtype=np.int64)
+        if len(self.propagator_profiles) != 0:
+            np.add.at(algorithm_profiles, self.problem.algorithms, self.propagator_profiles)
+        return self.propagator_profiles, algorithm_profiles
+
+    def get_nogood_statistics(self) -> dict[str, int]:
+        """
+        Returns the statistics of the nogoods, which are only recorded when the solver has been created with a
+        nogood capacity.
+
+        :return: a dictionary mapping the nogood statistic labels to values
+        :rtype: Dict[str, int]
+        """
+        if len(self.nogoods) == 0:
+            return {NOGOOD_LBL_RECORDED_NB: 0, NOGOOD_LBL_PRUNING_NB: 0, NOGOOD_LBL_FAILURE_NB: 0}
+        return {
+            NOGOOD_LBL_RECORDED_NB: int(self.nogoods[NOGOOD_IDX_RECORDED_NB]),
+            NOGOOD_LBL_PRUNING_NB: int(self.nogoods[NOGOOD_IDX_PRUNING_NB]),
+            NOGOOD_LBL_FAILURE_NB: int(self.nogoods[NOGOOD_IDX_FAILURE_NB]),
+        }
+
+    def get_backjump_statistics(self) -> dict[str, int]:
+        """
+        Returns the statistics of the backjumps, which are only recorded when the solver has been created with
+        backjumping.
+
+        :return: a dictionary mapping the backjump statistic labels to values
+        :rtype: Dict[str, int]
+        """
+        if len(self.reason_levels) == 0:
+            return {BACKJUMP_LBL_JUMP_NB: 0, BACKJUMP_LBL_SKIPPED_NB: 0}
         return {
-            STATS_LBL_ALG_BC_NB: int(self.statistics[STATS_IDX_ALG_BC_NB]),
-            STATS_LBL_PROPAGATOR_ENTAILMENT_NB: int(self.statistics[STATS_IDX_PROPAGATOR_ENTAILMENT_NB]),
-            STATS_LBL_PROPAGATOR_FILTER_NB: int(self.statistics[STATS_IDX_PROPAGATOR_FILTER_NB]),
-            STATS_LBL_PROPAGATOR_FILTER_NO_CHANGE_NB: int(self.statistics[STATS_IDX_PROPAGATOR_FILTER_NO_CHANGE_NB]),
-            STATS_LBL_PROPAGATOR_INCONSISTENCY_NB: int(self.statistics[STATS_IDX_PROPAGATOR_INCONSISTENCY_NB]),
-            STATS_LBL_SOLVER_BACKTRACK_NB: int(self.statistics[STATS_IDX_SOLVER_BACKTRACK_NB]),
-            STATS_LBL_SOLVER_CHOICE_NB: int(self.statistics[STATS_IDX_SOLVER_CHOICE_NB]),
-            STATS_LBL_SOLVER_CHOICE_DEPTH: int(self.statistics[STATS_IDX_SOLVER_CHOICE_DEPTH]),
-            STATS_LBL_SOLUTION_NB: int(self.statistics[STATS_IDX_SOLUTION_NB]),
-            # the statistics array accumulates nanoseconds, the reported statistic is in milliseconds
-            STATS_LBL_SOLVER_ELAPSED_TIME: int(self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME]) // 1_000_000,
+            BACKJUMP_LBL_JUMP_NB: int(self.reason_levels[BACKJUMP_IDX_JUMP_NB]),
+            BACKJUMP_LBL_SKIPPED_NB: int(self.reason_levels[BACKJUMP_IDX_SKIPPED_NB]),
         }
 
     def minimize(self, variable: int, mode: str = OPTIM_RESET) -> NDArray | None:
@@ -347,16 +623,124 @@ class BacktrackSolver(Solver):
             pass
         return best_solution
 
-    def _solve_one(self) -> NDArray | None:
+    def set_limits(
+        self, choice_nb: int | None = None, backtrack_nb: int | None = None, deadline: int | None = None
+    ) -> None:
+        """
+        Limits the searches run from now on; a search stopped on a limit can be resumed after raising it.
+
+        :param choice_nb: the number of choices that can still be made or None for no limit
+        :type choice_nb: Optional[int]
+        :param backtrack_nb: the number of backtracks that can still be made or None for no limit
+        :type backtrack_nb: Optional[int]
+        :param deadline: the time to stop at (see time.monotonic_ns) or None for no limit
+        :type deadline: Optional[int]
+        """
+        self.limits[LIMIT_IDX_CHOICE_NB] = (
+            LIMIT_NONE if choice_nb is None else self.statistics[STATS_IDX_SOLVER_CHOICE_NB] + choice_nb
+        )
+        self.limits[LIMIT_IDX_BACKTRACK_NB] = (
+            LIMIT_NONE if backtrack_nb is None else self.statistics[STATS_IDX_SOLVER_BACKTRACK_NB] + backtrack_nb
+        )
+        self.limits[LIMIT_IDX_DEADLINE] = LIMIT_NONE if deadline is None else deadline
+
+    def _solve_one(
+        self, restart: Callable[[], bool] | None = None, poll: Callable[[], bool] | None = None
+    ) -> NDArray | None:
         """
         Searches for the next solution by forwarding the solver state to the jitted solve_one.
 
-        :return: the next solution if it exists or None
+        :param restart: the function restarting the search when the restart policy says so, which returns whether
+                        the search can continue, or None for no restart
+        :type restart: Optional[Callable[[], bool]]
+        :param poll: the function called every INCUMBENT_POLL_PERIOD choices, which returns whether the search can
+                     continue, or None for no poll
+        :type poll: Optional[Callable[[], bool]]
+
+        :return: the next solution if it exists or None, in which case limit_reached tells whether it is because
+                 of a limit
         :rtype: Optional[NDArray]
         """
+        self.run_limits[:] = self.limits
+        while True:
+            if restart is not None:
+                self.run_limits[LIMIT_IDX_BACKTRACK_NB] = min(
+                    self.limits[LIMIT_IDX_BACKTRACK_NB], self.restart_backtrack_nb
+                )
+            if poll is not None:
+                self.run_limits[LIMIT_IDX_CHOICE_NB] = min(
+                    self.limits[LIMIT_IDX_CHOICE_NB],
+                    self.statistics[STATS_IDX_SOLVER_CHOICE_NB] + INCUMBENT_POLL_PERIOD,
+                )
+            status = self._search()
+            if status != SEARCH_LIMIT_REACHED or self._limit_reached():
+                break
+            if poll is not None and self.statistics[STATS_IDX_SOLVER_CHOICE_NB] >= self.run_limits[LIMIT_IDX_CHOICE_NB]:
+                if not poll():
+                    status = SEARCH_EXHAUSTED
+                    break
+                continue
+            if restart is None:
+                break
+            logger.debug("Restarting")
+            self.statistics[STATS_IDX_SOLVER_RESTART_NB] += 1
+            self.restart_idx += 1
+            self._schedule_restart()
+            if not restart():
+                status = SEARCH_EXHAUSTED
+                break
+        self.limit_reached = status == SEARCH_LIMIT_REACHED
+        if status != SEARCH_SOLUTION:
+            return None
+        solution = get_solution(self.domains_stk, self.stks_top[0])
+        if self.phase_saving:
+            self.phases[:] = solution
+        return solution
+
+    def _search(self) -> int:
+        """
+        Runs the jitted solve_one, growing the stacks or the trail whenever they are full.
+
+        :return: the status of the search
+        :rtype: int
+        """
+        while (status := self._run_solve_one()) == SEARCH_STACKS_FULL:
+            self._grow_stacks()
+        return status
+
+    def _grow_stacks(self) -> None:
+        """
+        Doubles the height of the choice point stacks, up to their maximal height, or grows the trail when the
+        domains are trailed.
+        """
+        if len(self.trail) != 0:
+            self.trail = grow_trail(self.trail)
+            return
+        height = 2 * len(self.domains_stk)
+        if self.stks_max_height is not None:
+            if len(self.domains_stk) >= self.stks_max_height:
+                raise RuntimeError(
+                    f"The stacks of the choice points cannot grow beyond their maximal height of {self.stks_max_height}"
+                )
+            height = min(height, self.stks_max_height)
+        logger.debug(f"Growing the stacks of the choice points to a height of {height}")
+        self.domains_stk = cp_grow(self.domains_stk, height)
+        self.domain_update_stk = cp_grow(self.domain_update_stk, height)
+        self.unbound_variable_nb_stk = cp_grow(self.unbound_variable_nb_stk, height)
+        self.nogoods = grow_nogoods(self.nogoods, height)
+        self.reason_levels = grow_reason_levels(self.reason_levels, height)
+
+    def _run_solve_one(self) -> int:
+        """
+        Forwards the solver state to the jitted solve_one.
+
+        :return: the status returned by solve_one
+        :rtype: int
+        """
         return solve_one(
             self.problem.propagator_nb,
             self.statistics,
+            self.run_limits,
             self.problem.algorithms,
             self.problem.priorities,
             self.problem.bounds,
@@ -376,15 +760,108 @@ class BacktrackSolver(Solver):
             self.decision_variables_offsets,
             self.var_heuristic_fcts,
             self.var_heuristic_params,
-            self.var_heuristic_params_offsets,
+            self.var_heuristic_params_ranges,
             self.var_heuristic_params_shapes,
             self.dom_heuristic_fcts,
             self.dom_heuristic_params,
             self.dom_heuristic_params_offsets,
             self.dom_heuristic_params_shapes,
+            self.phases,
             self.compute_domains_fcts,
             self.domain_buffer,
+            self.propagator_weights,
+            self.propagator_states,
+            self.problem.incremental_propagators,
+            self.problem.deltas,
+            self.problem.deltas_offsets,
+            self.propagator_profiles,
+            self.nogoods,
+            self.reason_levels,
+            self.trail,
+        )
+
+    def _limit_reached(self) -> bool:
+        """
+        Returns whether one of the limits set by :meth:`set_limits` has been reached.
+
+        :return: true iff a limit has been reached
+        :rtype: bool
+        """
+        return bool(
+            self.statistics[STATS_IDX_SOLVER_CHOICE_NB] >= self.limits[LIMIT_IDX_CHOICE_NB]
+            or self.statistics[STATS_IDX_SOLVER_BACKTRACK_NB] >= self.limits[LIMIT_IDX_BACKTRACK_NB]
+            or (
+                self.limits[LIMIT_IDX_DEADLINE] != LIMIT_NONE and time.monotonic_ns() >= self.limits[LIMIT_IDX_DEADLINE]
+            )
+        )
+
+    def _schedule_restart(self) -> None:
+        """
+        Sets, according to the restart policy, the number of backtracks at which the next restart occurs.
+        """
+        self.restart_backtrack_nb = min(
+            int(self.statistics[STATS_IDX_SOLVER_BACKTRACK_NB])  # a Python int does not overflow
+            + restart_backtrack_nb(self.restart_policy, self.restart_scale, self.restart_factor, self.restart_idx),
+            LIMIT_NONE,
+        )
+
+    def _restart(
+        self, variable: int | None = None, value: int | None = None, bound: int = MAX, incumbent: NDArray | None = None
+    ) -> bool:
+        """
+        Restarts the search from the initial domains, with all the propagators scheduled; when optimizing, the
+        objective bound is fixed with the value of the best solution and with the incumbent.
+
+        :param variable: the variable being optimized or None
+        :type variable: Optional[int]
+        :param value: the value of the variable in the best solution found so far or None
+        :type value: Optional[int]
+        :param bound: the bound to fix on the variable
+        :type bound: int
+        :param incumbent: an optional 1-element int64 array holding the shared incumbent value
+        :type incumbent: Optional[NDArray]
+
+        :return: whether the search can continue
+        :rtype: bool
+        """
+        cp_init(
+            self.domains_stk,
+            self.entailed_propagator_depths,
+            self.entailment_trail,
+            self.domain_update_stk,
+            self.unbound_variable_nb_stk,
+            self.stks_top,
+            self.initial_domains,
+            self.initial_unbound_variable_nb,
         )
+        restart_nogoods(self.nogoods)
+        clear_reason_levels(self.reason_levels)
+        clear_trail(self.trail)
+        if variable is not None:
+            if value is not None and not fix_choice_point(
+                self.domains_stk, self.unbound_variable_nb_stk, variable, value, bound
+            ):
+                return False
+            if incumbent is not None and not self._fix_incumbent(variable, bound, incumbent):
+                return False
+        buckets_empty(self.triggered_propagators, self.problem.priorities)
+        buckets_init(self.triggered_propagators, self.problem.priorities)
+        return True
+
+    def reset(self, domains: NDArray | None = None) -> None:
+        """
+        Resets the search on its initial domains; when domains are given, they become the initial domains, the
+        search and its restarts starting from them (eg a neighbourhood of a large neighbourhood search).
+
+        :param domains: the (domain_nb, 2) new initial domains or None
+        :type domains: Optional[NDArray]
+        """
+        if domains is not None:
+            self.initial_domains = domains
+            self.initial_unbound_variable_nb = int(np.count_nonzero(domains[:, MIN] != domains[:, MAX]))
+        self._restart()
+        # the nogoods recorded above other domains may not hold
+        clear_nogoods(self.nogoods)
 
     def _advance_after_optimum(self, variable: int, value: int, bound: int, mode: str) -> bool:
         """
@@ -405,25 +882,24 @@ class BacktrackSolver(Solver):
         """
         if mode == OPTIM_RESET:
             logger.debug("Resetting solver")
-            cp_init(
+            if not self._restart(variable, value, bound):
+                return False
+        elif len(self.trail) != 0:
+            logger.debug("Pruning choice points")
+            set_trail_objective(self.trail, variable, value, bound)
+            if not trail_pop(
+                self.trail,
                 self.domains_stk,
                 self.entailed_propagator_depths,
                 self.entailment_trail,
-                self.domain_update_stk,
-                self.unbound_variable_nb_stk,
-                self.stks_top,
-                self.initial_domains,
-                self.problem.unbound_variable_nb,
-            )
-            if not fix_choice_point(
-                self.domains_stk,
                 self.unbound_variable_nb_stk,
-                variable,
-                value,
-                bound,
+                self.triggered_propagators,
+                self.problem.triggers,
+                self.problem.triggers_offsets,
+                self.problem.priorities,
+                self.problem.propagator_nb,
             ):
                 return False
-            buckets_init(self.triggered_propagators, self.problem.priorities)
         else:
             logger.debug("Pruning choice points")
             if not fix_choice_points(
@@ -443,9 +919,12 @@ class BacktrackSolver(Solver):
                 bound,
             ):
                 return False
+            refute_reason_levels(self.reason_levels, self.domain_update_stk, int(self.stks_top[0]), True)
         return True
 
-    def optimize_solutions(self, variable: int, bound: int, mode: str) -> Iterator[NDArray]:
+    def optimize_solutions(
+        self, variable: int, bound: int, mode: str, incumbent: NDArray | None = None
+    ) -> Generator[NDArray, None, None]:
         """
         Iterates over the successively improving solutions found while optimizing a given variable.
 
@@ -454,28 +933,187 @@ class BacktrackSolver(Solver):
         use :meth:`optimize` (or :meth:`minimize` / :meth:`maximize`); streaming consumers (e.g. the
         FlatZinc runner) print each solution as it is produced.
 
+        Several solvers optimizing the same objective (on sub-problems) can share an incumbent: the best value
+        found by any of them, usually backed by shared memory. It is polled before the search starts, at restarts
+        and every INCUMBENT_POLL_PERIOD choices, and tightened with the value of every local optimum, so that a bound
+        found by one solver cuts the searches of the others shortly after. Its initial value must not restrict the
+        objective (eg the largest int64 when minimizing).
+
+        When the iteration stops on a limit (see :meth:`set_limits`), limit_reached is set and the last yielded
+        solution is not proven optimal; calling this method again resumes the search where it stopped.
+
+        With a restart policy, the search restarts from the initial domains whenever its backtrack budget is spent,
+        keeping the objective bound of the best solution found so far.
+
         :param variable: the variable
         :type variable: int
         :param bound: the bound to optimize
         :type bound: int
         :param mode: the optimization mode
         :type mode: str
+        :param incumbent: an optional 1-element int64 array holding the shared incumbent value
+        :type incumbent: Optional[NDArray]
 
         :return: an iterator over the improving solutions, the last one being optimal
-        :rtype: Iterator[NDArray]
+        :rtype: Generator[NDArray, None, None]
         """
         t0 = time.perf_counter_ns()
+        self.limit_reached = False
         buckets_empty(self.triggered_propagators, self.problem.priorities)
         buckets_init(self.triggered_propagators, self.problem.priorities)
+        clear_nogoods(self.nogoods)
+        self.restart_idx = 0
+        self._schedule_restart()
+        value = None
+
+        def restart() -> bool:
+            return self._restart(variable, value, bound, incumbent)
+
+        poll = None if incumbent is None else partial(self._poll_incumbent, variable, bound, incumbent)
+
         try:
-            while (solution := self._solve_one()) is not None:
+            if len(self.hint) != 0:
+                solution = self._check_hint()
+                if solution is not None:
+                    logger.info(f"Found a local optimum from the hint: {solution[variable]}")
+                    yield solution
+                    value = self._share_value(solution[variable], bound, incumbent)
+                if not self._restart(variable, value, bound, incumbent):
+                    return
+            elif incumbent is not None and not self._fix_incumbent(variable, bound, incumbent):
+                return
+            while (solution := self._solve_one(restart, poll)) is not None:
                 logger.info(f"Found a local optimum: {solution[variable]}")
                 yield solution
-                if not self._advance_after_optimum(variable, solution[variable], bound, mode):
+                value = self._share_value(solution[variable], bound, incumbent)
+                if not self._advance_after_optimum(variable, value, bound, mode):
                     break
         finally:
             self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME] += time.perf_counter_ns() - t0
 
+    def _check_hint(self) -> NDArray | None:
+        """
+        Checks the solution hint by propagation: the search dives, without backtracking, from the initial domains
+        restricted by the hint, the variables without a hint being chosen by the phases and the domain heuristics.
+        The choice points are left on the hinted domains, the caller restarts the search.
+
+        :return: the solution completing the hint or None
+        :rtype: Optional[NDArray]
+        """
+        hint_domains = get_hint_domains(self.initial_domains, self.hint)
+        if hint_domains is None:
+            return None
+        self.restore_choice_point(hint_domains)
+        self.run_limits[:] = self.limits
+        self.run_limits[LIMIT_IDX_BACKTRACK_NB] = min(
+            self.limits[LIMIT_IDX_BACKTRACK_NB], self.statistics[STATS_IDX_SOLVER_BACKTRACK_NB]
+        )
+        if self._search() != SEARCH_SOLUTION:
+            return None
+        solution = get_solution(self.domains_stk, self.stks_top[0])
+        if self.phase_saving:
+            self.phases[:] = solution
+        return solution
+
+    def _share_value(self, value: int, bound: int, incumbent: NDArray | None) -> int:
+        """
+        Tightens the shared incumbent with the value of a local optimum.
+
+        :param value: the value of the variable in the local optimum
+        :type value: int
+        :param bound: the bound being optimized
+        :type bound: int
+        :param incumbent: an optional 1-element int64 array holding the shared incumbent value
+        :type incumbent: Optional[NDArray]
+
+        :return: the best of the value and of the incumbent
+        :rtype: int
+        """
+        if incumbent is not None:
+            # the read-compare-write is not atomic: a lost update only weakens the pruning of the others
+            incumbent[0] = value = min(value, incumbent[0]) if bound == MAX else max(value, incumbent[0])
+        return value
+
+    def _fix_incumbent(self, variable: int, bound: int, incumbent: NDArray) -> bool:
+        """
+        Fixes the objective bound in the root choice point when the shared incumbent is better than it.
+
+        :param variable: the variable being optimized
+        :type variable: int
+        :param bound: the bound to fix on the variable
+        :type bound: int
+        :param incumbent: the 1-element array holding the shared incumbent value
+        :type incumbent: NDArray
+
+        :return: whether the search can continue
+        :rtype: bool
+        """
+        value = incumbent[0]
+        if len(self.trail) != 0:
+            # the domains are the root domains only when there is no choice point
+            set_trail_objective(self.trail, variable, value, bound)
+            if self.trail[TRAIL_IDX_LEVEL_NB] != 0:
+                return True
+        domain = self.domains_stk[0, variable]
+        if value <= domain[MAX] if bound == MAX else value >= domain[MIN]:
+            return fix_choice_point(self.domains_stk, self.unbound_variable_nb_stk, variable, value, bound)
+        return True
+
+    def _poll_incumbent(self, variable: int, bound: int, incumbent: NDArray) -> bool:
+        """
+        Fixes the objective bound in all the choice points with the shared incumbent, during a search stopped
+        every INCUMBENT_POLL_PERIOD choices; the current domains are kept unless the bound empties them.
+
+        :param variable: the variable being optimized
+        :type variable: int
+        :param bound: the bound to fix on the variable
+        :type bound: int
+        :param incumbent: the 1-element array holding the shared incumbent value
+        :type incumbent: NDArray
+
+        :return: whether the search can continue
+        :rtype: bool
+        """
+        value = int(incumbent[0])
+        if len(self.trail) != 0:
+            return trail_fix_objective(
+                self.trail,
+                self.domains_stk,
+                self.entailed_propagator_depths,
+                self.entailment_trail,
+                self.unbound_variable_nb_stk,
+                self.triggered_propagators,
+                self.problem.triggers,
+                self.problem.triggers_offsets,
+                self.problem.priorities,
+                self.problem.propagator_nb,
+                variable,
+                value,
+                bound,
+            )
+        top = int(self.stks_top[0])
+        if not fix_choice_points(
+            self.domains_stk,
+            self.entailed_propagator_depths,
+            self.entailment_trail,
+            self.domain_update_stk,
+            self.unbound_variable_nb_stk,
+            self.stks_top,
+            self.triggered_propagators,
+            self.problem.triggers,
+            self.problem.triggers_offsets,
+            self.problem.priorities,
+            self.problem.propagator_nb,
+            variable,
+            value,
+            bound,
+            False,
+        ):
+            return False
+        if self.stks_top[0] != top:
+            refute_reason_levels(self.reason_levels, self.domain_update_stk, int(self.stks_top[0]), True)
+        return True
+
     def solve(self) -> Iterator[NDArray]:
         """
         Returns an iterator over the solutions.
@@ -486,37 +1124,165 @@ class BacktrackSolver(Solver):
         logger.info("Solving and iterating over the solutions")
         buckets_empty(self.triggered_propagators, self.problem.priorities)
         buckets_init(self.triggered_propagators, self.problem.priorities)
+        clear_nogoods(self.nogoods)
+        self.restart_idx = 0
+        self._schedule_restart()
+        yield from self.resume(self.restart_policy != RESTART_NONE)
+
+    def resume(self, restart: bool = False) -> Iterator[NDArray]:
+        """
+        Returns an iterator over the solutions, resuming the search from the current choice points and
+        propagation queue (which are not reinitialized, unlike with :meth:`solve`).
+
+        When the iteration stops on a limit (see :meth:`set_limits`), limit_reached is set and calling this method
+        again resumes the search where it stopped.
+
+        :param restart: whether the search can restart from the initial domains, according to the restart policy,
+                        until the first solution is found, defaults to False
+        :type restart: bool
+
+        :return: an iterator
+        :rtype: Iterator[NDArray]
+        """
         t0 = time.perf_counter_ns()
+        self.limit_reached = False
         while True:
-            solution = self._solve_one()
+            solution = self._solve_one(self._restart if restart else None)
             self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME] += time.perf_counter_ns() - t0
             if solution is None:
                 break
             logger.debug("Found a solution")
             yield solution
+            # the last run started from the initial domains: enumerating its remaining solutions is complete
+            restart = False
             t0 = time.perf_counter_ns()
-            if not backtrack(
+            if not self._backtrack():
+                self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME] += time.perf_counter_ns() - t0
+                break
+            self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME] += time.perf_counter_ns() - t0
+            t0 = time.perf_counter_ns()
+
+    def _backtrack(self) -> bool:
+        """
+        Backtracks after a solution.
+
+        :return: true iff it is possible to backtrack
+        :rtype: bool
+        """
+        if len(self.trail) != 0:
+            return trail_backtrack(
                 self.statistics,
+                self.trail,
+                self.domains_stk,
                 self.entailed_propagator_depths,
                 self.entailment_trail,
-                self.domain_update_stk,
-                self.stks_top,
+                self.unbound_variable_nb_stk,
                 self.triggered_propagators,
                 self.problem.triggers,
                 self.problem.triggers_offsets,
                 self.problem.priorities,
                 self.problem.propagator_nb,
-            ):
-                self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME] += time.perf_counter_ns() - t0
-                break
-            self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME] += time.perf_counter_ns() - t0
-            t0 = time.perf_counter_ns()
+            )
+        if not backtrack(
+            self.statistics,
+            self.entailed_propagator_depths,
+            self.entailment_trail,
+            self.domain_update_stk,
+            self.stks_top,
+            self.triggered_propagators,
+            self.problem.triggers,
+            self.problem.triggers_offsets,
+            self.problem.priorities,
+            self.problem.propagator_nb,
+        ):
+            return False
+        refute_reason_levels(self.reason_levels, self.domain_update_stk, int(self.stks_top[0]), True)
+        return True
+
+    def steal_choice_point(self) -> tuple[NDArray, NDArray] | None:
+        """
+        Removes the pending choice point nearest to the root, so that another solver can explore it.
+
+        Meant to be called when an enumeration (:meth:`solve` or :meth:`resume`) is suspended, between two solutions
+        or after a stop on a limit (see :meth:`set_limits`): the solutions below the stolen choice point will not be
+        found by this solver anymore.
+
+        :return: the (domain_nb, 2) domains and the pending decision of the choice point, or None if there is none
+        :rtype: Optional[Tuple[NDArray, NDArray]]
+        """
+        stolen_domains = np.empty((self.problem.domain_nb, 2), dtype=np.int32)
+        stolen_domain_update = np.empty(2, dtype=np.uint32)
+        if len(self.trail) != 0:
+            return (
+                (stolen_domains, stolen_domain_update)
+                if trail_steal(self.trail, self.domains_stk, stolen_domains, stolen_domain_update)
+                else None
+            )
+        top = int(self.stks_top[0])
+        if not cp_steal(
+            self.domains_stk,
+            self.entailed_propagator_depths,
+            self.entailment_trail,
+            self.domain_update_stk,
+            self.unbound_variable_nb_stk,
+            self.stks_top,
+            stolen_domains,
+            stolen_domain_update,
+        ):
+            return None
+        steal_nogood_decision(self.nogoods, top)
+        steal_reason_levels(self.reason_levels, int(self.stks_top[0]))
+        return stolen_domains, stolen_domain_update
+
+    def restore_choice_point(self, domains: NDArray, domain_update: NDArray | None = None) -> None:
+        """
+        Resets the solver on a choice point, usually stolen from another solver of the same problem;
+        the search can then be run with :meth:`resume`.
+
+        The domains become the root of the search. When the pending decision of the choice point is given, the
+        domains are known to be a fixpoint but for this decision, and only the propagators it triggers are
+        scheduled; otherwise all the propagators are.
+
+        :param domains: the (domain_nb, 2) domains of the choice point
+        :type domains: NDArray
+        :param domain_update: the pending decision of the choice point or None
+        :type domain_update: Optional[NDArray]
+        """
+        cp_init(
+            self.domains_stk,
+            self.entailed_propagator_depths,
+            self.entailment_trail,
+            self.domain_update_stk,
+            self.unbound_variable_nb_stk,
+            self.stks_top,
+            domains,
+            int(np.count_nonzero(domains[:, MIN] != domains[:, MAX])),
+        )
+        # the nogoods recorded above other domains may not hold
+        clear_nogoods(self.nogoods)
+        clear_reason_levels(self.reason_levels)
+        clear_trail(self.trail)
+        buckets_empty(self.triggered_propagators, self.problem.priorities)
+        if domain_update is None:
+            buckets_init(self.triggered_propagators, self.problem.priorities)
+        else:
+            offset = domain_update[DOM_UPDATE_VARIABLE] * EVENT_MASK_NB + domain_update[DOM_UPDATE_EVENTS]
+            update_propagators(
+                self.triggered_propagators,
+                self.entailed_propagator_depths,
+                self.problem.triggers[
+                    self.problem.triggers_offsets[offset] : self.problem.triggers_offsets[offset + 1]
+                ],
+                self.problem.priorities,
+                self.problem.propagator_nb,
+            )
 
 
 @njit(cache=True)
 def solve_one(
     propagator_nb: int,
     statistics: NDArray,
+    limits: NDArray,
     algorithms: NDArray,
     priorities: NDArray,
     bounds: NDArray,
@@ -536,15 +1302,25 @@ def solve_one(
     decision_variables_offsets: NDArray,
     var_heuristic_fcts: VariableHeuristicFunctions,
     var_heuristic_params: NDArray,
-    var_heuristic_params_offsets: NDArray,
+    var_heuristic_params_ranges: NDArray,
     var_heuristic_params_shapes: NDArray,
     dom_heuristic_fcts: DomainHeuristicFunctions,
     dom_heuristic_params: NDArray,
     dom_heuristic_params_offsets: NDArray,
     dom_heuristic_params_shapes: NDArray,
+    phases: NDArray,
     compute_domains_fcts: ComputeDomainsFunctions,
     domain_buffer: NDArray,
-) -> NDArray | None:
+    propagator_weights: NDArray,
+    propagator_states: NDArray,
+    incremental_propagators: NDArray,
+    deltas: NDArray,
+    deltas_offsets: NDArray,
+    propagator_profiles: NDArray,
+    nogoods: NDArray,
+    reason_levels: NDArray,
+    trail: NDArray,
+) -> int:
     """
     Find at most one solution.
 
@@ -552,8 +1328,14 @@ def solve_one(
     all the propagators (buckets_init) before the first call, and rely on backtrack / fix_choice_points to
     schedule the propagators affected by a refutation or a bound tightening between subsequent calls.
 
+    The search stops when one of the limits is reached: the choice and backtrack limits are checked after every
+    choice and backtrack, the deadline every LIMIT_DEADLINE_PERIOD choices. The choice points and the
+    propagation queue are then left as they are, so that a subsequent call resumes the search.
+
     :param statistics: a Numpy array of statistics
     :type statistics: NDArray
+    :param limits: a Numpy array of limits on the statistics and on the time, LIMIT_NONE meaning no limit
+    :type limits: NDArray
     :param algorithms: the algorithms indexed by propagators
     :type algorithms: NDArray
     :param priorities: the propagation queue bucket priorities indexed by propagators
@@ -593,8 +1375,8 @@ def solve_one(
     :type var_heuristic_fcts: VarHeuristicFcts
     :param var_heuristic_params: the flattened concatenation of the per-search variable heuristic parameter arrays
     :type var_heuristic_params: NDArray
-    :param var_heuristic_params_offsets: the CSR offsets delimiting each search's slice of var_heuristic_params
-    :type var_heuristic_params_offsets: NDArray
+    :param var_heuristic_params_ranges: the range delimiting each search's slice of var_heuristic_params
+    :type var_heuristic_params_ranges: NDArray
     :param var_heuristic_params_shapes: the 2d shape of each search's variable heuristic parameter array
     :type var_heuristic_params_shapes: NDArray
     :param dom_heuristic_fcts: the typed list of domain heuristic functions, one per search
@@ -605,18 +1387,46 @@ def solve_one(
     :type dom_heuristic_params_offsets: NDArray
     :param dom_heuristic_params_shapes: the 2d shape of each search's domain heuristic parameter array
     :type dom_heuristic_params_shapes: NDArray
+    :param phases: the values tried first by the search, empty when there is no hint and no phase saving
+    :type phases: NDArray
     :param compute_domains_fcts: the typed list of compute_domains functions, built once at solver init
     :type compute_domains_fcts: ComputeDomainsFcts
     :param domain_buffer: a scratch buffer for prop_domains,
                           sized to max propagator arity, allocated once at solver init
     :type domain_buffer: NDArray
+    :param propagator_weights: the weights learned from the failures of the propagators
+    :type propagator_weights: NDArray
+    :param propagator_states: the concatenation of the states of the propagators
+    :type propagator_states: NDArray
+    :param incremental_propagators: 1 for the propagators that are given the changed positions, 0 otherwise
+    :type incremental_propagators: NDArray
+    :param deltas: the occurrences of the variables in the incremental propagators (see DELTA_OCCURRENCE_NB)
+    :type deltas: NDArray
+    :param deltas_offsets: the CSR offsets delimiting each variable's occurrences
+    :type deltas_offsets: NDArray
+    :param propagator_profiles: the counters indexed by propagators, empty when not profiling
+    :type propagator_profiles: NDArray
+    :param nogoods: the nogood store, empty when there is no nogood
+    :type nogoods: NDArray
+    :param reason_levels: the reason levels of the variables, empty when there is no backjumping
+    :type reason_levels: NDArray
+    :param trail: the trail, empty when the domains of the choice points are copied
+    :type trail: NDArray
 
-    :return: the solution if it exists or None
-    :rtype: Optional[NDArray]
+    :return: SEARCH_SOLUTION when a solution has been found (it is at the top of the stacks), SEARCH_EXHAUSTED
+             when there is no more solution, SEARCH_LIMIT_REACHED when a limit has been reached, SEARCH_STACKS_FULL
+             when the stacks or the trail have to grow
+    :rtype: int
     """
     consistency_alg_fct = consistency_alg_fcts[0]
     nb_searches = len(decision_variables_offsets) - 1
+    branch_domains = get_branch_domains(domains_stk.shape[1])
     while True:
+        if len(trail) != 0 and trail_full(trail):
+            return SEARCH_STACKS_FULL
+        if len(reason_levels) != 0:
+            # a failure that the consistency algorithm does not explain is a failure of the top level
+            set_conflict_levels(reason_levels, int(stks_top[0]), int(stks_top[0]) - 1)
         status = consistency_alg_fct(
             propagator_nb,
             statistics,
@@ -635,12 +1445,23 @@ def solve_one(
             triggered_propagators,
             compute_domains_fcts,
             domain_buffer,
+            propagator_weights,
+            propagator_states,
+            incremental_propagators,
+            deltas,
+            deltas_offsets,
+            propagator_profiles,
+            nogoods,
+            reason_levels,
+            trail,
         )
-        top = stks_top[0]
+        top = int(stks_top[0])
         if status == PROBLEM_BOUND:
             statistics[STATS_IDX_SOLUTION_NB] += 1
-            return get_solution(domains_stk, top)
+            return SEARCH_SOLUTION
         elif status == PROBLEM_UNBOUND:
+            if len(trail) == 0 and cp_full(domains_stk, stks_top):
+                return SEARCH_STACKS_FULL
             # sequential search: the first search that still has an unbound decision variable owns the
             # decision and branches with its own variable and domain heuristics
             for search_idx in range(nb_searches):
@@ -651,23 +1472,54 @@ def solve_one(
                     domains_stk,
                     top,
                     var_heuristic_params[
-                        var_heuristic_params_offsets[search_idx] : var_heuristic_params_offsets[search_idx + 1]
+                        var_heuristic_params_ranges[search_idx, RANGE_START] : var_heuristic_params_ranges[
+                            search_idx, RANGE_END
+                        ]
                     ].reshape(var_heuristic_params_shapes[search_idx, 0], var_heuristic_params_shapes[search_idx, 1]),
                 )
                 if variable != -1:
-                    events = dom_heuristic_fcts[search_idx](
-                        domains_stk,
-                        domain_update_stk,
-                        unbound_variable_nb_stk,
-                        stks_top,
-                        variable,
-                        dom_heuristic_params[
-                            dom_heuristic_params_offsets[search_idx] : dom_heuristic_params_offsets[search_idx + 1]
-                        ].reshape(
-                            dom_heuristic_params_shapes[search_idx, 0], dom_heuristic_params_shapes[search_idx, 1]
-                        ),
-                    )
-                    top = stks_top[0]
+                    heuristic_domains_stk = domains_stk
+                    if len(trail) != 0:
+                        heuristic_domains_stk = branch_domains
+                        branch_domains[0, variable] = domains_stk[0, variable]
+                    params = dom_heuristic_params[
+                        dom_heuristic_params_offsets[search_idx] : dom_heuristic_params_offsets[search_idx + 1]
+                    ].reshape(dom_heuristic_params_shapes[search_idx, 0], dom_heuristic_params_shapes[search_idx, 1])
+                    if has_phase(phases, heuristic_domains_stk[stks_top[0], variable], variable):
+                        events = value_dom_heuristic(
+                            heuristic_domains_stk,
+                            domain_update_stk,
+                            unbound_variable_nb_stk,
+                            stks_top,
+                            variable,
+                            phases[variable],
+                            params,
+                        )
+                    else:
+                        events = dom_heuristic_fcts[search_idx](
+                            heuristic_domains_stk,
+                            domain_update_stk,
+                            unbound_variable_nb_stk,
+                            stks_top,
+                            variable,
+                            params,
+                        )
+                    if len(nogoods) != 0:
+                        record_decisions(nogoods, domains_stk, domain_update_stk, top, stks_top[0])
+                    if len(reason_levels) != 0:
+                        record_decision_levels(reason_levels, variable, top, stks_top[0])
+                    if len(trail) != 0:
+                        trail_branch(
+                            trail,
+                            domains_stk,
+                            domain_update_stk,
+                            unbound_variable_nb_stk,
+                            stks_top,
+                            entailment_trail,
+                            branch_domains,
+                            variable,
+                        )
+                    top = int(stks_top[0])
                     offset = variable * EVENT_MASK_NB + events
                     update_propagators(
                         triggered_propagators,
@@ -677,21 +1529,73 @@ def solve_one(
                         propagator_nb,
                     )
                     statistics[STATS_IDX_SOLVER_CHOICE_NB] += 1
-                    statistics[STATS_IDX_SOLVER_CHOICE_DEPTH] = max(statistics[STATS_IDX_SOLVER_CHOICE_DEPTH], top)
+                    depth = top if len(trail) == 0 else trail[TRAIL_IDX_LEVEL_NB]
+                    statistics[STATS_IDX_SOLVER_CHOICE_DEPTH] = max(statistics[STATS_IDX_SOLVER_CHOICE_DEPTH], depth)
+                    if choice_limit_reached(statistics, limits):
+                        return SEARCH_LIMIT_REACHED
                     break
-        elif not backtrack(
-            statistics,
-            entailed_propagator_depths,
-            entailment_trail,
-            domain_update_stk,
-            stks_top,
-            triggered_propagators,
-            triggers,
-            triggers_offsets,
-            priorities,
-            propagator_nb,
-        ):
-            return None
+        else:
+            if len(trail) != 0:
+                if not trail_backtrack(
+                    statistics,
+                    trail,
+                    domains_stk,
+                    entailed_propagator_depths,
+                    entailment_trail,
+                    unbound_variable_nb_stk,
+                    triggered_propagators,
+                    triggers,
+                    triggers_offsets,
+                    priorities,
+                    propagator_nb,
+                ):
+                    return SEARCH_EXHAUSTED
+            else:
+                if len(reason_levels) != 0:
+                    # the pending refutations that keep the domains implying the failure are skipped
+                    stks_top[0] = backjump_level(reason_levels, top) + 1
+                if len(nogoods) != 0 and stks_top[0] > 0:
+                    # the decision of the choice point we backtrack to has failed
+                    record_nogood(nogoods, stks_top[0] - 1)
+                if not backtrack(
+                    statistics,
+                    entailed_propagator_depths,
+                    entailment_trail,
+                    domain_update_stk,
+                    stks_top,
+                    triggered_propagators,
+                    triggers,
+                    triggers_offsets,
+                    priorities,
+                    propagator_nb,
+                ):
+                    return SEARCH_EXHAUSTED
+                refute_reason_levels(reason_levels, domain_update_stk, stks_top[0], False)
+            if statistics[STATS_IDX_SOLVER_BACKTRACK_NB] >= limits[LIMIT_IDX_BACKTRACK_NB]:
+                return SEARCH_LIMIT_REACHED
+
+
+@njit(cache=True)
+def choice_limit_reached(statistics: NDArray, limits: NDArray) -> bool:
+    """
+    Returns whether the choice limit or, every LIMIT_DEADLINE_PERIOD choices, the deadline has been reached.
+
+    :param statistics: a Numpy array of statistics
+    :type statistics: NDArray
+    :param limits: a Numpy array of limits
+    :type limits: NDArray
+
+    :return: true iff a limit has been reached
+    :rtype: bool
+    """
+    choice_nb = statistics[STATS_IDX_SOLVER_CHOICE_NB]
+    if choice_nb >= limits[LIMIT_IDX_CHOICE_NB]:
+        return True
+    if limits[LIMIT_IDX_DEADLINE] == LIMIT_NONE or choice_nb & (LIMIT_DEADLINE_PERIOD - 1) != 0:
+        return False
+    with objmode(now="int64"):
+        now = time.monotonic_ns()
+    return now >= limits[LIMIT_IDX_DEADLINE]
 
 
 def get_domain_buffer(bounds: NDArray) -> NDArray:
@@ -713,3 +1617,19 @@ def get_domain_buffer(bounds: NDArray) -> NDArray:
         arity = np.int64(bounds[propagator_idx, VARIABLE, RANGE_END] - bounds[propagator_idx, VARIABLE, RANGE_START])
         max_arity = max(max_arity, arity)
     return np.empty((max_arity, 2), dtype=np.int32)
+
+
+def get_propagator_states(bounds: NDArray) -> NDArray:
+    """
+    Allocates the states of the propagators, in which the stateful propagators keep their working memory.
+
+    Sized from the state bounds computed by the problem, allocated once at solver init and threaded through the
+    consistency algorithms; a zeroed state is a cold state.
+
+    :param bounds: the bounds indexed by propagators
+    :type bounds: NDArray
+
+    :return: the concatenation of the states of the propagators
+    :rtype: NDArray
+    """
+    return np.zeros(bounds[-1, STATE, RANGE_END], dtype=np.int32)
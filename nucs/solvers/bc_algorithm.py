@@ -12,11 +12,20 @@
 ###############################################################################
 
 
-from numba import njit  # type: ignore
+import time
+
+from numba import njit, objmode  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.buckets import STORAGE_OFFSET, buckets_add, buckets_pop
 from nucs.constants import (
+    DELTA_IDX_NB,
+    DELTA_IDX_STAMP,
+    DELTA_IDX_WARM,
+    DELTA_OCCURRENCE_IDX_ARITY,
+    DELTA_OCCURRENCE_IDX_POSITION,
+    DELTA_OCCURRENCE_IDX_STATE,
+    DELTA_OCCURRENCE_NB,
     EVENT_MASK_GROUND,
     EVENT_MASK_MAX,
     EVENT_MASK_MIN,
@@ -24,14 +33,24 @@ from nucs.constants import (
     EVENT_MASK_NONE,
     MAX,
     MIN,
+    NOGOOD_IDX_CHANGE_NB,
     PARAM,
     PROBLEM_BOUND,
     PROBLEM_INCONSISTENT,
     PROBLEM_UNBOUND,
+    PROFILE_IDX_CALL_NB,
+    PROFILE_IDX_ENTAILMENT_NB,
+    PROFILE_IDX_INCONSISTENCY_NB,
+    PROFILE_IDX_NO_CHANGE_NB,
+    PROFILE_IDX_REMOVED_VALUE_NB,
+    PROFILE_IDX_TIMED_CALL_NB,
+    PROFILE_IDX_TIMED_CALL_TIME,
+    PROFILE_TIMING_PERIOD,
     PROP_ENTAILMENT,
     PROP_INCONSISTENCY,
     RANGE_END,
     RANGE_START,
+    STATE,
     STATS_IDX_ALG_BC_NB,
     STATS_IDX_PROPAGATOR_ENTAILMENT_NB,
     STATS_IDX_PROPAGATOR_FILTER_NB,
@@ -40,6 +59,11 @@ from nucs.constants import (
     VARIABLE,
 )
 from nucs.numba_helper import ComputeDomainsFunctions
+from nucs.propagators.deltas import append_delta, get_int64, rebuild_delta, set_int64
+from nucs.solvers.backjumps import get_propagator_levels, set_conflict_levels, set_variable_levels
+from nucs.solvers.nogoods import get_nogood_sections, propagate_nogoods
+from nucs.solvers.propagator_weights import bump_propagator_weights
+from nucs.solvers.trail import trail_domain
 
 
 @njit(cache=True)
@@ -61,10 +85,36 @@ def bc_algorithm(
     triggered_propagators: NDArray,
     compute_domains_fcts: ComputeDomainsFunctions,
     domain_buffer: NDArray,
+    propagator_weights: NDArray,
+    propagator_states: NDArray,
+    incremental_propagators: NDArray,
+    deltas: NDArray,
+    deltas_offsets: NDArray,
+    propagator_profiles: NDArray,
+    nogoods: NDArray,
+    reason_levels: NDArray,
+    trail: NDArray,
 ) -> int:
     """
     This is the default consistency algorithm used by the solver.
 
+    The incremental propagators are given, in their states, the positions of their variables whose domains changed
+    since their previous call. These deltas are stamped with the number of calls to the consistency algorithm:
+    a delta from a previous call misses the changes made in between (decisions, backtracks), it is then rebuilt from
+    the snapshot of the domains kept in the state.
+
+    When profiling, the counters of each propagator are maintained in propagator_profiles (see PROFILE_MAX);
+    a propagator is timed every PROFILE_TIMING_PERIOD calls, the clock being read in object mode.
+
+    When there are nogoods, they are propagated whenever the propagators have reached a fixpoint, the propagators
+    being scheduled again when the nogoods have changed some domains.
+
+    When backjumping, the reason levels of the changed variables are maintained, and so is the reason level of a
+    failure (see nucs/solvers/backjumps.py).
+
+    When the domains are trailed, the domains are pushed on the trail before they are changed
+    (see nucs/solvers/trail.py).
+
     :param statistics: a Numpy array of statistics
     :type statistics: NDArray
     :param algorithms: the algorithms indexed by propagators
@@ -100,17 +150,61 @@ def bc_algorithm(
     :param domain_buffer: a scratch buffer for prop_domains,
                           sized to max propagator arity, allocated once at solver init
     :type domain_buffer: NDArray
+    :param propagator_weights: the weights learned from the failures of the propagators
+    :type propagator_weights: NDArray
+    :param propagator_states: the concatenation of the states of the propagators
+    :type propagator_states: NDArray
+    :param incremental_propagators: 1 for the propagators that are given the changed positions, 0 otherwise
+    :type incremental_propagators: NDArray
+    :param deltas: the occurrences of the variables in the incremental propagators (see DELTA_OCCURRENCE_NB)
+    :type deltas: NDArray
+    :param deltas_offsets: the CSR offsets delimiting each variable's occurrences
+    :type deltas_offsets: NDArray
+    :param propagator_profiles: the counters indexed by propagators, empty when not profiling
+    :type propagator_profiles: NDArray
+    :param nogoods: the nogood store, empty when there is no nogood
+    :type nogoods: NDArray
+    :param reason_levels: the reason levels of the variables, empty when there is no backjumping
+    :type reason_levels: NDArray
+    :param trail: the trail, empty when the domains of the choice points are copied
+    :type trail: NDArray
 
     :return: a status (consistency, inconsistency or entailment) as an integer
     :rtype: int
     """
-    top = stks_top[0]
+    top = int(stks_top[0])
     domains = domains_stk[top]
     statistics[STATS_IDX_ALG_BC_NB] += 1
+    stamp = statistics[STATS_IDX_ALG_BC_NB]
     membership_offset = STORAGE_OFFSET + propagator_nb
+    profiling = len(propagator_profiles) != 0
     while True:
         prop_idx = buckets_pop(triggered_propagators, membership_offset)
         if prop_idx == -1:
+            if len(nogoods) != 0:
+                if not propagate_nogoods(nogoods, domains):
+                    if len(reason_levels) != 0:
+                        # the nogoods do not keep the levels of their literals
+                        set_conflict_levels(reason_levels, top, top - 1)
+                    return PROBLEM_INCONSISTENT
+                if nogoods[NOGOOD_IDX_CHANGE_NB] != 0:
+                    apply_nogood_changes(
+                        top,
+                        membership_offset,
+                        nogoods,
+                        domains,
+                        triggered_propagators,
+                        entailed_propagator_depths,
+                        triggers,
+                        triggers_offsets,
+                        unbound_variable_nb_stk,
+                        priorities,
+                        propagator_states,
+                        deltas,
+                        deltas_offsets,
+                        reason_levels,
+                    )
+                    continue
             return PROBLEM_BOUND if unbound_variable_nb_stk[top] == 0 else PROBLEM_UNBOUND
         statistics[STATS_IDX_PROPAGATOR_FILTER_NB] += 1
         prop_var_start = bounds[prop_idx, VARIABLE, RANGE_START]
@@ -119,12 +213,47 @@ def bc_algorithm(
         prop_domains = domain_buffer[:prop_arity]
         for var_idx in range(prop_arity):
             prop_domains[var_idx] = domains[propagator_variables[prop_var_start + var_idx]]
+        prop_state = propagator_states[bounds[prop_idx, STATE, RANGE_START] : bounds[prop_idx, STATE, RANGE_END]]
+        incremental = incremental_propagators[prop_idx] != 0
+        if (
+            incremental
+            and prop_state[DELTA_IDX_WARM] != 0
+            and (get_int64(prop_state, DELTA_IDX_STAMP) != stamp or prop_state[DELTA_IDX_NB] > prop_arity)
+        ):
+            # the delta misses the changes made before this call, or it has overflowed
+            rebuild_delta(prop_state, prop_domains)
+        timed = False
+        if profiling:
+            prop_profile = propagator_profiles[prop_idx]
+            timed = prop_profile[PROFILE_IDX_CALL_NB] & (PROFILE_TIMING_PERIOD - 1) == 0
+            prop_profile[PROFILE_IDX_CALL_NB] += 1
+            if timed:
+                start = get_time()
         status = compute_domains_fcts[algorithms[prop_idx]](
             prop_domains,
             propagator_parameters[bounds[prop_idx, PARAM, RANGE_START] : bounds[prop_idx, PARAM, RANGE_END]],
+            prop_state,
         )
+        if profiling:
+            if timed:
+                prop_profile[PROFILE_IDX_TIMED_CALL_NB] += 1
+                prop_profile[PROFILE_IDX_TIMED_CALL_TIME] += get_time() - start
+            profile_status(
+                prop_profile, status, prop_var_start, prop_arity, prop_domains, propagator_variables, domains
+            )
+        if incremental:
+            # the propagator is now up to date with the domains it was given
+            set_int64(prop_state, DELTA_IDX_STAMP, stamp)
+            prop_state[DELTA_IDX_WARM] = 1
+            prop_state[DELTA_IDX_NB] = 0
         if status == PROP_INCONSISTENCY:
             statistics[STATS_IDX_PROPAGATOR_INCONSISTENCY_NB] += 1
+            bump_propagator_weights(propagator_weights, propagator_nb, prop_idx)
+            if len(reason_levels) != 0:
+                level, lower_level = get_propagator_levels(
+                    reason_levels, propagator_variables, prop_var_start, prop_var_end
+                )
+                set_conflict_levels(reason_levels, level, lower_level)
             return PROBLEM_INCONSISTENT
         if status == PROP_ENTAILMENT:
             statistics[STATS_IDX_PROPAGATOR_ENTAILMENT_NB] += 1
@@ -150,9 +279,63 @@ def bc_algorithm(
             triggers_offsets,
             unbound_variable_nb_stk,
             priorities,
+            propagator_states,
+            deltas,
+            deltas_offsets,
+            reason_levels,
+            trail,
         )
         if no_change:
             statistics[STATS_IDX_PROPAGATOR_FILTER_NO_CHANGE_NB] += 1
+            if profiling:
+                propagator_profiles[prop_idx, PROFILE_IDX_NO_CHANGE_NB] += 1
+
+
+@njit(cache=True)
+def get_time() -> int:
+    """
+    Returns the value of the performance counter in ns, read in object mode.
+
+    :return: the time in ns
+    :rtype: int
+    """
+    with objmode(now="int64"):
+        now = time.perf_counter_ns()
+    return now
+
+
+@njit(cache=True)
+def profile_status(
+    prop_profile: NDArray,
+    status: int,
+    prop_var_start: int,
+    prop_arity: int,
+    prop_domains: NDArray,
+    propagator_variables: NDArray,
+    domains: NDArray,
+) -> None:
+    """
+    Updates the profile of a propagator with the outcome of a call, before its domains are applied.
+
+    :param prop_profile: the counters of the propagator
+    :type prop_profile: NDArray
+    :param status: the status returned by the propagator
+    :type status: int
+    :param prop_domains: the domains computed by the propagator
+    :type prop_domains: NDArray
+    :param domains: the current domains
+    :type domains: NDArray
+    """
+    if status == PROP_INCONSISTENCY:
+        prop_profile[PROFILE_IDX_INCONSISTENCY_NB] += 1
+        return
+    if status == PROP_ENTAILMENT:
+        prop_profile[PROFILE_IDX_ENTAILMENT_NB] += 1
+    removed_value_nb = 0
+    for var_idx in range(prop_arity):
+        domain = domains[propagator_variables[prop_var_start + var_idx]]
+        removed_value_nb += prop_domains[var_idx, MIN] - domain[MIN] + domain[MAX] - prop_domains[var_idx, MAX]
+    prop_profile[PROFILE_IDX_REMOVED_VALUE_NB] += removed_value_nb
 
 
 @njit(cache=True)
@@ -171,27 +354,40 @@ def update_domains(
     triggers_offsets: NDArray,
     unbound_variable_nb_stk: NDArray,
     priorities: NDArray,
+    propagator_states: NDArray,
+    deltas: NDArray,
+    deltas_offsets: NDArray,
+    reason_levels: NDArray,
+    trail: NDArray,
 ) -> bool:
     """
-    Applies a propagator's computed prop_domains and schedules the propagators triggered by the changes.
+    Applies a propagator's computed prop_domains, schedules the propagators triggered by the changes and records
+    the changes in the deltas of the incremental propagators (including the propagator itself).
 
     :param prop_domains: the domains computed by the propagator
     :type prop_domains: NDArray
+    :param reason_levels: the reason levels of the variables, empty when there is no backjumping
+    :type reason_levels: NDArray
+    :param trail: the trail, empty when the domains of the choice points are copied
+    :type trail: NDArray
 
     :return: true iff no domain was changed
     :rtype: bool
     """
     no_changes = True
+    level = lower_level = -1
     for var_idx in range(prop_var_end - prop_var_start):
         variable = propagator_variables[prop_var_start + var_idx]
         domain = domains[variable]
         if domain[MIN] != domain[MAX]:
             events = EVENT_MASK_NONE
             domain_min = prop_domains[var_idx, MIN]
+            domain_max = prop_domains[var_idx, MAX]
+            if len(trail) != 0 and (domain[MIN] != domain_min or domain[MAX] != domain_max):
+                trail_domain(trail, domains, variable)
             if domain[MIN] != domain_min:
                 domain[MIN] = domain_min
                 events |= EVENT_MASK_MIN
-            domain_max = prop_domains[var_idx, MAX]
             if domain[MAX] != domain_max:
                 domain[MAX] = domain_max
                 events |= EVENT_MASK_MAX
@@ -199,13 +395,129 @@ def update_domains(
                 if domain_min == domain_max:
                     events |= EVENT_MASK_GROUND
                     unbound_variable_nb_stk[top] -= 1
-                offset = variable * EVENT_MASK_NB + events
-                for other_prop_idx in triggers[triggers_offsets[offset] : triggers_offsets[offset + 1]]:
-                    if not (
-                        triggered_propagators[membership_offset + other_prop_idx]
-                        or other_prop_idx == prop_idx
-                        or entailed_propagator_depths[other_prop_idx] != -1
-                    ):
-                        buckets_add(triggered_propagators, priorities, other_prop_idx, membership_offset)
+                if len(reason_levels) != 0:
+                    if level == -1:
+                        # the levels of the variables before the changes
+                        level, lower_level = get_propagator_levels(
+                            reason_levels, propagator_variables, prop_var_start, prop_var_end
+                        )
+                    set_variable_levels(reason_levels, variable, level, lower_level)
+                schedule_propagators(
+                    variable,
+                    events,
+                    prop_idx,
+                    membership_offset,
+                    triggered_propagators,
+                    entailed_propagator_depths,
+                    triggers,
+                    triggers_offsets,
+                    priorities,
+                    propagator_states,
+                    deltas,
+                    deltas_offsets,
+                )
                 no_changes = False
     return no_changes
+
+
+@njit(cache=True)
+def apply_nogood_changes(
+    top: int,
+    membership_offset: int,
+    nogoods: NDArray,
+    domains: NDArray,
+    triggered_propagators: NDArray,
+    entailed_propagator_depths: NDArray,
+    triggers: NDArray,
+    triggers_offsets: NDArray,
+    unbound_variable_nb_stk: NDArray,
+    priorities: NDArray,
+    propagator_states: NDArray,
+    deltas: NDArray,
+    deltas_offsets: NDArray,
+    reason_levels: NDArray,
+) -> None:
+    """
+    Schedules the propagators triggered by the changes made by the nogoods and records the changes in the deltas
+    of the incremental propagators.
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+    :param domains: the current domains
+    :type domains: NDArray
+    :param reason_levels: the reason levels of the variables, empty when there is no backjumping
+    :type reason_levels: NDArray
+    """
+    _, _, _, change_variables, change_events, _, _, _ = get_nogood_sections(nogoods)
+    for change_idx in range(nogoods[NOGOOD_IDX_CHANGE_NB]):
+        variable = change_variables[change_idx]
+        events = change_events[variable]
+        change_events[variable] = 0
+        if domains[variable, MIN] == domains[variable, MAX]:
+            events |= EVENT_MASK_GROUND
+            unbound_variable_nb_stk[top] -= 1
+        if len(reason_levels) != 0:
+            # the nogoods do not keep the levels of their literals
+            set_variable_levels(reason_levels, variable, top, top - 1)
+        schedule_propagators(
+            variable,
+            events,
+            -1,
+            membership_offset,
+            triggered_propagators,
+            entailed_propagator_depths,
+            triggers,
+            triggers_offsets,
+            priorities,
+            propagator_states,
+            deltas,
+            deltas_offsets,
+        )
+    nogoods[NOGOOD_IDX_CHANGE_NB] = 0
+
+
+@njit(cache=True, inline="always")
+def schedule_propagators(
+    variable: int,
+    events: int,
+    prop_idx: int,
+    membership_offset: int,
+    triggered_propagators: NDArray,
+    entailed_propagator_depths: NDArray,
+    triggers: NDArray,
+    triggers_offsets: NDArray,
+    priorities: NDArray,
+    propagator_states: NDArray,
+    deltas: NDArray,
+    deltas_offsets: NDArray,
+) -> None:
+    """
+    Schedules the propagators triggered by the events of a variable, but the propagator that made them, and
+    records the change in the deltas of the incremental propagators.
+
+    :param variable: the variable
+    :type variable: int
+    :param events: the events
+    :type events: int
+    :param prop_idx: the propagator that made the change, -1 for none
+    :type prop_idx: int
+    """
+    offset = variable * EVENT_MASK_NB + events
+    for other_prop_idx in triggers[triggers_offsets[offset] : triggers_offsets[offset + 1]]:
+        if not (
+            triggered_propagators[membership_offset + other_prop_idx]
+            or other_prop_idx == prop_idx
+            or entailed_propagator_depths[other_prop_idx] != -1
+        ):
+            buckets_add(triggered_propagators, priorities, other_prop_idx, membership_offset)
+    for occurrence in range(
+        DELTA_OCCURRENCE_NB * deltas_offsets[variable],
+        DELTA_OCCURRENCE_NB * deltas_offsets[variable + 1],
+        DELTA_OCCURRENCE_NB,
+    ):
+        append_delta(
+            propagator_states,
+            deltas[occurrence + DELTA_OCCURRENCE_IDX_STATE],
+            deltas[occurrence + DELTA_OCCURRENCE_IDX_ARITY],
+            deltas[occurrence + DELTA_OCCURRENCE_IDX_POSITION],
+        )
@@ -11,10 +11,12 @@
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
 
+import numpy as np
 from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
 from nucs.constants import (
+    CP_BRANCH_NB,
     DOM_UPDATE_EVENTS,
     DOM_UPDATE_VARIABLE,
     EVENT_MASK_GROUND,
@@ -82,10 +84,103 @@ def cp_put(domains_stk: NDArray, unbound_variable_nb_stk: NDArray, top: int) ->
     :param top: the index of the top of the stacks
     :type top: int
     """
-    domains_stk[top + 1] = domains_stk[top]  # copy the domains
+    if domains_stk.strides[1] == 0:
+        # the branch domains of the trail only hold the domain being split (see nucs/solvers/trail.py)
+        domains_stk[top + 1, 0] = domains_stk[top, 0]
+    else:
+        domains_stk[top + 1] = domains_stk[top]  # copy the domains
     unbound_variable_nb_stk[top + 1] = unbound_variable_nb_stk[top]  # copy the number of unbound variables
 
 
+@njit(cache=True, inline="always")
+def cp_full(domains_stk: NDArray, stks_top: NDArray) -> bool:
+    """
+    Returns whether the stacks may not hold the choice points of a domain heuristic.
+
+    :param domains_stk: the stack of domains
+    :type domains_stk: NDArray
+    :param stks_top: the index of the top of the stacks as a Numpy array
+    :type stks_top: NDArray
+
+    :return: true iff the stacks have to grow
+    :rtype: bool
+    """
+    return stks_top[0] + CP_BRANCH_NB > len(domains_stk)
+
+
+def cp_grow(stk: NDArray, height: int) -> NDArray:
+    """
+    Returns a copy of a stack with a new height.
+
+    :param stk: the stack
+    :type stk: NDArray
+    :param height: the new height
+    :type height: int
+
+    :return: the new stack
+    :rtype: NDArray
+    """
+    new_stk = np.empty((height, *stk.shape[1:]), dtype=stk.dtype)
+    new_stk[: len(stk)] = stk
+    return new_stk
+
+
+@njit(cache=True)
+def cp_steal(
+    domains_stk: NDArray,
+    entailed_propagator_depths: NDArray,
+    entailment_trail: NDArray,
+    domain_update_stk: NDArray,
+    unbound_variable_nb_stk: NDArray,
+    stks_top: NDArray,
+    stolen_domains: NDArray,
+    stolen_domain_update: NDArray,
+) -> bool:
+    """
+    Removes the choice point nearest to the root (the level 0 of the stacks) so that it can be explored elsewhere.
+
+    Every level below the top holds a pending alternative: the bottom one is the largest subtree still to be
+    explored. Its domains are not propagated yet, its pending decision tells which propagators to schedule.
+    The remaining levels are shifted down by one, and so are the entailment depths (an entailment recorded at
+    depth 0 holds at the root, hence for the new level 0 too).
+
+    :param domains_stk: the stack of domains
+    :type domains_stk: NDArray
+    :param entailed_propagator_depths: the depth at which each propagator was entailed, -1 when active
+    :type entailed_propagator_depths: NDArray
+    :param entailment_trail: the entailment trail, the first cell holds the trail size
+    :type entailment_trail: NDArray
+    :param domain_update_stk: the stack of domain updates
+    :type domain_update_stk: NDArray
+    :param unbound_variable_nb_stk: the stack of the unbound variables nb
+    :type unbound_variable_nb_stk: NDArray
+    :param stks_top: the index of the top of the stacks as a Numpy array
+    :type stks_top: NDArray
+    :param stolen_domains: the (domain_nb, 2) array receiving the domains of the stolen choice point
+    :type stolen_domains: NDArray
+    :param stolen_domain_update: the array receiving the pending decision of the stolen choice point
+    :type stolen_domain_update: NDArray
+
+    :return: true iff a choice point has been stolen
+    :rtype: bool
+    """
+    top = stks_top[0]
+    if top == 0:
+        return False
+    stolen_domains[:] = domains_stk[0]
+    stolen_domain_update[:] = domain_update_stk[0]
+    for level in range(top):
+        domains_stk[level] = domains_stk[level + 1]
+        domain_update_stk[level] = domain_update_stk[level + 1]
+        unbound_variable_nb_stk[level] = unbound_variable_nb_stk[level + 1]
+    for trail_idx in range(1, entailment_trail[0] + 1):
+        prop_idx = entailment_trail[trail_idx]
+        if entailed_propagator_depths[prop_idx] > 0:
+            entailed_propagator_depths[prop_idx] -= 1
+    stks_top[0] = top - 1
+    return True
+
+
 @njit(cache=True)
 def unwind_entailment_trail(entailed_propagator_depths: NDArray, entailment_trail: NDArray, top: int) -> None:
     """
@@ -180,10 +275,14 @@ def fix_choice_points(
     variable: int,
     value: int,
     bound: int,
+    pop: bool = True,
 ) -> bool:
     """
     Fixes the domain of the variable being optimized in the choice points.
 
+    The top of the stacks, a solution, is popped first unless pop is false: a search stopped on a limit keeps
+    exploring its current domains when the objective bound does not empty them.
+
     Schedules the propagators watching the optimized variable, so that the tightened bound gets
     propagated by the next consistency run without a full requeue of all the propagators. Also schedules,
     like backtrack does, the pending alternative-branch decision of the resumed choice point: the domain
@@ -218,13 +317,17 @@ def fix_choice_points(
     :type value: int
     :param bound: the bound being optimized
     :type bound: int
+    :param pop: whether the top of the stacks is popped, defaults to True
+    :type pop: bool
 
     :return: true iff at least one choice point remains
     :rtype: bool
     """
-    if stks_top[0] == 0:
-        return False
-    stks_top[0] -= 1
+    initial_top = stks_top[0]
+    if pop:
+        if initial_top == 0:
+            return False
+        stks_top[0] -= 1
     for stks_idx in range(stks_top[0], -1, -1):
         domain = domains_stk[stks_idx, variable]
         was_bound = domain[MAX] == domain[MIN]
@@ -253,6 +356,8 @@ def fix_choice_points(
         priorities,
         propagator_nb,
     )
+    if top == initial_top:
+        return True
     # schedule the resumed choice point's pending alternative-branch decision (as backtrack does)
     domain_update = domain_update_stk[top]
     offset = domain_update[DOM_UPDATE_VARIABLE] * EVENT_MASK_NB + domain_update[DOM_UPDATE_EVENTS]
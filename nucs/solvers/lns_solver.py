@@ -0,0 +1,344 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import logging
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from nucs.constants import (
+    LNS_LBL_EXHAUSTED_NB,
+    LNS_LBL_IMPROVEMENT_NB,
+    LNS_LBL_ITERATION_NB,
+    LOG_LEVEL_INFO,
+    MAX,
+    MIN,
+    OPTIM_RESET,
+)
+from nucs.problems.problem import Problem
+from nucs.solvers.backtrack_solver import BacktrackSolver
+from nucs.solvers.solver import Solver
+
+logger = logging.getLogger(__name__)
+
+# a neighbourhood returns, given a solution, the decision variables, the relaxation rate and a random generator,
+# the decision variables to relax; the other decision variables are fixed to their values in the solution
+Neighborhood = Callable[[NDArray, NDArray, float, np.random.Generator], NDArray]
+
+
+def random_neighborhood(
+    solution: NDArray, decision_variables: NDArray, relaxation_rate: float, rng: np.random.Generator
+) -> NDArray:
+    """
+    Relaxes a random subset of the decision variables.
+
+    :param solution: the solution to relax
+    :type solution: NDArray
+    :param decision_variables: the decision variables
+    :type decision_variables: NDArray
+    :param relaxation_rate: the proportion of decision variables to relax
+    :type relaxation_rate: float
+    :param rng: the random generator
+    :type rng: np.random.Generator
+
+    :return: the decision variables to relax
+    :rtype: NDArray
+    """
+    relaxed_nb = max(1, round(relaxation_rate * len(decision_variables)))
+    return rng.choice(decision_variables, size=relaxed_nb, replace=False)
+
+
+class LnsSolver(Solver):
+    """
+    A solver that improves a solution by large neighbourhood search (LNS): it looks for good solutions fast rather
+    than for optimality proofs.
+
+    Once a first solution has been found, each iteration fixes a subset of the decision variables to their values in
+    the best solution and optimizes the relaxed sub-problem with a :class:`BacktrackSolver`, under a backtrack limit
+    and with the objective bounded by the best value (see :meth:`BacktrackSolver.reset`).
+
+    The relaxation rate adapts to the sub-problems: it grows when a neighbourhood is completely explored and shrinks
+    when the backtrack limit is reached without improvement. The best solution is proven optimal, and the search
+    stops, when every decision variable is relaxed and the sub-problem is completely explored; the backtrack limit
+    of these complete searches doubles whenever it is reached.
+
+    The neighbourhoods default to random subsets of the decision variables; problems can supply their own (eg
+    :meth:`JobShopProblem.window_neighborhood`), one of them being randomly chosen at each iteration.
+    """
+
+    def __init__(
+        self,
+        problem: Problem,
+        neighborhoods: list[Neighborhood] | None = None,
+        relaxation_rate: float = 0.1,
+        relaxation_factor: float = 1.5,
+        backtrack_nb: int = 100,
+        iteration_nb: int | None = 100,
+        seed: int | None = None,
+        log_level: str = LOG_LEVEL_INFO,
+        **solver_kwargs: Any,
+    ):
+        """
+        Initializes the solver.
+
+        :param problem: the problem to be solved
+        :type problem: Problem
+        :param neighborhoods: the neighbourhoods, defaults to the random neighbourhood
+        :type neighborhoods: Optional[List[Neighborhood]]
+        :param relaxation_rate: the initial proportion of decision variables to relax, defaults to 0.1
+        :type relaxation_rate: float
+        :param relaxation_factor: the factor by which the relaxation rate grows or shrinks, defaults to 1.5
+        :type relaxation_factor: float
+        :param backtrack_nb: the number of backtracks allowed to the search of a neighbourhood, defaults to 100
+        :type backtrack_nb: int
+        :param iteration_nb: the number of neighbourhoods to search or None for no limit, defaults to 100
+        :type iteration_nb: Optional[int]
+        :param seed: the seed of the random generator, defaults to None
+        :type seed: Optional[int]
+        :param log_level: the log level, defaults to INFO
+        :type log_level: str
+        :param solver_kwargs: the arguments of the BacktrackSolver searching the neighbourhoods
+        :type solver_kwargs: Any
+        """
+        super().__init__(None, log_level)
+        self.problem = problem
+        self.solver = BacktrackSolver(problem, log_level=log_level, **solver_kwargs)
+        self.problem_domains = np.array(problem.domains, dtype=np.int32)
+        self.decision_variables = np.unique(self.solver.decision_variables).astype(np.int64)
+        self.neighborhoods = neighborhoods or [random_neighborhood]
+        self.initial_relaxation_rate = relaxation_rate
+        self.relaxation_factor = relaxation_factor
+        self.backtrack_nb = backtrack_nb
+        self.rng = np.random.default_rng(seed)
+        self.set_limits(iteration_nb)
+        self.iteration_nb = self.improvement_nb = self.exhausted_nb = 0
+        # whether the last search stopped on a limit rather than on a proof of optimality
+        self.limit_reached = False
+        logger.info(f"LnsSolver uses {len(self.neighborhoods)} neighbourhoods")
+
+    def set_limits(self, iteration_nb: int | None = None, deadline: int | None = None) -> None:
+        """
+        Limits the searches run from now on.
+
+        :param iteration_nb: the number of neighbourhoods to search or None for no limit
+        :type iteration_nb: Optional[int]
+        :param deadline: the time to stop at (see time.monotonic_ns) or None for no limit
+        :type deadline: Optional[int]
+        """
+        self.iteration_limit = iteration_nb
+        self.deadline = deadline
+
+    def get_statistics_as_dictionary(self) -> dict[str, int]:
+        """
+        Returns the statistics of the backtrack solver searching the neighbourhoods as a dictionary.
+
+        :return: a dictionary mapping statistic labels to values
+        :rtype: Dict[str, int]
+        """
+        return self.solver.get_statistics_as_dictionary()
+
+    def get_lns_statistics(self) -> dict[str, int]:
+        """
+        Returns the statistics of the large neighbourhood search.
+
+        :return: a dictionary mapping the LNS statistic labels to values
+        :rtype: Dict[str, int]
+        """
+        return {
+            LNS_LBL_ITERATION_NB: self.iteration_nb,
+            LNS_LBL_IMPROVEMENT_NB: self.improvement_nb,
+            LNS_LBL_EXHAUSTED_NB: self.exhausted_nb,
+        }
+
+    def solve(self) -> Iterator[NDArray]:
+        """
+        Returns an iterator over the solutions, found by the backtrack solver.
+
+        :return: an iterator
+        :rtype: Iterator[NDArray]
+        """
+        return self.solver.solve()
+
+    def minimize(self, variable: int, mode: str = OPTIM_RESET) -> NDArray | None:
+        """
+        Returns the best solution found while minimizing a variable.
+
+        :param variable: the variable to minimize
+        :type variable: int
+        :param mode: the optimization mode of the searches of the neighbourhoods, defaults to RESET
+        :type mode: str
+
+        :return: the best solution if there is a solution or None
+        :rtype: Optional[NDArray]
+        """
+        return self.optimize(variable, MAX, mode)
+
+    def maximize(self, variable: int, mode: str = OPTIM_RESET) -> NDArray | None:
+        """
+        Returns the best solution found while maximizing a variable.
+
+        :param variable: the variable to maximize
+        :type variable: int
+        :param mode: the optimization mode of the searches of the neighbourhoods, defaults to RESET
+        :type mode: str
+
+        :return: the best solution if there is a solution or None
+        :rtype: Optional[NDArray]
+        """
+        return self.optimize(variable, MIN, mode)
+
+    def minimize_solutions(self, variable: int, mode: str = OPTIM_RESET) -> Iterator[NDArray]:
+        """
+        Iterates over the successively improving solutions found while minimizing a variable.
+
+        :param variable: the variable to minimize
+        :type variable: int
+        :param mode: the optimization mode of the searches of the neighbourhoods, defaults to RESET
+        :type mode: str
+
+        :return: an iterator over the improving solutions
+        :rtype: Iterator[NDArray]
+        """
+        return self.optimize_solutions(variable, MAX, mode)
+
+    def maximize_solutions(self, variable: int, mode: str = OPTIM_RESET) -> Iterator[NDArray]:
+        """
+        Iterates over the successively improving solutions found while maximizing a variable.
+
+        :param variable: the variable to maximize
+        :type variable: int
+        :param mode: the optimization mode of the searches of the neighbourhoods, defaults to RESET
+        :type mode: str
+
+        :return: an iterator over the improving solutions
+        :rtype: Iterator[NDArray]
+        """
+        return self.optimize_solutions(variable, MIN, mode)
+
+    def optimize(self, variable: int, bound: int, mode: str) -> NDArray | None:
+        """
+        Returns the best solution found while optimizing a variable.
+
+        :param variable: the variable
+        :type variable: int
+        :param bound: the bound to optimize
+        :type bound: int
+        :param mode: the optimization mode of the searches of the neighbourhoods
+        :type mode: str
+
+        :return: the best solution if there is a solution or None
+        :rtype: Optional[NDArray]
+        """
+        best_solution = None
+        for best_solution in self.optimize_solutions(variable, bound, mode):
+            pass
+        return best_solution
+
+    def optimize_solutions(self, variable: int, bound: int, mode: str = OPTIM_RESET) -> Iterator[NDArray]:
+        """
+        Iterates over the successively improving solutions found while optimizing a variable.
+
+        When the iteration stops on a limit (see :meth:`set_limits`), limit_reached is set and the last yielded
+        solution is not proven optimal.
+
+        :param variable: the variable
+        :type variable: int
+        :param bound: the bound to optimize
+        :type bound: int
+        :param mode: the optimization mode of the searches of the neighbourhoods, defaults to RESET
+        :type mode: str
+
+        :return: an iterator over the improving solutions
+        :rtype: Iterator[NDArray]
+        """
+        self.iteration_nb = self.improvement_nb = self.exhausted_nb = 0
+        self.limit_reached = False
+        self.solver.reset(self.problem_domains)
+        self.solver.set_limits(deadline=self.deadline)
+        if len(self.decision_variables) == 0:
+            # there is nothing to relax, the first search is complete
+            yield from self.solver.optimize_solutions(variable, bound, mode)
+            self.limit_reached = self.solver.limit_reached
+            return
+        solutions = self.solver.optimize_solutions(variable, bound, mode)
+        best_solution = next(solutions, None)
+        solutions.close()
+        if best_solution is None:
+            self.limit_reached = self.solver.limit_reached
+            return
+        yield best_solution
+        incumbent = np.array([best_solution[variable]], dtype=np.int64)
+        relaxation_rate = self.initial_relaxation_rate
+        backtrack_nb = self.backtrack_nb
+        while True:
+            if self._limit_reached():
+                self.limit_reached = True
+                return
+            self.iteration_nb += 1
+            neighborhood = self.neighborhoods[self.rng.integers(len(self.neighborhoods))]
+            relaxed_variables = np.unique(
+                neighborhood(best_solution, self.decision_variables, relaxation_rate, self.rng)
+            ).astype(np.int64)
+            self.solver.reset(self._fix(best_solution, relaxed_variables))
+            self.solver.set_limits(backtrack_nb=backtrack_nb, deadline=self.deadline)
+            improved = False
+            for solution in self.solver.optimize_solutions(variable, bound, mode, incumbent):
+                best_solution = solution
+                improved = True
+                yield solution
+            if improved:
+                self.improvement_nb += 1
+                logger.info(f"LNS iteration {self.iteration_nb} improves the objective to {incumbent[0]}")
+            complete = len(relaxed_variables) == len(self.decision_variables)
+            if not self.solver.limit_reached:
+                self.exhausted_nb += 1
+                if complete:
+                    logger.info("LNS has proven the optimality of the best solution")
+                    return
+                if not improved:
+                    relaxation_rate = min(1.0, relaxation_rate * self.relaxation_factor)
+            elif not improved:
+                relaxation_rate = max(1 / len(self.decision_variables), relaxation_rate / self.relaxation_factor)
+                if complete:
+                    # the whole problem is too hard for the limit, the next complete searches go further
+                    backtrack_nb *= 2
+
+    def _fix(self, solution: NDArray, relaxed_variables: NDArray) -> NDArray:
+        """
+        Returns the domains of the problem where the decision variables that are not relaxed are fixed.
+
+        :param solution: the solution giving the values of the fixed variables
+        :type solution: NDArray
+        :param relaxed_variables: the decision variables to relax
+        :type relaxed_variables: NDArray
+
+        :return: the domains
+        :rtype: NDArray
+        """
+        domains = self.problem_domains.copy()
+        fixed_variables = np.setdiff1d(self.decision_variables, relaxed_variables)
+        domains[fixed_variables, MIN] = domains[fixed_variables, MAX] = solution[fixed_variables]
+        return domains
+
+    def _limit_reached(self) -> bool:
+        """
+        Returns whether one of the limits set by :meth:`set_limits` has been reached.
+
+        :return: true iff a limit has been reached
+        :rtype: bool
+        """
+        return (self.iteration_limit is not None and self.iteration_nb >= self.iteration_limit) or (
+            self.deadline is not None and time.monotonic_ns() >= self.deadline
+        )
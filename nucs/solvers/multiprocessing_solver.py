@@ -0,0 +1,502 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Iterator, Sequence
+from multiprocessing.queues import Queue
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.sharedctypes import Synchronized
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from nucs.constants import (
+    LOG_LEVEL_INFO,
+    MAX,
+    MIN,
+    OPTIM_RESET,
+    STATS_IDX_SOLVER_CHOICE_DEPTH,
+    STATS_IDX_SOLVER_ELAPSED_TIME,
+    STATS_MAX,
+)
+from nucs.problems.problem import Problem
+from nucs.solvers.backtrack_solver import BacktrackSolver
+from nucs.solvers.solver import Solver, statistics_as_dictionary
+
+logger = logging.getLogger(__name__)
+
+# the kinds of the messages sent by the workers through the solution queue
+MSG_SOLUTION = 0  # payload: a solution
+MSG_STATISTICS = 1  # payload: the statistics of a completed sub-problem
+MSG_ERROR = 2  # payload: the exception raised by a worker
+MSG_SEARCH_DONE = 3  # no payload: every task has been completely explored (work stealing)
+
+# the number of choices after which a work-stealing worker stops its search to donate choice points
+STEAL_CHOICE_PERIOD = 1 << 12
+
+# the queue of a worker process, set by the pool initializer
+_worker_queue: Queue | None = None
+
+
+class MultiprocessingSolver(Solver):
+    """
+    A solver that spreads sub-problems (usually obtained with :meth:`Problem.split`) over a pool of processes,
+    each sub-problem being solved by its own :class:`BacktrackSolver`.
+
+    The solutions are streamed back through a queue as soon as the workers find them, so their order is not
+    deterministic. The statistics are the sum of the statistics of the solved sub-problems (the choice depth
+    being their maximum).
+
+    Static splitting can give very unbalanced sub-problems. In work-stealing mode, the enumeration of the
+    solutions is done by long-lived workers sharing a task queue, seeded with the sub-problems: whenever a worker
+    is idle, a busy one donates the pending choice point nearest to the root of its search (see
+    :meth:`BacktrackSolver.steal_choice_point`), serialized as its domains and its pending decision.
+    The busy workers check for idle ones after each solution and every STEAL_CHOICE_PERIOD choices, so that the
+    work of a subtree without solution is shared as well.
+    The sub-problems must then only differ by their domains, as the ones returned by :meth:`Problem.split` do.
+    """
+
+    def __init__(
+        self,
+        problems: Sequence[Problem],
+        processor_nb: int | None = None,
+        work_stealing: bool = False,
+        log_level: str = LOG_LEVEL_INFO,
+        **solver_kwargs: Any,
+    ):
+        """
+        Initializes the solver.
+
+        :param problems: the sub-problems, not initialized yet
+        :type problems: Sequence[Problem]
+        :param processor_nb: the number of worker processes, defaults to the number of CPUs
+        :type processor_nb: Optional[int]
+        :param work_stealing: whether the enumeration of the solutions relies on work stealing, defaults to False
+        :type work_stealing: bool
+        :param log_level: the log level, defaults to INFO
+        :type log_level: str
+        :param solver_kwargs: the arguments of the BacktrackSolver built for each sub-problem
+        :type solver_kwargs: Any
+        """
+        super().__init__(None, log_level)
+        self.problems = problems
+        self.problem = problems[0]  # the sub-problems share their model, any of them can print a solution
+        self.work_stealing = work_stealing
+        processor_nb = processor_nb or os.cpu_count() or 1
+        # without work stealing, a worker has nothing to do once the sub-problems are all being solved
+        self.processor_nb = processor_nb if work_stealing else min(len(problems), processor_nb)
+        self.solver_kwargs = {**solver_kwargs, "log_level": log_level}
+        self.statistics = np.zeros(STATS_MAX, dtype=np.int64)
+        logger.info(f"MultiprocessingSolver uses {self.processor_nb} processes for {len(problems)} problems")
+
+    def get_statistics_as_array(self) -> NDArray:
+        """
+        Returns the statistics as a Numpy array.
+
+        :return: the statistics array
+        :rtype: NDArray
+        """
+        return self.statistics
+
+    def get_statistics_as_dictionary(self) -> dict[str, int]:
+        """
+        Returns the statistics as a dictionary.
+
+        :return: a dictionary mapping statistic labels to values
+        :rtype: Dict[str, int]
+        """
+        return statistics_as_dictionary(self.statistics)
+
+    def solve(self) -> Iterator[NDArray]:
+        """
+        Returns an iterator over the solutions of all the sub-problems.
+
+        :return: an iterator
+        :rtype: Iterator[NDArray]
+        """
+        logger.info("Solving and iterating over the solutions")
+        if self.work_stealing:
+            return self._stealing_solutions()
+        return self._solutions(None, MIN, OPTIM_RESET)
+
+    def minimize(self, variable: int, mode: str = OPTIM_RESET) -> NDArray | None:
+        """
+        Return the solution that minimizes a variable.
+
+        :param variable: the variable to minimize
+        :type variable: int
+        :param mode: the optimization mode (RESET or PRUNE) of each worker, defaults to RESET
+        :type mode: str
+
+        :return: the optimal solution if it exists or None
+        :rtype: Optional[NDArray]
+        """
+        logger.info(f"Minimizing (mode {mode}) variable {variable}")
+        return self.optimize(variable, MAX, mode)
+
+    def maximize(self, variable: int, mode: str = OPTIM_RESET) -> NDArray | None:
+        """
+        Return the solution that maximizes a variable.
+
+        :param variable: the variable to maximize
+        :type variable: int
+        :param mode: the optimization mode (RESET or PRUNE) of each worker, defaults to RESET
+        :type mode: str
+
+        :return: the optimal solution if it exists or None
+        :rtype: Optional[NDArray]
+        """
+        logger.info(f"Maximizing (mode {mode}) variable {variable}")
+        return self.optimize(variable, MIN, mode)
+
+    def minimize_solutions(self, variable: int, mode: str = OPTIM_RESET) -> Iterator[NDArray]:
+        """
+        Iterates over the successively improving solutions while minimizing a variable.
+
+        :param variable: the variable to minimize
+        :type variable: int
+        :param mode: the optimization mode (RESET or PRUNE) of each worker, defaults to RESET
+        :type mode: str
+
+        :return: an iterator over the improving solutions, the last one being optimal
+        :rtype: Iterator[NDArray]
+        """
+        logger.info(f"Minimizing (mode {mode}) variable {variable}")
+        return self.optimize_solutions(variable, MAX, mode)
+
+    def maximize_solutions(self, variable: int, mode: str = OPTIM_RESET) -> Iterator[NDArray]:
+        """
+        Iterates over the successively improving solutions while maximizing a variable.
+
+        :param variable: the variable to maximize
+        :type variable: int
+        :param mode: the optimization mode (RESET or PRUNE) of each worker, defaults to RESET
+        :type mode: str
+
+        :return: an iterator over the improving solutions, the last one being optimal
+        :rtype: Iterator[NDArray]
+        """
+        logger.info(f"Maximizing (mode {mode}) variable {variable}")
+        return self.optimize_solutions(variable, MIN, mode)
+
+    def optimize(self, variable: int, bound: int, mode: str) -> NDArray | None:
+        """
+        Finds, if it exists, the solution to the problem that optimizes a given variable.
+
+        :param variable: the variable
+        :type variable: int
+        :param bound: the bound to optimize
+        :type bound: int
+        :param mode: the optimization mode of each worker
+        :type mode: str
+
+        :return: the solution if it exists or None
+        :rtype: Optional[NDArray]
+        """
+        best_solution = None
+        for best_solution in self.optimize_solutions(variable, bound, mode):
+            pass
+        return best_solution
+
+    def optimize_solutions(self, variable: int, bound: int, mode: str) -> Iterator[NDArray]:
+        """
+        Iterates over the successively improving solutions found by the workers while optimizing a given variable.
+
+        Each worker optimizes its own sub-problem; a solution is only yielded when it improves on every solution
+        yielded before, so the last yielded solution is the optimum. The workers share their best objective value
+        through a shared-memory incumbent, polled every INCUMBENT_POLL_PERIOD choices, so that a bound found in one
+        sub-problem soon cuts the others.
+
+        :param variable: the variable
+        :type variable: int
+        :param bound: the bound to optimize
+        :type bound: int
+        :param mode: the optimization mode of each worker
+        :type mode: str
+
+        :return: an iterator over the improving solutions, the last one being optimal
+        :rtype: Iterator[NDArray]
+        """
+        incumbent_memory = SharedMemory(create=True, size=np.dtype(np.int64).itemsize)
+        try:
+            incumbent = np.ndarray((1,), dtype=np.int64, buffer=incumbent_memory.buf)
+            incumbent[0] = np.iinfo(np.int64).max if bound == MAX else np.iinfo(np.int64).min
+            del incumbent  # the shared memory cannot be closed while a view on it exists
+            best_value = None
+            for solution in self._solutions(variable, bound, mode, incumbent_memory.name):
+                value = solution[variable]
+                if best_value is None or (value < best_value if bound == MAX else value > best_value):
+                    best_value = value
+                    logger.info(f"Found a local optimum: {value}")
+                    yield solution
+        finally:
+            incumbent_memory.close()
+            incumbent_memory.unlink()
+
+    def _solutions(
+        self, variable: int | None, bound: int, mode: str, incumbent_name: str | None = None
+    ) -> Iterator[NDArray]:
+        """
+        Runs the sub-problems on the pool of processes and iterates over the solutions they send back.
+
+        The pool is terminated when the iteration stops, including when the consumer stops early: the statistics
+        then only account for the sub-problems that were completed.
+
+        :param variable: the variable to optimize or None to enumerate the solutions
+        :type variable: Optional[int]
+        :param bound: the bound to optimize
+        :type bound: int
+        :param mode: the optimization mode
+        :type mode: str
+        :param incumbent_name: the name of the shared memory holding the incumbent when optimizing
+        :type incumbent_name: Optional[str]
+
+        :return: an iterator over the solutions
+        :rtype: Iterator[NDArray]
+        """
+        t0 = time.perf_counter_ns()
+        context = multiprocessing.get_context()
+        queue = context.Queue()
+        pool = context.Pool(self.processor_nb, initializer=_init_worker, initargs=(queue,))
+        try:
+            for problem in self.problems:
+                # a task that cannot even be run (eg a sub-problem that cannot be pickled) is reported as an error
+                pool.apply_async(
+                    solve_problem,
+                    (problem, self.solver_kwargs, variable, bound, mode, incumbent_name),
+                    error_callback=lambda exception: queue.put((MSG_ERROR, exception)),
+                )
+            pool.close()
+            running_nb = len(self.problems)
+            while running_nb > 0:
+                kind, payload = queue.get()
+                if kind == MSG_SOLUTION:
+                    yield payload
+                elif kind == MSG_STATISTICS:
+                    self._add_statistics(payload)
+                    running_nb -= 1
+                else:
+                    raise payload
+        finally:
+            pool.terminate()
+            pool.join()
+            self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME] += time.perf_counter_ns() - t0
+
+    def _add_statistics(self, statistics: NDArray) -> None:
+        """
+        Adds the statistics of a completed sub-problem, except the elapsed time which is measured by this solver.
+
+        :param statistics: the statistics of the sub-problem
+        :type statistics: NDArray
+        """
+        elapsed_time = self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME]
+        choice_depth = max(self.statistics[STATS_IDX_SOLVER_CHOICE_DEPTH], statistics[STATS_IDX_SOLVER_CHOICE_DEPTH])
+        self.statistics += statistics
+        self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME] = elapsed_time
+        self.statistics[STATS_IDX_SOLVER_CHOICE_DEPTH] = choice_depth
+
+    def _stealing_solutions(self) -> Iterator[NDArray]:
+        """
+        Runs the work-stealing workers and iterates over the solutions they send back.
+
+        The number of outstanding tasks is shared by the workers: a donor counts a task before queuing it, so
+        this number cannot drop to zero while some task is still to be explored. Since the messages of distinct
+        workers are not ordered, the solutions are also collected until every worker has sent its statistics.
+
+        :return: an iterator over the solutions
+        :rtype: Iterator[NDArray]
+        """
+        t0 = time.perf_counter_ns()
+        context = multiprocessing.get_context()
+        tasks = context.Queue()
+        messages = context.Queue()
+        # the number of pending task requests of the idle workers, the seeded tasks answering the first ones
+        requests = context.Value("i", -len(self.problems))
+        task_nb = context.Value("i", len(self.problems))
+        for problem in self.problems:
+            tasks.put((np.array(problem.domains, dtype=np.int32), None))
+        workers = [
+            context.Process(
+                target=steal_work, args=(self.problem, self.solver_kwargs, tasks, messages, requests, task_nb)
+            )
+            for _ in range(self.processor_nb)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            while True:
+                kind, payload = messages.get()
+                if kind == MSG_SOLUTION:
+                    yield payload
+                elif kind == MSG_SEARCH_DONE:
+                    break
+                elif kind == MSG_ERROR:
+                    raise payload
+            for _ in workers:
+                tasks.put(None)
+            statistics_nb = 0
+            while statistics_nb < len(workers):
+                kind, payload = messages.get()
+                if kind == MSG_SOLUTION:
+                    yield payload
+                elif kind == MSG_STATISTICS:
+                    self._add_statistics(payload)
+                    statistics_nb += 1
+                elif kind == MSG_ERROR:
+                    raise payload
+            for worker in workers:
+                worker.join()
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+            self.statistics[STATS_IDX_SOLVER_ELAPSED_TIME] += time.perf_counter_ns() - t0
+
+
+def _init_worker(queue: Queue) -> None:
+    """
+    Initializes a worker process of the pool.
+
+    :param queue: the queue through which the worker sends its messages
+    :type queue: Queue
+    """
+    global _worker_queue
+    _worker_queue = queue
+
+
+def solve_problem(
+    problem: Problem,
+    solver_kwargs: dict[str, Any],
+    variable: int | None,
+    bound: int,
+    mode: str,
+    incumbent_name: str | None,
+) -> None:
+    """
+    Solves a sub-problem in a worker process, sending its solutions then its statistics to the queue.
+
+    :param problem: the sub-problem
+    :type problem: Problem
+    :param solver_kwargs: the arguments of the BacktrackSolver
+    :type solver_kwargs: Dict[str, Any]
+    :param variable: the variable to optimize or None to enumerate the solutions
+    :type variable: Optional[int]
+    :param bound: the bound to optimize
+    :type bound: int
+    :param mode: the optimization mode
+    :type mode: str
+    :param incumbent_name: the name of the shared memory holding the incumbent when optimizing
+    :type incumbent_name: Optional[str]
+    """
+    assert _worker_queue is not None
+    incumbent_memory = None if incumbent_name is None else SharedMemory(name=incumbent_name)
+    try:
+        solver = BacktrackSolver(problem, **solver_kwargs)
+        if variable is None:
+            solutions = solver.solve()
+        else:
+            assert incumbent_memory is not None
+            # the view is only referenced by the generator, so that it is released once the search is over
+            solutions = solver.optimize_solutions(
+                variable, bound, mode, np.ndarray((1,), dtype=np.int64, buffer=incumbent_memory.buf)
+            )
+        for solution in solutions:
+            _worker_queue.put((MSG_SOLUTION, solution))
+        _worker_queue.put((MSG_STATISTICS, solver.statistics))
+    except Exception as exception:  # noqa: BLE001 - forwarded so that the consumer does not wait forever
+        _worker_queue.put((MSG_ERROR, exception))
+    finally:
+        if incumbent_memory is not None:
+            incumbent_memory.close()
+
+
+def steal_work(
+    problem: Problem,
+    solver_kwargs: dict[str, Any],
+    tasks: Queue,
+    messages: Queue,
+    requests: Synchronized,
+    task_nb: Synchronized,
+) -> None:
+    """
+    Runs a work-stealing worker: explores the choice points taken from the task queue until a None task is met,
+    donating the bottom choice point of its search to the idle workers, then sends its statistics.
+
+    :param problem: the problem, the tasks only bring their domains
+    :type problem: Problem
+    :param solver_kwargs: the arguments of the BacktrackSolver
+    :type solver_kwargs: Dict[str, Any]
+    :param tasks: the queue of the choice points to explore
+    :type tasks: Queue
+    :param messages: the queue through which the worker sends its messages
+    :type messages: Queue
+    :param requests: the shared number of pending task requests
+    :type requests: Synchronized
+    :param task_nb: the shared number of outstanding tasks
+    :type task_nb: Synchronized
+    """
+    try:
+        solver = BacktrackSolver(problem, **solver_kwargs)
+        while True:
+            with requests.get_lock():
+                requests.value += 1
+            task = tasks.get()
+            if task is None:
+                break
+            solver.restore_choice_point(*task)
+            while True:
+                # the search stops periodically so that a subtree without solution can be shared too
+                solver.set_limits(choice_nb=STEAL_CHOICE_PERIOD)
+                for solution in solver.resume():
+                    messages.put((MSG_SOLUTION, solution))
+                    donate_choice_points(solver, tasks, requests, task_nb)
+                if not solver.limit_reached:
+                    break
+                donate_choice_points(solver, tasks, requests, task_nb)
+            with task_nb.get_lock():
+                task_nb.value -= 1
+                if task_nb.value == 0:
+                    messages.put((MSG_SEARCH_DONE, None))
+        messages.put((MSG_STATISTICS, solver.statistics))
+    except Exception as exception:  # noqa: BLE001 - forwarded so that the consumer does not wait forever
+        messages.put((MSG_ERROR, exception))
+
+
+def donate_choice_points(solver: BacktrackSolver, tasks: Queue, requests: Synchronized, task_nb: Synchronized) -> None:
+    """
+    Donates, while some workers are idle, the pending choice point nearest to the root of the search of a solver.
+
+    :param solver: the solver
+    :type solver: BacktrackSolver
+    :param tasks: the queue of the choice points to explore
+    :type tasks: Queue
+    :param requests: the shared number of pending task requests
+    :type requests: Synchronized
+    :param task_nb: the shared number of outstanding tasks
+    :type task_nb: Synchronized
+    """
+    while requests.value > 0:
+        with requests.get_lock():
+            if requests.value <= 0:
+                return
+            choice_point = solver.steal_choice_point()
+            if choice_point is None:
+                return
+            requests.value -= 1
+        with task_nb.get_lock():
+            task_nb.value += 1  # counted before the task can be explored and completed
+        tasks.put(choice_point)
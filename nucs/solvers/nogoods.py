@@ -0,0 +1,559 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import (
+    DOM_UPDATE_EVENTS,
+    DOM_UPDATE_VARIABLE,
+    EVENT_MASK_MAX,
+    EVENT_MASK_MIN,
+    MAX,
+    MIN,
+    NOGOOD_BOUND_NONE,
+    NOGOOD_HEADER_NB,
+    NOGOOD_IDX_CAPACITY,
+    NOGOOD_IDX_CHANGE_NB,
+    NOGOOD_IDX_DOMAIN_NB,
+    NOGOOD_IDX_FAILURE_NB,
+    NOGOOD_IDX_LITERAL_CAPACITY,
+    NOGOOD_IDX_LITERAL_NB,
+    NOGOOD_IDX_NB,
+    NOGOOD_IDX_PRUNING_NB,
+    NOGOOD_IDX_RECORDED_NB,
+    NOGOOD_IDX_RUN_START,
+    NOGOOD_IDX_RUN_TOP,
+    NOGOOD_IDX_STKS_MAX_HEIGHT,
+    NOGOOD_LITERAL_FACTOR,
+    NOGOOD_NONE,
+    NOGOOD_RECORD_IDX_LBD,
+    NOGOOD_RECORD_IDX_LEVEL,
+    NOGOOD_RECORD_IDX_NEXT_0,
+    NOGOOD_RECORD_IDX_PREVIOUS,
+    NOGOOD_RECORD_IDX_SIZE,
+    NOGOOD_RECORD_IDX_START,
+    NOGOOD_RECORD_IDX_WATCH_0,
+    NOGOOD_RECORD_IDX_WATCH_1,
+    NOGOOD_RECORD_NB,
+)
+
+# A nogood is a conjunction of bound literals that no solution satisfies. A literal is a pair (key, value) where
+# key = 2 * variable + bound: [variable >= value] when bound is MIN, [variable <= value] when bound is MAX.
+#
+# The nogoods are recorded from the decisions of the search: when the search backtracks to the choice point of
+# level k, the subtree of its decision is exhausted, so the decisions of the levels 0..k form a nogood. This
+# decision-based explanation is minimized by keeping, for each key, only the literal of the deepest decision, which
+# implies the others. Such a nogood cannot prune the rest of the current run, which never satisfies the decision of
+# level k again, but it prunes the runs that follow a restart. In the current run, a nogood recorded at level k
+# subsumes the nogoods recorded since at deeper levels, and the nogood recorded before at level k on a decision it
+# implies: these are deleted, so that the nogoods of a run are the negative-last-decision nogoods of its branch.
+#
+# The nogoods are propagated by the consistency algorithm, with two watched literals: a nogood is only visited when
+# one of its watched literals becomes true; another literal that is not true is then watched, or, when there is
+# none, the other watched literal is made false or, when it is already true, the domains are inconsistent.
+# Since the domains are restored by copy on backtrack, the consistency algorithm knows what has changed by comparing
+# the domains with a snapshot of those of its previous call.
+#
+# The store is a single int64 array, laid out as:
+# - the header (see NOGOOD_HEADER_NB),
+# - the decisions of the levels of the choice points, as literals,
+# - the snapshot of the domains,
+# - the heads of the watch lists, indexed by keys; a watch list links the nodes 2 * nogood + watch,
+# - the variables changed by the last propagation and their events,
+# - the marks of the keys, used when a nogood is recorded,
+# - the records of the nogoods (see NOGOOD_RECORD_NB),
+# - the literals of the nogoods, the deepest decision first.
+# When the store is full, the deleted nogoods are removed and, if need be, the nogoods recorded before the current
+# run with the largest LBD, the number of decision levels of their literals.
+
+
+def get_nogoods_size(capacity: int, domain_nb: int, stks_max_height: int) -> int:
+    """
+    Returns the size of the nogood store, 0 when there is no nogood.
+
+    :param capacity: the maximal number of nogoods
+    :type capacity: int
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+    :param stks_max_height: the maximal height of the choice point stacks
+    :type stks_max_height: int
+
+    :return: the size
+    :rtype: int
+    """
+    if capacity == 0:
+        return 0
+    return (
+        NOGOOD_HEADER_NB
+        + 2 * stks_max_height
+        + 8 * domain_nb
+        + NOGOOD_RECORD_NB * capacity
+        + 2 * NOGOOD_LITERAL_FACTOR * capacity
+    )
+
+
+def get_nogoods(capacity: int, domain_nb: int, stks_max_height: int) -> NDArray:
+    """
+    Allocates an empty nogood store.
+
+    :param capacity: the maximal number of nogoods, 0 for none
+    :type capacity: int
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+    :param stks_max_height: the maximal height of the choice point stacks
+    :type stks_max_height: int
+
+    :return: the nogood store
+    :rtype: NDArray
+    """
+    nogoods = np.zeros(get_nogoods_size(capacity, domain_nb, stks_max_height), dtype=np.int64)
+    if capacity > 0:
+        nogoods[NOGOOD_IDX_CAPACITY] = capacity
+        nogoods[NOGOOD_IDX_LITERAL_CAPACITY] = NOGOOD_LITERAL_FACTOR * capacity
+        nogoods[NOGOOD_IDX_DOMAIN_NB] = domain_nb
+        nogoods[NOGOOD_IDX_STKS_MAX_HEIGHT] = stks_max_height
+        clear_nogoods(nogoods)
+    return nogoods
+
+
+def grow_nogoods(nogoods: NDArray, stks_max_height: int) -> NDArray:
+    """
+    Returns a copy of the nogood store holding the decisions of more choice points.
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+    :param stks_max_height: the new maximal height of the choice point stacks
+    :type stks_max_height: int
+
+    :return: the new nogood store
+    :rtype: NDArray
+    """
+    if len(nogoods) == 0:
+        return nogoods
+    height = int(nogoods[NOGOOD_IDX_STKS_MAX_HEIGHT])
+    start = NOGOOD_HEADER_NB + 2 * height  # the end of the decisions
+    new_nogoods = np.concatenate(
+        (nogoods[:start], np.zeros(2 * (stks_max_height - height), dtype=np.int64), nogoods[start:])
+    )
+    new_nogoods[NOGOOD_IDX_STKS_MAX_HEIGHT] = stks_max_height
+    return new_nogoods
+
+
+@njit(cache=True, inline="always")
+def get_nogood_sections(
+    nogoods: NDArray,
+) -> tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]:
+    """
+    Returns the sections of the nogood store.
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+
+    :return: the decisions, the snapshot, the watch list heads, the changed variables, their events, the marks,
+             the records and the literals
+    :rtype: Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]
+    """
+    domain_nb = nogoods[NOGOOD_IDX_DOMAIN_NB]
+    height = nogoods[NOGOOD_IDX_STKS_MAX_HEIGHT]
+    capacity = nogoods[NOGOOD_IDX_CAPACITY]
+    start = NOGOOD_HEADER_NB
+    decisions = nogoods[start : start + 2 * height].reshape(height, 2)
+    start += 2 * height
+    snapshot = nogoods[start : start + 2 * domain_nb].reshape(domain_nb, 2)
+    start += 2 * domain_nb
+    heads = nogoods[start : start + 2 * domain_nb]
+    start += 2 * domain_nb
+    change_variables = nogoods[start : start + domain_nb]
+    start += domain_nb
+    change_events = nogoods[start : start + domain_nb]
+    start += domain_nb
+    marks = nogoods[start : start + 2 * domain_nb]
+    start += 2 * domain_nb
+    records = nogoods[start : start + NOGOOD_RECORD_NB * capacity].reshape(capacity, NOGOOD_RECORD_NB)
+    start += NOGOOD_RECORD_NB * capacity
+    literals = nogoods[start:].reshape(-1, 2)
+    return decisions, snapshot, heads, change_variables, change_events, marks, records, literals
+
+
+@njit(cache=True)
+def clear_nogoods(nogoods: NDArray) -> None:
+    """
+    Removes all the nogoods, the statistics are kept.
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+    """
+    if len(nogoods) == 0:
+        return
+    _, snapshot, heads, _, change_events, marks, _, _ = get_nogood_sections(nogoods)
+    nogoods[NOGOOD_IDX_NB] = nogoods[NOGOOD_IDX_LITERAL_NB] = nogoods[NOGOOD_IDX_RUN_START] = 0
+    nogoods[NOGOOD_IDX_RUN_TOP] = NOGOOD_NONE
+    nogoods[NOGOOD_IDX_CHANGE_NB] = 0
+    snapshot[:, MIN] = -NOGOOD_BOUND_NONE
+    snapshot[:, MAX] = NOGOOD_BOUND_NONE
+    heads[:] = NOGOOD_NONE
+    change_events[:] = 0
+    marks[:] = 0
+
+
+@njit(cache=True)
+def restart_nogoods(nogoods: NDArray) -> None:
+    """
+    Ends the current run: its nogoods will not be subsumed by the nogoods of the next run.
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+    """
+    if len(nogoods) == 0:
+        return
+    nogoods[NOGOOD_IDX_RUN_START] = nogoods[NOGOOD_IDX_NB]
+    nogoods[NOGOOD_IDX_RUN_TOP] = NOGOOD_NONE
+
+
+@njit(cache=True)
+def steal_nogood_decision(nogoods: NDArray, top: int) -> None:
+    """
+    Removes the decision of the level 0, when its choice point has been stolen (see cp_steal).
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+    :param top: the index of the top of the stacks before the choice point was stolen
+    :type top: int
+    """
+    if len(nogoods) == 0:
+        return
+    decisions = get_nogood_sections(nogoods)[0]
+    for level in range(top - 1):
+        decisions[level] = decisions[level + 1]
+
+
+@njit(cache=True, inline="always")
+def get_literal_status(domains: NDArray, key: int, value: int) -> int:
+    """
+    Returns the status of a literal.
+
+    :param domains: the domains
+    :type domains: NDArray
+    :param key: the key of the literal
+    :type key: int
+    :param value: the value of the literal
+    :type value: int
+
+    :return: 1 when the literal is true, -1 when it is false, 0 otherwise
+    :rtype: int
+    """
+    domain = domains[key >> 1]
+    if key & 1 == MIN:
+        if domain[MIN] >= value:
+            return 1
+        return -1 if domain[MAX] < value else 0
+    if domain[MAX] <= value:
+        return 1
+    return -1 if domain[MIN] > value else 0
+
+
+@njit(cache=True)
+def record_decisions(
+    nogoods: NDArray, domains_stk: NDArray, domain_update_stk: NDArray, start_level: int, end_level: int
+) -> None:
+    """
+    Records the decisions of the new choice points, from their pending refutations: a refutation raising the min
+    of a variable to v refutes the decision [variable <= v - 1], a refutation lowering its max to v refutes the
+    decision [variable >= v + 1].
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+    :param domains_stk: the stack of domains
+    :type domains_stk: NDArray
+    :param domain_update_stk: the stack of domain updates
+    :type domain_update_stk: NDArray
+    :param start_level: the level of the first new choice point
+    :type start_level: int
+    :param end_level: the level following the last new choice point
+    :type end_level: int
+    """
+    decisions = get_nogood_sections(nogoods)[0]
+    for level in range(start_level, end_level):
+        variable = int(domain_update_stk[level, DOM_UPDATE_VARIABLE])
+        if domain_update_stk[level, DOM_UPDATE_EVENTS] & EVENT_MASK_MIN:
+            decisions[level, 0] = 2 * variable + MAX
+            decisions[level, 1] = domains_stk[level, variable, MIN] - 1
+        else:
+            decisions[level, 0] = 2 * variable + MIN
+            decisions[level, 1] = domains_stk[level, variable, MAX] + 1
+
+
+@njit(cache=True, inline="always")
+def link_watch(heads: NDArray, records: NDArray, literals: NDArray, nogood_idx: int, watch: int) -> None:
+    """
+    Adds a watched literal of a nogood to the watch list of its key.
+
+    :param heads: the heads of the watch lists
+    :type heads: NDArray
+    :param records: the records of the nogoods
+    :type records: NDArray
+    :param literals: the literals
+    :type literals: NDArray
+    :param nogood_idx: the index of the nogood
+    :type nogood_idx: int
+    :param watch: 0 or 1
+    :type watch: int
+    """
+    record = records[nogood_idx]
+    key = literals[record[NOGOOD_RECORD_IDX_START] + record[NOGOOD_RECORD_IDX_WATCH_0 + watch], 0]
+    record[NOGOOD_RECORD_IDX_NEXT_0 + watch] = heads[key]
+    heads[key] = 2 * nogood_idx + watch
+
+
+@njit(cache=True)
+def record_nogood(nogoods: NDArray, level: int) -> None:
+    """
+    Records the nogood made of the decisions of the levels 0..level, when the search backtracks to this level.
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+    :param level: the level of the choice point whose decision is refuted
+    :type level: int
+    """
+    decisions, snapshot, heads, _, _, marks, records, literals = get_nogood_sections(nogoods)
+    # the nogoods of the run that the new one subsumes are deleted
+    key = decisions[level, 0]
+    value = decisions[level, 1]
+    run_top = nogoods[NOGOOD_IDX_RUN_TOP]
+    while run_top != NOGOOD_NONE:
+        record = records[run_top]
+        if record[NOGOOD_RECORD_IDX_LEVEL] == level:
+            # the deepest literal of the previous nogood of this level must imply the new decision
+            last_key = literals[record[NOGOOD_RECORD_IDX_START], 0]
+            last_value = literals[record[NOGOOD_RECORD_IDX_START], 1]
+            if last_key != key or (last_value < value if key & 1 == MIN else last_value > value):
+                break
+        elif record[NOGOOD_RECORD_IDX_LEVEL] < level:
+            break
+        record[NOGOOD_RECORD_IDX_SIZE] = 0
+        run_top = record[NOGOOD_RECORD_IDX_PREVIOUS]
+    nogoods[NOGOOD_IDX_RUN_TOP] = run_top
+    # only the deepest decision of each key is kept
+    size = 0
+    for decision_level in range(level, -1, -1):
+        if marks[decisions[decision_level, 0]] == 0:
+            marks[decisions[decision_level, 0]] = 1
+            size += 1
+    if nogoods[NOGOOD_IDX_NB] == nogoods[NOGOOD_IDX_CAPACITY] or (
+        nogoods[NOGOOD_IDX_LITERAL_NB] + size > nogoods[NOGOOD_IDX_LITERAL_CAPACITY]
+    ):
+        reduce_nogoods(nogoods)
+    nogood_idx = nogoods[NOGOOD_IDX_NB]
+    literal_start = nogoods[NOGOOD_IDX_LITERAL_NB]
+    fits = nogood_idx < nogoods[NOGOOD_IDX_CAPACITY] and literal_start + size <= nogoods[NOGOOD_IDX_LITERAL_CAPACITY]
+    literal_idx = literal_start
+    for decision_level in range(level, -1, -1):
+        decision_key = decisions[decision_level, 0]
+        if marks[decision_key] != 0:
+            marks[decision_key] = 0
+            if fits:
+                literals[literal_idx] = decisions[decision_level]
+                literal_idx += 1
+    if not fits:
+        return
+    record = records[nogood_idx]
+    record[NOGOOD_RECORD_IDX_START] = literal_start
+    record[NOGOOD_RECORD_IDX_SIZE] = size
+    record[NOGOOD_RECORD_IDX_LEVEL] = level
+    record[NOGOOD_RECORD_IDX_LBD] = size  # the literals are decisions, each has its own level
+    record[NOGOOD_RECORD_IDX_PREVIOUS] = nogoods[NOGOOD_IDX_RUN_TOP]
+    nogoods[NOGOOD_IDX_RUN_TOP] = nogood_idx
+    nogoods[NOGOOD_IDX_NB] = nogood_idx + 1
+    nogoods[NOGOOD_IDX_LITERAL_NB] = literal_start + size
+    nogoods[NOGOOD_IDX_RECORDED_NB] += 1
+    # the two deepest decisions are watched, the watch lists of their keys are visited by the next propagation
+    record[NOGOOD_RECORD_IDX_WATCH_0] = 0
+    record[NOGOOD_RECORD_IDX_WATCH_1] = 1 if size > 1 else 0
+    for watch in range(2 if size > 1 else 1):
+        link_watch(heads, records, literals, nogood_idx, watch)
+        watched_key = literals[literal_start + watch, 0]
+        snapshot[watched_key >> 1, watched_key & 1] = (
+            -NOGOOD_BOUND_NONE if watched_key & 1 == MIN else NOGOOD_BOUND_NONE
+        )
+
+
+@njit(cache=True)
+def reduce_nogoods(nogoods: NDArray) -> None:
+    """
+    Removes the deleted nogoods and, while the store is more than half full, the nogoods recorded before the
+    current run with the largest LBD, the oldest first.
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+    """
+    _, _, heads, _, _, _, records, literals = get_nogood_sections(nogoods)
+    nogood_nb = nogoods[NOGOOD_IDX_NB]
+    capacity = nogoods[NOGOOD_IDX_CAPACITY]
+    run_start = nogoods[NOGOOD_IDX_RUN_START]
+    live_nb = 0
+    live_literal_nb = 0
+    for nogood_idx in range(nogood_nb):
+        if records[nogood_idx, NOGOOD_RECORD_IDX_SIZE] != 0:
+            live_nb += 1
+            live_literal_nb += records[nogood_idx, NOGOOD_RECORD_IDX_SIZE]
+    if live_nb > capacity // 2 or live_literal_nb > nogoods[NOGOOD_IDX_LITERAL_CAPACITY] // 2:
+        # the nogoods of the previous runs, by increasing LBD and, for the same LBD, the newest first
+        keys = np.full(run_start, NOGOOD_BOUND_NONE, dtype=np.int64)
+        for nogood_idx in range(run_start):
+            if records[nogood_idx, NOGOOD_RECORD_IDX_SIZE] != 0:
+                keys[nogood_idx] = records[nogood_idx, NOGOOD_RECORD_IDX_LBD] * capacity + capacity - 1 - nogood_idx
+        order = np.argsort(keys)
+        for order_idx in range(run_start - 1, -1, -1):
+            if live_nb <= capacity // 2 and live_literal_nb <= nogoods[NOGOOD_IDX_LITERAL_CAPACITY] // 2:
+                break
+            record = records[order[order_idx]]
+            if record[NOGOOD_RECORD_IDX_SIZE] != 0:
+                live_nb -= 1
+                live_literal_nb -= record[NOGOOD_RECORD_IDX_SIZE]
+                record[NOGOOD_RECORD_IDX_SIZE] = 0
+    # the remaining nogoods are moved to the front, in the same order
+    new_indices = np.full(nogood_nb, NOGOOD_NONE, dtype=np.int64)
+    new_nb = 0
+    new_literal_nb = 0
+    new_run_start = -1
+    for nogood_idx in range(nogood_nb):
+        if nogood_idx == run_start:
+            new_run_start = new_nb
+        size = records[nogood_idx, NOGOOD_RECORD_IDX_SIZE]
+        if size == 0:
+            continue
+        new_indices[nogood_idx] = new_nb
+        start = records[nogood_idx, NOGOOD_RECORD_IDX_START]
+        for position in range(size):
+            literals[new_literal_nb + position] = literals[start + position]
+        records[new_nb] = records[nogood_idx]
+        records[new_nb, NOGOOD_RECORD_IDX_START] = new_literal_nb
+        new_nb += 1
+        new_literal_nb += size
+    nogoods[NOGOOD_IDX_RUN_START] = new_nb if new_run_start == -1 else new_run_start
+    nogoods[NOGOOD_IDX_NB] = new_nb
+    nogoods[NOGOOD_IDX_LITERAL_NB] = new_literal_nb
+    # the nogoods of the run are never evicted
+    if nogoods[NOGOOD_IDX_RUN_TOP] != NOGOOD_NONE:
+        nogoods[NOGOOD_IDX_RUN_TOP] = new_indices[nogoods[NOGOOD_IDX_RUN_TOP]]
+    for nogood_idx in range(new_nb):
+        previous = records[nogood_idx, NOGOOD_RECORD_IDX_PREVIOUS]
+        if previous != NOGOOD_NONE:
+            records[nogood_idx, NOGOOD_RECORD_IDX_PREVIOUS] = new_indices[previous]
+    heads[:] = NOGOOD_NONE
+    for nogood_idx in range(new_nb):
+        link_watch(heads, records, literals, nogood_idx, 0)
+        if records[nogood_idx, NOGOOD_RECORD_IDX_SIZE] > 1:
+            link_watch(heads, records, literals, nogood_idx, 1)
+
+
+@njit(cache=True)
+def propagate_nogoods(nogoods: NDArray, domains: NDArray) -> bool:
+    """
+    Propagates the nogoods whose watched literals have become true since the previous propagation; the variables
+    whose domains are changed are recorded, with their events, for the consistency algorithm to schedule the
+    propagators.
+
+    :param nogoods: the nogood store
+    :type nogoods: NDArray
+    :param domains: the domains
+    :type domains: NDArray
+
+    :return: false iff the domains violate a nogood
+    :rtype: bool
+    """
+    _, snapshot, heads, change_variables, change_events, _, records, literals = get_nogood_sections(nogoods)
+    change_nb = 0
+    for variable in range(len(domains)):
+        domain = domains[variable]
+        for bound in range(2):
+            tightened = domain[MIN] > snapshot[variable, MIN] if bound == MIN else domain[MAX] < snapshot[variable, MAX]
+            snapshot[variable, bound] = domain[bound]
+            if not tightened:
+                continue
+            # the bound has been tightened, the watched literals of its key may have become true
+            key = 2 * variable + bound
+            previous = NOGOOD_NONE
+            node = heads[key]
+            while node != NOGOOD_NONE:
+                nogood_idx = node >> 1
+                watch = node & 1
+                record = records[nogood_idx]
+                next_node = record[NOGOOD_RECORD_IDX_NEXT_0 + watch]
+                size = record[NOGOOD_RECORD_IDX_SIZE]
+                start = record[NOGOOD_RECORD_IDX_START]
+                watched = record[NOGOOD_RECORD_IDX_WATCH_0 + watch]
+                if (
+                    size == 0
+                    or get_literal_status(domains, literals[start + watched, 0], literals[start + watched, 1]) != 1
+                ):
+                    if size == 0:
+                        # a deleted nogood is unlinked
+                        if previous == NOGOOD_NONE:
+                            heads[key] = next_node
+                        else:
+                            records[previous >> 1, NOGOOD_RECORD_IDX_NEXT_0 + (previous & 1)] = next_node
+                    else:
+                        previous = node
+                    node = next_node
+                    continue
+                other = record[NOGOOD_RECORD_IDX_WATCH_1 - watch]
+                replacement = -1
+                for position in range(size):
+                    if (
+                        position != watched
+                        and position != other
+                        and get_literal_status(domains, literals[start + position, 0], literals[start + position, 1])
+                        != 1
+                    ):
+                        replacement = position
+                        break
+                if replacement != -1:
+                    # the replacement is watched instead
+                    if previous == NOGOOD_NONE:
+                        heads[key] = next_node
+                    else:
+                        records[previous >> 1, NOGOOD_RECORD_IDX_NEXT_0 + (previous & 1)] = next_node
+                    record[NOGOOD_RECORD_IDX_WATCH_0 + watch] = replacement
+                    link_watch(heads, records, literals, nogood_idx, watch)
+                    node = next_node
+                    continue
+                previous = node
+                node = next_node
+                other_key = literals[start + other, 0]
+                other_value = literals[start + other, 1]
+                other_status = 1 if size == 1 else get_literal_status(domains, other_key, other_value)
+                if other_status == -1:
+                    continue
+                if other_status == 1:
+                    nogoods[NOGOOD_IDX_FAILURE_NB] += 1
+                    for change_idx in range(change_nb):
+                        change_events[change_variables[change_idx]] = 0
+                    nogoods[NOGOOD_IDX_CHANGE_NB] = 0
+                    return False
+                # the other watched literal is made false
+                other_variable = other_key >> 1
+                if other_key & 1 == MIN:
+                    domains[other_variable, MAX] = other_value - 1
+                    events = EVENT_MASK_MAX
+                else:
+                    domains[other_variable, MIN] = other_value + 1
+                    events = EVENT_MASK_MIN
+                if change_events[other_variable] == 0:
+                    change_variables[change_nb] = other_variable
+                    change_nb += 1
+                change_events[other_variable] |= events
+                nogoods[NOGOOD_IDX_PRUNING_NB] += 1
+    nogoods[NOGOOD_IDX_CHANGE_NB] = change_nb
+    return True
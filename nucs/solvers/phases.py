@@ -0,0 +1,98 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+from collections.abc import Sequence
+
+import numpy as np
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import MAX, MIN, PHASE_NONE
+
+
+def get_hint(domain_nb: int, solution_hint: Sequence[int | None] | NDArray | None) -> NDArray:
+    """
+    Returns the solution hint as an array of values indexed by variables.
+
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+    :param solution_hint: a value or None per variable, or None for no hint
+    :type solution_hint: Optional[Union[Sequence[Optional[int]], NDArray]]
+
+    :return: the values, PHASE_NONE for a variable without a hint, an empty array when there is no hint
+    :rtype: NDArray
+    """
+    if solution_hint is None:
+        return np.empty(0, dtype=np.int64)
+    if len(solution_hint) != domain_nb:
+        raise ValueError(f"The solution hint has {len(solution_hint)} values instead of {domain_nb}")
+    return np.array([PHASE_NONE if value is None else value for value in solution_hint], dtype=np.int64)
+
+
+def get_phases(domain_nb: int, hint: NDArray, phase_saving: bool) -> NDArray:
+    """
+    Returns the phases, the values tried first by the search, initialized with the solution hint.
+
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+    :param hint: the solution hint, see get_hint
+    :type hint: NDArray
+    :param phase_saving: whether the phases are updated with the solutions found
+    :type phase_saving: bool
+
+    :return: the phases, PHASE_NONE for a variable without a phase, an empty array when there is no hint and no
+             phase saving
+    :rtype: NDArray
+    """
+    if len(hint) != 0:
+        return hint.copy()
+    return np.full(domain_nb if phase_saving else 0, PHASE_NONE, dtype=np.int64)
+
+
+def get_hint_domains(domains: NDArray, hint: NDArray) -> NDArray | None:
+    """
+    Returns the domains restricted by the solution hint.
+
+    :param domains: the domains
+    :type domains: NDArray
+    :param hint: the solution hint, see get_hint
+    :type hint: NDArray
+
+    :return: the restricted domains or None when a value of the hint is not in its domain
+    :rtype: Optional[NDArray]
+    """
+    hinted = hint != PHASE_NONE
+    values = hint[hinted]
+    if np.any(values < domains[hinted, MIN]) or np.any(values > domains[hinted, MAX]):
+        return None
+    hint_domains = domains.copy()
+    hint_domains[hinted, MIN] = values
+    hint_domains[hinted, MAX] = values
+    return hint_domains
+
+
+@njit(cache=True, inline="always")
+def has_phase(phases: NDArray, domain: NDArray, variable: int) -> bool:
+    """
+    Returns whether the phase of a variable can be tried.
+
+    :param phases: the phases, see get_phases
+    :type phases: NDArray
+    :param domain: the domain of the variable
+    :type domain: NDArray
+    :param variable: the variable
+    :type variable: int
+
+    :return: true iff there are phases and the phase of the variable is in its domain
+    :rtype: bool
+    """
+    return len(phases) != 0 and domain[MIN] <= phases[variable] <= domain[MAX]
@@ -0,0 +1,144 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import (
+    RANGE_END,
+    RANGE_START,
+    VARIABLE,
+    WEIGHTS_ACTIVITY_BUMP_INIT,
+    WEIGHTS_ACTIVITY_BUMP_MAX,
+    WEIGHTS_ACTIVITY_DECAY,
+    WEIGHTS_CHB_SCALE,
+    WEIGHTS_CHB_STEP_INIT,
+    WEIGHTS_CHB_STEP_MIN,
+    WEIGHTS_HEADER_NB,
+    WEIGHTS_IDX_ACTIVITY_BUMP,
+    WEIGHTS_IDX_CHB_STEP,
+    WEIGHTS_IDX_FAILURE_NB,
+    WEIGHTS_SECTION_ACTIVITY,
+    WEIGHTS_SECTION_CHB_LAST_FAILURE,
+    WEIGHTS_SECTION_CHB_SCORE,
+    WEIGHTS_SECTION_FAILURE_NB,
+    WEIGHTS_SECTION_NB,
+)
+
+
+def get_propagator_weights_size(propagator_nb: int) -> int:
+    """
+    Returns the size of the array of the propagator weights.
+
+    :param propagator_nb: the number of propagators
+    :type propagator_nb: int
+
+    :return: the size
+    :rtype: int
+    """
+    return WEIGHTS_HEADER_NB + WEIGHTS_SECTION_NB * propagator_nb
+
+
+def init_propagator_weights(propagator_weights: NDArray) -> None:
+    """
+    Initializes the propagator weights, before any failure.
+
+    :param propagator_weights: the propagator weights
+    :type propagator_weights: NDArray
+    """
+    propagator_weights[:] = 0
+    propagator_weights[WEIGHTS_IDX_ACTIVITY_BUMP] = WEIGHTS_ACTIVITY_BUMP_INIT
+    propagator_weights[WEIGHTS_IDX_CHB_STEP] = WEIGHTS_CHB_STEP_INIT
+
+
+def get_weighted_var_heuristic_params(
+    propagator_nb: int, domain_nb: int, bounds: NDArray, propagator_variables: NDArray
+) -> NDArray:
+    """
+    Returns the parameters of the weighted variable heuristics: a single row holding the number of propagators,
+    the propagator weights and the CSR (offsets then propagators) of the propagators of each variable.
+
+    :param propagator_nb: the number of propagators
+    :type propagator_nb: int
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+    :param bounds: the bounds indexed by propagators
+    :type bounds: NDArray
+    :param propagator_variables: the variables by propagators
+    :type propagator_variables: NDArray
+
+    :return: the parameters, whose propagator weights still have to be initialized
+    :rtype: NDArray
+    """
+    arities = (bounds[:, VARIABLE, RANGE_END] - bounds[:, VARIABLE, RANGE_START]).astype(np.int64)
+    variables = np.concatenate(
+        [np.empty(0, dtype=np.int64)]
+        + [
+            propagator_variables[bounds[prop_idx, VARIABLE, RANGE_START] : bounds[prop_idx, VARIABLE, RANGE_END]]
+            for prop_idx in range(propagator_nb)
+        ]
+    ).astype(np.int64)
+    propagators = np.repeat(np.arange(propagator_nb, dtype=np.int64), arities)
+    # a propagator referencing a variable twice is only listed once for it
+    pairs = (
+        np.unique(np.stack((variables, propagators), axis=1), axis=0)
+        if len(variables)
+        else np.empty((0, 2), dtype=np.int64)
+    )
+    offsets = np.zeros(domain_nb + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pairs[:, 0].astype(np.int64), minlength=domain_nb), out=offsets[1:])
+    return np.concatenate(
+        (
+            np.array([propagator_nb], dtype=np.int64),
+            np.zeros(get_propagator_weights_size(propagator_nb), dtype=np.int64),
+            offsets,
+            pairs[:, 1].astype(np.int64),
+        )
+    ).reshape(1, -1)
+
+
+@njit(cache=True)
+def bump_propagator_weights(propagator_weights: NDArray, propagator_nb: int, prop_idx: int) -> None:
+    """
+    Updates the propagator weights after a failure of a propagator.
+
+    :param propagator_weights: the propagator weights
+    :type propagator_weights: NDArray
+    :param propagator_nb: the number of propagators
+    :type propagator_nb: int
+    :param prop_idx: the index of the failing propagator
+    :type prop_idx: int
+    """
+    propagator_weights[WEIGHTS_IDX_FAILURE_NB] += 1
+    failure_nb = propagator_weights[WEIGHTS_IDX_FAILURE_NB]
+    # weighted degree
+    propagator_weights[WEIGHTS_HEADER_NB + WEIGHTS_SECTION_FAILURE_NB * propagator_nb + prop_idx] += 1
+    # activity: the bump grows instead of every activity decaying, the activities are rescaled before overflowing
+    activity_offset = WEIGHTS_HEADER_NB + WEIGHTS_SECTION_ACTIVITY * propagator_nb
+    propagator_weights[activity_offset + prop_idx] += propagator_weights[WEIGHTS_IDX_ACTIVITY_BUMP]
+    propagator_weights[WEIGHTS_IDX_ACTIVITY_BUMP] = (
+        propagator_weights[WEIGHTS_IDX_ACTIVITY_BUMP] * 100 // WEIGHTS_ACTIVITY_DECAY
+    )
+    if propagator_weights[WEIGHTS_IDX_ACTIVITY_BUMP] > WEIGHTS_ACTIVITY_BUMP_MAX:
+        rescaling = WEIGHTS_ACTIVITY_BUMP_MAX // WEIGHTS_ACTIVITY_BUMP_INIT
+        propagator_weights[activity_offset : activity_offset + propagator_nb] //= rescaling
+        propagator_weights[WEIGHTS_IDX_ACTIVITY_BUMP] //= rescaling
+    # CHB: the reward is higher when the previous failure of the propagator is recent
+    score_idx = WEIGHTS_HEADER_NB + WEIGHTS_SECTION_CHB_SCORE * propagator_nb + prop_idx
+    last_failure_idx = WEIGHTS_HEADER_NB + WEIGHTS_SECTION_CHB_LAST_FAILURE * propagator_nb + prop_idx
+    reward = WEIGHTS_CHB_SCALE // (failure_nb - propagator_weights[last_failure_idx])
+    step = propagator_weights[WEIGHTS_IDX_CHB_STEP]
+    propagator_weights[score_idx] += step * (reward - propagator_weights[score_idx]) // 1_000_000
+    propagator_weights[last_failure_idx] = failure_nb
+    if step > WEIGHTS_CHB_STEP_MIN:
+        propagator_weights[WEIGHTS_IDX_CHB_STEP] = step - 1
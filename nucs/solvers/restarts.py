@@ -0,0 +1,54 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+from nucs.constants import LIMIT_NONE, RESTART_GEOMETRIC, RESTART_LUBY
+
+
+def luby(index: int) -> int:
+    """
+    Returns a term of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...
+
+    :param index: the index of the term, starting at 0
+    :type index: int
+
+    :return: the term
+    :rtype: int
+    """
+    index += 1
+    while True:
+        size = 1 << index.bit_length()  # the smallest power of 2 greater than index
+        if index == size - 1:
+            return size >> 1
+        index -= (size >> 1) - 1  # the sequence up to size - 1 repeats its first half
+
+
+def restart_backtrack_nb(policy: str, scale: int, factor: float, restart_idx: int) -> int:
+    """
+    Returns the number of backtracks allowed before a restart.
+
+    :param policy: the restart policy
+    :type policy: str
+    :param scale: the number of backtracks of the first run
+    :type scale: int
+    :param factor: the growth factor of the geometric policy
+    :type factor: float
+    :param restart_idx: the number of restarts already made
+    :type restart_idx: int
+
+    :return: the number of backtracks or LIMIT_NONE when the policy never restarts
+    :rtype: int
+    """
+    if policy == RESTART_LUBY:
+        return scale * luby(restart_idx)
+    if policy == RESTART_GEOMETRIC:
+        return min(int(scale * factor**restart_idx), LIMIT_NONE)
+    return LIMIT_NONE
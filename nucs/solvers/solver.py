@@ -18,7 +18,33 @@ from numba import njit  # type: ignore
 from numpy.typing import NDArray
 from rich import print
 
-from nucs.constants import LOG_FORMAT, LOG_LEVEL_INFO, MIN
+from nucs.constants import (
+    LOG_FORMAT,
+    LOG_LEVEL_INFO,
+    MIN,
+    STATS_IDX_ALG_BC_NB,
+    STATS_IDX_PROPAGATOR_ENTAILMENT_NB,
+    STATS_IDX_PROPAGATOR_FILTER_NB,
+    STATS_IDX_PROPAGATOR_FILTER_NO_CHANGE_NB,
+    STATS_IDX_PROPAGATOR_INCONSISTENCY_NB,
+    STATS_IDX_SOLUTION_NB,
+    STATS_IDX_SOLVER_BACKTRACK_NB,
+    STATS_IDX_SOLVER_CHOICE_DEPTH,
+    STATS_IDX_SOLVER_CHOICE_NB,
+    STATS_IDX_SOLVER_ELAPSED_TIME,
+    STATS_IDX_SOLVER_RESTART_NB,
+    STATS_LBL_ALG_BC_NB,
+    STATS_LBL_PROPAGATOR_ENTAILMENT_NB,
+    STATS_LBL_PROPAGATOR_FILTER_NB,
+    STATS_LBL_PROPAGATOR_FILTER_NO_CHANGE_NB,
+    STATS_LBL_PROPAGATOR_INCONSISTENCY_NB,
+    STATS_LBL_SOLUTION_NB,
+    STATS_LBL_SOLVER_BACKTRACK_NB,
+    STATS_LBL_SOLVER_CHOICE_DEPTH,
+    STATS_LBL_SOLVER_CHOICE_NB,
+    STATS_LBL_SOLVER_ELAPSED_TIME,
+    STATS_LBL_SOLVER_RESTART_NB,
+)
 from nucs.problems.problem import Problem
 
 logger = logging.getLogger(__name__)
@@ -140,3 +166,29 @@ def get_solution(domains_stk: NDArray, top: int) -> NDArray:
     :rtype: NDArray
     """
     return domains_stk[top, :, MIN].copy()
+
+
+def statistics_as_dictionary(statistics: NDArray) -> dict[str, int]:
+    """
+    Returns a statistics array as a dictionary.
+
+    :param statistics: the statistics array
+    :type statistics: NDArray
+
+    :return: a dictionary mapping statistic labels to values
+    :rtype: Dict[str, int]
+    """
+    return {
+        STATS_LBL_ALG_BC_NB: int(statistics[STATS_IDX_ALG_BC_NB]),
+        STATS_LBL_PROPAGATOR_ENTAILMENT_NB: int(statistics[STATS_IDX_PROPAGATOR_ENTAILMENT_NB]),
+        STATS_LBL_PROPAGATOR_FILTER_NB: int(statistics[STATS_IDX_PROPAGATOR_FILTER_NB]),
+        STATS_LBL_PROPAGATOR_FILTER_NO_CHANGE_NB: int(statistics[STATS_IDX_PROPAGATOR_FILTER_NO_CHANGE_NB]),
+        STATS_LBL_PROPAGATOR_INCONSISTENCY_NB: int(statistics[STATS_IDX_PROPAGATOR_INCONSISTENCY_NB]),
+        STATS_LBL_SOLVER_BACKTRACK_NB: int(statistics[STATS_IDX_SOLVER_BACKTRACK_NB]),
+        STATS_LBL_SOLVER_CHOICE_NB: int(statistics[STATS_IDX_SOLVER_CHOICE_NB]),
+        STATS_LBL_SOLVER_CHOICE_DEPTH: int(statistics[STATS_IDX_SOLVER_CHOICE_DEPTH]),
+        STATS_LBL_SOLVER_RESTART_NB: int(statistics[STATS_IDX_SOLVER_RESTART_NB]),
+        STATS_LBL_SOLUTION_NB: int(statistics[STATS_IDX_SOLUTION_NB]),
+        # the statistics array accumulates nanoseconds, the reported statistic is in milliseconds
+        STATS_LBL_SOLVER_ELAPSED_TIME: int(statistics[STATS_IDX_SOLVER_ELAPSED_TIME]) // 1_000_000,
+    }
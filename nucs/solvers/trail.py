@@ -0,0 +1,627 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+from nucs.constants import (
+    CHOICE_POINTS_AUTO,
+    CHOICE_POINTS_TRAIL,
+    CP_BRANCH_NB,
+    DOM_UPDATE_EVENTS,
+    DOM_UPDATE_VARIABLE,
+    EVENT_MASK_GROUND,
+    EVENT_MASK_MAX,
+    EVENT_MASK_MIN,
+    EVENT_MASK_NB,
+    EVENT_MASK_NONE,
+    MAX,
+    MIN,
+    STATS_IDX_SOLVER_BACKTRACK_NB,
+    TRAIL_AUTO_CELL_NB,
+    TRAIL_ENTRY_IDX_DOMAIN,
+    TRAIL_ENTRY_IDX_VARIABLE,
+    TRAIL_ENTRY_NB,
+    TRAIL_HEADER_NB,
+    TRAIL_IDX_DOMAIN_NB,
+    TRAIL_IDX_ENTRY_CAPACITY,
+    TRAIL_IDX_ENTRY_NB,
+    TRAIL_IDX_LEVEL_CAPACITY,
+    TRAIL_IDX_LEVEL_NB,
+    TRAIL_IDX_OBJECTIVE_BOUND,
+    TRAIL_IDX_OBJECTIVE_VALUE,
+    TRAIL_IDX_OBJECTIVE_VARIABLE,
+    TRAIL_IDX_STAMP,
+    TRAIL_LEVEL_IDX_DOMAIN,
+    TRAIL_LEVEL_IDX_ENTAILMENT_NB,
+    TRAIL_LEVEL_IDX_ENTRY_NB,
+    TRAIL_LEVEL_IDX_EVENTS,
+    TRAIL_LEVEL_IDX_UNBOUND_NB,
+    TRAIL_LEVEL_IDX_VARIABLE,
+    TRAIL_LEVEL_NB,
+)
+from nucs.propagators.propagators import update_propagators
+
+# With the trail, the stacks of the choice points hold a single level: the current domains, which are changed in
+# place. Before a domain is changed for the first time at a level, its previous bounds are pushed on the trail as an
+# entry (variable, min, max), the stamps of the variables telling which ones have already been pushed at the current
+# level. A choice point is a record of the pending refutation: the number of entries and the size of the entailment
+# trail when it was made, and the domain of the variable of the refutation. Backtracking pops the entries pushed
+# since the choice point, from the last one, then applies the refutation, which starts a new level.
+#
+# The domain heuristics split the domain of their variable on a stack of CP_BRANCH_NB levels that is only one
+# variable wide (see get_branch_domains and cp_put), so that a choice costs the same whatever the number of variables.
+#
+# When optimizing with the PRUNE mode, the bound of the objective is kept in the header and applied after every
+# backtrack, since the domains restored from the trail do not know about it.
+#
+# The trail is stored in a single int64 array, laid out as:
+# - the header (see TRAIL_HEADER_NB),
+# - the stamps of the variables,
+# - the records of the choice points (see TRAIL_LEVEL_NB),
+# - the entries (see TRAIL_ENTRY_NB).
+# The solve loop returns SEARCH_STACKS_FULL when the trail may not hold the next level, the solver then grows it.
+
+
+def is_trailing(choice_points: str, domain_nb: int, expected_depth: int) -> bool:
+    """
+    Returns whether the domains of the choice points are trailed rather than copied.
+
+    :param choice_points: the choice point mode, see CHOICE_POINTS_MODES
+    :type choice_points: str
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+    :param expected_depth: the expected depth of the search
+    :type expected_depth: int
+
+    :return: true iff the domains are trailed
+    :rtype: bool
+    """
+    if choice_points == CHOICE_POINTS_AUTO:
+        return domain_nb * expected_depth >= TRAIL_AUTO_CELL_NB
+    return choice_points == CHOICE_POINTS_TRAIL
+
+
+def get_trail_size(domain_nb: int, level_capacity: int, entry_capacity: int) -> int:
+    """
+    Returns the size of the trail.
+
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+    :param level_capacity: the maximal number of choice points
+    :type level_capacity: int
+    :param entry_capacity: the maximal number of entries
+    :type entry_capacity: int
+
+    :return: the size
+    :rtype: int
+    """
+    return TRAIL_HEADER_NB + domain_nb + TRAIL_LEVEL_NB * level_capacity + TRAIL_ENTRY_NB * entry_capacity
+
+
+def get_trail(domain_nb: int, stks_max_height: int, trailing: bool) -> NDArray:
+    """
+    Allocates an empty trail, empty when the domains of the choice points are copied.
+
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+    :param stks_max_height: the initial maximal number of choice points
+    :type stks_max_height: int
+    :param trailing: whether the domains of the choice points are trailed
+    :type trailing: bool
+
+    :return: the trail
+    :rtype: NDArray
+    """
+    if not trailing:
+        return np.zeros(0, dtype=np.int64)
+    level_capacity = max(stks_max_height, CP_BRANCH_NB)
+    entry_capacity = 2 * (domain_nb + CP_BRANCH_NB) + stks_max_height
+    trail = np.zeros(get_trail_size(domain_nb, level_capacity, entry_capacity), dtype=np.int64)
+    trail[TRAIL_IDX_DOMAIN_NB] = domain_nb
+    trail[TRAIL_IDX_LEVEL_CAPACITY] = level_capacity
+    trail[TRAIL_IDX_ENTRY_CAPACITY] = entry_capacity
+    clear_trail(trail)
+    return trail
+
+
+def grow_trail(trail: NDArray) -> NDArray:
+    """
+    Returns a copy of a full trail with room for the next level.
+
+    :param trail: the trail
+    :type trail: NDArray
+
+    :return: the new trail
+    :rtype: NDArray
+    """
+    domain_nb = int(trail[TRAIL_IDX_DOMAIN_NB])
+    level_capacity = int(trail[TRAIL_IDX_LEVEL_CAPACITY])
+    entry_capacity = int(trail[TRAIL_IDX_ENTRY_CAPACITY])
+    while trail[TRAIL_IDX_LEVEL_NB] + CP_BRANCH_NB > level_capacity:
+        level_capacity *= 2
+    while trail[TRAIL_IDX_ENTRY_NB] + domain_nb + CP_BRANCH_NB > entry_capacity:
+        entry_capacity *= 2
+    new_trail = np.zeros(get_trail_size(domain_nb, level_capacity, entry_capacity), dtype=np.int64)
+    new_trail[:TRAIL_HEADER_NB] = trail[:TRAIL_HEADER_NB]
+    new_trail[TRAIL_IDX_LEVEL_CAPACITY] = level_capacity
+    new_trail[TRAIL_IDX_ENTRY_CAPACITY] = entry_capacity
+    stamps, levels, entries = get_trail_sections(trail)
+    new_stamps, new_levels, new_entries = get_trail_sections(new_trail)
+    new_stamps[:] = stamps
+    new_levels[: len(levels)] = levels
+    new_entries[: len(entries)] = entries
+    return new_trail
+
+
+@njit(cache=True, inline="always")
+def get_trail_sections(trail: NDArray) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    Returns the sections of the trail.
+
+    :param trail: the trail
+    :type trail: NDArray
+
+    :return: the stamps of the variables, the (level_capacity, TRAIL_LEVEL_NB) records of the choice points and the
+             (entry_capacity, TRAIL_ENTRY_NB) entries
+    :rtype: Tuple[NDArray, NDArray, NDArray]
+    """
+    levels_start = TRAIL_HEADER_NB + trail[TRAIL_IDX_DOMAIN_NB]
+    entries_start = levels_start + TRAIL_LEVEL_NB * trail[TRAIL_IDX_LEVEL_CAPACITY]
+    return (
+        trail[TRAIL_HEADER_NB:levels_start],
+        trail[levels_start:entries_start].reshape(-1, TRAIL_LEVEL_NB),
+        trail[entries_start:].reshape(-1, TRAIL_ENTRY_NB),
+    )
+
+
+@njit(cache=True)
+def get_branch_domains(domain_nb: int) -> NDArray:
+    """
+    Returns the stack on which the domain heuristics split a domain when the domains are trailed: all the variables
+    of a level share the same domain.
+
+    :param domain_nb: the number of variables
+    :type domain_nb: int
+
+    :return: a (CP_BRANCH_NB, domain_nb, 2) view of a (CP_BRANCH_NB, 1, 2) array
+    :rtype: NDArray
+    """
+    domains = np.zeros((CP_BRANCH_NB, 1, 2), dtype=np.int32)
+    return np.lib.stride_tricks.as_strided(
+        domains, shape=(CP_BRANCH_NB, domain_nb, 2), strides=(domains.strides[0], 0, domains.strides[2])
+    )
+
+
+@njit(cache=True)
+def clear_trail(trail: NDArray) -> None:
+    """
+    Removes the choice points and the entries of the trail, the domains becoming the root domains.
+
+    :param trail: the trail
+    :type trail: NDArray
+    """
+    if len(trail) == 0:
+        return
+    trail[TRAIL_IDX_LEVEL_NB] = trail[TRAIL_IDX_ENTRY_NB] = 0
+    trail[TRAIL_IDX_STAMP] += 1
+    trail[TRAIL_IDX_OBJECTIVE_VARIABLE] = -1
+
+
+@njit(cache=True, inline="always")
+def trail_full(trail: NDArray) -> bool:
+    """
+    Returns whether the trail may not hold the next level: the consistency algorithm changes each domain at most
+    once per level, a choice point adds CP_BRANCH_NB - 1 records at most.
+
+    :param trail: the trail
+    :type trail: NDArray
+
+    :return: true iff the trail has to grow
+    :rtype: bool
+    """
+    return (
+        trail[TRAIL_IDX_LEVEL_NB] + CP_BRANCH_NB > trail[TRAIL_IDX_LEVEL_CAPACITY]
+        or trail[TRAIL_IDX_ENTRY_NB] + trail[TRAIL_IDX_DOMAIN_NB] + CP_BRANCH_NB > trail[TRAIL_IDX_ENTRY_CAPACITY]
+    )
+
+
+@njit(cache=True, inline="always")
+def trail_domain(trail: NDArray, domains: NDArray, variable: int) -> None:
+    """
+    Pushes the domain of a variable on the trail, unless it has already been pushed at the current level;
+    must be called before the domain is changed.
+
+    :param trail: the trail
+    :type trail: NDArray
+    :param domains: the current domains
+    :type domains: NDArray
+    :param variable: the variable
+    :type variable: int
+    """
+    stamp = trail[TRAIL_IDX_STAMP]
+    if trail[TRAIL_HEADER_NB + variable] == stamp:
+        return
+    trail[TRAIL_HEADER_NB + variable] = stamp
+    entry = (
+        TRAIL_HEADER_NB
+        + trail[TRAIL_IDX_DOMAIN_NB]
+        + TRAIL_LEVEL_NB * trail[TRAIL_IDX_LEVEL_CAPACITY]
+        + TRAIL_ENTRY_NB * trail[TRAIL_IDX_ENTRY_NB]
+    )
+    trail[entry + TRAIL_ENTRY_IDX_VARIABLE] = variable
+    trail[entry + TRAIL_ENTRY_IDX_DOMAIN + MIN] = domains[variable, MIN]
+    trail[entry + TRAIL_ENTRY_IDX_DOMAIN + MAX] = domains[variable, MAX]
+    trail[TRAIL_IDX_ENTRY_NB] += 1
+
+
+@njit(cache=True)
+def trail_branch(
+    trail: NDArray,
+    domains_stk: NDArray,
+    domain_update_stk: NDArray,
+    unbound_variable_nb_stk: NDArray,
+    stks_top: NDArray,
+    entailment_trail: NDArray,
+    branch_domains: NDArray,
+    variable: int,
+) -> None:
+    """
+    Records the choice points made by a domain heuristic on the branch domains and applies its decision.
+
+    :param trail: the trail
+    :type trail: NDArray
+    :param domains_stk: the stack of domains, its single level holds the current domains
+    :type domains_stk: NDArray
+    :param domain_update_stk: the stack of domain updates, written by the domain heuristic
+    :type domain_update_stk: NDArray
+    :param unbound_variable_nb_stk: the stack of the unbound variables nb, written by the domain heuristic
+    :type unbound_variable_nb_stk: NDArray
+    :param stks_top: the index of the top of the stacks, the number of choice points made by the domain heuristic
+    :type stks_top: NDArray
+    :param entailment_trail: the entailment trail, the first cell holds the trail size
+    :type entailment_trail: NDArray
+    :param branch_domains: the branch domains, see get_branch_domains
+    :type branch_domains: NDArray
+    :param variable: the variable
+    :type variable: int
+    """
+    choice_nb = stks_top[0]
+    stks_top[0] = 0
+    levels = get_trail_sections(trail)[1]
+    level_nb = trail[TRAIL_IDX_LEVEL_NB]
+    for choice_idx in range(choice_nb):
+        level = levels[level_nb + choice_idx]
+        level[TRAIL_LEVEL_IDX_ENTRY_NB] = trail[TRAIL_IDX_ENTRY_NB]
+        level[TRAIL_LEVEL_IDX_ENTAILMENT_NB] = entailment_trail[0]
+        level[TRAIL_LEVEL_IDX_UNBOUND_NB] = unbound_variable_nb_stk[choice_idx]
+        level[TRAIL_LEVEL_IDX_VARIABLE] = variable
+        level[TRAIL_LEVEL_IDX_EVENTS] = domain_update_stk[choice_idx, DOM_UPDATE_EVENTS]
+        level[TRAIL_LEVEL_IDX_DOMAIN + MIN] = branch_domains[choice_idx, variable, MIN]
+        level[TRAIL_LEVEL_IDX_DOMAIN + MAX] = branch_domains[choice_idx, variable, MAX]
+    trail[TRAIL_IDX_LEVEL_NB] = level_nb + choice_nb
+    trail[TRAIL_IDX_STAMP] += 1
+    domains = domains_stk[0]
+    trail_domain(trail, domains, variable)
+    domains[variable] = branch_domains[choice_nb, variable]
+    unbound_variable_nb_stk[0] = unbound_variable_nb_stk[choice_nb]
+
+
+@njit(cache=True)
+def set_trail_objective(trail: NDArray, variable: int, value: int, bound: int) -> None:
+    """
+    Sets the bound of the objective applied after every backtrack.
+
+    :param trail: the trail
+    :type trail: NDArray
+    :param variable: the variable being optimized
+    :type variable: int
+    :param value: the value that the bound must improve on
+    :type value: int
+    :param bound: the bound being optimized
+    :type bound: int
+    """
+    if len(trail) == 0:
+        return
+    trail[TRAIL_IDX_OBJECTIVE_VARIABLE] = variable
+    trail[TRAIL_IDX_OBJECTIVE_BOUND] = bound
+    trail[TRAIL_IDX_OBJECTIVE_VALUE] = value
+
+
+@njit(cache=True)
+def fix_trail_objective(trail: NDArray, domains: NDArray, unbound_variable_nb_stk: NDArray) -> int:
+    """
+    Applies the bound of the objective to the current domains.
+
+    :param trail: the trail
+    :type trail: NDArray
+    :param domains: the current domains
+    :type domains: NDArray
+    :param unbound_variable_nb_stk: the stack of the unbound variables nb
+    :type unbound_variable_nb_stk: NDArray
+
+    :return: the events, -1 when the domain of the objective is empty
+    :rtype: int
+    """
+    variable = trail[TRAIL_IDX_OBJECTIVE_VARIABLE]
+    if variable == -1:
+        return EVENT_MASK_NONE
+    value = trail[TRAIL_IDX_OBJECTIVE_VALUE]
+    domain = domains[variable]
+    if trail[TRAIL_IDX_OBJECTIVE_BOUND] == MIN:
+        if domain[MIN] > value:
+            return EVENT_MASK_NONE
+        events = EVENT_MASK_MIN
+    else:
+        if domain[MAX] < value:
+            return EVENT_MASK_NONE
+        events = EVENT_MASK_MAX
+    if domain[MIN] == domain[MAX]:
+        return -1
+    trail_domain(trail, domains, variable)
+    if events == EVENT_MASK_MIN:
+        domain[MIN] = value + 1
+    else:
+        domain[MAX] = value - 1
+    if domain[MIN] > domain[MAX]:
+        return -1
+    if domain[MIN] == domain[MAX]:
+        events |= EVENT_MASK_GROUND
+        unbound_variable_nb_stk[0] -= 1
+    return events
+
+
+@njit(cache=True)
+def trail_pop(
+    trail: NDArray,
+    domains_stk: NDArray,
+    entailed_propagator_depths: NDArray,
+    entailment_trail: NDArray,
+    unbound_variable_nb_stk: NDArray,
+    triggered_propagators: NDArray,
+    triggers: NDArray,
+    triggers_offsets: NDArray,
+    priorities: NDArray,
+    propagator_nb: int,
+) -> bool:
+    """
+    Restores the domains of the last choice point whose refutation does not empty the domain of the objective,
+    applies its refutation and schedules the propagators it triggers.
+
+    :param trail: the trail
+    :type trail: NDArray
+    :param domains_stk: the stack of domains, its single level holds the current domains
+    :type domains_stk: NDArray
+    :param entailed_propagator_depths: the depth at which each propagator was entailed, -1 when active
+    :type entailed_propagator_depths: NDArray
+    :param entailment_trail: the entailment trail, the first cell holds the trail size
+    :type entailment_trail: NDArray
+    :param unbound_variable_nb_stk: the stack of the unbound variables nb
+    :type unbound_variable_nb_stk: NDArray
+    :param triggered_propagators: the Numpy array of triggered propagators
+    :type triggered_propagators: NDArray
+    :param triggers: a Numpy array of event masks indexed by variables and propagators
+    :type triggers: NDArray
+    :param triggers_offsets: the CSR offsets delimiting each (variable, event) slice of triggers
+    :type triggers_offsets: NDArray
+    :param priorities: the propagation queue bucket priorities indexed by propagators
+    :type priorities: NDArray
+    :param propagator_nb: the number of propagators
+    :type propagator_nb: int
+
+    :return: true iff there was such a choice point
+    :rtype: bool
+    """
+    domains = domains_stk[0]
+    levels, entries = get_trail_sections(trail)[1:]
+    while trail[TRAIL_IDX_LEVEL_NB] > 0:
+        trail[TRAIL_IDX_LEVEL_NB] -= 1
+        level = levels[trail[TRAIL_IDX_LEVEL_NB]]
+        entry_nb = level[TRAIL_LEVEL_IDX_ENTRY_NB]
+        for entry_idx in range(trail[TRAIL_IDX_ENTRY_NB] - 1, entry_nb - 1, -1):
+            entry = entries[entry_idx]
+            domains[entry[TRAIL_ENTRY_IDX_VARIABLE], MIN] = entry[TRAIL_ENTRY_IDX_DOMAIN + MIN]
+            domains[entry[TRAIL_ENTRY_IDX_VARIABLE], MAX] = entry[TRAIL_ENTRY_IDX_DOMAIN + MAX]
+        trail[TRAIL_IDX_ENTRY_NB] = entry_nb
+        # the propagators entailed since the choice point was made are reactivated
+        while entailment_trail[0] > level[TRAIL_LEVEL_IDX_ENTAILMENT_NB]:
+            entailed_propagator_depths[entailment_trail[entailment_trail[0]]] = -1
+            entailment_trail[0] -= 1
+        unbound_variable_nb_stk[0] = level[TRAIL_LEVEL_IDX_UNBOUND_NB]
+        trail[TRAIL_IDX_STAMP] += 1
+        variable = level[TRAIL_LEVEL_IDX_VARIABLE]
+        trail_domain(trail, domains, variable)
+        domains[variable, MIN] = level[TRAIL_LEVEL_IDX_DOMAIN + MIN]
+        domains[variable, MAX] = level[TRAIL_LEVEL_IDX_DOMAIN + MAX]
+        offset = variable * EVENT_MASK_NB + level[TRAIL_LEVEL_IDX_EVENTS]
+        update_propagators(
+            triggered_propagators,
+            entailed_propagator_depths,
+            triggers[triggers_offsets[offset] : triggers_offsets[offset + 1]],
+            priorities,
+            propagator_nb,
+        )
+        events = fix_trail_objective(trail, domains, unbound_variable_nb_stk)
+        if events == -1:
+            continue
+        if events != EVENT_MASK_NONE:
+            offset = trail[TRAIL_IDX_OBJECTIVE_VARIABLE] * EVENT_MASK_NB + events
+            update_propagators(
+                triggered_propagators,
+                entailed_propagator_depths,
+                triggers[triggers_offsets[offset] : triggers_offsets[offset + 1]],
+                priorities,
+                propagator_nb,
+            )
+        return True
+    return False
+
+
+@njit(cache=True)
+def trail_fix_objective(
+    trail: NDArray,
+    domains_stk: NDArray,
+    entailed_propagator_depths: NDArray,
+    entailment_trail: NDArray,
+    unbound_variable_nb_stk: NDArray,
+    triggered_propagators: NDArray,
+    triggers: NDArray,
+    triggers_offsets: NDArray,
+    priorities: NDArray,
+    propagator_nb: int,
+    variable: int,
+    value: int,
+    bound: int,
+) -> bool:
+    """
+    Tightens the bound of the objective during a search stopped on a limit: the current domains are kept when
+    the bound does not empty them, otherwise the search pops to the last choice point it does not empty.
+
+    :param trail: the trail
+    :type trail: NDArray
+    :param domains_stk: the stack of domains, its single level holds the current domains
+    :type domains_stk: NDArray
+    :param entailed_propagator_depths: the depth at which each propagator was entailed, -1 when active
+    :type entailed_propagator_depths: NDArray
+    :param entailment_trail: the entailment trail, the first cell holds the trail size
+    :type entailment_trail: NDArray
+    :param unbound_variable_nb_stk: the stack of the unbound variables nb
+    :type unbound_variable_nb_stk: NDArray
+    :param triggered_propagators: the Numpy array of triggered propagators
+    :type triggered_propagators: NDArray
+    :param triggers: a Numpy array of event masks indexed by variables and propagators
+    :type triggers: NDArray
+    :param triggers_offsets: the CSR offsets delimiting each (variable, event) slice of triggers
+    :type triggers_offsets: NDArray
+    :param priorities: the propagation queue bucket priorities indexed by propagators
+    :type priorities: NDArray
+    :param propagator_nb: the number of propagators
+    :type propagator_nb: int
+    :param variable: the variable being optimized
+    :type variable: int
+    :param value: the value that the bound must improve on
+    :type value: int
+    :param bound: the bound being optimized
+    :type bound: int
+
+    :return: true iff the search can continue
+    :rtype: bool
+    """
+    if trail[TRAIL_IDX_OBJECTIVE_VARIABLE] == variable:
+        # the objective bound is never loosened
+        previous_value = trail[TRAIL_IDX_OBJECTIVE_VALUE]
+        value = max(value, previous_value) if bound == MIN else min(value, previous_value)
+    set_trail_objective(trail, variable, value, bound)
+    events = fix_trail_objective(trail, domains_stk[0], unbound_variable_nb_stk)
+    if events == -1:
+        return trail_pop(
+            trail,
+            domains_stk,
+            entailed_propagator_depths,
+            entailment_trail,
+            unbound_variable_nb_stk,
+            triggered_propagators,
+            triggers,
+            triggers_offsets,
+            priorities,
+            propagator_nb,
+        )
+    if events != EVENT_MASK_NONE:
+        offset = variable * EVENT_MASK_NB + events
+        update_propagators(
+            triggered_propagators,
+            entailed_propagator_depths,
+            triggers[triggers_offsets[offset] : triggers_offsets[offset + 1]],
+            priorities,
+            propagator_nb,
+        )
+    return True
+
+
+@njit(cache=True)
+def trail_backtrack(
+    statistics: NDArray,
+    trail: NDArray,
+    domains_stk: NDArray,
+    entailed_propagator_depths: NDArray,
+    entailment_trail: NDArray,
+    unbound_variable_nb_stk: NDArray,
+    triggered_propagators: NDArray,
+    triggers: NDArray,
+    triggers_offsets: NDArray,
+    priorities: NDArray,
+    propagator_nb: int,
+) -> bool:
+    """
+    Backtracks, see backtrack and trail_pop.
+
+    :param statistics: the statistics array
+    :type statistics: NDArray
+
+    :return: true iff it is possible to backtrack
+    :rtype: bool
+    """
+    if trail[TRAIL_IDX_LEVEL_NB] == 0:
+        return False
+    statistics[STATS_IDX_SOLVER_BACKTRACK_NB] += 1
+    return trail_pop(
+        trail,
+        domains_stk,
+        entailed_propagator_depths,
+        entailment_trail,
+        unbound_variable_nb_stk,
+        triggered_propagators,
+        triggers,
+        triggers_offsets,
+        priorities,
+        propagator_nb,
+    )
+
+
+@njit(cache=True)
+def trail_steal(trail: NDArray, domains_stk: NDArray, stolen_domains: NDArray, stolen_domain_update: NDArray) -> bool:
+    """
+    Removes the choice point nearest to the root so that it can be explored elsewhere, see cp_steal.
+
+    Its domains are the current domains restored from all the entries, but for its refutation. The entries pushed
+    before the next choice point become part of the root domains.
+
+    :param trail: the trail
+    :type trail: NDArray
+    :param domains_stk: the stack of domains, its single level holds the current domains
+    :type domains_stk: NDArray
+    :param stolen_domains: the (domain_nb, 2) array receiving the domains of the stolen choice point
+    :type stolen_domains: NDArray
+    :param stolen_domain_update: the array receiving the pending decision of the stolen choice point
+    :type stolen_domain_update: NDArray
+
+    :return: true iff a choice point has been stolen
+    :rtype: bool
+    """
+    level_nb = trail[TRAIL_IDX_LEVEL_NB]
+    if level_nb == 0:
+        return False
+    levels, entries = get_trail_sections(trail)[1:]
+    stolen_domains[:] = domains_stk[0]
+    for entry_idx in range(trail[TRAIL_IDX_ENTRY_NB] - 1, levels[0, TRAIL_LEVEL_IDX_ENTRY_NB] - 1, -1):
+        entry = entries[entry_idx]
+        stolen_domains[entry[TRAIL_ENTRY_IDX_VARIABLE], MIN] = entry[TRAIL_ENTRY_IDX_DOMAIN + MIN]
+        stolen_domains[entry[TRAIL_ENTRY_IDX_VARIABLE], MAX] = entry[TRAIL_ENTRY_IDX_DOMAIN + MAX]
+    variable = levels[0, TRAIL_LEVEL_IDX_VARIABLE]
+    stolen_domains[variable, MIN] = levels[0, TRAIL_LEVEL_IDX_DOMAIN + MIN]
+    stolen_domains[variable, MAX] = levels[0, TRAIL_LEVEL_IDX_DOMAIN + MAX]
+    stolen_domain_update[DOM_UPDATE_VARIABLE] = variable
+    stolen_domain_update[DOM_UPDATE_EVENTS] = levels[0, TRAIL_LEVEL_IDX_EVENTS]
+    levels[: level_nb - 1] = levels[1:level_nb]
+    trail[TRAIL_IDX_LEVEL_NB] = level_nb - 1
+    return True
@@ -0,0 +1,109 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+"""
+Compare the two choice point modes (copying the domains vs trailing the changed bounds) and report the crossover.
+
+The n-queens problem is solved with a growing number of extra variables that no propagator constrains: they are not
+decided but, as in big FlatZinc models, they are copied at each choice point in COPY mode.
+The size of the search is therefore the same for all rows, only the number of variables changes.
+
+Usage:
+    NUMBA_CACHE_DIR=.numba/cache python scripts/benchmark_choice_points.py [queen_nb]
+
+The first run may include JIT compilation time; subsequent runs use the cache.
+"""
+
+import sys
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from nucs.constants import (
+    CHOICE_POINTS_COPY,
+    CHOICE_POINTS_TRAIL,
+    STATS_LBL_SOLUTION_NB,
+    STATS_LBL_SOLVER_BACKTRACK_NB,
+    TRAIL_AUTO_CELL_NB,
+)
+from nucs.examples.queens.queens_problem import QueensProblem
+from nucs.solvers.backtrack_solver import BacktrackSolver
+
+EXTRA_VARIABLE_NBS = [0, 100, 1_000, 3_000, 10_000, 30_000, 100_000, 200_000]
+
+
+def queens_problem(queen_nb: int, extra_variable_nb: int) -> QueensProblem:
+    problem = QueensProblem(queen_nb)
+    problem.add_variables([queen_nb] * extra_variable_nb)
+    return problem
+
+
+def run(queen_nb: int, extra_variable_nb: int, choice_points: str) -> tuple[float, int, int, int]:
+    problem = queens_problem(queen_nb, extra_variable_nb)
+    solver = BacktrackSolver(
+        problem,
+        decision_variables=range(queen_nb),
+        stks_max_height=2 * queen_nb,  # the search is never deeper than the number of queens
+        choice_points=choice_points,
+        log_level="WARNING",
+    )
+    start = time.perf_counter()
+    solver.solve_all()
+    elapsed = time.perf_counter() - start
+    stats = solver.get_statistics_as_dictionary()
+    memory = solver.domains_stk.nbytes + solver.trail.nbytes
+    return elapsed, memory, stats[STATS_LBL_SOLUTION_NB], stats[STATS_LBL_SOLVER_BACKTRACK_NB]
+
+
+def main() -> None:
+    queen_nb = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    console = Console(width=140)
+    run(queen_nb, 0, CHOICE_POINTS_COPY)  # warms the JIT up
+    run(queen_nb, 0, CHOICE_POINTS_TRAIL)
+    table = Table(title=f"\nChoice points: COPY vs TRAIL on queens({queen_nb})", header_style="bold cyan")
+    table.add_column("Variables", justify="right")
+    table.add_column("Cells (variables × depth)", justify="right")
+    table.add_column("Backtracks", justify="right")
+    table.add_column("COPY (ms)", justify="right")
+    table.add_column("TRAIL (ms)", justify="right")
+    table.add_column("COPY (KB)", justify="right")
+    table.add_column("TRAIL (KB)", justify="right")
+    table.add_column("COPY/TRAIL", justify="right", style="yellow")
+    crossover: int | None = None
+    for extra_variable_nb in EXTRA_VARIABLE_NBS:
+        domain_nb = queen_nb + extra_variable_nb
+        copy_time, copy_memory, copy_solution_nb, backtrack_nb = run(queen_nb, extra_variable_nb, CHOICE_POINTS_COPY)
+        trail_time, trail_memory, trail_solution_nb, _ = run(queen_nb, extra_variable_nb, CHOICE_POINTS_TRAIL)
+        assert copy_solution_nb == trail_solution_nb
+        cell_nb = domain_nb * queen_nb
+        if crossover is None and trail_time < copy_time:
+            crossover = cell_nb
+        table.add_row(
+            f"{domain_nb:,}",
+            f"{cell_nb:,}",
+            f"{backtrack_nb:,}",
+            f"{copy_time * 1000:,.0f}",
+            f"{trail_time * 1000:,.0f}",
+            f"{copy_memory // 1024:,}",
+            f"{trail_memory // 1024:,}",
+            f"{copy_time / trail_time:.2f}",
+        )
+    console.print(table)
+    if crossover is None:
+        console.print("\nTRAIL never beats COPY on these sizes")
+    else:
+        console.print(f"\nTRAIL beats COPY from {crossover:,} cells on (AUTO trails from {TRAIL_AUTO_CELL_NB:,} cells)")
+
+
+if __name__ == "__main__":
+    main()
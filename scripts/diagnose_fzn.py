@@ -27,6 +27,7 @@ Usage::
     python scripts/diagnose_fzn.py model.mzn [data.dzn ...]   # flattens then analyzes
     python scripts/diagnose_fzn.py model.fzn                  # analyzes an existing FlatZinc
     python scripts/diagnose_fzn.py model.mzn data.dzn --solve --time-limit 30
+    python scripts/diagnose_fzn.py model.mzn data.dzn --solve --profile  # which propagators burn the time
 
 Run with the NuCS environment (so ``minizinc --solver nucs`` resolves and ``import nucs`` works).
 """
@@ -40,8 +41,18 @@ import sys
 import time
 from typing import List, Tuple
 
+import numpy as np
+
 import nucs
 from nucs.constants import (
+    PROFILE_IDX_CALL_NB,
+    PROFILE_IDX_ENTAILMENT_NB,
+    PROFILE_IDX_INCONSISTENCY_NB,
+    PROFILE_IDX_NO_CHANGE_NB,
+    PROFILE_IDX_REMOVED_VALUE_NB,
+    PROFILE_IDX_TIMED_CALL_NB,
+    PROFILE_IDX_TIMED_CALL_TIME,
+    PROFILE_TIMING_PERIOD,
     STATS_IDX_PROPAGATOR_FILTER_NB,
     STATS_IDX_SOLVER_BACKTRACK_NB,
 )
@@ -57,6 +68,9 @@ SHARE_DIR = os.path.join(os.path.dirname(nucs.__file__), "fzn", "share")
 # global that MiniZinc kept native rather than decomposing.
 _PRIMITIVE_PREFIXES = ("int_", "bool_", "float_", "set_", "array_")
 
+# the seconds given to a search past its deadline before it is hard-killed
+_DEADLINE_GRACE = 5
+
 
 def _flatten(mzn: str, data: List[str]) -> Tuple[str, float]:
     """Flattens a MiniZinc model with the NuCS solver, returning the FlatZinc text and the elapsed time."""
@@ -94,10 +108,12 @@ def _print_histogram(counter: "collections.Counter[str]", top: int) -> None:
         print(f"  {'':8}  ... and {remaining} more kinds")
 
 
-def _solve_worker(problem, model, queue) -> None:  # type: ignore[no-untyped-def]
+def _solve_worker(problem, model, profile, seconds, queue) -> None:  # type: ignore[no-untyped-def]
     """Solves to the first solution / optimum and reports stats on the queue. Run in a child process so it can
-    be hard-killed on timeout (the search runs in compiled code and ignores in-process signals)."""
-    solver = BacktrackSolver(problem, log_level="ERROR")
+    be hard-killed on timeout (the search runs in compiled code and ignores in-process signals). The search is
+    also given the timeout as a deadline, so that it usually stops by itself and still reports its stats."""
+    solver = BacktrackSolver(problem, log_level="ERROR", profile_propagators=profile)
+    solver.set_limits(deadline=time.monotonic_ns() + seconds * 1_000_000_000)
     if model.solve.kind in ("minimize", "maximize"):
         objective_var = model.var_index_of(model.solve.objective)
         solution = (
@@ -109,40 +125,80 @@ def _solve_worker(problem, model, queue) -> None:  # type: ignore[no-untyped-def
         solution = next(solver.solve(), None)
         status = "SATISFIABLE" if solution is not None else "UNSATISFIABLE"
         objective = None
+    if solver.limit_reached:
+        status = "TIMEOUT" if solution is None else "SATISFIABLE (optimality not proven)"
+    propagator_profiles, algorithm_profiles = solver.get_propagator_profile()
     queue.put(
         (
             status,
             objective,
             int(solver.statistics[STATS_IDX_SOLVER_BACKTRACK_NB]),
             int(solver.statistics[STATS_IDX_PROPAGATOR_FILTER_NB]),
+            propagator_profiles,
+            algorithm_profiles,
         )
     )
 
 
-def _solve_with_timeout(problem, model, seconds: int) -> None:  # type: ignore[no-untyped-def]
-    """Runs the solve in a forked child and hard-kills it after the timeout. With ``fork`` the child inherits
-    the built model and the warm JIT cache (no recompile); on timeout it is terminated, so no NuCS stats are
-    available -- the search was still running in compiled code."""
+def _estimated_time_ms(profiles: np.ndarray) -> np.ndarray:
+    """Extrapolates the time spent in the propagators from their timed calls, in milliseconds."""
+    timed_call_nb = np.maximum(profiles[:, PROFILE_IDX_TIMED_CALL_NB], 1)
+    return profiles[:, PROFILE_IDX_TIMED_CALL_TIME] * profiles[:, PROFILE_IDX_CALL_NB] / timed_call_nb / 1e6
+
+
+def _print_profile_rows(profiles: np.ndarray, names: List[str], top: int) -> None:
+    """Prints the counters of the profiles with the largest estimated times."""
+    times = _estimated_time_ms(profiles)
+    print(f"  {'time ms':>10}  {'calls':>10}  {'no change':>10}  {'fails':>8}  {'entailed':>8}  {'removed':>10}  name")
+    for idx in np.argsort(-times, kind="stable")[:top]:
+        if profiles[idx, PROFILE_IDX_CALL_NB] == 0:
+            break
+        print(
+            f"  {times[idx]:10.1f}  {profiles[idx, PROFILE_IDX_CALL_NB]:10d}"
+            f"  {profiles[idx, PROFILE_IDX_NO_CHANGE_NB]:10d}  {profiles[idx, PROFILE_IDX_INCONSISTENCY_NB]:8d}"
+            f"  {profiles[idx, PROFILE_IDX_ENTAILMENT_NB]:8d}  {profiles[idx, PROFILE_IDX_REMOVED_VALUE_NB]:10d}"
+            f"  {names[idx]}"
+        )
+
+
+def _print_profile(problem, propagator_profiles, algorithm_profiles, top: int) -> None:  # type: ignore[no-untyped-def]
+    """Prints the propagator profile, aggregated by ALG and for the hottest propagator instances."""
+    alg_names = [fct.__name__.replace("compute_domains_", "") for fct in COMPUTE_DOMAINS_FCTS]
+    print(f"\n== PROPAGATOR PROFILE (times extrapolated from 1 call in {PROFILE_TIMING_PERIOD}) ==")
+    print("  by ALG:")
+    _print_profile_rows(algorithm_profiles, alg_names, top)
+    print("  by propagator:")
+    names = [f"#{idx} {alg_names[alg]}/{len(variables)}" for idx, (variables, alg, _) in enumerate(problem.propagators)]
+    _print_profile_rows(propagator_profiles, names, top)
+
+
+def _solve_with_timeout(problem, model, seconds: int, profile: bool, top: int) -> None:  # type: ignore[no-untyped-def]
+    """Runs the solve in a forked child and hard-kills it if it overruns the timeout. With ``fork`` the child
+    inherits the built model and the warm JIT cache (no recompile); when it has to be terminated, no NuCS stats
+    are available -- the search was still running in compiled code."""
     ctx = mp.get_context("fork")
     queue = ctx.Queue()
-    process = ctx.Process(target=_solve_worker, args=(problem, model, queue))
+    process = ctx.Process(target=_solve_worker, args=(problem, model, profile, seconds, queue))
     start = time.perf_counter()
     process.start()
-    process.join(seconds)
+    # the grace period lets the search reach its deadline, which is only checked every few choices
+    process.join(seconds + _DEADLINE_GRACE)
     elapsed = time.perf_counter() - start
     if process.is_alive():
         process.terminate()
         process.join()
-        print(f"  status      : TIMEOUT (killed at {seconds}s)")
+        print(f"  status      : TIMEOUT (killed at {seconds + _DEADLINE_GRACE}s)")
         print(f"  solve time  : >{seconds}s (search still running in compiled code -- no stats)")
         return
-    status, objective, backtracks, filters = queue.get()
+    status, objective, backtracks, filters, propagator_profiles, algorithm_profiles = queue.get()
     print(f"  status      : {status}")
     if objective is not None:
         print(f"  objective   : {objective}")
     print(f"  solve time  : {elapsed:.3f}s")
     print(f"  backtracks  : {backtracks}")
     print(f"  filter calls: {filters}")
+    if profile:
+        _print_profile(problem, propagator_profiles, algorithm_profiles, top)
 
 
 def main() -> None:
@@ -151,6 +207,7 @@ def main() -> None:
     parser.add_argument("data", nargs="*", help="optional .dzn data files (only with a .mzn model)")
     parser.add_argument("--solve", action="store_true", help="also solve to the first solution / optimum")
     parser.add_argument("--time-limit", type=int, default=30, help="solve timeout in seconds (default 30)")
+    parser.add_argument("--profile", action="store_true", help="also profile the propagators during the solve")
     parser.add_argument("--top", type=int, default=15, help="how many histogram entries to show (default 15)")
     args = parser.parse_args()
 
@@ -187,7 +244,7 @@ def main() -> None:
 
     if args.solve:
         print(f"\n== SOLVE (first solution / optimum, timeout {args.time_limit}s) ==")
-        _solve_with_timeout(model.problem, model, args.time_limit)
+        _solve_with_timeout(model.problem, model, args.time_limit, args.profile, args.top)
 
 
 if __name__ == "__main__":
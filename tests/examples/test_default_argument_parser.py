@@ -14,15 +14,20 @@ from typing import Any
 
 import pytest
 
-from nucs.examples.default_argument_parser import DefaultArgumentParser, solver_kwargs_from_args
+from nucs.examples.default_argument_parser import DefaultArgumentParser, solver_from_args, solver_kwargs_from_args
+from nucs.examples.queens.queens_problem import QueensProblem
 from nucs.heuristics.heuristics import DOM_HEURISTIC_MIN_VALUE, DOM_HEURISTIC_SPLIT_LOW, VAR_HEURISTIC_SMALLEST_DOMAIN
+from nucs.solvers.backtrack_solver import BacktrackSolver
 from nucs.solvers.consistency_algorithms import CONSISTENCY_ALG_BC
+from nucs.solvers.multiprocessing_solver import MultiprocessingSolver
 
 
 class TestDefaultArgumentParser:
     @pytest.mark.parametrize(
         "args, expected_args",
         [
+            (["--backjumping"], {"backjumping": True}),
+            (["--choice-points", "TRAIL"], {"choice_points": "TRAIL"}),
             (["--consistency-algorithm", "BC"], {"consistency_algorithm": "BC"}),
             (["--cp-max-height", "512"], {"cp_max_height": 512}),
             (["--display-solutions"], {"display_solutions": True}),
@@ -32,6 +37,7 @@ class TestDefaultArgumentParser:
             (["--log-level", "INFO"], {"log_level": "INFO"}),
             (["--optimization-mode", "RESET"], {"optimization_mode": "RESET"}),
             (["--processors", "4"], {"processors": 4}),
+            (["--restart-policy", "LUBY"], {"restart_policy": "LUBY"}),
             (["--symmetry-breaking"], {"symmetry_breaking": True}),
             (["--var-heuristic", "SMALLEST_DOMAIN"], {"var_heuristic": "SMALLEST_DOMAIN"}),
         ],
@@ -57,3 +63,11 @@ class TestDefaultArgumentParser:
         args = parser.parse_args([])
         kwargs = solver_kwargs_from_args(args, dom_heuristic=DOM_HEURISTIC_SPLIT_LOW)
         assert kwargs == {"dom_heuristic": DOM_HEURISTIC_SPLIT_LOW}
+
+    def test_solver_from_args(self) -> None:
+        parser = DefaultArgumentParser()
+        assert isinstance(solver_from_args(QueensProblem(4), parser.parse_args([])), BacktrackSolver)
+        solver = solver_from_args(QueensProblem(4), parser.parse_args(["--processors", "8"]))
+        assert isinstance(solver, MultiprocessingSolver)
+        assert len(solver.problems) == 4  # never more sub-problems than values of the split variable
+        assert len(solver.find_all()) == 2
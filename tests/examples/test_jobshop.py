@@ -17,6 +17,7 @@ import pytest
 
 from nucs.examples.jobshop.jobshop_problem import JobShopProblem
 from nucs.solvers.backtrack_solver import BacktrackSolver
+from nucs.solvers.lns_solver import LnsSolver
 
 
 def _assert_valid_schedule(problem: JobShopProblem, solution) -> int:  # type: ignore[no-untyped-def]
@@ -88,3 +89,19 @@ class TestJobShop:
         solution = solver.minimize(problem.makespan)
         assert solution is not None
         assert solution[problem.makespan] == optimum
+
+    def test_jobshop_lns(self) -> None:
+        with open("datasets/examples/jobshop/mt10.json", "r") as json_file:
+            dataset = json.load(json_file)
+        problem = JobShopProblem(dataset["jobs"])
+        solver = LnsSolver(
+            problem,
+            neighborhoods=problem.recommended_neighborhoods(),
+            iteration_nb=20,
+            seed=0,
+            searches=problem.recommended_searches(),
+        )
+        solutions = list(solver.minimize_solutions(problem.makespan))
+        assert len(solutions) > 1
+        makespan = _assert_valid_schedule(problem, solutions[-1])
+        assert 930 <= makespan < solutions[0][problem.makespan]
@@ -36,7 +36,7 @@ class TestTSP:
         [
             ("gr17", 2085),
             ("gr21", 2707),
-            # ("gr24", 1272)
+            ("gr24", 1272),
         ],
     )
     def test_tsp_gr(self, name: str, minimum: int) -> None:
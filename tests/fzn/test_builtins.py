@@ -24,6 +24,7 @@ from nucs.heuristics.heuristics import (
     DOM_HEURISTIC_MID_VALUE,
     DOM_HEURISTIC_MIN_VALUE,
     DOM_HEURISTIC_SPLIT_HIGH,
+    VAR_HEURISTIC_DOM_WDEG,
     VAR_HEURISTIC_FIRST_NOT_INSTANTIATED,
     VAR_HEURISTIC_LARGEST_MAXIMAL_VALUE,
     VAR_HEURISTIC_SMALLEST_DOMAIN,
@@ -32,6 +33,7 @@ from nucs.heuristics.heuristics import (
 from nucs.propagators.propagators import (
     ALG_ADD_C_EQ,
     ALG_ALLDIFFERENT,
+    ALG_CIRCUIT_COST,
     ALG_COUNT_EQ,
     ALG_COUNT_EQ_C,
     ALG_COUNT_GEQ_C,
@@ -1261,6 +1263,29 @@ class TestBuiltins:
             assert len(model.problem.domains) == 3
             assert model.problem.propagators[1][2] == [offset]
 
+    def test_circuit_cost_maps_to_circuit_cost(self) -> None:
+        # the successors then the cost, the node offset leading the costs row by row
+        model = build_model(
+            parse(
+                "array [1..3] of var 1..3: x;\nvar 0..100: c;\n"
+                "constraint nucs_circuit_cost(x, [0, 1, 5, 5, 0, 1, 1, 5, 0], c, 1);\nsolve satisfy;"
+            )
+        )
+        assert [prop[1] for prop in model.problem.propagators] == [ALG_CIRCUIT_COST]
+        assert model.problem.propagators[0][2] == [1, 0, 1, 5, 5, 0, 1, 1, 5, 0]
+
+    def test_circuit_cost(self) -> None:
+        # the circuit_cost global posts the circuit and its cost: 1 -> 2 -> 3 -> 1 costs 3, 1 -> 3 -> 2 -> 1 costs 15
+        out = solve_fzn(
+            "var 1..3: a :: output_var;\nvar 1..3: b :: output_var;\nvar 1..3: c :: output_var;\n"
+            "var 0..100: cost :: output_var;\n"
+            "array [1..3] of var int: x = [a, b, c];\n"
+            "constraint nucs_circuit(x, 1);\n"
+            "constraint nucs_circuit_cost(x, [0, 1, 5, 5, 0, 1, 1, 5, 0], cost, 1);\n"
+            "solve minimize cost;"
+        )
+        assert "a = 2;\nb = 3;\nc = 1;\ncost = 3;" in out
+
     def test_seq_search_annotation(self) -> None:
         # seq_search nests int_search/bool_search calls inside an array: the parser must accept call terms
         # and the runner must flatten the nested searches into a single decision order.
@@ -1505,10 +1530,10 @@ class TestBuiltins:
         assert args.output_objective is True
 
     def test_a_time_limit_streams_so_the_incumbent_survives(self) -> None:
-        # A deadline is noticed only between solutions -- a descent runs in compiled code nothing can
-        # interrupt -- so under a time limit the best solution found so far has to be on the stream already,
-        # or MiniZinc's kill loses it. A generous limit still proves optimality here; what matters is that
-        # the improving solutions were printed on the way.
+        # A deadline is only checked every LIMIT_DEADLINE_PERIOD choices, so the search can be late and under
+        # a time limit the best solution found so far has to be on the stream already, or MiniZinc's kill
+        # loses it. A generous limit still proves optimality here; what matters is that the improving
+        # solutions were printed on the way.
         out = solve_fzn(self.OPTIMIZATION_MODEL, output_objective=True, time_limit_ms=600_000)
         objectives = [int(line.split("=")[1].strip(" ;")) for line in out.splitlines() if "_objective" in line]
         assert len(objectives) > 1
@@ -1520,6 +1545,14 @@ class TestBuiltins:
         out = solve_fzn("var 0..9: x :: output_var;\nsolve satisfy;", time_limit_ms=0)
         assert out.strip() in ("=====UNKNOWN=====", "x = 0;\n----------")
 
+    def test_time_limit_interrupts_a_descent(self) -> None:
+        # ten pigeons in nine holes: bound consistency on int_ne cannot prove the infeasibility before a very
+        # long search, which the deadline interrupts from inside the descent
+        lines = [f"var 1..9: x{i} :: output_var;" for i in range(10)]
+        lines += [f"constraint int_ne(x{i}, x{j});" for i in range(10) for j in range(i + 1, 10)]
+        out = solve_fzn("\n".join([*lines, "solve satisfy;"]), time_limit_ms=100)
+        assert out.strip() == "=====UNKNOWN====="
+
     def test_cli_parses_time_limit(self) -> None:
         from nucs.fzn.__main__ import build_arg_parser
 
@@ -1561,13 +1594,19 @@ class TestBuiltins:
 
     def test_search_heuristics_unknown_selectors_fall_back(self) -> None:
         model = build_model(
-            parse("var 0..3: x;\nsolve :: int_search([x], dom_w_deg, indomain_median, complete) satisfy;")
+            parse("var 0..3: x;\nsolve :: int_search([x], occurrence, indomain_median, complete) satisfy;")
         )
         result = search_heuristics(model)
         assert result
-        assert result[0].var_heuristic == VAR_HEURISTIC_FIRST_NOT_INSTANTIATED  # 'dom_w_deg' has no NuCS equivalent
+        assert result[0].var_heuristic == VAR_HEURISTIC_FIRST_NOT_INSTANTIATED  # 'occurrence' has no NuCS equivalent
         assert result[0].dom_heuristic == DOM_HEURISTIC_MID_VALUE
 
+    def test_search_heuristics_maps_dom_w_deg(self) -> None:
+        model = build_model(parse("var 0..3: x;\nsolve :: int_search([x], dom_w_deg, indomain_min, complete) satisfy;"))
+        result = search_heuristics(model)
+        assert result
+        assert result[0].var_heuristic == VAR_HEURISTIC_DOM_WDEG
+
     def test_search_heuristics_maps_smallest_and_largest(self) -> None:
         smallest = build_model(
             parse("var 0..3: x;\nsolve :: int_search([x], smallest, indomain_min, complete) satisfy;")
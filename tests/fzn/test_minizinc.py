@@ -252,6 +252,18 @@ def test_circuit_non_one_based_index_with_wide_domain(tmp_path) -> None:  # type
     assert "c = [2: 3, 3: 4, 4: 5, 5: 2];" in out
 
 
+def test_circuit_cost_stays_native(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    """circuit_cost is a NuCS global, included explicitly: the circuit and its cost both reach NuCS natively,
+    the cost matrix row by row and the node numbering as the offset."""
+    fzn = _compile_to_fzn(
+        'include "circuit_cost.mzn";\narray[0..2] of var 0..2: x;\nvar 0..100: c;\n'
+        "constraint circuit_cost(x, array2d(0..2, 0..2, [0, 1, 5, 5, 0, 1, 1, 5, 0]), c);",
+        tmp_path,
+    )
+    assert "constraint nucs_circuit(" in fzn
+    assert "constraint nucs_circuit_cost(" in fzn
+
+
 def test_subcircuit_non_one_based_index_with_wide_domain(tmp_path) -> None:  # type: ignore[no-untyped-def]
     """subcircuit over an index set 2..5 with a wide declared domain: like circuit, successor values are
     rebased to the node set, so self-loops and the sub-circuit stay within 2..5."""
@@ -0,0 +1,77 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+
+from nucs.constants import MAX, MIN
+from nucs.heuristics.dom_wdeg_var_heuristic import dom_wdeg_var_heuristic
+from nucs.heuristics.heuristics import (
+    VAR_HEURISTIC_CRITICAL_RESOURCE,
+    VAR_HEURISTIC_DOM_WDEG,
+    VAR_HEURISTIC_FIRST_NOT_INSTANTIATED,
+    VAR_HEURISTIC_SMALLEST_MINIMAL_VALUE,
+)
+from nucs.problems.problem import Problem
+from nucs.propagators.propagators import ALG_LINEAR_LEQ_C
+from nucs.solvers.propagator_weights import bump_propagator_weights, get_weighted_var_heuristic_params
+
+
+def _domains_stk(domains, top=0, height=2):  # type: ignore[no-untyped-def]
+    stk = np.zeros((height, len(domains), 2), dtype=np.int32)
+    for i, (lo, hi) in enumerate(domains):
+        stk[top, i, MIN] = lo
+        stk[top, i, MAX] = hi
+    return stk
+
+
+def _params(propagator_variables, domain_nb):  # type: ignore[no-untyped-def]
+    problem = Problem([(0, 9)] * domain_nb)
+    for variables in propagator_variables:
+        problem.add_propagator(ALG_LINEAR_LEQ_C, variables, [1] * len(variables) + [9])
+    problem.init()
+    return get_weighted_var_heuristic_params(
+        problem.propagator_nb, problem.domain_nb, problem.bounds, problem.propagator_variables
+    )
+
+
+class TestDomWdegVarHeuristic:
+    def test_selects_largest_degree_without_failure(self) -> None:
+        params = _params([[0, 1], [1, 2]], 3)
+        stk = _domains_stk([(0, 3), (0, 3), (0, 3)])
+        variables = np.array([0, 1, 2], dtype=np.uint32)
+        assert dom_wdeg_var_heuristic(variables, stk, 0, params) == 1  # variable 1 has 2 propagators
+
+    def test_selects_largest_weighted_degree(self) -> None:
+        params = _params([[0, 1], [1, 2]], 3)
+        for _ in range(3):
+            bump_propagator_weights(params[0, 1:], 2, 1)
+        stk = _domains_stk([(0, 3), (0, 3), (0, 3)])
+        variables = np.array([0, 2], dtype=np.uint32)
+        assert dom_wdeg_var_heuristic(variables, stk, 0, params) == 2  # the propagator of 2 has failed
+
+    def test_divides_by_domain_size(self) -> None:
+        params = _params([[0, 1], [1, 2]], 3)
+        stk = _domains_stk([(0, 1), (0, 9), (0, 3)])
+        variables = np.array([0, 1, 2], dtype=np.uint32)
+        assert dom_wdeg_var_heuristic(variables, stk, 0, params) == 0
+
+    def test_returns_minus_one_when_all_instantiated(self) -> None:
+        params = _params([[0, 1]], 2)
+        stk = _domains_stk([(3, 3), (7, 7)])
+        variables = np.array([0, 1], dtype=np.uint32)
+        assert dom_wdeg_var_heuristic(variables, stk, 0, params) == -1
+
+    def test_registration_keeps_the_original_indices(self) -> None:
+        assert VAR_HEURISTIC_CRITICAL_RESOURCE == 0
+        assert VAR_HEURISTIC_FIRST_NOT_INSTANTIATED == 1
+        assert VAR_HEURISTIC_SMALLEST_MINIMAL_VALUE == 7
+        assert VAR_HEURISTIC_DOM_WDEG > VAR_HEURISTIC_SMALLEST_MINIMAL_VALUE
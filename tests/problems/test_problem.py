@@ -10,7 +10,12 @@
 #
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
-from nucs.problems.problem import Problem
+import numpy as np
+import pytest
+
+from nucs.constants import RANGE_START, STATE
+from nucs.problems.problem import Problem, insert_triggers, remove_triggers
+from nucs.propagators.propagators import ALG_ALLDIFFERENT, ALG_DUMMY, ALG_LINEAR_LEQ_C, ALG_SUM_EQ
 
 
 class TestProblem:
@@ -38,3 +43,157 @@ class TestProblem:
         assert problems[5].domains[0] == (9, 9)
         assert problems[6].domains[0] == (10, 10)
         assert problems[7].domains[0] == (11, 11)
+
+    def test_init_deltas(self) -> None:
+        problem = Problem([(0, 20)] * 17)
+        problem.add_propagator(ALG_LINEAR_LEQ_C, [16, 0], [1, 1, 5])
+        problem.add_propagator(ALG_ALLDIFFERENT, range(17))
+        problem.add_propagator(ALG_SUM_EQ, range(17))
+        problem.init()
+        # the small linear propagator rescans, alldifferent is not incremental
+        assert problem.incremental_propagators.tolist() == [0, 0, 1]
+        # the (state start, arity, position) occurrences of the incremental propagators, grouped by variable
+        state_start = problem.bounds[2, STATE, RANGE_START]
+        assert problem.deltas.tolist() == [value for position in range(17) for value in (state_start, 17, position)]
+        assert problem.deltas_offsets.tolist() == list(range(18))
+
+    @staticmethod
+    def build(init_nb: int) -> Problem:
+        problem = Problem([(0, 20)] * 17)
+        propagators = [
+            (ALG_LINEAR_LEQ_C, [16, 0], [1, 1, 5]),
+            (ALG_ALLDIFFERENT, list(range(17)), []),
+            (ALG_SUM_EQ, list(range(17)), []),
+            (ALG_LINEAR_LEQ_C, [3, 4, 5], [1, 2, 3, 12]),
+        ]
+        for algorithm, variables, parameters in propagators[:init_nb]:
+            problem.add_propagator(algorithm, variables, parameters)
+        problem.init()
+        for algorithm, variables, parameters in propagators[init_nb:]:
+            problem.add_propagator(algorithm, variables, parameters)
+        return problem
+
+    @staticmethod
+    def trigger_sets(problem: Problem) -> list[set[int]]:
+        offsets = problem.triggers_offsets
+        return [set(problem.triggers[offsets[i] : offsets[i + 1]].tolist()) for i in range(len(offsets) - 1)]
+
+    @pytest.mark.parametrize("init_nb", [0, 1, 2, 3])
+    def test_update(self, init_nb: int) -> None:
+        problem = self.build(init_nb)
+        problem.update()
+        expected = self.build(4)
+        assert problem.algorithms.tolist() == expected.algorithms.tolist()
+        assert problem.priorities.tolist() == expected.priorities.tolist()
+        assert problem.bounds.tolist() == expected.bounds.tolist()
+        assert problem.propagator_variables.tolist() == expected.propagator_variables.tolist()
+        assert problem.propagator_parameters.tolist() == expected.propagator_parameters.tolist()
+        assert self.trigger_sets(problem) == self.trigger_sets(expected)
+        assert problem.incremental_propagators.tolist() == expected.incremental_propagators.tolist()
+        assert problem.deltas.tolist() == expected.deltas.tolist()
+        assert problem.deltas_offsets.tolist() == expected.deltas_offsets.tolist()
+
+    def test_update_new_variable(self) -> None:
+        problem = self.build(4)
+        problem.add_variable((0, 1))
+        problem.add_propagator(ALG_LINEAR_LEQ_C, [17, 0], [1, 1, 5])
+        with pytest.raises(ValueError):
+            problem.update()
+
+    def test_remove_propagator(self) -> None:
+        problem = self.build(4)
+        problem.remove_propagator(2)
+        assert problem.algorithms[2] == ALG_DUMMY
+        assert 2 not in problem.triggers.tolist()
+        assert problem.incremental_propagators.tolist() == [0, 0, 0, 0]
+        assert problem.deltas.tolist() == []
+        # the triggers of the other propagators are unchanged
+        expected = self.build(4)
+        assert [triggers - {2} for triggers in self.trigger_sets(expected)] == self.trigger_sets(problem)
+
+    def test_remove_propagator_before_init(self) -> None:
+        problem = self.build(1)
+        problem.remove_propagator(2)
+        problem.update()
+        assert problem.algorithms.tolist() == [ALG_LINEAR_LEQ_C, ALG_ALLDIFFERENT, ALG_DUMMY, ALG_LINEAR_LEQ_C]
+        assert 2 not in problem.triggers.tolist()
+
+    def test_insert_triggers(self) -> None:
+        triggers = np.array([0, 1, 2], dtype=np.int32)
+        offsets = np.array([0, 2, 2, 3], dtype=np.int32)
+        counts = np.array([[1], [2], [0]], dtype=np.int32)
+        new_triggers, new_offsets, cursors = insert_triggers(triggers, offsets, counts)
+        assert new_offsets.tolist() == [0, 3, 5, 6]
+        assert cursors.tolist() == [2, 3, 6]
+        assert new_triggers[[0, 1, 5]].tolist() == [0, 1, 2]
+
+    def test_remove_triggers(self) -> None:
+        triggers = np.array([0, 1, 1, 2, 1], dtype=np.int32)
+        offsets = np.array([0, 2, 2, 4, 5], dtype=np.int32)
+        new_triggers, new_offsets = remove_triggers(triggers, offsets, 1)
+        assert new_triggers.tolist() == [0, 2]
+        assert new_offsets.tolist() == [0, 1, 1, 2, 2]
+
+    @staticmethod
+    def assert_same_arrays(problem: Problem, expected: Problem) -> None:
+        assert problem.algorithms.tolist() == expected.algorithms.tolist()
+        assert problem.priorities.tolist() == expected.priorities.tolist()
+        assert problem.bounds.tolist() == expected.bounds.tolist()
+        assert problem.propagator_variables.tolist() == expected.propagator_variables.tolist()
+        assert problem.propagator_parameters.tolist() == expected.propagator_parameters.tolist()
+        assert problem.triggers.tolist() == expected.triggers.tolist()
+        assert problem.triggers_offsets.tolist() == expected.triggers_offsets.tolist()
+        assert problem.incremental_propagators.tolist() == expected.incremental_propagators.tolist()
+        assert problem.deltas.tolist() == expected.deltas.tolist()
+
+    def test_add_propagators(self) -> None:
+        problem = Problem([(0, 20)] * 17)
+        problem.add_propagator(ALG_ALLDIFFERENT, range(17))
+        problem.add_propagators(ALG_LINEAR_LEQ_C, [[16, 0], [1, 2], [3, 4]], [[1, 1, 5], [1, 2, 5], [1, 1, 5]])
+        problem.add_propagator(ALG_SUM_EQ, range(17))
+        problem.add_propagators(ALG_ALLDIFFERENT, np.arange(16).reshape(2, 8))
+        problem.init()
+        expected = Problem([(0, 20)] * 17)
+        expected.add_propagator(ALG_ALLDIFFERENT, range(17))
+        expected.add_propagator(ALG_LINEAR_LEQ_C, [16, 0], [1, 1, 5])
+        expected.add_propagator(ALG_LINEAR_LEQ_C, [1, 2], [1, 2, 5])
+        expected.add_propagator(ALG_LINEAR_LEQ_C, [3, 4], [1, 1, 5])
+        expected.add_propagator(ALG_SUM_EQ, range(17))
+        expected.add_propagator(ALG_ALLDIFFERENT, range(8))
+        expected.add_propagator(ALG_ALLDIFFERENT, range(8, 16))
+        expected.init()
+        assert problem.propagator_nb == 7
+        self.assert_same_arrays(problem, expected)
+
+    def test_add_propagators_invalid(self) -> None:
+        problem = Problem([(0, 20)] * 3)
+        with pytest.raises(ValueError):
+            problem.add_propagators(ALG_SUM_EQ, [0, 1, 2])
+        with pytest.raises(ValueError):
+            problem.add_propagators(ALG_LINEAR_LEQ_C, [[0, 1], [1, 2]], [[1, 1, 5]])
+
+    def test_update_add_propagators(self) -> None:
+        problem = Problem([(0, 20)] * 17)
+        problem.add_propagator(ALG_ALLDIFFERENT, range(17))
+        problem.add_propagators(ALG_LINEAR_LEQ_C, [[16, 0], [1, 2]], [[1, 1, 5], [1, 2, 5]])
+        problem.init()
+        problem.add_propagators(ALG_LINEAR_LEQ_C, [[3, 4]], [[1, 1, 5]])
+        problem.add_propagator(ALG_SUM_EQ, range(17))
+        problem.update()
+        expected = Problem([(0, 20)] * 17)
+        expected.add_propagator(ALG_ALLDIFFERENT, range(17))
+        expected.add_propagators(ALG_LINEAR_LEQ_C, [[16, 0], [1, 2], [3, 4]], [[1, 1, 5], [1, 2, 5], [1, 1, 5]])
+        expected.add_propagator(ALG_SUM_EQ, range(17))
+        expected.init()
+        self.assert_same_arrays(problem, expected)
+
+    def test_remove_batch_propagator(self) -> None:
+        problem = Problem([(0, 20)] * 17)
+        problem.add_propagator(ALG_ALLDIFFERENT, range(17))
+        problem.add_propagators(ALG_LINEAR_LEQ_C, [[16, 0], [1, 2]], [[1, 1, 5], [1, 2, 5]])
+        problem.add_propagator(ALG_SUM_EQ, range(17))
+        problem.remove_propagator(2)
+        problem.remove_propagator(3)
+        problem.init()
+        assert problem.algorithms.tolist() == [ALG_ALLDIFFERENT, ALG_LINEAR_LEQ_C, ALG_DUMMY, ALG_DUMMY]
+        assert not {2, 3} & set(problem.triggers.tolist())
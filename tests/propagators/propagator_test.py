@@ -13,6 +13,19 @@
 from collections.abc import Callable
 
 import numpy as np
+from numpy.typing import NDArray
+
+from nucs.constants import DELTA_IDX_NB, DELTA_IDX_WARM, MAX, MIN, PROP_CONSISTENCY, PROP_INCONSISTENCY
+from nucs.propagators.deltas import append_delta, rebuild_delta
+from nucs.propagators.propagators import COMPUTE_DOMAINS_FCTS, GET_STATE_SIZE_FCTS
+
+
+def cold_state(compute_domains_fct: Callable, n: int, parameters: list[int]) -> NDArray:
+    """
+    Returns a cold state for a propagator, empty for a stateless propagator.
+    """
+    get_state_size_fct = GET_STATE_SIZE_FCTS[COMPUTE_DOMAINS_FCTS.index(compute_domains_fct)]
+    return np.zeros(0 if get_state_size_fct is None else get_state_size_fct(n, parameters), dtype=np.int32)
 
 
 class PropagatorTest:
@@ -27,6 +40,51 @@ class PropagatorTest:
         domains_arr = np.array(
             [(domain, domain) if isinstance(domain, int) else domain for domain in domains], dtype=np.int32
         )
-        assert compute_domains_fct(domains_arr, np.array(parameters, dtype=np.int32)) == consistency_result
+        state = cold_state(compute_domains_fct, len(domains_arr), parameters)
+        assert compute_domains_fct(domains_arr, np.array(parameters, dtype=np.int32), state) == consistency_result
         if expected_domains:
             assert np.all(domains_arr == np.array(expected_domains))
+
+    def assert_incremental(
+        self, compute_domains_fct: Callable, domains: list[tuple[int, int]], parameters: list[int], seed: int
+    ) -> None:
+        """
+        Narrows random domains as the consistency algorithm would between the calls of an incremental propagator,
+        goes back to previous domains as a backtrack would, and checks that each warm call behaves as a cold call.
+        """
+        rng = np.random.default_rng(seed)
+        domains_arr = np.array(domains, dtype=np.int32)
+        parameters_arr = np.array(parameters, dtype=np.int32)
+        n = len(domains_arr)
+        state = cold_state(compute_domains_fct, n, parameters)
+        history = [domains_arr.copy()]
+        for _ in range(8 * n):
+            input_domains = domains_arr.copy()
+            expected_domains = domains_arr.copy()
+            expected_result = compute_domains_fct(
+                expected_domains, parameters_arr, cold_state(compute_domains_fct, n, parameters)
+            )
+            if state[DELTA_IDX_WARM] != 0 and state[DELTA_IDX_NB] > n:
+                # the delta has overflowed
+                rebuild_delta(state, domains_arr)
+            assert compute_domains_fct(domains_arr, parameters_arr, state) == expected_result
+            state[DELTA_IDX_WARM] = 1
+            state[DELTA_IDX_NB] = 0
+            if expected_result != PROP_INCONSISTENCY:
+                assert np.all(domains_arr == expected_domains)
+                for position in np.flatnonzero(np.any(domains_arr != input_domains, axis=1)):
+                    append_delta(state, 0, n, int(position))
+                history.append(domains_arr.copy())
+            unfixed_positions = np.flatnonzero(domains_arr[:, MIN] < domains_arr[:, MAX])
+            if expected_result != PROP_CONSISTENCY or len(unfixed_positions) == 0 or rng.integers(4) == 0:
+                # a backtrack: the delta is rebuilt from the snapshot
+                domains_arr = history[rng.integers(len(history))].copy()
+                rebuild_delta(state, domains_arr)
+                continue
+            narrowed_nb = rng.integers(1, len(unfixed_positions) + 1)
+            for position in rng.choice(unfixed_positions, size=narrowed_nb, replace=False):
+                if rng.integers(2) == 0:
+                    domains_arr[position, MIN] += 1
+                else:
+                    domains_arr[position, MAX] -= 1
+                append_delta(state, 0, n, position)
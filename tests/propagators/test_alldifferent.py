@@ -11,11 +11,19 @@
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
 
+import random
+
 import numpy as np
 import pytest
 
-from nucs.constants import PROP_CONSISTENCY
-from nucs.propagators.alldifferent_propagator import compute_domains_alldifferent, path_max, path_min, path_set
+from nucs.constants import PROP_CONSISTENCY, PROP_INCONSISTENCY
+from nucs.propagators.alldifferent_propagator import (
+    compute_domains_alldifferent,
+    get_state_size_alldifferent,
+    path_max,
+    path_min,
+    path_set,
+)
 from tests.propagators.propagator_test import PropagatorTest
 
 
@@ -64,3 +72,34 @@ class TestAlldifferent(PropagatorTest):
         self.assert_compute_domains(
             compute_domains_alldifferent, domains, parameters, consistency_result, expected_domains
         )
+
+    def test_state_is_reused_from_any_node(self) -> None:
+        """The permutations kept in the state, as from the nodes of a search tree visited in any order, must give the
+        same result as a cold computation."""
+        rng = random.Random(20261017)
+        for _ in range(200):
+            n = rng.randint(1, 8)
+            parameters = np.array([], dtype=np.int32)
+            state = np.zeros(get_state_size_alldifferent(n, parameters), dtype=np.int32)
+            for _ in range(10):
+                doms = [sorted((rng.randint(0, 9), rng.randint(0, 9))) for _ in range(n)]
+                warm = np.array(doms, dtype=np.int32)
+                cold = np.array(doms, dtype=np.int32)
+                status = compute_domains_alldifferent(warm, parameters, state)
+                assert status == compute_domains_alldifferent(cold, parameters, np.zeros(len(state), dtype=np.int32))
+                if status != PROP_INCONSISTENCY:
+                    assert warm.tolist() == cold.tolist()
+
+    def test_state_is_reused_at_large_arity(self) -> None:
+        """Above SORT_MAX_N, a warm permutation far from sorted (here reversed) falls back to a full sort and must
+        give the same result as a cold computation."""
+        n = 200
+        parameters = np.array([], dtype=np.int32)
+        state = np.zeros(get_state_size_alldifferent(n, parameters), dtype=np.int32)
+        compute_domains_alldifferent(np.array([[i, n] for i in range(n)], dtype=np.int32), parameters, state)
+        doms = [[n - 1 - i, 2 * n] for i in range(n)]
+        warm = np.array(doms, dtype=np.int32)
+        cold = np.array(doms, dtype=np.int32)
+        status = compute_domains_alldifferent(warm, parameters, state)
+        assert status == compute_domains_alldifferent(cold, parameters, np.zeros(len(state), dtype=np.int32))
+        assert warm.tolist() == cold.tolist()
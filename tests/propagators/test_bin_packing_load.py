@@ -19,7 +19,7 @@ import pytest
 
 from nucs.constants import MAX, MIN, PROP_CONSISTENCY, PROP_INCONSISTENCY
 from nucs.propagators.bin_packing_load_propagator import compute_domains_bin_packing_load
-from tests.propagators.propagator_test import PropagatorTest
+from tests.propagators.propagator_test import PropagatorTest, cold_state
 
 
 def _pair(a: int, b: int) -> tuple[int, int]:
@@ -86,6 +86,14 @@ class TestBinPackingLoad(PropagatorTest):
             ([(4, 4), (0, 100), (1, 2), (1, 2)], [1, 5, 5], PROP_INCONSISTENCY, None),
             # item fixed to bin 1 forces load 5 but that load is capped at 3 -> inconsistency
             ([(0, 3), (0, 100), (1, 1)], [1, 5], PROP_INCONSISTENCY, None),
+            # no-sum load tightening across the words of the bitset: subsets of {100, 100, 70} only reach 0, 70,
+            # 100, 170, 200 and 270, so [101, 199] collapses to [170, 170], which needs the weight-70 item
+            (
+                [(101, 199), (0, 1000), (1, 2), (1, 2), (1, 2)],
+                [1, 100, 100, 70],
+                PROP_CONSISTENCY,
+                [[170, 170], [100, 100], [1, 2], [1, 2], [1, 1]],
+            ),
             # already tight and consistent -> no change
             (
                 [(8, 8), (2, 2), (1, 1), (2, 2), (1, 1)],
@@ -106,20 +114,23 @@ class TestBinPackingLoad(PropagatorTest):
             compute_domains_bin_packing_load, domains, parameters, consistency_result, expected_domains
         )
 
-    def test_soundness_against_brute_force(self) -> None:
+    @pytest.mark.parametrize("scale", [1, 997])
+    def test_soundness_against_brute_force(self, scale: int) -> None:
         """Fuzz: the propagator must never drop a value that appears in some solution, nor report
         inconsistency when a solution exists (checked against exhaustive enumeration)."""
         rng = random.Random(20260814)
         for _ in range(4000):
             bin_nb = rng.randint(1, 3)
             item_nb = rng.randint(1, 5)
-            weights = [rng.randint(1, 4) for _ in range(item_nb)]
+            # scaled weights spread the sums over many words of the bitsets
+            weights = [scale * rng.randint(1, 4) + rng.randint(0, scale - 1) for _ in range(item_nb)]
             total = sum(weights)
             load_doms = [_pair(rng.randint(0, total), rng.randint(0, total)) for _ in range(bin_nb)]
             bin_doms = [_pair(rng.randint(1, bin_nb), rng.randint(1, bin_nb)) for _ in range(item_nb)]
             solutions = _brute_solutions(weights, load_doms, bin_doms)
             arr = np.array(list(load_doms) + list(bin_doms), dtype=np.int32)
-            status = compute_domains_bin_packing_load(arr, np.array([1, *weights], dtype=np.int32))
+            state = cold_state(compute_domains_bin_packing_load, len(arr), [1, *weights])
+            status = compute_domains_bin_packing_load(arr, np.array([1, *weights], dtype=np.int32), state)
             # only soundness is asserted: with no solution the propagator may or may not detect it (the exact
             # subset-sum reasoning is complete within its budget but the budget can be exceeded)
             if solutions:
@@ -128,3 +139,32 @@ class TestBinPackingLoad(PropagatorTest):
                     lo = min(sol[var] for sol in solutions)
                     hi = max(sol[var] for sol in solutions)
                     assert arr[var][MIN] <= lo and arr[var][MAX] >= hi, (weights, load_doms, bin_doms, var)
+
+    def test_warm_state(self) -> None:
+        # the reachabilities kept by the state from a call to the next must not change the filtering
+        rng = random.Random(20261017)
+        for _ in range(500):
+            bin_nb = rng.randint(1, 4)
+            item_nb = rng.randint(1, 12)
+            weights = [rng.randint(1, 300) for _ in range(item_nb)]
+            total = sum(weights)
+            parameters = np.array([1, *weights], dtype=np.int32)
+            domains = np.array(
+                [_pair(rng.randint(0, total), rng.randint(0, total)) for _ in range(bin_nb)]
+                + [_pair(rng.randint(1, bin_nb), rng.randint(1, bin_nb)) for _ in range(item_nb)],
+                dtype=np.int32,
+            )
+            state = cold_state(compute_domains_bin_packing_load, len(domains), parameters.tolist())
+            for _ in range(5):
+                cold_domains = domains.copy()
+                cold_result = compute_domains_bin_packing_load(
+                    cold_domains,
+                    parameters,
+                    cold_state(compute_domains_bin_packing_load, len(domains), parameters.tolist()),
+                )
+                assert compute_domains_bin_packing_load(domains, parameters, state) == cold_result
+                if cold_result == PROP_INCONSISTENCY:
+                    break
+                assert domains.tolist() == cold_domains.tolist()
+                i = bin_nb + rng.randrange(item_nb)
+                domains[i, MIN] = rng.randint(domains[i, MIN], domains[i, MAX])
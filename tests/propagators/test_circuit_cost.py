@@ -0,0 +1,166 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from nucs.constants import MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+from nucs.problems.circuit_problem import CircuitProblem
+from nucs.propagators.circuit_cost_propagator import compute_domains_circuit_cost
+from nucs.propagators.propagators import ALG_CIRCUIT_COST
+from nucs.solvers.backtrack_solver import BacktrackSolver
+from tests.propagators.propagator_test import PropagatorTest, cold_state
+
+
+def _pair(a: int, b: int) -> tuple[int, int]:
+    return (a, b) if a <= b else (b, a)
+
+
+def _brute_solutions(costs: list[list[int]], offset: int, domains: list[tuple[int, int]]) -> list[list[int]]:
+    """Enumerates the circuits fitting the successor domains whose cost fits the cost domain."""
+    n = len(costs)
+    solutions = []
+    for perm in itertools.permutations(range(n)):
+        if not all(domains[i][0] <= perm[i] + offset <= domains[i][1] for i in range(n)):
+            continue
+        node, length = 0, 0
+        while True:
+            node, length = perm[node], length + 1
+            if node == 0:
+                break
+        cost = sum(costs[i][perm[i]] for i in range(n))
+        if length == n and domains[n][0] <= cost <= domains[n][1]:
+            solutions.append([j + offset for j in perm] + [cost])
+    return solutions
+
+
+def _random_instance(rng: random.Random) -> tuple[list[list[int]], int, list[tuple[int, int]]]:
+    n = rng.randint(1, 6)
+    offset = rng.randint(-1, 2)
+    costs = [[rng.randint(0, 20) for _ in range(n)] for _ in range(n)]
+    domains = [_pair(rng.randint(offset - 1, offset + n), rng.randint(offset - 1, offset + n)) for _ in range(n)]
+    domains.append(_pair(rng.randint(0, 100), rng.randint(0, 100)))
+    return costs, offset, domains
+
+
+class TestCircuitCost(PropagatorTest):
+    # domains = [succ_0, ..., succ_{n-1}, cost]; parameters = [offset, costs row by row]
+    @pytest.mark.parametrize(
+        "domains,parameters,consistency_result,expected_domains",
+        [
+            # the cheapest assignment, the circuit 0 -> 1 -> 2 -> 0, costs 3 and the most expensive arcs sum up to 15;
+            # the self-loops at the bounds of the successors are removed
+            (
+                [(0, 2), (0, 2), (0, 2), (0, 100)],
+                [0, 0, 1, 5, 5, 0, 1, 1, 5, 0],
+                PROP_CONSISTENCY,
+                [[1, 2], [0, 2], [0, 1], [3, 15]],
+            ),
+            # a cost of at most 8 leaves no slack for the arcs of cost 9: the circuit, hence its cost, is fixed
+            (
+                [(0, 2), (0, 2), (0, 2), (0, 8)],
+                [0, 0, 1, 9, 9, 0, 1, 1, 9, 0],
+                PROP_ENTAILMENT,
+                [[1, 1], [2, 2], [0, 0], [3, 3]],
+            ),
+            # the same with 1-based node labels
+            (
+                [(1, 3), (1, 3), (1, 3), (0, 8)],
+                [1, 0, 1, 9, 9, 0, 1, 1, 9, 0],
+                PROP_ENTAILMENT,
+                [[2, 2], [3, 3], [1, 1], [3, 3]],
+            ),
+            # the assignment bound exceeds the upper bound of the cost
+            ([(0, 2), (0, 2), (0, 2), (0, 2)], [0, 0, 1, 5, 5, 0, 1, 1, 5, 0], PROP_INCONSISTENCY, None),
+            # node 0 can only be its own successor
+            ([(0, 0), (0, 2), (0, 2), (0, 100)], [0, 0, 1, 5, 5, 0, 1, 1, 5, 0], PROP_INCONSISTENCY, None),
+            # nodes 0 and 1 can only go to node 2: no assignment
+            ([(2, 2), (2, 2), (0, 1), (0, 100)], [0, 0, 1, 5, 5, 0, 1, 1, 5, 0], PROP_INCONSISTENCY, None),
+            # all the successors are fixed: the cost is the cost of the circuit
+            (
+                [(2, 2), (0, 0), (1, 1), (0, 100)],
+                [0, 0, 1, 5, 5, 0, 1, 1, 5, 0],
+                PROP_ENTAILMENT,
+                [[2, 2], [0, 0], [1, 1], [15, 15]],
+            ),
+        ],
+    )
+    def test_compute_domains(
+        self,
+        domains: list[int | tuple[int, int]],
+        parameters: list[int],
+        consistency_result: int,
+        expected_domains: list[list[int]] | None,
+    ) -> None:
+        self.assert_compute_domains(
+            compute_domains_circuit_cost, domains, parameters, consistency_result, expected_domains
+        )
+
+    def test_soundness_against_brute_force(self) -> None:
+        # the propagator must never drop a value that appears in some circuit, nor fail when there is one
+        rng = random.Random(20261017)
+        for _ in range(2000):
+            costs, offset, domains = _random_instance(rng)
+            parameters = [offset] + [cost for row in costs for cost in row]
+            solutions = _brute_solutions(costs, offset, domains)
+            domains_arr = np.array(domains, dtype=np.int32)
+            state = cold_state(compute_domains_circuit_cost, len(domains_arr), parameters)
+            status = compute_domains_circuit_cost(domains_arr, np.array(parameters, dtype=np.int32), state)
+            if solutions:
+                assert status != PROP_INCONSISTENCY, (costs, offset, domains)
+                for var in range(len(domains)):
+                    assert domains_arr[var, MIN] <= min(solution[var] for solution in solutions)
+                    assert domains_arr[var, MAX] >= max(solution[var] for solution in solutions)
+
+    def test_warm_state(self) -> None:
+        # the assignment kept by the state from a call to the next, narrowed or widened domains in between, must
+        # give the bound of a cold call and keep the filtering sound
+        rng = random.Random(20261018)
+        for _ in range(500):
+            costs, offset, domains = _random_instance(rng)
+            n = len(costs)
+            parameters = [offset] + [cost for row in costs for cost in row]
+            parameters_arr = np.array(parameters, dtype=np.int32)
+            state = cold_state(compute_domains_circuit_cost, n + 1, parameters)
+            for _ in range(6):
+                domains_arr = np.array(domains, dtype=np.int32)
+                cold_domains = domains_arr.copy()
+                cold_result = compute_domains_circuit_cost(
+                    cold_domains, parameters_arr, cold_state(compute_domains_circuit_cost, n + 1, parameters)
+                )
+                result = compute_domains_circuit_cost(domains_arr, parameters_arr, state)
+                assert (result == PROP_INCONSISTENCY) == (cold_result == PROP_INCONSISTENCY)
+                solutions = _brute_solutions(costs, offset, domains)
+                if result != PROP_INCONSISTENCY:
+                    assert domains_arr[n, MIN] == cold_domains[n, MIN]
+                    for var in range(n + 1):
+                        assert all(
+                            domains_arr[var, MIN] <= solution[var] <= domains_arr[var, MAX] for solution in solutions
+                        )
+                i = rng.randrange(n)
+                domains[i] = _pair(rng.randint(offset - 1, offset + n), rng.randint(offset - 1, offset + n))
+
+    def test_solve(self) -> None:
+        # the cheapest circuit of a small asymmetric instance, checked against the brute force
+        rng = random.Random(20261019)
+        n = 6
+        costs = [[0 if i == j else rng.randint(1, 50) for j in range(n)] for i in range(n)]
+        problem = CircuitProblem(n)
+        cost = problem.add_variable((0, 50 * n))
+        problem.add_propagator(ALG_CIRCUIT_COST, list(range(n)) + [cost], [0] + [c for row in costs for c in row])
+        solution = BacktrackSolver(problem).minimize(cost)
+        assert solution is not None
+        solutions = _brute_solutions(costs, 0, [(0, n - 1)] * n + [(0, 50 * n)])
+        assert solution[cost] == min(solution[n] for solution in solutions)
@@ -80,3 +80,7 @@ class TestCountEq(PropagatorTest):
         expected_domains: list[list[int]] | None,
     ) -> None:
         self.assert_compute_domains(compute_domains_count_eq, domains, parameters, consistency_result, expected_domains)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_incremental(self, seed: int) -> None:
+        self.assert_incremental(compute_domains_count_eq, [(0, 3)] * 16 + [(0, 16)], [1], seed)
@@ -58,3 +58,7 @@ class TestCountLeqC(PropagatorTest):
         self.assert_compute_domains(
             compute_domains_count_leq_c, domains, parameters, consistency_result, expected_domains
         )
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_incremental(self, seed: int) -> None:
+        self.assert_incremental(compute_domains_count_leq_c, [(0, 3)] * 16, [1, 5], seed)
@@ -17,8 +17,13 @@ import numpy as np
 import pytest
 
 from nucs.constants import MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
-from nucs.propagators.cumulative_propagator import compute_domains_cumulative
-from tests.propagators.propagator_test import PropagatorTest
+from nucs.propagators.cumulative_propagator import (
+    CUMULATIVE_FILTERING_ENERGETIC,
+    CUMULATIVE_FILTERING_TIMETABLE,
+    CUMULATIVE_FILTERING_TTEF,
+    compute_domains_cumulative,
+)
+from tests.propagators.propagator_test import PropagatorTest, cold_state
 
 
 def _feasible_starts(
@@ -78,7 +83,35 @@ class TestCumulative(PropagatorTest):
             compute_domains_cumulative, domains, parameters, consistency_result, expected_domains
         )
 
-    def test_soundness_against_brute_force(self) -> None:
+    @pytest.mark.parametrize(
+        "domains,parameters,consistency_result,expected_domains",
+        [
+            # the energetic case above: timetabling alone prunes nothing
+            ([(3, 8), (3, 4)], [3, 1, 1, 1, 1, CUMULATIVE_FILTERING_TIMETABLE], PROP_CONSISTENCY, [[3, 8], [3, 4]]),
+            # timetable edge finding: the short task runs in [0, 3) and leaves 5 of the 6 units of energy of this
+            # window, while the tall task, left-shifted, would need 6 of them, so it cannot start at 0
+            ([(0, 2), (0, 4)], [1, 3, 1, 2, 2, CUMULATIVE_FILTERING_TIMETABLE], PROP_CONSISTENCY, [[0, 2], [0, 4]]),
+            ([(0, 2), (0, 4)], [1, 3, 1, 2, 2, CUMULATIVE_FILTERING_TTEF], PROP_CONSISTENCY, [[0, 2], [1, 4]]),
+            ([(0, 2), (0, 4)], [1, 3, 1, 2, 2, CUMULATIVE_FILTERING_ENERGETIC], PROP_CONSISTENCY, [[0, 2], [1, 4]]),
+            # overload detected by timetable edge finding: 3 units of energy must fit in [0, 2) on a unit resource
+            ([(0, 1), (0, 1), (0, 1)], [1, 1, 1, 1, 1, 1, 1, CUMULATIVE_FILTERING_TTEF], PROP_INCONSISTENCY, None),
+        ],
+    )
+    def test_compute_domains_filtering(
+        self,
+        domains: list[int | tuple[int, int]],
+        parameters: list[int],
+        consistency_result: int,
+        expected_domains: list[list[int]] | None,
+    ) -> None:
+        self.assert_compute_domains(
+            compute_domains_cumulative, domains, parameters, consistency_result, expected_domains
+        )
+
+    @pytest.mark.parametrize(
+        "filtering", [CUMULATIVE_FILTERING_TIMETABLE, CUMULATIVE_FILTERING_TTEF, CUMULATIVE_FILTERING_ENERGETIC]
+    )
+    def test_soundness_against_brute_force(self, filtering: int) -> None:
         # for many small random instances the propagator must be sound: never remove a start that belongs to a
         # feasible schedule, and never claim inconsistency when a feasible schedule exists. (timetabling is
         # incomplete, so it may stay consistent on an infeasible instance -- that is allowed.)
@@ -95,8 +128,9 @@ class TestCumulative(PropagatorTest):
                 bounds.append((lo, hi))
             feasible = _feasible_starts(bounds, durations, heights, capacity)
             domains = np.array([[lo, hi] for lo, hi in bounds], dtype=np.int32)
-            parameters = np.array(durations + heights + [capacity], dtype=np.int32)
-            result = compute_domains_cumulative(domains, parameters)
+            parameters = np.array(durations + heights + [capacity, filtering], dtype=np.int32)
+            state = cold_state(compute_domains_cumulative, n, parameters.tolist())
+            result = compute_domains_cumulative(domains, parameters, state)
             if result == PROP_INCONSISTENCY:
                 assert not feasible, (
                     f"declared inconsistent but feasible: {bounds} p={durations} h={heights} c={capacity}"
@@ -114,3 +148,25 @@ class TestCumulative(PropagatorTest):
                 assert domains[i, MAX] >= bc_max, (
                     f"over-pruned MAX of {i}: {bounds} p={durations} h={heights} c={capacity}"
                 )
+
+    def test_warm_state(self) -> None:
+        # the orders kept by the state from a call to the next must not change the filtering
+        rng = random.Random(20261017)
+        for _ in range(200):
+            n = rng.randint(2, 80)
+            parameters = np.array(
+                [rng.randint(1, 10) for _ in range(n)] + [rng.randint(1, 3) for _ in range(n)] + [4], dtype=np.int32
+            )
+            domains = np.array([[lo, lo + rng.randint(0, 40)] for lo in range(n)], dtype=np.int32)
+            state = cold_state(compute_domains_cumulative, n, parameters.tolist())
+            for _ in range(5):
+                cold_domains = domains.copy()
+                cold_result = compute_domains_cumulative(
+                    cold_domains, parameters, cold_state(compute_domains_cumulative, n, parameters.tolist())
+                )
+                assert compute_domains_cumulative(domains, parameters, state) == cold_result
+                if cold_result == PROP_INCONSISTENCY:
+                    break
+                assert domains.tolist() == cold_domains.tolist()
+                i = rng.randrange(n)
+                domains[i, MIN] = rng.randint(domains[i, MIN], domains[i, MAX])
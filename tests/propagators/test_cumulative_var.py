@@ -18,8 +18,13 @@ import numpy as np
 import pytest
 
 from nucs.constants import MAX, MIN, PROP_CONSISTENCY, PROP_INCONSISTENCY
-from nucs.propagators.cumulative_propagator import compute_domains_cumulative_var
-from tests.propagators.propagator_test import PropagatorTest
+from nucs.propagators.cumulative_propagator import (
+    CUMULATIVE_FILTERING_ENERGETIC,
+    CUMULATIVE_FILTERING_TIMETABLE,
+    CUMULATIVE_FILTERING_TTEF,
+    compute_domains_cumulative_var,
+)
+from tests.propagators.propagator_test import PropagatorTest, cold_state
 
 
 def _pair(a: int, b: int) -> tuple[int, int]:
@@ -49,6 +54,7 @@ def _brute_solutions(
 
 class TestCumulativeVar(PropagatorTest):
     # domains = [start_0, ..., start_{n-1}, dur_0, ..., dur_{n-1}]; parameters = [h_0, ..., h_{n-1}, capacity]
+    # (optionally followed by the filtering)
     @pytest.mark.parametrize(
         "domains,parameters,consistency_result,expected_domains",
         [
@@ -81,7 +87,10 @@ class TestCumulativeVar(PropagatorTest):
             compute_domains_cumulative_var, domains, parameters, consistency_result, expected_domains
         )
 
-    def test_soundness_against_brute_force(self) -> None:
+    @pytest.mark.parametrize(
+        "filtering", [CUMULATIVE_FILTERING_TIMETABLE, CUMULATIVE_FILTERING_TTEF, CUMULATIVE_FILTERING_ENERGETIC]
+    )
+    def test_soundness_against_brute_force(self, filtering: int) -> None:
         """Fuzz: the propagator must never drop a value that appears in some solution, nor report
         inconsistency when a solution exists (checked against exhaustive enumeration)."""
         rng = random.Random(20260814)
@@ -93,7 +102,9 @@ class TestCumulativeVar(PropagatorTest):
             capacity = rng.randint(1, 3)
             solutions = _brute_solutions(start_doms, dur_doms, heights, capacity)
             arr = np.array(list(start_doms) + list(dur_doms), dtype=np.int32)
-            status = compute_domains_cumulative_var(arr, np.array([*heights, capacity], dtype=np.int32))
+            parameters = [*heights, capacity, filtering]
+            state = cold_state(compute_domains_cumulative_var, 2 * n, parameters)
+            status = compute_domains_cumulative_var(arr, np.array(parameters, dtype=np.int32), state)
             if solutions:
                 assert status != PROP_INCONSISTENCY, (start_doms, dur_doms, heights, capacity)
                 for var in range(2 * n):
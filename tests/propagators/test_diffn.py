@@ -17,8 +17,8 @@ import numpy as np
 import pytest
 
 from nucs.constants import MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
-from nucs.propagators.diffn_propagator import compute_domains_diffn
-from tests.propagators.propagator_test import PropagatorTest
+from nucs.propagators.diffn_propagator import DIFFN_SWEEP_MIN_N, compute_domains_diffn
+from tests.propagators.propagator_test import PropagatorTest, cold_state
 
 
 def _feasible_placements(bounds: list[tuple[int, int]], dx: list[int], dy: list[int]) -> list[tuple[int, ...]]:
@@ -42,6 +42,14 @@ def _feasible_placements(bounds: list[tuple[int, int]], dx: list[int], dy: list[
     return feasible
 
 
+def _pad(domains: list, parameters: list[int], pad_nb: int) -> tuple[list, list[int]]:
+    """Adds fixed unit squares, far from the other rectangles and from each other, so as to reach the sweep."""
+    n = len(parameters) // 2
+    xs = domains[:n] + [(100 + 2 * k, 100 + 2 * k) for k in range(pad_nb)]
+    ys = domains[n:] + [(100, 100)] * pad_nb
+    return xs + ys, parameters[:n] + [1] * pad_nb + parameters[n:] + [1] * pad_nb
+
+
 class TestDiffn(PropagatorTest):
     @pytest.mark.parametrize(
         "domains,parameters,consistency_result,expected_domains",
@@ -66,7 +74,41 @@ class TestDiffn(PropagatorTest):
     ) -> None:
         self.assert_compute_domains(compute_domains_diffn, domains, parameters, consistency_result, expected_domains)
 
-    def test_soundness_against_brute_force(self) -> None:
+    @pytest.mark.parametrize(
+        "domains,parameters,pairwise_domains,sweep_domains",
+        [
+            # two fixed unit squares at (0, 0) and (0, 1) forbid x = 0 to a unit square with y in [0, 1]: the sweep
+            # combines them while neither forces a separation alone
+            (
+                [(0, 0), (0, 0), (0, 1), (0, 0), (1, 1), (0, 1)],
+                [1, 1, 1, 1, 1, 1],
+                [[0, 0], [0, 0], [0, 1], [0, 0], [1, 1], [0, 1]],
+                [[0, 0], [0, 0], [1, 1], [0, 0], [1, 1], [0, 1]],
+            ),
+        ],
+    )
+    def test_compute_domains_sweep(
+        self,
+        domains: list[int | tuple[int, int]],
+        parameters: list[int],
+        pairwise_domains: list[list[int]],
+        sweep_domains: list[list[int]],
+    ) -> None:
+        self.assert_compute_domains(compute_domains_diffn, domains, parameters, PROP_CONSISTENCY, pairwise_domains)
+        n = len(parameters) // 2
+        pad_nb = DIFFN_SWEEP_MIN_N - n
+        padded_domains, padded_parameters = _pad(domains, parameters, pad_nb)
+        expected_domains, _ = _pad(sweep_domains, parameters, pad_nb)
+        self.assert_compute_domains(
+            compute_domains_diffn,
+            padded_domains,
+            padded_parameters,
+            PROP_CONSISTENCY,
+            [list(domain) for domain in expected_domains],
+        )
+
+    @pytest.mark.parametrize("sweep", [False, True])
+    def test_soundness_against_brute_force(self, sweep: bool) -> None:
         # for many small random instances the propagator must be sound: never remove a coordinate value that
         # belongs to a feasible non-overlapping placement, and never claim inconsistency when one exists.
         rng = random.Random(20260618)
@@ -80,8 +122,10 @@ class TestDiffn(PropagatorTest):
                 hi = lo + rng.randint(0, 3)
                 bounds.append((lo, hi))
             feasible = _feasible_placements(bounds, dx, dy)
-            domains = np.array([[lo, hi] for lo, hi in bounds], dtype=np.int32)
-            result = compute_domains_diffn(domains, np.array(dx + dy, dtype=np.int32))
+            padded_bounds, parameters = _pad(bounds, dx + dy, DIFFN_SWEEP_MIN_N - n if sweep else 0)
+            domains = np.array(padded_bounds, dtype=np.int32)
+            state = cold_state(compute_domains_diffn, len(domains), parameters)
+            result = compute_domains_diffn(domains, np.array(parameters, dtype=np.int32), state)
             if result == PROP_INCONSISTENCY:
                 assert not feasible, f"declared inconsistent but feasible: {bounds} {dx} {dy}"
                 continue
@@ -90,5 +134,6 @@ class TestDiffn(PropagatorTest):
             for v in range(2 * n):
                 bc_min = min(coord[v] for coord in feasible)
                 bc_max = max(coord[v] for coord in feasible)
-                assert domains[v, MIN] <= bc_min, f"over-pruned MIN of {v}: {bounds} {dx} {dy}"
-                assert domains[v, MAX] >= bc_max, f"over-pruned MAX of {v}: {bounds} {dx} {dy}"
+                w = v if v < n else v - n + len(domains) // 2  # the index of the variable among the padded ones
+                assert domains[w, MIN] <= bc_min, f"over-pruned MIN of {v}: {bounds} {dx} {dy}"
+                assert domains[w, MAX] >= bc_max, f"over-pruned MAX of {v}: {bounds} {dx} {dy}"
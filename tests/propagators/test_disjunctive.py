@@ -18,7 +18,7 @@ import pytest
 
 from nucs.constants import MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
 from nucs.propagators.disjunctive_propagator import compute_domains_disjunctive
-from tests.propagators.propagator_test import PropagatorTest
+from tests.propagators.propagator_test import PropagatorTest, cold_state
 
 
 def _feasible_starts(bounds: list[tuple[int, int]], durations: list[int]) -> list[tuple[int, ...]]:
@@ -58,6 +58,11 @@ class TestDisjunctive(PropagatorTest):
             # task 2's latest start 2, lowering task 0's latest start to 1 -- a prune neither edge finding nor
             # not-first/not-last makes (even at fixpoint)
             ([(0, 2), (6, 6), (1, 2)], [1, 3, 3], PROP_CONSISTENCY, [[0, 1], [6, 6], [1, 2]]),
+            # not-last: tasks 0 and 1 cannot both complete before the latest start of task 2, which must then
+            # complete before one of them starts, down to a latest start of 3 at fixpoint -- the rule considers the
+            # tasks whose latest start is below the latest completion of task 2, including task 0 which may
+            # complete after task 2
+            ([(3, 5), (4, 6), (1, 6)], [3, 1, 1], PROP_CONSISTENCY, [[3, 5], [4, 6], [1, 3]]),
         ],
     )
     def test_compute_domains(
@@ -86,7 +91,8 @@ class TestDisjunctive(PropagatorTest):
                 bounds.append((lo, hi))
             feasible = _feasible_starts(bounds, durations)
             domains = np.array([[lo, hi] for lo, hi in bounds], dtype=np.int32)
-            result = compute_domains_disjunctive(domains, np.array(durations, dtype=np.int32))
+            state = cold_state(compute_domains_disjunctive, n, durations)
+            result = compute_domains_disjunctive(domains, np.array(durations, dtype=np.int32), state)
             if result == PROP_INCONSISTENCY:
                 assert not feasible, f"declared inconsistent but feasible: {bounds} {durations} {feasible[:3]}"
                 continue
@@ -98,3 +104,21 @@ class TestDisjunctive(PropagatorTest):
                 # soundness: the filtered interval must keep every feasible value
                 assert domains[i, MIN] <= bc_min, f"over-pruned MIN of {i}: {bounds} {durations}"
                 assert domains[i, MAX] >= bc_max, f"over-pruned MAX of {i}: {bounds} {durations}"
+
+    def test_warm_state(self) -> None:
+        # the orders kept by the state from a call to the next are only a starting point: a warm state filters
+        # like a cold one, whatever the previous domains
+        rng = random.Random(20261017)
+        for n in [3, 20, 50]:
+            durations = np.array([rng.randint(1, 5) for _ in range(n)], dtype=np.int32)
+            state = cold_state(compute_domains_disjunctive, n, durations.tolist())
+            for _ in range(100):
+                los = [rng.randint(0, 3 * n) for _ in range(n)]
+                domains = np.array([[lo, lo + rng.randint(0, 3 * n)] for lo in los], dtype=np.int32)
+                expected_domains = domains.copy()
+                expected = compute_domains_disjunctive(
+                    expected_domains, durations, cold_state(compute_domains_disjunctive, n, durations.tolist())
+                )
+                assert compute_domains_disjunctive(domains, durations, state) == expected
+                if expected != PROP_INCONSISTENCY:
+                    assert domains.tolist() == expected_domains.tolist()
@@ -11,10 +11,13 @@
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
 
+import random
+
+import numpy as np
 import pytest
 
-from nucs.constants import PROP_CONSISTENCY
-from nucs.propagators.gcc_propagator import compute_domains_gcc
+from nucs.constants import PROP_CONSISTENCY, PROP_INCONSISTENCY
+from nucs.propagators.gcc_propagator import compute_domains_gcc, get_state_size_gcc
 from tests.propagators.propagator_test import PropagatorTest
 
 
@@ -54,3 +57,23 @@ class TestGCC(PropagatorTest):
         expected_domains: list[list[int]] | None,
     ) -> None:
         self.assert_compute_domains(compute_domains_gcc, domains, parameters, consistency_result, expected_domains)
+
+    def test_state_is_reused_from_any_node(self) -> None:
+        """The permutations and partial sums kept in the state, as from the nodes of a search tree visited in any
+        order, must give the same result as a cold computation."""
+        rng = random.Random(20261017)
+        for _ in range(200):
+            n = rng.randint(1, 6)
+            m = 4
+            parameters = np.array(
+                [0, *[rng.randint(0, 1) for _ in range(m)], *[rng.randint(1, 3) for _ in range(m)]], dtype=np.int32
+            )
+            state = np.zeros(get_state_size_gcc(n, parameters), dtype=np.int32)
+            for _ in range(10):
+                doms = [sorted((rng.randint(0, m - 1), rng.randint(0, m - 1))) for _ in range(n)]
+                warm = np.array(doms, dtype=np.int32)
+                cold = np.array(doms, dtype=np.int32)
+                status = compute_domains_gcc(warm, parameters, state)
+                assert status == compute_domains_gcc(cold, parameters, np.zeros(len(state), dtype=np.int32))
+                if status != PROP_INCONSISTENCY:
+                    assert warm.tolist() == cold.tolist()
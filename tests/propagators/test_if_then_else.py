@@ -82,7 +82,7 @@ class TestIfThenElse(PropagatorTest):
                 bounds.append((lo, hi))
             feasible = _feasible(bounds)
             domains = np.array([[lo, hi] for lo, hi in bounds], dtype=np.int32)
-            result = compute_domains_if_then_else(domains, np.empty(0, dtype=np.int32))
+            result = compute_domains_if_then_else(domains, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32))
             if result == PROP_INCONSISTENCY:
                 assert not feasible, f"declared inconsistent but feasible exists: {bounds}"
                 continue
@@ -50,3 +50,12 @@ class TestLinearLeqC(PropagatorTest):
         self.assert_compute_domains(
             compute_domains_linear_leq_c, domains, parameters, consistency_result, expected_domains
         )
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_incremental(self, seed: int) -> None:
+        self.assert_incremental(
+            compute_domains_linear_leq_c,
+            [(-3, 5)] * 16,
+            [2, -3, 1, 4, -1, 3, 1, 1, -2, 5, 1, -1, 2, 3, -4, 1, -20],
+            seed,
+        )
@@ -18,7 +18,10 @@ import numpy as np
 import pytest
 
 from nucs.constants import MAX, MIN, PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
-from nucs.propagators.regular_propagator import compute_domains_regular
+from nucs.problems.problem import Problem
+from nucs.propagators.propagators import ALG_REGULAR
+from nucs.propagators.regular_propagator import compute_domains_regular, get_state_size_regular
+from nucs.solvers.backtrack_solver import BacktrackSolver
 from tests.propagators.propagator_test import PropagatorTest
 
 
@@ -88,7 +91,9 @@ class TestRegular(PropagatorTest):
             params = [q_nb, s_nb, q0, *d, *accept]
             solutions = _brute_solutions(doms, q_nb, s_nb, d, q0, accept)
             arr = np.array(list(doms), dtype=np.int32)
-            status = compute_domains_regular(arr, np.array(params, dtype=np.int32))
+            params_arr = np.array(params, dtype=np.int32)
+            state = np.zeros(get_state_size_regular(length, params_arr), dtype=np.int32)
+            status = compute_domains_regular(arr, params_arr, state)
             if not solutions:
                 assert status == PROP_INCONSISTENCY, (d, accept, doms)
                 continue
@@ -96,3 +101,63 @@ class TestRegular(PropagatorTest):
             for var in range(length):
                 values = {sol[var] for sol in solutions}
                 assert arr[var][MIN] == min(values) and arr[var][MAX] == max(values), (d, accept, doms, var)
+
+    def test_state_is_reused_from_any_node(self) -> None:
+        """The state kept between calls, as from the nodes of a search tree visited in any order, must give
+        the same result as a cold computation."""
+        rng = random.Random(20261017)
+        for _ in range(200):
+            q_nb = rng.randint(1, 4)
+            s_nb = 3
+            d = [rng.randint(0, q_nb) for _ in range(q_nb * s_nb)]
+            accept = [rng.randint(0, 1) for _ in range(q_nb)]
+            length = rng.randint(1, 6)
+            params = [q_nb, s_nb, 1, *d, *accept]
+            params_arr = np.array(params, dtype=np.int32)
+            state = np.zeros(get_state_size_regular(length, params_arr), dtype=np.int32)
+            for _ in range(10):
+                doms = [_pair(rng.randint(1, 3), rng.randint(1, 3)) for _ in range(length)]
+                warm = np.array(doms, dtype=np.int32)
+                cold = np.array(doms, dtype=np.int32)
+                assert compute_domains_regular(warm, params_arr, state) == compute_domains_regular(
+                    cold, params_arr, np.zeros(len(state), dtype=np.int32)
+                )
+                assert warm.tolist() == cold.tolist()
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_narrowings_are_incremental(self, seed: int) -> None:
+        """Sequences of narrowings, where the layered graph is only updated with the removed edges, must give the
+        same result as a cold computation, with larger automata (and their unreachable or equivalent states)."""
+        rng = random.Random(seed)
+        q_nb = rng.randint(1, 12)
+        s_nb = rng.randint(1, 5)
+        d = [rng.randint(0, q_nb) for _ in range(q_nb * s_nb)]
+        accept = [rng.randint(0, 1) for _ in range(q_nb)]
+        length = rng.randint(1, 12)
+        params_arr = np.array([q_nb, s_nb, 1, *d, *accept], dtype=np.int32)
+        state = np.zeros(get_state_size_regular(length, params_arr), dtype=np.int32)
+        for _ in range(20):
+            warm = np.array([_pair(rng.randint(0, s_nb + 1), rng.randint(0, s_nb + 1)) for _ in range(length)])
+            warm = warm.astype(np.int32)
+            for _ in range(2 * length):
+                cold = warm.copy()
+                result = compute_domains_regular(warm, params_arr, state)
+                assert result == compute_domains_regular(cold, params_arr, np.zeros(len(state), dtype=np.int32))
+                if result == PROP_INCONSISTENCY:
+                    break
+                assert warm.tolist() == cold.tolist()
+                # a narrowing, as a decision would make
+                var = rng.randrange(length)
+                if rng.randint(0, 1) == 0:
+                    warm[var, MIN] = rng.randint(warm[var, MIN], warm[var, MAX])
+                else:
+                    warm[var, MAX] = rng.randint(warm[var, MIN], warm[var, MAX])
+
+    def test_solve_with_state(self) -> None:
+        problem = Problem([(1, 2)] * 6)
+        problem.add_propagator(ALG_REGULAR, range(6), AT_LEAST_ONE_2)
+        solver = BacktrackSolver(problem)
+        # the parameters are left untouched, the state is allocated by the solver
+        assert len(problem.propagator_parameters) == len(AT_LEAST_ONE_2)
+        assert len(solver.propagator_states) == get_state_size_regular(6, np.array(AT_LEAST_ONE_2))
+        assert len(solver.find_all()) == 2**6 - 1
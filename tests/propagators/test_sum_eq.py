@@ -45,3 +45,7 @@ class TestSumEq(PropagatorTest):
         expected_domains: list[list[int]] | None,
     ) -> None:
         self.assert_compute_domains(compute_domains_sum_eq, domains, [], consistency_result, expected_domains)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_incremental(self, seed: int) -> None:
+        self.assert_incremental(compute_domains_sum_eq, [(0, 5)] * 16 + [(0, 80)], [], seed)
@@ -0,0 +1,88 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+import pytest
+
+from nucs.constants import PROP_CONSISTENCY, PROP_ENTAILMENT, PROP_INCONSISTENCY
+from nucs.problems.problem import Problem
+from nucs.propagators.propagators import ALG_RELATION, ALG_TABLE
+from nucs.propagators.relation_propagator import compute_domains_relation, get_state_size_relation
+from nucs.propagators.table_propagator import compute_domains_table, get_state_size_table
+from nucs.solvers.backtrack_solver import BacktrackSolver
+from tests.propagators.propagator_test import PropagatorTest
+
+
+class TestTable(PropagatorTest):
+    @pytest.mark.parametrize(
+        "domains,parameters,consistency_result,expected_domains",
+        [
+            ([(-5, 5), (-5, 5)], [0, 7, 1, 4, 2, -7, 3, 3], PROP_CONSISTENCY, [[1, 3], [3, 4]]),
+            ([(0, 3), (0, 3)], [4, 5], PROP_INCONSISTENCY, None),
+            ([(0, 3), (0, 3)], [1, 2], PROP_ENTAILMENT, [[1, 1], [2, 2]]),
+            ([(0, 3), (0, 3)], [1, 2, 1, 2], PROP_ENTAILMENT, [[1, 1], [2, 2]]),
+            ([0, 1, (0, 5)], [0, 1, 0, 0, 2, 1, 0, 3, 2, 1, 2, 3, 1, 3, 4, 2, 3, 5], PROP_ENTAILMENT, [0, 1, 0]),
+            ([1, 2, (0, 5)], [0, 1, 0, 0, 2, 1, 0, 3, 2, 1, 2, 3, 1, 3, 4, 2, 3, 5], PROP_ENTAILMENT, [1, 2, 3]),
+            ([(0, 1), (0, 5)], [0, 1, 0, 2, 1, 4, 1, 5], PROP_CONSISTENCY, [[0, 1], [1, 5]]),
+            ([(2, 3), (0, 5)], [0, 1, 0, 2, 1, 4, 1, 5], PROP_INCONSISTENCY, None),
+        ],
+    )
+    def test_compute_domains(
+        self,
+        domains: list[int | tuple[int, int]],
+        parameters: list[int],
+        consistency_result: int,
+        expected_domains: list[int | list[int]] | None,
+    ) -> None:
+        bounds: list[list[int]] | None = None
+        if expected_domains is not None:
+            bounds = [[domain, domain] if isinstance(domain, int) else domain for domain in expected_domains]
+        self.assert_compute_domains(compute_domains_table, domains, parameters, consistency_result, bounds)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_state_is_reused_from_any_node(self, seed: int) -> None:
+        """The state kept between calls, as from the nodes of a search tree visited in any order, must give
+        the same result as the relation propagator, which rescans the tuples."""
+        rng = np.random.default_rng(seed)
+        n = int(rng.integers(1, 5))
+        tuples = rng.integers(-3, 4, size=(int(rng.integers(1, 100)), n))
+        parameters = tuples.reshape(-1).astype(np.int32)
+        state = np.zeros(get_state_size_table(n, parameters), dtype=np.int32)
+        for _ in range(50):
+            domains = np.sort(rng.integers(-4, 5, size=(n, 2)), axis=1).astype(np.int32)
+            for _ in range(4):
+                expected_domains = domains.copy()
+                expected_result = compute_domains_relation(
+                    expected_domains, parameters, np.zeros(get_state_size_relation(n, parameters), dtype=np.int32)
+                )
+                result = compute_domains_table(domains, parameters, state)
+                assert (result == PROP_INCONSISTENCY) == (expected_result == PROP_INCONSISTENCY)
+                if result == PROP_INCONSISTENCY:
+                    break
+                assert domains.tolist() == expected_domains.tolist()
+                # a narrowing, as a decision would make
+                col = int(rng.integers(n))
+                if rng.integers(2) == 0:
+                    domains[col, 0] = int(rng.integers(domains[col, 0], domains[col, 1] + 1))
+                else:
+                    domains[col, 1] = int(rng.integers(domains[col, 0], domains[col, 1] + 1))
+
+    def test_solve(self) -> None:
+        rng = np.random.default_rng(0)
+        tuples = rng.integers(0, 6, size=(200, 3)).reshape(-1).tolist()
+        solution_nbs = []
+        for algorithm in (ALG_RELATION, ALG_TABLE):
+            problem = Problem([(0, 5)] * 4)
+            problem.add_propagator(algorithm, [0, 1, 2], tuples)
+            problem.add_propagator(algorithm, [1, 2, 3], tuples)
+            solution_nbs.append(len(BacktrackSolver(problem).find_all()))
+        assert solution_nbs[0] == solution_nbs[1] > 0
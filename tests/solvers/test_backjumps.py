@@ -0,0 +1,144 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+from typing import Any
+
+import numpy as np
+import pytest
+
+from nucs.constants import (
+    BACKJUMP_LBL_JUMP_NB,
+    BACKJUMP_LBL_SKIPPED_NB,
+    BACKJUMP_LEVEL,
+    BACKJUMP_LOWER_LEVEL,
+    DOM_UPDATE_VARIABLE,
+    OPTIM_PRUNE,
+    OPTIM_RESET,
+    RESTART_LUBY,
+    STATS_IDX_SOLVER_BACKTRACK_NB,
+)
+from nucs.examples.golomb.golomb_problem import GolombProblem, golomb_consistency_algorithm
+from nucs.examples.queens.queens_problem import QueensProblem
+from nucs.problems.problem import Problem
+from nucs.propagators.propagators import ALG_NEQ
+from nucs.solvers.backjumps import (
+    backjump_level,
+    get_reason_level_sections,
+    get_reason_levels,
+    grow_reason_levels,
+    record_decision_levels,
+    refute_reason_levels,
+    set_conflict_levels,
+    union_levels,
+)
+from nucs.solvers.backtrack_solver import BacktrackSolver
+from nucs.solvers.consistency_algorithms import register_consistency_algorithm
+
+
+def pigeonhole_problem(free_variable_nb: int) -> Problem:
+    # free variables, then 3 pigeons in 2 holes
+    problem = Problem([(0, 1)] * (free_variable_nb + 3))
+    for i in range(3):
+        problem.add_propagator(ALG_NEQ, [free_variable_nb + i, free_variable_nb + (i + 1) % 3], [0])
+    return problem
+
+
+class TestBackjumps:
+    @pytest.mark.parametrize(
+        "pair, other_pair, union",
+        [
+            ((3, 0), (5, 1), (5, 3)),
+            ((5, 0), (5, 2), (5, 2)),
+            ((5, 4), (2, 1), (5, 4)),
+            ((0, -1), (4, -1), (4, 0)),
+            ((0, -1), (0, -1), (0, -1)),
+        ],
+    )
+    def test_union_levels(self, pair: tuple[int, int], other_pair: tuple[int, int], union: tuple[int, int]) -> None:
+        assert union_levels(*pair, *other_pair) == union
+
+    def test_backjump_level(self) -> None:
+        reason_levels = get_reason_levels(2, 8, True)
+        record_decision_levels(reason_levels, 0, 0, 1)
+        record_decision_levels(reason_levels, 1, 1, 2)
+        levels, refutation_levels = get_reason_level_sections(reason_levels)
+        assert levels.tolist() == [[1, 0], [2, 0]]
+        # a failure that only depends on the decision of the level 1 jumps over the choice point of the level 1
+        set_conflict_levels(reason_levels, 1, -1)
+        assert backjump_level(reason_levels, 2) == 0
+        assert refutation_levels[0] == -1
+        domain_update_stk = np.zeros((8, 2), dtype=np.uint32)
+        domain_update_stk[0, DOM_UPDATE_VARIABLE] = 0
+        refute_reason_levels(reason_levels, domain_update_stk, 0, False)
+        assert levels.tolist() == [[0, -1], [0, -1]]
+        set_conflict_levels(reason_levels, 3, 2)
+        assert backjump_level(reason_levels, 2) == 1
+        assert refutation_levels[1] == 1
+
+    def test_refute_reason_levels(self) -> None:
+        reason_levels = get_reason_levels(3, 8, True)
+        levels, refutation_levels = get_reason_level_sections(reason_levels)
+        levels[:] = [[4, 1], [5, 3], [2, 1]]
+        refutation_levels[2] = 1
+        domain_update_stk = np.zeros((8, 2), dtype=np.uint32)
+        domain_update_stk[2, DOM_UPDATE_VARIABLE] = 2
+        refute_reason_levels(reason_levels, domain_update_stk, 2, False)
+        assert levels[:, BACKJUMP_LEVEL].tolist() == [1, 2, 2]
+        assert levels[:, BACKJUMP_LOWER_LEVEL].tolist() == [0, 1, 1]
+
+    def test_grow_reason_levels(self) -> None:
+        reason_levels = get_reason_levels(3, 4, True)
+        reason_levels[-1] = 2
+        new_reason_levels = grow_reason_levels(reason_levels, 8)
+        assert len(new_reason_levels) == len(reason_levels) + 4
+        assert new_reason_levels[: len(reason_levels)].tolist() == reason_levels.tolist()
+        assert new_reason_levels[len(reason_levels) :].tolist() == [-1] * 4
+        assert len(grow_reason_levels(get_reason_levels(3, 4, False), 8)) == 0
+
+    def test_solve_pigeonhole(self) -> None:
+        backtrack_nbs = []
+        for backjumping in (False, True):
+            solver = BacktrackSolver(pigeonhole_problem(8), backjumping=backjumping)
+            assert len(solver.find_all()) == 0
+            backtrack_nbs.append(solver.statistics[STATS_IDX_SOLVER_BACKTRACK_NB])
+        assert backtrack_nbs == [511, 1]
+        assert solver.get_backjump_statistics() == {BACKJUMP_LBL_JUMP_NB: 1, BACKJUMP_LBL_SKIPPED_NB: 8}
+
+    @pytest.mark.parametrize("restart_policy, nogood_capacity", [(None, 0), (RESTART_LUBY, 16)])
+    def test_solve_all(self, restart_policy: str | None, nogood_capacity: int) -> None:
+        kwargs: dict[str, Any] = (
+            {} if restart_policy is None else {"restart_policy": restart_policy, "restart_scale": 1}
+        )
+        solver = BacktrackSolver(QueensProblem(8), backjumping=True, nogood_capacity=nogood_capacity, **kwargs)
+        assert len(solver.find_all()) == 92
+
+    @pytest.mark.parametrize("restart_policy, nogood_capacity", [(None, 0), (RESTART_LUBY, 16)])
+    def test_solve_all_grow(self, restart_policy: str | None, nogood_capacity: int) -> None:
+        kwargs: dict[str, Any] = (
+            {} if restart_policy is None else {"restart_policy": restart_policy, "restart_scale": 1}
+        )
+        solver = BacktrackSolver(
+            QueensProblem(8), backjumping=True, nogood_capacity=nogood_capacity, stks_initial_height=4, **kwargs
+        )
+        assert len(solver.find_all()) == 92
+        assert len(solver.domains_stk) > 4
+
+    @pytest.mark.parametrize("mode", [OPTIM_PRUNE, OPTIM_RESET])
+    def test_minimize_golomb(self, mode: str) -> None:
+        problem = GolombProblem(7)
+        consistency_alg_golomb = register_consistency_algorithm(golomb_consistency_algorithm)
+        solver = BacktrackSolver(problem, consistency_algorithm=consistency_alg_golomb, backjumping=True)
+        solution = solver.minimize(problem.length_idx, mode=mode)
+        assert solution is not None
+        assert solution[problem.length_idx] == 25
+        # the levels below the top of the stacks are signed: a failure at the root does not wrap them around
+        assert solver.get_backjump_statistics() == {BACKJUMP_LBL_JUMP_NB: 0, BACKJUMP_LBL_SKIPPED_NB: 0}
@@ -10,21 +10,54 @@
 #
 # Copyright 2024-2026 - Yan Georget
 ###############################################################################
+import time
+
+import numpy as np
 import pytest
 
 from nucs.buckets import STORAGE_OFFSET, buckets_empty
 from nucs.constants import (
+    CHOICE_POINTS_COPY,
+    CHOICE_POINTS_TRAIL,
+    LIMIT_DEADLINE_PERIOD,
+    LIMIT_NONE,
+    MAX,
     OPTIM_PRUNE,
     OPTIM_RESET,
+    PROFILE_IDX_CALL_NB,
+    PROFILE_IDX_ENTAILMENT_NB,
+    PROFILE_IDX_INCONSISTENCY_NB,
+    PROFILE_IDX_NO_CHANGE_NB,
+    PROFILE_IDX_REMOVED_VALUE_NB,
+    PROFILE_IDX_TIMED_CALL_NB,
+    PROFILE_MAX,
+    PROFILE_TIMING_PERIOD,
+    RESTART_GEOMETRIC,
+    RESTART_LUBY,
+    SEARCH_SOLUTION,
+    STATS_IDX_PROPAGATOR_ENTAILMENT_NB,
+    STATS_IDX_PROPAGATOR_FILTER_NB,
+    STATS_IDX_PROPAGATOR_FILTER_NO_CHANGE_NB,
+    STATS_IDX_PROPAGATOR_INCONSISTENCY_NB,
     STATS_LBL_SOLUTION_NB,
+    STATS_LBL_SOLVER_BACKTRACK_NB,
     STATS_LBL_SOLVER_CHOICE_DEPTH,
+    STATS_LBL_SOLVER_CHOICE_NB,
+    STATS_LBL_SOLVER_RESTART_NB,
+    WEIGHTS_IDX_FAILURE_NB,
 )
+from nucs.examples.golomb.golomb_problem import GolombProblem
+from nucs.examples.queens.queens_problem import QueensProblem
 from nucs.heuristics.heuristics import (
     DOM_HEURISTIC_MAX_VALUE,
     DOM_HEURISTIC_MID_VALUE,
     DOM_HEURISTIC_MIN_VALUE,
     DOM_HEURISTIC_SPLIT_HIGH,
     DOM_HEURISTIC_SPLIT_LOW,
+    DOM_HEURISTIC_SPLIT_RANDOM,
+    VAR_HEURISTIC_ACTIVITY,
+    VAR_HEURISTIC_CHB,
+    VAR_HEURISTIC_DOM_WDEG,
     VAR_HEURISTIC_FIRST_NOT_INSTANTIATED,
     VAR_HEURISTIC_GREATEST_DOMAIN,
 )
@@ -36,9 +69,11 @@ from nucs.propagators.propagators import (
     ALG_NEQ,
     ALG_RELATION,
 )
+from nucs.solvers import backtrack_solver
 from nucs.solvers.backtrack_solver import BacktrackSolver, solve_one
 from nucs.solvers.choice_points import backtrack
 from nucs.solvers.search import Search
+from nucs.solvers.solver import get_solution
 
 
 class TestBacktrackSolver:
@@ -52,11 +87,12 @@ class TestBacktrackSolver:
 
     def test_solve_one(self) -> None:
         problem = Problem([(0, 1), (0, 1)])
-        solver = BacktrackSolver(problem, stks_max_height=3)
+        solver = BacktrackSolver(problem, stks_initial_height=4)
         buckets_empty(solver.triggered_propagators, problem.priorities)
-        solution = solve_one(
+        status = solve_one(
             problem.propagator_nb,
             solver.statistics,
+            solver.limits,
             problem.algorithms,
             problem.priorities,
             problem.bounds,
@@ -76,17 +112,27 @@ class TestBacktrackSolver:
             solver.decision_variables_offsets,
             solver.var_heuristic_fcts,
             solver.var_heuristic_params,
-            solver.var_heuristic_params_offsets,
+            solver.var_heuristic_params_ranges,
             solver.var_heuristic_params_shapes,
             solver.dom_heuristic_fcts,
             solver.dom_heuristic_params,
             solver.dom_heuristic_params_offsets,
             solver.dom_heuristic_params_shapes,
+            solver.phases,
             solver.compute_domains_fcts,
             solver.domain_buffer,
+            solver.propagator_weights,
+            solver.propagator_states,
+            problem.incremental_propagators,
+            problem.deltas,
+            problem.deltas_offsets,
+            solver.propagator_profiles,
+            solver.nogoods,
+            solver.reason_levels,
+            solver.trail,
         )
-        assert solution is not None
-        assert solution.tolist() == [0, 0]
+        assert status == SEARCH_SOLUTION
+        assert get_solution(solver.domains_stk, solver.stks_top[0]).tolist() == [0, 0]
         assert solver.stks_top == 2
         assert solver.domains_stk[0, 0].tolist() == [1, 1]
         assert solver.domains_stk[0, 1].tolist() == [0, 1]
@@ -124,6 +170,27 @@ class TestBacktrackSolver:
         assert statistics[STATS_LBL_SOLUTION_NB] == 4
         assert statistics[STATS_LBL_SOLVER_CHOICE_DEPTH] == 2
 
+    @pytest.mark.parametrize("stks_initial_height", [1, 4])
+    def test_find_all_grow(self, stks_initial_height: int) -> None:
+        solver = BacktrackSolver(QueensProblem(8), stks_initial_height=stks_initial_height)
+        assert len(solver.find_all()) == 92
+        height = len(solver.domains_stk)
+        assert height > stks_initial_height
+        assert height & (height - 1) == 0  # the stacks double
+        assert len(solver.domain_update_stk) == height
+        assert len(solver.unbound_variable_nb_stk) == height
+
+    def test_find_all_max_height(self) -> None:
+        solver = BacktrackSolver(QueensProblem(8), stks_initial_height=3, stks_max_height=8)
+        assert len(solver.find_all()) == 92
+        assert len(solver.domains_stk) == 8
+
+    def test_find_all_max_height_reached(self) -> None:
+        solver = BacktrackSolver(QueensProblem(8), stks_initial_height=4, stks_max_height=6)
+        with pytest.raises(RuntimeError, match="maximal height of 6"):
+            solver.find_all()
+        assert len(solver.domains_stk) == 6
+
     def test_find_all_alldifferent(self) -> None:
         problem = Problem([(0, 2), (0, 2), (0, 2)])
         problem.add_propagator(ALG_ALLDIFFERENT, [0, 1, 2])
@@ -139,6 +206,49 @@ class TestBacktrackSolver:
         statistics = solver.get_statistics_as_dictionary()
         assert statistics[STATS_LBL_SOLUTION_NB] == 6
 
+    def test_resume_fresh_solver(self) -> None:
+        # the propagation queue of a new solver holds all the propagators, as after a reset
+        solutions = [solution.tolist() for solution in BacktrackSolver(QueensProblem(6)).resume()]
+        assert len(solutions) == 4
+        assert len({tuple(solution) for solution in solutions}) == 4
+
+    def test_steal_choice_point(self) -> None:
+        problem = QueensProblem(8)
+        victim = BacktrackSolver(problem)
+        thief = BacktrackSolver(problem)
+        solutions = victim.solve()
+        victim_solutions = [next(solutions).tolist()]
+        choice_point = victim.steal_choice_point()
+        assert choice_point is not None
+        domains, domain_update = choice_point
+        assert domains.shape == (8, 2)
+        victim_solutions.extend(solution.tolist() for solution in solutions)
+        thief.restore_choice_point(domains, domain_update)
+        thief_solutions = [solution.tolist() for solution in thief.resume()]
+        assert len(victim_solutions) + len(thief_solutions) == 92
+        assert len({tuple(solution) for solution in victim_solutions + thief_solutions}) == 92
+
+    def test_steal_choice_point_on_limit(self) -> None:
+        problem = QueensProblem(8)
+        victim = BacktrackSolver(problem)
+        thief = BacktrackSolver(problem)
+        victim.set_limits(choice_nb=10)
+        victim_solutions = [solution.tolist() for solution in victim.solve()]
+        assert victim.limit_reached
+        choice_point = victim.steal_choice_point()
+        assert choice_point is not None
+        victim.set_limits()
+        victim_solutions.extend(solution.tolist() for solution in victim.resume())
+        thief.restore_choice_point(*choice_point)
+        thief_solutions = [solution.tolist() for solution in thief.resume()]
+        assert len(thief_solutions) > 0
+        assert len({tuple(solution) for solution in victim_solutions + thief_solutions}) == 92
+        assert len(victim_solutions) + len(thief_solutions) == 92
+
+    def test_steal_choice_point_at_root(self) -> None:
+        solver = BacktrackSolver(Problem([(0, 1)]))
+        assert solver.steal_choice_point() is None
+
     def test_sequential_search(self) -> None:
         # two searches: the first branches variable 0 (indomain_max), the second variable 1 (indomain_min)
         problem = Problem([(1, 3), (1, 3)])
@@ -171,6 +281,54 @@ class TestBacktrackSolver:
         solution = next(solver.solve())
         assert solution.tolist() == [0, 0, 9]  # variable 2 grounded to 9 first, then 0 and 1 to their min
 
+    @pytest.mark.parametrize("var_heuristic", [VAR_HEURISTIC_ACTIVITY, VAR_HEURISTIC_CHB, VAR_HEURISTIC_DOM_WDEG])
+    def test_solve_all_weighted(self, var_heuristic: int) -> None:
+        problem = QueensProblem(8)
+        solver = BacktrackSolver(problem, var_heuristic=var_heuristic)
+        solutions = solver.find_all()
+        assert len({tuple(solution.tolist()) for solution in solutions}) == 92
+        statistics = solver.get_statistics_as_array()
+        assert solver.propagator_weights[WEIGHTS_IDX_FAILURE_NB] == statistics[STATS_IDX_PROPAGATOR_INCONSISTENCY_NB]
+
+    def test_propagator_profile(self) -> None:
+        problem = QueensProblem(8)
+        solver = BacktrackSolver(problem, profile_propagators=True)
+        assert len(solver.find_all()) == 92
+        propagator_profiles, algorithm_profiles = solver.get_propagator_profile()
+        assert propagator_profiles.shape == (problem.propagator_nb, PROFILE_MAX)
+        statistics = solver.get_statistics_as_array()
+        totals = propagator_profiles.sum(axis=0)
+        assert totals[PROFILE_IDX_CALL_NB] == statistics[STATS_IDX_PROPAGATOR_FILTER_NB]
+        assert totals[PROFILE_IDX_NO_CHANGE_NB] == statistics[STATS_IDX_PROPAGATOR_FILTER_NO_CHANGE_NB]
+        assert totals[PROFILE_IDX_INCONSISTENCY_NB] == statistics[STATS_IDX_PROPAGATOR_INCONSISTENCY_NB]
+        assert totals[PROFILE_IDX_ENTAILMENT_NB] == statistics[STATS_IDX_PROPAGATOR_ENTAILMENT_NB]
+        assert totals[PROFILE_IDX_REMOVED_VALUE_NB] > 0
+        assert (
+            propagator_profiles[:, PROFILE_IDX_TIMED_CALL_NB].tolist()
+            == (-(-propagator_profiles[:, PROFILE_IDX_CALL_NB] // PROFILE_TIMING_PERIOD)).tolist()
+        )
+        assert algorithm_profiles[ALG_ALLDIFFERENT].tolist() == totals.tolist()
+
+    def test_propagator_profile_off(self) -> None:
+        solver = BacktrackSolver(QueensProblem(8))
+        assert len(solver.find_all()) == 92
+        propagator_profiles, algorithm_profiles = solver.get_propagator_profile()
+        assert propagator_profiles.shape == (0, PROFILE_MAX)
+        assert not algorithm_profiles.any()
+
+    def test_sequential_search_weighted(self) -> None:
+        # both weighted searches read the same propagator weights
+        problem = QueensProblem(8)
+        solver = BacktrackSolver(
+            problem,
+            searches=[
+                Search(range(4), VAR_HEURISTIC_DOM_WDEG, [[]], DOM_HEURISTIC_MIN_VALUE, [[]]),
+                Search(range(4, 8), VAR_HEURISTIC_CHB, [[]], DOM_HEURISTIC_MIN_VALUE, [[]]),
+            ],
+        )
+        assert solver.var_heuristic_params_ranges[0].tolist() == solver.var_heuristic_params_ranges[1].tolist()
+        assert len(solver.find_all()) == 92
+
     def test_split_grounding_wakes_ground_triggered_propagator(self) -> None:
         # A split heuristic that grounds a variable in its current branch must report a GROUND event,
         # otherwise a propagator woken only on ground events (here linear_neq_c) never fires and an
@@ -183,6 +341,80 @@ class TestBacktrackSolver:
             assert len(solutions) == 8
             assert all(x != y for x, y in (s.tolist() for s in solutions))
 
+    def test_choice_limit(self) -> None:
+        problem = QueensProblem(8)
+        solver = BacktrackSolver(problem)
+        solver.set_limits(choice_nb=10)
+        assert list(solver.solve()) == []
+        assert solver.limit_reached
+        assert solver.get_statistics_as_dictionary()[STATS_LBL_SOLVER_CHOICE_NB] == 10
+        solver.set_limits()
+        solutions = list(solver.resume())
+        assert not solver.limit_reached
+        assert len(solutions) == 92
+
+    def test_backtrack_limit(self) -> None:
+        problem = QueensProblem(8)
+        solver = BacktrackSolver(problem)
+        solver.set_limits(backtrack_nb=7)
+        solutions = list(solver.solve())
+        while solver.limit_reached:
+            solver.set_limits(backtrack_nb=7)
+            solutions.extend(solver.resume())
+        assert len({tuple(solution.tolist()) for solution in solutions}) == 92
+        assert solver.get_statistics_as_dictionary()[STATS_LBL_SOLVER_BACKTRACK_NB] > 7
+
+    def test_deadline(self) -> None:
+        problem = QueensProblem(10)
+        solver = BacktrackSolver(problem)
+        solver.set_limits(deadline=time.monotonic_ns())
+        solutions = list(solver.solve())
+        assert solver.limit_reached
+        assert solver.get_statistics_as_dictionary()[STATS_LBL_SOLVER_CHOICE_NB] == LIMIT_DEADLINE_PERIOD
+        solver.set_limits()
+        assert len(solutions) + len(list(solver.resume())) == 724
+
+    def test_optimize_limit(self) -> None:
+        problem = Problem([(-5, 5), (-100, 100)])
+        problem.add_propagator(
+            ALG_RELATION, [0, 1], [-5, 25, -4, 16, -3, 9, -2, 4, -1, 1, 0, 0, 1, 1, 2, 4, 3, 9, 4, 16, 5, 25]
+        )
+        solver = BacktrackSolver(problem)
+        solver.set_limits(choice_nb=1)
+        solutions = list(solver.minimize_solutions(1))
+        assert solver.limit_reached
+        solver.set_limits()
+        solutions.extend(solver.minimize_solutions(1))
+        assert not solver.limit_reached
+        assert solutions[-1].tolist() == [0, 0]
+
+    @pytest.mark.parametrize("restart_policy", [RESTART_LUBY, RESTART_GEOMETRIC])
+    def test_solve_all_restart(self, restart_policy: str) -> None:
+        # the first solution of the deterministic search needs more backtracks than the first runs allow
+        solver = BacktrackSolver(QueensProblem(10), restart_policy=restart_policy, restart_scale=1)
+        assert len(solver.find_all()) == 724
+        assert solver.get_statistics_as_dictionary()[STATS_LBL_SOLVER_RESTART_NB] > 0
+
+    @pytest.mark.parametrize("restart_policy", [RESTART_LUBY, RESTART_GEOMETRIC])
+    def test_solve_all_restart_random(self, restart_policy: str) -> None:
+        # a random search can find its first solution before any restart, only the solutions are checked
+        problem = QueensProblem(10)
+        solver = BacktrackSolver(
+            problem, dom_heuristic=DOM_HEURISTIC_SPLIT_RANDOM, restart_policy=restart_policy, restart_scale=1
+        )
+        solutions = solver.find_all()
+        assert len({tuple(solution.tolist()) for solution in solutions}) == 724
+        assert solver.get_statistics_as_dictionary()[STATS_LBL_SOLUTION_NB] == 724
+
+    @pytest.mark.parametrize("mode", [OPTIM_PRUNE, OPTIM_RESET])
+    def test_minimize_restart(self, mode: str) -> None:
+        problem = GolombProblem(6)
+        solver = BacktrackSolver(problem, restart_policy=RESTART_LUBY, restart_scale=4)
+        solution = solver.minimize(problem.length_idx, mode=mode)
+        assert solution is not None
+        assert solution[problem.length_idx] == 17
+        assert solver.get_statistics_as_dictionary()[STATS_LBL_SOLVER_RESTART_NB] > 0
+
     def test_minimize_relation(self) -> None:
         problem = Problem([(-5, 5), (-100, 100)])
         problem.add_propagator(
@@ -205,6 +437,44 @@ class TestBacktrackSolver:
         statistics = solver.get_statistics_as_dictionary()
         assert statistics[STATS_LBL_SOLUTION_NB] == 1
 
+    @pytest.mark.parametrize("mode", [OPTIM_PRUNE, OPTIM_RESET])
+    def test_minimize_incumbent(self, mode: str) -> None:
+        problem = Problem([(-5, 5), (-100, 100)])
+        problem.add_propagator(
+            ALG_RELATION, [0, 1], [-5, 25, -4, 16, -3, 9, -2, 4, -1, 1, 0, 0, 1, 1, 2, 4, 3, 9, 4, 16, 5, 25]
+        )
+        solver = BacktrackSolver(problem)
+        incumbent = np.array([5], dtype=np.int64)
+        solutions = list(solver.optimize_solutions(1, MAX, mode, incumbent))
+        assert [solution[1] for solution in solutions] == [4, 1, 0]
+        assert incumbent[0] == 0
+
+    def test_minimize_incumbent_optimal(self) -> None:
+        problem = Problem([(2, 5), (2, 5), (0, 10)])
+        problem.add_propagator(ALG_LINEAR_LEQ_C, [0, 1, 2], [1, 1, -1, 0])
+        solver = BacktrackSolver(problem)
+        incumbent = np.array([4], dtype=np.int64)
+        assert list(solver.optimize_solutions(2, MAX, OPTIM_RESET, incumbent)) == []
+        assert incumbent[0] == 4
+
+    @pytest.mark.parametrize("choice_points", [CHOICE_POINTS_COPY, CHOICE_POINTS_TRAIL])
+    def test_minimize_incumbent_polled(self, monkeypatch: pytest.MonkeyPatch, choice_points: str) -> None:
+        monkeypatch.setattr(backtrack_solver, "INCUMBENT_POLL_PERIOD", 1)
+        problem = GolombProblem(6)
+        incumbent = np.array([LIMIT_NONE], dtype=np.int64)
+
+        class SharedIncumbentSolver(BacktrackSolver):
+            def _search(self) -> int:
+                status = super()._search()
+                # another solver improves the incumbent while this one is searching
+                incumbent[0] = min(incumbent[0], 18)
+                return status
+
+        solver = SharedIncumbentSolver(problem, choice_points=choice_points)
+        solutions = list(solver.optimize_solutions(problem.length_idx, MAX, OPTIM_PRUNE, incumbent))
+        assert [solution[problem.length_idx] for solution in solutions] == [17]
+        assert incumbent[0] == 17
+
     @pytest.mark.parametrize(
         "mode,dom_heuristic, solution_nb",
         [
@@ -226,3 +496,35 @@ class TestBacktrackSolver:
         assert solution.tolist() == [5]
         statistics = solver.get_statistics_as_dictionary()
         assert statistics[STATS_LBL_SOLUTION_NB] == solution_nb
+
+    @pytest.mark.parametrize("choice_points", [CHOICE_POINTS_COPY, CHOICE_POINTS_TRAIL])
+    def test_update(self, choice_points: str) -> None:
+        problem = Problem([(0, 3), (0, 3)])
+        solver = BacktrackSolver(problem, choice_points=choice_points)
+        assert len(solver.find_all()) == 16
+        problem.add_propagator(ALG_NEQ, [0, 1])  # x != y
+        solver.update()
+        assert len(solver.find_all()) == 12
+        # an algorithm unknown to the solver is resolved
+        problem.add_propagator(ALG_LINEAR_LEQ_C, [0, 1], [1, 1, 3])  # x + y <= 3
+        solver.update()
+        assert len(solver.find_all()) == 8
+        problem.remove_propagator(0)
+        solver.update()
+        assert len(solver.find_all()) == 10
+
+    def test_update_weighted(self) -> None:
+        problem = QueensProblem(6)
+        solver = BacktrackSolver(problem, var_heuristic=VAR_HEURISTIC_DOM_WDEG, profile_propagators=True)
+        assert len(solver.find_all()) == 4
+        problem.add_propagator(ALG_LINEAR_LEQ_C, [0], [1, 2])  # the queen of the first row is in the first 3 columns
+        solver.update()
+        assert len(solver.find_all()) == 2
+        propagator_profiles, _ = solver.get_propagator_profile()
+        assert propagator_profiles.shape == (problem.propagator_nb, PROFILE_MAX)
+
+    def test_add_propagators(self) -> None:
+        problem = Problem([(0, 3)] * 4)
+        problem.add_propagators(ALG_NEQ, [[i, j] for i in range(4) for j in range(i + 1, 4)])
+        solver = BacktrackSolver(problem)
+        assert len(solver.find_all()) == 24
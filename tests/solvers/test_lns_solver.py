@@ -0,0 +1,99 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import json
+import time
+
+import numpy as np
+import pytest
+
+from nucs.constants import LNS_LBL_IMPROVEMENT_NB, LNS_LBL_ITERATION_NB, OPTIM_PRUNE, OPTIM_RESET
+from nucs.examples.golomb.golomb_problem import GolombProblem
+from nucs.examples.knapsack.knapsack_problem import KnapsackProblem
+from nucs.heuristics.heuristics import DOM_HEURISTIC_MAX_VALUE
+from nucs.problems.problem import Problem
+from nucs.propagators.propagators import ALG_ALLDIFFERENT
+from nucs.solvers.lns_solver import LnsSolver, random_neighborhood
+
+
+class TestLnsSolver:
+    def test_random_neighborhood(self) -> None:
+        decision_variables = np.arange(10, 20)
+        relaxed_variables = random_neighborhood(np.zeros(20), decision_variables, 0.3, np.random.default_rng(0))
+        assert len(set(relaxed_variables.tolist())) == 3
+        assert set(relaxed_variables.tolist()) <= set(decision_variables.tolist())
+        assert len(random_neighborhood(np.zeros(20), decision_variables, 0, np.random.default_rng(0))) == 1
+
+    @pytest.mark.parametrize("mode", [OPTIM_PRUNE, OPTIM_RESET])
+    def test_minimize_golomb(self, mode: str) -> None:
+        problem = GolombProblem(6)
+        solver = LnsSolver(problem, iteration_nb=None, seed=0, decision_variables=range(problem.mark_nb - 1))
+        solution = solver.minimize(problem.length_idx, mode=mode)
+        assert solution is not None
+        assert solution[problem.length_idx] == 17
+        assert not solver.limit_reached  # the optimality is proven
+        assert solver.get_lns_statistics()[LNS_LBL_ITERATION_NB] > 0
+
+    def test_maximize_knapsack(self) -> None:
+        with open("datasets/examples/knapsack/simple.json", "r") as json_file:
+            problem = KnapsackProblem(json.load(json_file))
+        solver = LnsSolver(
+            problem, iteration_nb=None, seed=0, decision_variables=range(problem.weight), backtrack_nb=10
+        )
+        solutions = list(solver.maximize_solutions(problem.weight))
+        assert [solution[problem.weight] for solution in solutions] == sorted(
+            solution[problem.weight] for solution in solutions
+        )
+        assert solutions[-1][problem.weight] == 54
+        assert 0 < solver.get_lns_statistics()[LNS_LBL_IMPROVEMENT_NB] <= len(solutions) - 1
+
+    def test_maximize_knapsack_neighborhood(self) -> None:
+        with open("datasets/examples/knapsack/simple.json", "r") as json_file:
+            problem = KnapsackProblem(json.load(json_file))
+        relaxation_rates = []
+
+        def neighborhood(
+            solution: np.ndarray, decision_variables: np.ndarray, relaxation_rate: float, rng: np.random.Generator
+        ) -> np.ndarray:
+            relaxation_rates.append(relaxation_rate)
+            return decision_variables[:0]  # the neighbourhood of the first solution is this solution
+
+        solver = LnsSolver(
+            problem, neighborhoods=[neighborhood], iteration_nb=3, decision_variables=range(problem.weight)
+        )
+        assert solver.maximize(problem.weight) is not None
+        assert solver.limit_reached
+        assert relaxation_rates == pytest.approx([0.1, 0.15, 0.225])  # the exhausted neighbourhoods grow
+
+    def test_unsatisfiable(self) -> None:
+        problem = Problem([(0, 1)] * 3)
+        problem.add_propagator(ALG_ALLDIFFERENT, [0, 1, 2])
+        solver = LnsSolver(problem)
+        assert solver.minimize(0) is None
+        assert not solver.limit_reached
+
+    def test_deadline(self) -> None:
+        problem = GolombProblem(8)
+        solver = LnsSolver(
+            problem, decision_variables=range(problem.mark_nb - 1), dom_heuristic=DOM_HEURISTIC_MAX_VALUE
+        )
+        solver.set_limits(deadline=time.monotonic_ns() + 100_000_000)
+        solution = solver.minimize(problem.length_idx)
+        assert solution is not None
+        assert solver.limit_reached
+
+    def test_no_decision_variable(self) -> None:
+        solver = LnsSolver(Problem([(2, 2), (3, 3)]), decision_variables=[])
+        solution = solver.minimize(1)
+        assert solution is not None
+        assert solution.tolist() == [2, 3]
+        assert not solver.limit_reached
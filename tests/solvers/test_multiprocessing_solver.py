@@ -0,0 +1,109 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import pickle
+
+import pytest
+
+from nucs.constants import OPTIM_PRUNE, STATS_LBL_SOLUTION_NB, STATS_LBL_SOLVER_CHOICE_DEPTH
+from nucs.examples.queens.queens_problem import QueensProblem
+from nucs.problems.problem import Problem
+from nucs.propagators.propagators import ALG_LINEAR_LEQ_C, ALG_NEQ, ALG_RELATION
+from nucs.solvers.multiprocessing_solver import MultiprocessingSolver
+
+
+class TestMultiprocessingSolver:
+    def test_find_all(self) -> None:
+        problem = Problem([(0, 3), (0, 3)])
+        solver = MultiprocessingSolver(problem.split(3, 0), 2)
+        solutions = solver.find_all()
+        assert sorted(solution.tolist() for solution in solutions) == [[x, y] for x in range(4) for y in range(4)]
+        statistics = solver.get_statistics_as_dictionary()
+        assert statistics[STATS_LBL_SOLUTION_NB] == 16
+        assert statistics[STATS_LBL_SOLVER_CHOICE_DEPTH] == 2
+
+    def test_queens(self) -> None:
+        problem = QueensProblem(8)
+        solver = MultiprocessingSolver(problem.split(4, 0), 4)
+        solver.solve_all()
+        assert solver.get_statistics_as_dictionary()[STATS_LBL_SOLUTION_NB] == 92
+
+    def test_first_solution(self) -> None:
+        problem = QueensProblem(8)
+        solver = MultiprocessingSolver(problem.split(4, 0), 2)
+        solution = next(solver.solve())
+        assert len(set(solution.tolist())) == 8
+
+    @pytest.mark.parametrize("split_nb,processor_nb", [(1, 4), (2, 3), (8, 2)])
+    def test_queens_work_stealing(self, split_nb: int, processor_nb: int) -> None:
+        problem = QueensProblem(9)
+        solver = MultiprocessingSolver(problem.split(split_nb, 0), processor_nb, work_stealing=True)
+        solutions = solver.find_all()
+        assert len({tuple(solution.tolist()) for solution in solutions}) == 352
+        assert solver.get_statistics_as_dictionary()[STATS_LBL_SOLUTION_NB] == 352
+
+    def test_first_solution_work_stealing_unsatisfiable_subtree(self) -> None:
+        # 12 pigeons in 11 holes when x0 = 0, in 12 holes when x0 = 1: the first subtree has no solution and
+        # takes a long time to refute, the other worker gets the second one while the first subtree is explored
+        pigeon_nb = 12
+        problem = Problem([(0, 1)] + [(0, pigeon_nb - 1)] * pigeon_nb)
+        for i in range(1, pigeon_nb + 1):
+            problem.add_propagator(ALG_LINEAR_LEQ_C, [i, 0], [1, 1 - pigeon_nb, pigeon_nb - 2])
+            for j in range(i + 1, pigeon_nb + 1):
+                problem.add_propagator(ALG_NEQ, [i, j], [0])
+        solver = MultiprocessingSolver([problem], 2, work_stealing=True)
+        solution = next(solver.solve())
+        assert solution[0] == 1
+        assert len(set(solution[1:].tolist())) == pigeon_nb
+
+    def test_first_solution_work_stealing(self) -> None:
+        solver = MultiprocessingSolver([QueensProblem(8)], 2, work_stealing=True)
+        solution = next(solver.solve())
+        assert len(set(solution.tolist())) == 8
+
+    def test_minimize_relation(self) -> None:
+        problem = Problem([(-5, 5), (-100, 100)])
+        problem.add_propagator(
+            ALG_RELATION, [0, 1], [-5, 25, -4, 16, -3, 9, -2, 4, -1, 1, 0, 0, 1, 1, 2, 4, 3, 9, 4, 16, 5, 25]
+        )
+        solver = MultiprocessingSolver(problem.split(3, 0), 3)
+        solution = solver.minimize(1)
+        assert solution is not None
+        assert solution.tolist() == [0, 0]
+
+    def test_maximize_linear_leq_c(self) -> None:
+        problem = Problem([(0, 5), (0, 5), (0, 10)])
+        problem.add_propagator(ALG_LINEAR_LEQ_C, [0, 1, 2], [1, 1, 1, 6])
+        solver = MultiprocessingSolver(problem.split(2, 0), 2)
+        solutions = list(solver.maximize_solutions(2, mode=OPTIM_PRUNE))
+        assert [solution[2] for solution in solutions] == sorted({solution[2] for solution in solutions})
+        assert solutions[-1].tolist() == [0, 0, 6]
+
+    def test_minimize_shared_incumbent(self) -> None:
+        problem = QueensProblem(8)
+        solver = MultiprocessingSolver(problem.split(4, 0), 4)
+        solutions = list(solver.minimize_solutions(7))
+        assert [solution[7] for solution in solutions] == sorted({solution[7] for solution in solutions}, reverse=True)
+        assert solutions[-1][7] == 0
+
+    def test_unsatisfiable(self) -> None:
+        problem = Problem([(0, 3), (0, 3)])
+        problem.add_propagator(ALG_LINEAR_LEQ_C, [0, 1], [1, 1, -1])
+        solver = MultiprocessingSolver(problem.split(2, 0), 2)
+        assert solver.minimize(0) is None
+
+    def test_unpicklable_problem(self) -> None:
+        problems = Problem([(0, 3), (0, 3)]).split(2, 0)
+        problems[1].callback = lambda: None  # type: ignore[attr-defined]
+        solver = MultiprocessingSolver(problems, 2)
+        with pytest.raises((AttributeError, pickle.PicklingError)):
+            solver.find_all()
@@ -0,0 +1,136 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+import pytest
+
+from nucs.constants import (
+    MAX,
+    MIN,
+    NOGOOD_IDX_CHANGE_NB,
+    NOGOOD_IDX_NB,
+    NOGOOD_LBL_FAILURE_NB,
+    NOGOOD_LBL_PRUNING_NB,
+    NOGOOD_LBL_RECORDED_NB,
+    NOGOOD_RECORD_IDX_SIZE,
+    OPTIM_PRUNE,
+    OPTIM_RESET,
+    RESTART_LUBY,
+)
+from nucs.examples.golomb.golomb_problem import GolombProblem
+from nucs.examples.queens.queens_problem import QueensProblem
+from nucs.solvers.backtrack_solver import BacktrackSolver
+from nucs.solvers.nogoods import (
+    get_nogood_sections,
+    get_nogoods,
+    grow_nogoods,
+    propagate_nogoods,
+    record_nogood,
+    reduce_nogoods,
+    restart_nogoods,
+)
+
+
+def set_decisions(nogoods: np.ndarray, decisions: list[tuple[int, int, int]]) -> None:
+    for level, (variable, bound, value) in enumerate(decisions):
+        get_nogood_sections(nogoods)[0][level] = (2 * variable + bound, value)
+
+
+class TestNogoods:
+    def test_propagate_prunes(self) -> None:
+        nogoods = get_nogoods(10, 3, 4)
+        # x0 <= 1 and x1 >= 2 and x0 <= 0 is not a solution
+        set_decisions(nogoods, [(0, MAX, 1), (1, MIN, 2), (0, MAX, 0)])
+        record_nogood(nogoods, 2)
+        literals = get_nogood_sections(nogoods)[7]
+        # only the deepest decision on the max of x0 is kept
+        assert literals[:2].tolist() == [[2 * 0 + MAX, 0], [2 * 1 + MIN, 2]]
+        domains = np.array([[0, 5], [0, 5], [0, 5]], dtype=np.int32)
+        assert propagate_nogoods(nogoods, domains)
+        assert nogoods[NOGOOD_IDX_CHANGE_NB] == 0
+        domains[0, MAX] = 0
+        assert propagate_nogoods(nogoods, domains)
+        assert domains.tolist() == [[0, 0], [0, 1], [0, 5]]
+        assert nogoods[NOGOOD_IDX_CHANGE_NB] == 1
+
+    def test_grow_nogoods(self) -> None:
+        nogoods = get_nogoods(10, 3, 4)
+        set_decisions(nogoods, [(0, MAX, 1), (1, MIN, 2), (0, MAX, 0)])
+        record_nogood(nogoods, 2)
+        new_nogoods = grow_nogoods(nogoods, 8)
+        assert len(new_nogoods) == len(nogoods) + 2 * 4
+        sections, new_sections = get_nogood_sections(nogoods), get_nogood_sections(new_nogoods)
+        assert len(new_sections[0]) == 8
+        assert new_sections[0][:3].tolist() == sections[0][:3].tolist()
+        assert new_sections[7].tolist() == sections[7].tolist()
+        domains = np.array([[0, 0], [2, 5], [0, 5]], dtype=np.int32)
+        assert not propagate_nogoods(new_nogoods, domains)
+
+    def test_grow_nogoods_disabled(self) -> None:
+        assert len(grow_nogoods(get_nogoods(0, 3, 4), 8)) == 0
+
+    def test_propagate_fails(self) -> None:
+        nogoods = get_nogoods(10, 2, 4)
+        set_decisions(nogoods, [(0, MIN, 3), (1, MAX, 2)])
+        record_nogood(nogoods, 1)
+        domains = np.array([[3, 5], [0, 2]], dtype=np.int32)
+        assert not propagate_nogoods(nogoods, domains)
+
+    def test_propagate_after_widening(self) -> None:
+        nogoods = get_nogoods(10, 2, 4)
+        set_decisions(nogoods, [(0, MIN, 3), (1, MAX, 2)])
+        record_nogood(nogoods, 1)
+        # the domains grow back, as on a backtrack, the watched literals are visited again
+        for _ in range(2):
+            domains = np.array([[0, 5], [0, 5]], dtype=np.int32)
+            assert propagate_nogoods(nogoods, domains)
+            domains[0, MIN] = 4
+            assert propagate_nogoods(nogoods, domains)
+            assert domains.tolist() == [[4, 5], [3, 5]]
+
+    def test_record_subsumes_run(self) -> None:
+        nogoods = get_nogoods(10, 3, 4)
+        set_decisions(nogoods, [(0, MAX, 1), (1, MIN, 2), (2, MIN, 1)])
+        record_nogood(nogoods, 2)
+        record_nogood(nogoods, 1)
+        records = get_nogood_sections(nogoods)[6]
+        assert records[:2, NOGOOD_RECORD_IDX_SIZE].tolist() == [0, 2]
+        restart_nogoods(nogoods)
+        record_nogood(nogoods, 0)
+        assert records[:3, NOGOOD_RECORD_IDX_SIZE].tolist() == [0, 2, 1]
+
+    def test_reduce(self) -> None:
+        nogoods = get_nogoods(4, 4, 4)
+        for variable in range(4):
+            set_decisions(nogoods, [(variable, MIN, 1), ((variable + 1) % 4, MIN, 1)])
+            record_nogood(nogoods, variable % 2)
+            restart_nogoods(nogoods)
+        reduce_nogoods(nogoods)
+        assert nogoods[NOGOOD_IDX_NB] == 2
+        # the nogoods of size 1 are kept
+        assert get_nogood_sections(nogoods)[6][:2, NOGOOD_RECORD_IDX_SIZE].tolist() == [1, 1]
+
+    def test_solve_all_restart(self) -> None:
+        solver = BacktrackSolver(QueensProblem(10), restart_policy=RESTART_LUBY, restart_scale=1, nogood_capacity=64)
+        assert len(solver.find_all()) == 724
+        statistics = solver.get_nogood_statistics()
+        assert statistics[NOGOOD_LBL_RECORDED_NB] > 0
+        assert statistics[NOGOOD_LBL_PRUNING_NB] + statistics[NOGOOD_LBL_FAILURE_NB] > 0
+
+    @pytest.mark.parametrize("mode", [OPTIM_PRUNE, OPTIM_RESET])
+    def test_minimize_restart(self, mode: str) -> None:
+        problem = GolombProblem(6)
+        solver = BacktrackSolver(problem, restart_policy=RESTART_LUBY, restart_scale=4, nogood_capacity=16)
+        solution = solver.minimize(problem.length_idx, mode=mode)
+        assert solution is not None
+        assert solution[problem.length_idx] == 17
+        assert solver.get_nogood_statistics()[NOGOOD_LBL_RECORDED_NB] > 0
@@ -0,0 +1,94 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+import pytest
+
+from nucs.constants import (
+    CHOICE_POINTS_COPY,
+    CHOICE_POINTS_TRAIL,
+    MAX,
+    OPTIM_PRUNE,
+    OPTIM_RESET,
+    PHASE_NONE,
+    STATS_LBL_SOLVER_CHOICE_NB,
+)
+from nucs.examples.golomb.golomb_problem import GolombProblem
+from nucs.examples.queens.queens_problem import QueensProblem
+from nucs.solvers.backtrack_solver import BacktrackSolver
+from nucs.solvers.phases import get_hint, get_hint_domains, get_phases
+
+GOLOMB_6 = [1, 4, 10, 12, 17, 3, 9, 11, 16, 6, 8, 13, 2, 7, 5]  # an optimal solution of GolombProblem(6)
+
+
+class TestPhases:
+    def test_get_hint(self) -> None:
+        assert get_hint(3, None).tolist() == []
+        assert get_hint(3, [1, None, 2]).tolist() == [1, PHASE_NONE, 2]
+        with pytest.raises(ValueError):
+            get_hint(3, [1, 2])
+
+    def test_get_phases(self) -> None:
+        hint = get_hint(2, [None, 1])
+        assert get_phases(2, hint, False).tolist() == [PHASE_NONE, 1]
+        assert get_phases(2, get_hint(2, None), True).tolist() == [PHASE_NONE, PHASE_NONE]
+        assert get_phases(2, get_hint(2, None), False).tolist() == []
+
+    def test_get_hint_domains(self) -> None:
+        domains = np.array([[0, 3], [0, 3]], dtype=np.int32)
+        hint_domains = get_hint_domains(domains, get_hint(2, [None, 2]))
+        assert hint_domains is not None
+        assert hint_domains.tolist() == [[0, 3], [2, 2]]
+        assert get_hint_domains(domains, get_hint(2, [4, None])) is None
+
+    @pytest.mark.parametrize("choice_points", [CHOICE_POINTS_COPY, CHOICE_POINTS_TRAIL])
+    def test_solve_hint(self, choice_points: str) -> None:
+        solver = BacktrackSolver(QueensProblem(8), solution_hint=[7, 3, 0, 2, 5, 1, 6, 4], choice_points=choice_points)
+        assert next(solver.solve()).tolist() == [7, 3, 0, 2, 5, 1, 6, 4]
+
+    @pytest.mark.parametrize("choice_points", [CHOICE_POINTS_COPY, CHOICE_POINTS_TRAIL])
+    @pytest.mark.parametrize("mode", [OPTIM_RESET, OPTIM_PRUNE])
+    def test_minimize_hint(self, choice_points: str, mode: str) -> None:
+        problem = GolombProblem(6)
+        solver = BacktrackSolver(problem, solution_hint=GOLOMB_6, choice_points=choice_points)
+        solutions = list(solver.optimize_solutions(problem.length_idx, MAX, mode))
+        assert [solution.tolist() for solution in solutions] == [GOLOMB_6]
+        problem = GolombProblem(6)
+        cold_solver = BacktrackSolver(problem, choice_points=choice_points)
+        assert cold_solver.minimize(problem.length_idx, mode) is not None
+        assert (
+            solver.get_statistics_as_dictionary()[STATS_LBL_SOLVER_CHOICE_NB]
+            < cold_solver.get_statistics_as_dictionary()[STATS_LBL_SOLVER_CHOICE_NB]
+        )
+
+    def test_minimize_partial_hint(self) -> None:
+        problem = GolombProblem(6)
+        solver = BacktrackSolver(problem, solution_hint=GOLOMB_6[:6] + [None] * (problem.domain_nb - 6))
+        solutions = list(solver.minimize_solutions(problem.length_idx))
+        assert [solution[problem.length_idx] for solution in solutions] == [17]
+
+    @pytest.mark.parametrize("choice_points", [CHOICE_POINTS_COPY, CHOICE_POINTS_TRAIL])
+    def test_minimize_infeasible_hint(self, choice_points: str) -> None:
+        problem = GolombProblem(6)
+        hint = [1, 2, 3, 4, 5] + [None] * (problem.domain_nb - 5)  # the differences 1 are not distinct
+        solver = BacktrackSolver(problem, solution_hint=hint, choice_points=choice_points)
+        solution = solver.minimize(problem.length_idx)
+        assert solution is not None
+        assert solution[problem.length_idx] == 17
+
+    def test_phase_saving(self) -> None:
+        solver = BacktrackSolver(QueensProblem(8), phase_saving=True)
+        solutions = solver.solve()
+        solution = next(solutions)
+        assert solver.phases.tolist() == solution.tolist()
+        solution = next(solutions)
+        assert solver.phases.tolist() == solution.tolist()
@@ -0,0 +1,84 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+
+from nucs.constants import (
+    WEIGHTS_ACTIVITY_BUMP_INIT,
+    WEIGHTS_ACTIVITY_BUMP_MAX,
+    WEIGHTS_HEADER_NB,
+    WEIGHTS_IDX_ACTIVITY_BUMP,
+    WEIGHTS_IDX_FAILURE_NB,
+    WEIGHTS_SECTION_ACTIVITY,
+    WEIGHTS_SECTION_CHB_SCORE,
+    WEIGHTS_SECTION_FAILURE_NB,
+)
+from nucs.problems.problem import Problem
+from nucs.propagators.propagators import ALG_ALLDIFFERENT, ALG_LINEAR_LEQ_C
+from nucs.solvers.propagator_weights import (
+    bump_propagator_weights,
+    get_propagator_weights_size,
+    get_weighted_var_heuristic_params,
+    init_propagator_weights,
+)
+
+
+def _weights(propagator_nb):  # type: ignore[no-untyped-def]
+    propagator_weights = np.empty(get_propagator_weights_size(propagator_nb), dtype=np.int64)
+    init_propagator_weights(propagator_weights)
+    return propagator_weights
+
+
+def _section(propagator_weights, propagator_nb, section):  # type: ignore[no-untyped-def]
+    start = WEIGHTS_HEADER_NB + section * propagator_nb
+    return propagator_weights[start : start + propagator_nb].tolist()
+
+
+class TestPropagatorWeights:
+    def test_bump_counts_failures(self) -> None:
+        propagator_weights = _weights(3)
+        for prop_idx in (1, 2, 1):
+            bump_propagator_weights(propagator_weights, 3, prop_idx)
+        assert propagator_weights[WEIGHTS_IDX_FAILURE_NB] == 3
+        assert _section(propagator_weights, 3, WEIGHTS_SECTION_FAILURE_NB) == [0, 2, 1]
+
+    def test_bump_favors_recent_failures(self) -> None:
+        propagator_weights = _weights(2)
+        for prop_idx in (0, 1, 1):
+            bump_propagator_weights(propagator_weights, 2, prop_idx)
+        activities = _section(propagator_weights, 2, WEIGHTS_SECTION_ACTIVITY)
+        assert activities[0] == WEIGHTS_ACTIVITY_BUMP_INIT
+        assert activities[1] > 2 * activities[0]
+        scores = _section(propagator_weights, 2, WEIGHTS_SECTION_CHB_SCORE)
+        assert 0 < scores[0] < scores[1]
+
+    def test_bump_rescales_activities(self) -> None:
+        propagator_weights = _weights(1)
+        for _ in range(1_000):
+            bump_propagator_weights(propagator_weights, 1, 0)
+            assert WEIGHTS_ACTIVITY_BUMP_INIT <= propagator_weights[WEIGHTS_IDX_ACTIVITY_BUMP]
+            assert propagator_weights[WEIGHTS_IDX_ACTIVITY_BUMP] <= WEIGHTS_ACTIVITY_BUMP_MAX
+        assert 0 < _section(propagator_weights, 1, WEIGHTS_SECTION_ACTIVITY)[0]
+
+    def test_get_weighted_var_heuristic_params(self) -> None:
+        problem = Problem([(0, 3)] * 3)
+        problem.add_propagator(ALG_ALLDIFFERENT, [0, 2])
+        problem.add_propagator(ALG_LINEAR_LEQ_C, [1, 2, 2], [1, 1, 1, 3])
+        problem.init()
+        params = get_weighted_var_heuristic_params(
+            problem.propagator_nb, problem.domain_nb, problem.bounds, problem.propagator_variables
+        )
+        assert params.shape[0] == 1
+        assert params[0, 0] == 2
+        csr = params[0, 1 + get_propagator_weights_size(2) :].tolist()
+        # the offsets of the variables then their propagators, variable 2 being listed once in propagator 1
+        assert csr == [0, 1, 2, 4, 0, 1, 0, 1]
@@ -0,0 +1,24 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+from nucs.constants import LIMIT_NONE, RESTART_GEOMETRIC, RESTART_LUBY, RESTART_NONE
+from nucs.solvers.restarts import luby, restart_backtrack_nb
+
+
+class TestRestarts:
+    def test_luby(self) -> None:
+        assert [luby(index) for index in range(15)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+    def test_restart_backtrack_nb(self) -> None:
+        assert [restart_backtrack_nb(RESTART_LUBY, 10, 2, index) for index in range(4)] == [10, 10, 20, 10]
+        assert [restart_backtrack_nb(RESTART_GEOMETRIC, 10, 1.5, index) for index in range(4)] == [10, 15, 22, 33]
+        assert restart_backtrack_nb(RESTART_NONE, 10, 1.5, 3) == LIMIT_NONE
@@ -0,0 +1,142 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+import pytest
+
+from nucs.constants import (
+    CHOICE_POINTS_AUTO,
+    CHOICE_POINTS_COPY,
+    CHOICE_POINTS_TRAIL,
+    MAX,
+    MIN,
+    OPTIM_PRUNE,
+    OPTIM_RESET,
+    RESTART_LUBY,
+    STATS_IDX_SOLVER_BACKTRACK_NB,
+    TRAIL_AUTO_CELL_NB,
+    TRAIL_ENTRY_IDX_DOMAIN,
+    TRAIL_ENTRY_IDX_VARIABLE,
+    TRAIL_IDX_ENTRY_CAPACITY,
+    TRAIL_IDX_ENTRY_NB,
+    TRAIL_IDX_LEVEL_CAPACITY,
+)
+from nucs.examples.golomb.golomb_problem import GolombProblem, golomb_consistency_algorithm
+from nucs.examples.queens.queens_problem import QueensProblem
+from nucs.heuristics.heuristics import DOM_HEURISTIC_MID_VALUE, DOM_HEURISTIC_MIN_VALUE, DOM_HEURISTIC_SPLIT_LOW
+from nucs.solvers.backtrack_solver import BacktrackSolver
+from nucs.solvers.consistency_algorithms import register_consistency_algorithm
+from nucs.solvers.multiprocessing_solver import MultiprocessingSolver
+from nucs.solvers.trail import (
+    clear_trail,
+    get_branch_domains,
+    get_trail,
+    get_trail_sections,
+    grow_trail,
+    is_trailing,
+    trail_domain,
+)
+
+
+class TestTrail:
+    @pytest.mark.parametrize(
+        "choice_points, domain_nb, expected_depth, trailing",
+        [
+            (CHOICE_POINTS_COPY, 1 << 20, 1 << 10, False),
+            (CHOICE_POINTS_TRAIL, 8, 8, True),
+            (CHOICE_POINTS_AUTO, 8, 8, False),
+            (CHOICE_POINTS_AUTO, TRAIL_AUTO_CELL_NB, 1, True),
+        ],
+    )
+    def test_is_trailing(self, choice_points: str, domain_nb: int, expected_depth: int, trailing: bool) -> None:
+        assert is_trailing(choice_points, domain_nb, expected_depth) == trailing
+
+    def test_get_trail(self) -> None:
+        assert len(get_trail(10, 8, False)) == 0
+
+    def test_trail_domain(self) -> None:
+        trail = get_trail(3, 8, True)
+        domains = np.array([[0, 5], [1, 2], [3, 3]], dtype=np.int32)
+        trail_domain(trail, domains, 1)
+        trail_domain(trail, domains, 1)  # a domain is trailed once per stamp
+        assert trail[TRAIL_IDX_ENTRY_NB] == 1
+        clear_trail(trail)
+        assert trail[TRAIL_IDX_ENTRY_NB] == 0
+        trail_domain(trail, domains, 1)
+        trail_domain(trail, domains, 0)
+        _, _, entries = get_trail_sections(trail)
+        assert entries[:2, TRAIL_ENTRY_IDX_VARIABLE].tolist() == [1, 0]
+        assert entries[:2, TRAIL_ENTRY_IDX_DOMAIN + MIN].tolist() == [1, 0]
+        assert entries[:2, TRAIL_ENTRY_IDX_DOMAIN + MAX].tolist() == [2, 5]
+
+    def test_grow_trail(self) -> None:
+        trail = get_trail(3, 8, True)
+        domains = np.array([[0, 5], [1, 2], [3, 3]], dtype=np.int32)
+        trail_domain(trail, domains, 2)
+        trail[TRAIL_IDX_ENTRY_NB] = trail[TRAIL_IDX_ENTRY_CAPACITY]
+        new_trail = grow_trail(trail)
+        assert new_trail[TRAIL_IDX_ENTRY_CAPACITY] == 2 * trail[TRAIL_IDX_ENTRY_CAPACITY]
+        assert new_trail[TRAIL_IDX_LEVEL_CAPACITY] == trail[TRAIL_IDX_LEVEL_CAPACITY]
+        _, _, entries = get_trail_sections(new_trail)
+        assert entries[0].tolist() == [2, 3, 3]
+
+    def test_get_branch_domains(self) -> None:
+        branch_domains = get_branch_domains(1000)
+        assert branch_domains.shape == (3, 1000, 2)
+        branch_domains[1, 0] = [4, 7]
+        assert branch_domains[1, 999].tolist() == [4, 7]
+
+    @pytest.mark.parametrize(
+        "dom_heuristic", [DOM_HEURISTIC_MID_VALUE, DOM_HEURISTIC_MIN_VALUE, DOM_HEURISTIC_SPLIT_LOW]
+    )
+    @pytest.mark.parametrize("stks_initial_height", [4, 128])
+    def test_queens(self, dom_heuristic: int, stks_initial_height: int) -> None:
+        backtrack_nbs = []
+        for choice_points in (CHOICE_POINTS_COPY, CHOICE_POINTS_TRAIL):
+            solver = BacktrackSolver(
+                QueensProblem(8),
+                dom_heuristic=dom_heuristic,
+                stks_initial_height=stks_initial_height if choice_points == CHOICE_POINTS_TRAIL else 128,
+                choice_points=choice_points,
+            )
+            assert len(solver.find_all()) == 92
+            backtrack_nbs.append(solver.statistics[STATS_IDX_SOLVER_BACKTRACK_NB])
+        assert backtrack_nbs[0] == backtrack_nbs[1]
+
+    def test_queens_restarts(self) -> None:
+        solver = BacktrackSolver(
+            QueensProblem(8), restart_policy=RESTART_LUBY, restart_scale=1, choice_points=CHOICE_POINTS_TRAIL
+        )
+        assert len(solver.find_all()) == 92
+
+    def test_queens_work_stealing(self) -> None:
+        solver = MultiprocessingSolver([QueensProblem(9)], 2, work_stealing=True, choice_points=CHOICE_POINTS_TRAIL)
+        assert len({tuple(solution.tolist()) for solution in solver.find_all()}) == 352
+
+    @pytest.mark.parametrize("mode", [OPTIM_PRUNE, OPTIM_RESET])
+    def test_minimize_golomb(self, mode: str) -> None:
+        problem = GolombProblem(7)
+        consistency_alg_golomb = register_consistency_algorithm(golomb_consistency_algorithm)
+        solver = BacktrackSolver(
+            problem,
+            consistency_algorithm=consistency_alg_golomb,
+            stks_initial_height=4,
+            choice_points=CHOICE_POINTS_TRAIL,
+        )
+        solution = solver.minimize(problem.length_idx, mode=mode)
+        assert solution is not None
+        assert solution[problem.length_idx] == 25
+
+    def test_nogoods_copy(self) -> None:
+        solver = BacktrackSolver(QueensProblem(8), nogood_capacity=16, choice_points=CHOICE_POINTS_TRAIL)
+        assert len(solver.trail) == 0
+        assert len(solver.find_all()) == 92
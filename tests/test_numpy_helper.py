@@ -0,0 +1,34 @@
+###############################################################################
+# __   _            _____    _____
+# | \ | |          / ____|  / ____|
+# |  \| |  _   _  | |      | (___
+# | . ` | | | | | | |       \___ \
+# | |\  | | |_| | | |____   ____) |
+# |_| \_|  \__,_|  \_____| |_____/
+#
+# Fast constraint solving in Python  - https://github.com/yangeorget/nucs
+#
+# Copyright 2024-2026 - Yan Georget
+###############################################################################
+import numpy as np
+
+from nucs.numpy_helper import flatten_arrays, unique_rows
+
+
+class TestNumpyHelper:
+    def test_flatten_arrays(self) -> None:
+        flat, offsets = flatten_arrays([np.array([1, 2]), np.array([[3, 4], [5, 6]]), np.array([], dtype=np.int64)])
+        assert flat.tolist() == [1, 2, 3, 4, 5, 6]
+        assert offsets.tolist() == [0, 2, 6, 6]
+
+    def test_unique_rows(self) -> None:
+        array = np.array([[1, 2], [0, 5], [1, 2], [1, 0], [0, 5]], dtype=np.int32)
+        rows, indices = unique_rows(array)
+        expected_rows, expected_indices = np.unique(array, axis=0, return_inverse=True)
+        assert rows.tolist() == expected_rows.tolist() == [[0, 5], [1, 0], [1, 2]]
+        assert indices.tolist() == expected_indices.reshape(-1).tolist() == [2, 0, 2, 1, 0]
+
+    def test_unique_rows_no_column(self) -> None:
+        rows, indices = unique_rows(np.empty((3, 0), dtype=np.int32))
+        assert rows.shape == (1, 0)
+        assert indices.tolist() == [0, 0, 0]